@@ -0,0 +1,207 @@
+"""
+bench_pacing.py
+---------------
+
+Benchmark of fixed and adaptive pacing against a local server that throttles.
+
+The server started here stands in for arXiv under load. It has a budget of
+`--server_rate` requests per second: requests over it get a 429 response with
+a 'Retry-After' header. Its latency grows with the number of requests in
+flight, and halfway through the run it slows down (half the budget, longer
+responses), as a busy server would.
+
+Every case downloads `--requests` pages with `--workers` threads through an
+`HTTPClient`:
+
+- `fixed_fast`: a fixed rate well over the budget of the server;
+- `fixed_safe`: a fixed rate under the budget of the slow phase;
+- `adaptive`: an `AdaptiveTokenBucket` starting from the fast rate.
+
+For each case the wall time, throughput, throttled (429) responses and, for
+the adaptive case, the pacing decisions are reported. Times are scaled down
+(intervals of tens of milliseconds instead of seconds) so the run is short.
+
+Usage:
+    python benchmarks/bench_pacing.py
+    python benchmarks/bench_pacing.py --requests 300 --server_rate 20 --output pacing.json
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Import the package from the source tree ---
+try:
+    from arxivscraper.monitoring.metrics import RunMetrics
+    from arxivscraper.webtools.fetcher import fetch_pages
+    from arxivscraper.webtools.httpclient import HTTPClient
+    from arxivscraper.webtools.pacing import AdaptiveTokenBucket
+    from arxivscraper.webtools.ratelimit import TokenBucket
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_DIR), "source"))
+    from arxivscraper.monitoring.metrics import RunMetrics
+    from arxivscraper.webtools.fetcher import fetch_pages
+    from arxivscraper.webtools.httpclient import HTTPClient
+    from arxivscraper.webtools.pacing import AdaptiveTokenBucket
+    from arxivscraper.webtools.ratelimit import TokenBucket
+
+# Latency of an idle server, and added by every other request in flight (seconds)
+BASE_LATENCY = 0.02
+LOAD_LATENCY = 0.02
+
+# Page returned by the server
+BODY = b"<html><body><ol class='breathe-horizontal'></ol></body></html>"
+
+
+class ThrottlingServer(ThreadingHTTPServer):
+    """
+    Local HTTP server with a request budget, a latency growing with the load
+    and a slow phase starting after `slow_after` requests.
+
+    Args:
+        rate (float): Requests per second served before the slow phase.
+        slow_after (int): Number of served requests after which the budget is
+            halved and the latency doubled.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, rate: float, slow_after: int):
+        super().__init__(("127.0.0.1", 0), ThrottlingHandler)
+        self.rate = rate
+        self.slow_after = slow_after
+        self.served = 0
+        self.throttled = 0
+        self.in_flight = 0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def admit(self) -> tuple[bool, float]:
+        """Takes a request from the budget; returns whether it is served, and its latency."""
+        with self._lock:
+            slow = self.served >= self.slow_after
+            rate = self.rate / 2 if slow else self.rate
+            now = time.monotonic()
+            self._tokens = min(1.0, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            latency = (BASE_LATENCY + LOAD_LATENCY * self.in_flight) * (2 if slow else 1)
+            if self._tokens < 1:
+                self.throttled += 1
+                return False, latency
+            self._tokens -= 1
+            self.served += 1
+            self.in_flight += 1
+            return True, latency
+
+    def done(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        served, latency = self.server.admit()
+        if not served:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+        finally:
+            self.server.done()
+
+    def log_message(self, *args):
+        pass
+
+
+def run_case(name: str, limiter: TokenBucket, args: argparse.Namespace) -> dict:
+    """Downloads `args.requests` pages from a new server with the given limiter."""
+    server = ThrottlingServer(args.server_rate, slow_after=args.requests // 2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    metrics = RunMetrics()
+    if isinstance(limiter, AdaptiveTokenBucket):
+        limiter.metrics = metrics
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base_url}/page/{number}" for number in range(args.requests)]
+    client = HTTPClient(limiter=limiter, metrics=metrics, backoff_base=0.05, backoff_max=1.0,
+                        max_retries=20, pool_size=args.workers)
+    start = time.perf_counter()
+    try:
+        with client:
+            for _ in fetch_pages(urls, fetch=client.fetch, workers=args.workers):
+                pass
+    finally:
+        server.shutdown()
+        server.server_close()
+    elapsed = time.perf_counter() - start
+
+    counters = metrics.summary()["counters"]
+    result = {"seconds": elapsed, "pages_per_second": args.requests / elapsed, "throttled": server.throttled,
+              "decreases": counters.get("pacing_decreases", 0), "pauses": counters.get("pacing_pauses", 0)}
+    print(f"  {name:<12} {elapsed:8.2f} s {result['pages_per_second']:8.1f} pages/s "
+          f"{server.throttled:6d} throttled {result['decreases']:4d} decreases {result['pauses']:4d} pauses")
+    return result
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fixed and adaptive pacing against a local throttling server.")
+    parser.add_argument("--requests", type=int, default=200, help="Pages downloaded per case")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent downloads")
+    parser.add_argument("--server_rate", type=float, default=20.0,
+                        help="Requests per second the server accepts before its slow phase")
+    parser.add_argument("--verbose", action="store_true", help="Print every pacing decision")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    fast = args.server_rate * 2
+    safe = args.server_rate / 2 * 0.8
+    cases = {
+        "fixed_fast": TokenBucket(requests=fast, period=1.0, burst=1),
+        "fixed_safe": TokenBucket(requests=safe, period=1.0, burst=1),
+        "adaptive": AdaptiveTokenBucket(requests=fast, period=1.0, min_interval=1 / fast, max_interval=5.0,
+                                        max_concurrency=args.workers, step=6.0,
+                                        latency_target=0.2, log=print if args.verbose else None),
+    }
+    print(f"{args.requests} pages, {args.workers} workers, server budget {args.server_rate:g}/s "
+          f"then {args.server_rate / 2:g}/s")
+    results = {name: run_case(name, limiter, args) for name, limiter in cases.items()}
+
+    if args.output:
+        report = {"python": platform.python_version(), "requests": args.requests, "workers": args.workers,
+                  "server_rate": args.server_rate, "results": results}
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+bench_parsing.py
+----------------
+
+Offline benchmarks of the parsing, extraction and export stages.
+
+Every recorded page of `benchmarks/pages/` (see `make_pages.py`), and the
+trimmed pages with the markup of arXiv itself kept in `tests/fixtures/html/`,
+is run through:
+
+- `soup`: building the BeautifulSoup tree (`html.parser`), as `get_soup()` does.
+- `number_of_results` and each `get_*` extractor, over every result of the page.
+- `extract_records`: whole-page extraction with the BeautifulSoup reference.
+- `parse_page[bs4]`: parsing plus extraction, the default engine end to end.
+- `parse_page[fast/lxml]` and `parse_page[fast/html.parser]`: the single-pass engine.
+- `export_dataframe_csv`: building the DataFrame and `DataFrame.to_csv()`.
+- `export_csv_sink`: writing the page through the streaming `CSVSink`.
+
+For each case the best and median wall time of `--repeat` runs are reported,
+with the throughput in records/s and the peak memory allocated by Python
+(measured with `tracemalloc` in a separate run, so it does not slow down the
+timings). No network access is needed.
+
+Results can be saved as JSON and compared with a baseline: the run fails (exit
+status 1) when a case is slower than the baseline by more than `--tolerance`.
+
+Usage:
+    python benchmarks/bench_parsing.py
+    python benchmarks/bench_parsing.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_parsing.py --compare benchmarks/baseline.json --tolerance 0.2
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import argparse
+import glob
+import gzip
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from bs4 import BeautifulSoup
+from pandas import DataFrame
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES_DIR = os.path.join(BENCHMARKS_DIR, "pages")
+FIXTURES_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "tests", "fixtures", "html")
+
+# --- Import the package from the source tree ---
+try:
+    from arxivscraper.config.config import RECORD_FIELDS
+except Exception:
+    SOURCE_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "source")
+    if SOURCE_DIR not in sys.path:
+        sys.path.insert(0, SOURCE_DIR)
+
+    from arxivscraper.config.config import RECORD_FIELDS
+
+from arxivscraper.scrapertools.scrapertools import (extract_records, get_abstract, get_authors, get_index,
+                                                    get_tags, get_title, number_of_results, parse_page)
+from arxivscraper.scrapertools.fastextract import check_parity, extract_page_fast, lxml
+from arxivscraper.storage.sinks import CSVSink
+
+
+# A benchmark case: a setup function, run before every timed call and not timed
+# itself, and the timed function, which receives the value returned by the setup.
+Case = tuple[Callable[[], Any], Callable[[Any], Any]]
+
+
+def load_pages(pattern: str = "*") -> dict[str, bytes]:
+    """Reads the recorded pages and the arXiv fixtures whose name matches `pattern`."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, f"{pattern}.html.gz"))):
+        with gzip.open(path, "rb") as file:
+            pages[os.path.basename(path)[:-len(".html.gz")]] = file.read()
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, f"{pattern}.html"))):
+        with open(path, "rb") as file:
+            pages[os.path.basename(path)[:-len(".html")]] = file.read()
+    return pages
+
+
+def page_cases(content: bytes) -> dict[str, Case]:
+    """Builds the benchmark cases of one page."""
+    def soup():
+        return BeautifulSoup(content, "html.parser")
+
+    def results():
+        return soup().select("li.arxiv-result")
+
+    def extractor(function):
+        def run(results):
+            for result in results:
+                function(result)
+        return results, run
+
+    records = extract_records(soup())
+
+    def export_dataframe_csv(records):
+        DataFrame(records, columns=list(RECORD_FIELDS)).to_csv(io.StringIO(), index=False)
+
+    def export_csv_sink(records):
+        with tempfile.TemporaryDirectory() as directory:
+            with CSVSink(os.path.join(directory, "page.csv")) as sink:
+                sink.write(records)
+
+    cases = {
+        "soup": (lambda: content, lambda content: BeautifulSoup(content, "html.parser")),
+        "number_of_results": (soup, number_of_results),
+        "get_index": extractor(get_index),
+        "get_title": extractor(get_title),
+        "get_tags": extractor(get_tags),
+        "get_authors": extractor(get_authors),
+        # get_abstract() removes the More/Less links, so every run needs a fresh tree
+        "get_abstract": extractor(get_abstract),
+        "extract_records": (soup, extract_records),
+        "parse_page[bs4]": (lambda: content, lambda content: parse_page(content, engine="bs4")),
+        "parse_page[fast/html.parser]": (lambda: content,
+                                         lambda content: extract_page_fast(content, backend="html.parser")),
+        "export_dataframe_csv": (lambda: records, export_dataframe_csv),
+        "export_csv_sink": (lambda: records, export_csv_sink),
+    }
+    if lxml is not None:
+        cases["parse_page[fast/lxml]"] = (lambda: content, lambda content: extract_page_fast(content, backend="lxml"))
+    return cases
+
+
+def measure(case: Case, repeat: int) -> dict:
+    """Times a case `repeat` times and measures its peak memory in one more run."""
+    setup, run = case
+    timings = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"best": min(timings), "median": statistics.median(timings), "peak_bytes": peak}
+
+
+def run_benchmarks(pages: dict[str, bytes], repeat: int, selected: str | None = None) -> dict:
+    """Runs every case on every page and returns the results as a JSON-serialisable dict."""
+    results = {}
+    for page, content in pages.items():
+        # The fast engine is only worth timing if it agrees with the reference
+        for backend in ("html.parser", "lxml") if lxml is not None else ("html.parser",):
+            differences = check_parity(content, backend=backend)
+            if differences:
+                raise AssertionError(f"{page}: fast/{backend} differs from bs4: {differences[:3]}")
+
+        count = len(extract_page_fast(content)[1])
+        for name, case in page_cases(content).items():
+            if selected and selected not in name:
+                continue
+            result = measure(case, repeat)
+            result["records"] = count
+            result["records_per_s"] = count / result["best"] if result["best"] else None
+            results[f"{page}/{name}"] = result
+            print(f"{page:<16} {name:<30} best {result['best'] * 1000:9.2f} ms   "
+                  f"median {result['median'] * 1000:9.2f} ms   "
+                  f"{result['records_per_s'] or 0:12,.0f} rec/s   peak {result['peak_bytes'] / 1024:10,.0f} KiB")
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lxml": lxml is not None,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares a report with a baseline.
+
+    Args:
+        report (dict): Results of this run.
+        baseline (dict): Results of a previous run.
+        tolerance (float): Allowed relative slowdown of the best time (0.2 = 20%).
+
+    Returns:
+        list[str]: The cases slower than the baseline beyond the tolerance.
+    """
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["best"] / reference["best"]
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"  {name:<48} {ratio:6.2f}x  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline benchmarks of the arXiv page parsing and export stages.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--pages", type=str, default="*", help="Glob pattern of the recorded pages to use")
+    parser.add_argument("--case", type=str, default=None, help="Only run the cases whose name contains this text")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--save-baseline", type=str, default=None, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=str, default=None, help="Compare the results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before failing")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"No recorded pages found in {PAGES_DIR}; run benchmarks/make_pages.py first.")
+        return 1
+
+    report = run_benchmarks(pages, repeat=args.repeat, selected=args.case)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            print(f"Results saved to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+bench_startup.py
+----------------
+
+Startup-time benchmark of the command-line interface.
+
+Short jobs (e.g., incremental harvests launched from cron) are dominated by the
+time spent starting the interpreter and importing modules. Every case runs
+`python -m arxivscraper` in a fresh process:
+
+- `python`: the bare interpreter (`python -c pass`), the floor of every case.
+- `help`: `--help` of the scrape command.
+- `validation_error`: an invalid date range, rejected by `usercli.validate_inputs`.
+- `search_help`, `authors_help`, `dedup_help`, `archive_help`,
+  `queue_help`: `--help` of the subcommands.
+
+For each case the best and median wall time of `--repeat` runs are reported,
+along with the overhead over the bare interpreter. One more run with
+`-X importtime` lists the heavy libraries imported (pandas, numpy, bs4,
+requests, tqdm...): none of these cases needs them, so the run fails (exit
+status 1) if any is imported, as well as when a case is slower than a saved
+baseline by more than `--tolerance`.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --save-baseline benchmarks/startup_baseline.json
+    python benchmarks/bench_startup.py --compare benchmarks/startup_baseline.json --tolerance 0.2
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "source")
+
+# Libraries that argument parsing and validation must not import
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "requests", "urllib3", "tqdm", "lxml", "pyarrow")
+
+# Arguments of every case, after `python`
+CASES = {
+    "python": ["-c", "pass"],
+    "help": ["-m", "arxivscraper", "--help"],
+    "validation_error": ["-m", "arxivscraper", "--start_date", "2025-02-01", "--end_date", "2025-01-01",
+                         "--category", "gr-qc"],
+    "search_help": ["-m", "arxivscraper", "search", "--help"],
+    "authors_help": ["-m", "arxivscraper", "authors", "--help"],
+    "dedup_help": ["-m", "arxivscraper", "dedup", "--help"],
+    "archive_help": ["-m", "arxivscraper", "archive", "--help"],
+    "queue_help": ["-m", "arxivscraper", "queue", "--help"],
+}
+
+
+def run_case(arguments: list[str], directory: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    """Runs the interpreter with `arguments` in `directory`, with the source tree importable."""
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [SOURCE_DIR, environment.get("PYTHONPATH")]))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + arguments
+    # Validation errors exit with a non-zero status on purpose, so it is not checked
+    return subprocess.run(command, cwd=directory, env=environment, capture_output=True, text=True)
+
+
+def imported_modules(stderr: str) -> set[str]:
+    """Returns the top-level packages listed in the `-X importtime` output."""
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            modules.add(name.split(".")[0])
+    return modules
+
+
+def measure(arguments: list[str], repeat: int, directory: str) -> dict:
+    """Times a case `repeat` times and lists the heavy modules it imports in one more run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_case(arguments, directory)
+        timings.append(time.perf_counter() - start)
+
+    heavy = sorted(imported_modules(run_case(arguments, directory, importtime=True).stderr) & set(HEAVY_MODULES))
+    return {"best": min(timings), "median": statistics.median(timings), "heavy_modules": heavy}
+
+
+def run_benchmarks(repeat: int, selected: str | None = None) -> dict:
+    """Runs every case and returns the results as a JSON-serialisable dict."""
+    results = {}
+    # Run outside the repository, so `arxivscraper` is only found through PYTHONPATH
+    with tempfile.TemporaryDirectory() as directory:
+        for name, arguments in CASES.items():
+            if selected and selected not in name and name != "python":
+                continue
+            results[name] = measure(arguments, repeat, directory)
+
+    floor = results["python"]["best"]
+    for name, result in results.items():
+        result["overhead"] = result["best"] - floor
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"{name:<18} best {result['best'] * 1000:8.1f} ms   median {result['median'] * 1000:8.1f} ms   "
+              f"overhead {result['overhead'] * 1000:8.1f} ms   heavy imports: {heavy}")
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares a report with a baseline.
+
+    Args:
+        report (dict): Results of this run.
+        baseline (dict): Results of a previous run.
+        tolerance (float): Allowed relative slowdown of the best time (0.2 = 20%).
+
+    Returns:
+        list[str]: The cases slower than the baseline beyond the tolerance.
+    """
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["best"] / reference["best"]
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"  {name:<18} {ratio:6.2f}x  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Startup-time benchmark of the arXiv scraper command line.")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per case")
+    parser.add_argument("--case", type=str, default=None, help="Only run the cases whose name contains this text")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--save-baseline", type=str, default=None, help="Save the results as a baseline")
+    parser.add_argument("--compare", type=str, default=None, help="Compare the results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before failing")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    report = run_benchmarks(repeat=args.repeat, selected=args.case)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(report, file, indent=2)
+            print(f"Results saved to {path}")
+
+    status = 0
+    heavy = [name for name, result in report["results"].items() if result["heavy_modules"]]
+    if heavy:
+        print(f"{len(heavy)} case(s) import heavy libraries: {', '.join(heavy)}")
+        status = 1
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline.")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+make_pages.py
+-------------
+
+Builds the recorded arXiv search result pages used by the offline benchmarks.
+
+Pages are rendered from the papers of `dataset/arxiv_data.csv` with the markup
+of the arXiv advanced search (result heading, `li.arxiv-result` blocks, tags
+with DOI labels, author links, short and full abstracts with their More/Less
+links), and saved gzip-compressed in `benchmarks/pages/`. The output is
+deterministic, so the pages only need to be rebuilt if the markup changes.
+
+Recorded pages:
+
+- `small`: 10 results.
+- `medium`: 50 results.
+- `full`: 200 results, the maximum page size.
+- `long_abstracts`: 200 results with the longest abstracts of the dataset.
+- `many_authors`: 50 collaboration papers with 100 to 500 authors each.
+
+Usage:
+    python benchmarks/make_pages.py
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import ast
+import csv
+import gzip
+import html
+import os
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET = os.path.join(os.path.dirname(BENCHMARKS_DIR), "dataset", "arxiv_data.csv")
+PAGES_DIR = os.path.join(BENCHMARKS_DIR, "pages")
+
+
+def render_result(record: dict) -> str:
+    """Renders one `li.arxiv-result` block like the arXiv advanced search does."""
+    index = record["index"]
+    tags = "".join(f'<span class="tag is-small is-link tooltip is-tooltip-top" '
+                   f'data-tooltip="{html.escape(tag)}">{html.escape(tag)}</span>\n' for tag in record["tags"])
+    authors = ", \n".join(f'<a href="/search/?searchtype=author&amp;query={html.escape(author)}">'
+                          f'{html.escape(author)}</a>' for author in record["authors"])
+    abstract = html.escape(record["abstract"])
+    return f"""<li class="arxiv-result">
+<div class="is-marginless">
+<p class="list-title is-inline-block"><a href="https://arxiv.org/abs/{index}">arXiv:{index}</a>
+<span>&nbsp;[<a href="https://arxiv.org/pdf/{index}">pdf</a>, <a href="https://arxiv.org/format/{index}">other</a>]&nbsp;</span>
+</p>
+<div class="tags is-inline-block">
+{tags}</div>
+<div class="is-inline-block" style="margin-left: 0.5rem">
+<div class="tags has-addons"><span class="tag is-dark is-size-7">doi</span><span class="tag is-light is-size-7"><a class="" href="https://doi.org/10.48550/arXiv.{index}">10.48550/arXiv.{index}</a></span></div>
+</div>
+</div>
+<p class="title is-5 mathjax">
+      {html.escape(record["title"])}
+</p>
+<p class="authors">
+<span class="search-hit">Authors:</span>
+{authors}
+</p>
+<p class="abstract mathjax">
+<span class="has-text-black-bis has-text-weight-semibold">Abstract</span>:
+<span class="abstract-short has-text-grey-dark mathjax" id="{index}v1-abstract-short" style="display: inline;">
+{abstract[:250]}&hellip;
+<a class="is-size-7" style="white-space: nowrap;" onclick="document.getElementById('{index}v1-abstract-full').style.display = 'inline'; document.getElementById('{index}v1-abstract-short').style.display = 'none';">&#9661; More</a>
+</span>
+<span class="abstract-full has-text-grey-dark mathjax" id="{index}v1-abstract-full" style="display: none;">
+{abstract}
+<a class="is-size-7" style="white-space: nowrap;" onclick="document.getElementById('{index}v1-abstract-full').style.display = 'none'; document.getElementById('{index}v1-abstract-short').style.display = 'inline';">&#9651; Less</a>
+</span>
+</p>
+<p class="is-size-7"><span class="has-text-black-bis has-text-weight-semibold">Submitted</span> 30 May, 2025;
+<span class="has-text-black-bis has-text-weight-semibold">originally announced</span> June 2025.</p>
+</li>"""
+
+
+def render_page(records: list[dict], total: int) -> bytes:
+    """Renders a whole search result page listing `records` out of `total` results."""
+    parts = ['<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8"/>\n'
+             '<title>Advanced Search | arXiv e-print repository</title>\n'
+             '<script type="text/javascript">window.MathJax = {tex: {inlineMath: [["$", "$"]]}};</script>\n'
+             '</head>\n<body>\n<main class="container" id="main-container">\n'
+             '<div class="level is-marginless">\n<div class="level-left">\n'
+             f'<h1 class="title is-clearfix">\n    Showing 1&ndash;{len(records)} of {total:,} results\n</h1>\n'
+             '</div>\n</div>\n<ol class="breathe-horizontal" start="1">']
+    parts.extend(render_result(record) for record in records)
+    parts.append('</ol>\n</main>\n</body>\n</html>\n')
+    return "\n".join(parts).encode("utf-8")
+
+
+def load_dataset() -> list[dict]:
+    """Reads the sample dataset, turning the list columns back into lists."""
+    with open(DATASET, encoding="utf-8", newline="") as file:
+        return [dict(row, tags=ast.literal_eval(row["tags"]), authors=ast.literal_eval(row["authors"]))
+                for row in csv.DictReader(file)]
+
+
+def build_pages(records: list[dict]) -> dict[str, tuple[list[dict], int]]:
+    """Selects the records (and reported total) of every recorded page."""
+    longest = sorted(records, key=lambda record: len(record["abstract"]), reverse=True)
+
+    # Collaboration papers: real author names, deterministically drawn from the dataset
+    names = list(dict.fromkeys(author for record in records for author in record["authors"]))
+    collaborations = []
+    for number, record in enumerate(records[:50]):
+        count = 100 + (number * 181) % 401
+        start = (number * 997) % len(names)
+        collaborations.append(dict(record, authors=[names[(start + k) % len(names)] for k in range(count)]))
+
+    return {
+        "small": (records[:10], 10),
+        "medium": (records[:50], 1254),
+        "full": (records[:200], 18345),
+        "long_abstracts": (longest[:200], 18345),
+        "many_authors": (collaborations, 4210),
+    }
+
+
+def main() -> None:
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for name, (records, total) in build_pages(load_dataset()).items():
+        path = os.path.join(PAGES_DIR, f"{name}.html.gz")
+        # A fixed mtime keeps the compressed files byte-identical between rebuilds
+        with open(path, "wb") as raw, gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as file:
+            file.write(render_page(records, total))
+        print(f"{path}: {len(records)} results")
+
+
+if __name__ == "__main__":
+    main()
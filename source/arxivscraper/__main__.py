@@ -0,0 +1,17 @@
+"""
+__main__.py
+
+Runs the arXiv scraper with `python -m arxivscraper` (see `arxivscraper.main()`).
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+from arxivscraper.arxivscraper import main
+
+if __name__ == "__main__":
+    main()
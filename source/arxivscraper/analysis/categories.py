@@ -0,0 +1,361 @@
+"""
+categories.py
+-------------
+
+This module provides vectorised post-processing of the `tags` of scraped papers.
+
+The tags of a paper (e.g. `['cs.CV', 'cs.LG', 'eess.IV']`) list its primary
+category first, then the categories it is cross-listed in. `CategoryMatrix`
+keeps the tags of a whole corpus as a sparse paper × tag incidence matrix in
+CSR form (the codes and offsets of a `DictionaryListColumn`), plus the archive
+of every distinct tag in the `CATEGORIES` taxonomy (`cs` for `cs.CV`,
+`physics` for `physics.optics`). Everything derived from them is computed with
+NumPy array operations over all the papers at once, instead of a Python loop
+per row:
+
+- primary tag, primary archive and domain (`physics` for the archives in
+  `PHYSICS_CATEGORIES`, the `NON_PHYSICS_MAP` name otherwise) of every paper;
+- cross-list flags, overall or for a given category;
+- paper counts and co-occurrence matrices per tag or per archive;
+- boolean masks selecting the papers of some categories (to filter a DataFrame).
+
+Building the matrix from a `ColumnarRecords` (`scrape_arxiv(..., columnar=True)`)
+shares its buffers; building it from lists of tags (a DataFrame column, a file
+read with `read_records()`) encodes every tag once per paper.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import ast
+from collections.abc import Iterable, Sequence
+from itertools import islice
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# --- Import the taxonomy and the CSR helpers from sibling modules ---
+from arxivscraper.config.config import CATEGORIES, NON_PHYSICS_MAP, PHYSICS_CATEGORIES
+from arxivscraper.storage.authors import coauthorship
+from arxivscraper.storage.columnar import ColumnarRecords, DictionaryListColumn
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# Archives of the taxonomy, by code, and the domain of every archive
+ARCHIVES = tuple(sorted(CATEGORIES))
+DOMAINS = ("physics",) + tuple(sorted(NON_PHYSICS_MAP.values()))
+_ARCHIVE_CODES = {archive: code for code, archive in enumerate(ARCHIVES)}
+_ARCHIVE_DOMAINS = np.array([DOMAINS.index("physics" if archive in PHYSICS_CATEGORIES else NON_PHYSICS_MAP[archive])
+                             for archive in ARCHIVES], dtype=np.int8)
+
+# Levels of the taxonomy the counts and co-occurrences are computed at
+LEVELS = ("tag", "archive")
+
+# Code of a missing value (a paper without tags, or a tag outside the taxonomy)
+UNKNOWN = -1
+
+
+def archive_of(tag: str) -> str:
+    """Returns the archive of a tag ('cs' for 'cs.CV', 'hep-th' for 'hep-th')."""
+    return tag.split(".", 1)[0]
+
+
+class CategoryMatrix:
+    """
+    Sparse paper × tag incidence matrix, with the taxonomy of every tag.
+
+    The tags of paper `i` are `tags[codes[offsets[i]:offsets[i + 1]]]`, the
+    first one being its primary category.
+
+    Args:
+        offsets (np.ndarray): Paper offsets (length papers + 1).
+        codes (np.ndarray): Tag codes of every paper, concatenated.
+        tags (Sequence[str]): Distinct tags, by code.
+    """
+
+    def __init__(self, offsets: np.ndarray, codes: np.ndarray, tags: Sequence[str]):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.tags = list(tags)
+        # Archive of every distinct tag: one dictionary lookup per tag, not per paper
+        self.tag_archives = np.array([_ARCHIVE_CODES.get(archive_of(tag), UNKNOWN) for tag in self.tags],
+                                     dtype=np.int16)
+        self.sizes = np.diff(self.offsets)
+        # Paper of every element of `codes`
+        self._rows = np.repeat(np.arange(len(self.sizes), dtype=np.int32), self.sizes)
+        self._archive_incidence = None
+
+    @classmethod
+    def from_column(cls, column: DictionaryListColumn) -> "CategoryMatrix":
+        """
+        Wraps a dictionary-encoded `tags` column without copying its buffers.
+
+        Args:
+            column (DictionaryListColumn): Column of tag lists.
+
+        Returns:
+            CategoryMatrix: The incidence matrix of the column.
+        """
+        return cls(column.offsets.view(), column.codes.view(), column.dictionary)
+
+    @classmethod
+    def from_tags(cls, rows: Iterable[Sequence[str] | str]) -> "CategoryMatrix":
+        """
+        Encodes the tags of every paper, e.g. the `tags` column of a DataFrame.
+
+        Args:
+            rows (Iterable[Sequence[str] | str]): Tags of every paper, as lists
+                or as their string form (the `tags` column of a CSV output).
+
+        Returns:
+            CategoryMatrix: The incidence matrix of the tags.
+        """
+        column = DictionaryListColumn()
+        rows = iter(rows)
+        while batch := list(islice(rows, 10000)):
+            column.extend([ast.literal_eval(row) if isinstance(row, str) else row for row in batch])
+        return cls.from_column(column)
+
+    @classmethod
+    def from_records(cls, records: ColumnarRecords | Iterable[dict]) -> "CategoryMatrix":
+        """
+        Builds the incidence matrix of the `tags` of some records.
+
+        Args:
+            records (ColumnarRecords | Iterable[dict]): A columnar container
+                (its buffers are shared) or records with a 'tags' key.
+
+        Returns:
+            CategoryMatrix: The incidence matrix of the records.
+
+        Raises:
+            ValueError: If a columnar container has no 'tags' field.
+        """
+        if isinstance(records, ColumnarRecords):
+            if "tags" not in records.columns:
+                raise ValueError("The records have no 'tags' field.")
+            return cls.from_column(records.columns["tags"])
+        return cls.from_tags(record["tags"] for record in records)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def labels(self, level: str = "tag") -> list[str]:
+        """
+        Names of the columns of the matrix at a level of the taxonomy.
+
+        Args:
+            level (str): 'tag' (the distinct tags of the corpus) or 'archive'
+                (`ARCHIVES`, the archives of the taxonomy).
+
+        Returns:
+            list[str]: The names, by code.
+
+        Raises:
+            ValueError: If the level is unknown.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level: {level}. Expected one of {LEVELS}")
+        return self.tags if level == "tag" else list(ARCHIVES)
+
+    def incidence(self, level: str = "tag") -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the paper × tag or paper × archive incidence matrix in CSR form.
+
+        At the archive level every archive appears once per paper (a paper
+        tagged 'cs.CV' and 'cs.LG' is in 'cs' once) and tags outside the
+        taxonomy are left out.
+
+        Args:
+            level (str): 'tag' or 'archive'.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Offsets per paper and column codes
+                (increasing within each paper at the archive level).
+        """
+        self.labels(level)
+        if level == "tag":
+            return self.offsets, self.codes
+        if self._archive_incidence is None:
+            archives = self.tag_archives[self.codes].astype(np.int64)
+            known = archives != UNKNOWN
+            keys = np.unique(self._rows[known].astype(np.int64) * len(ARCHIVES) + archives[known])
+            counts = np.bincount(keys // len(ARCHIVES), minlength=len(self))
+            self._archive_incidence = (np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+                                       (keys % len(ARCHIVES)).astype(np.int32))
+        return self._archive_incidence
+
+    def primary(self) -> np.ndarray:
+        """Returns the code of the primary tag of every paper (`UNKNOWN` if it has no tags)."""
+        if not len(self.codes):
+            return np.full(len(self), UNKNOWN, dtype=np.int32)
+        first = self.codes[np.minimum(self.offsets[:-1], len(self.codes) - 1)]
+        return np.where(self.sizes > 0, first, UNKNOWN).astype(np.int32)
+
+    def primary_archive(self) -> np.ndarray:
+        """Returns the code (in `ARCHIVES`) of the primary archive of every paper, or `UNKNOWN`."""
+        primary = self.primary()
+        return np.where(primary != UNKNOWN, self.tag_archives[primary], UNKNOWN).astype(np.int16)
+
+    def domain(self) -> np.ndarray:
+        """Returns the code (in `DOMAINS`) of the domain of the primary archive of every paper, or `UNKNOWN`."""
+        archives = self.primary_archive()
+        return np.where(archives != UNKNOWN, _ARCHIVE_DOMAINS[archives], UNKNOWN).astype(np.int8)
+
+    def physics(self) -> np.ndarray:
+        """Returns whether the primary archive of every paper is a physics archive."""
+        return self.domain() == DOMAINS.index("physics")
+
+    def _selected(self, categories: Iterable[str]) -> np.ndarray:
+        """Boolean array over the distinct tags: those named, or in a named archive."""
+        categories = [categories] if isinstance(categories, str) else list(categories)
+        unknown = [category for category in categories if archive_of(category) not in CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unknown category: {', '.join(unknown)}")
+        names = set(categories)
+        archives = np.zeros(len(ARCHIVES) + 1, dtype=bool)
+        archives[[_ARCHIVE_CODES[name] for name in names if name in _ARCHIVE_CODES]] = True
+        # Tags outside the taxonomy map to the extra last slot, never selected
+        selected = archives[self.tag_archives]
+        selected |= np.fromiter((tag in names for tag in self.tags), dtype=bool, count=len(self.tags))
+        return selected
+
+    def mask(self, categories: str | Iterable[str], primary: bool = False) -> np.ndarray:
+        """
+        Selects the papers in some categories, e.g. to filter a DataFrame of the
+        same records (`frame[matrix.mask('cs')]`).
+
+        Args:
+            categories (str | Iterable[str]): Tags ('cs.CV') and archives ('cs').
+            primary (bool): Only consider the primary category of every paper.
+
+        Returns:
+            np.ndarray: Boolean array with one value per paper.
+
+        Raises:
+            ValueError: If a category is not in the taxonomy.
+        """
+        selected = self._selected(categories)
+        if primary:
+            codes = self.primary()
+            return (codes != UNKNOWN) & selected[codes]
+        found = np.zeros(len(self), dtype=bool)
+        found[self._rows[selected[self.codes]]] = True
+        return found
+
+    def cross_listed(self, category: str | None = None) -> np.ndarray:
+        """
+        Flags cross-listed papers.
+
+        Args:
+            category (str | None): Tag or archive. If given, flags the papers
+                listed in it but whose primary category is elsewhere; if None,
+                the papers listed in any archive besides their primary one.
+
+        Returns:
+            np.ndarray: Boolean array with one value per paper.
+
+        Raises:
+            ValueError: If the category is not in the taxonomy.
+        """
+        if category is not None:
+            return self.mask(category) & ~self.mask(category, primary=True)
+        offsets, archives = self.incidence("archive")
+        rows = np.repeat(np.arange(len(self), dtype=np.int32), np.diff(offsets))
+        primary = self.primary_archive()
+        found = np.zeros(len(self), dtype=bool)
+        found[rows[archives != primary[rows]]] = True
+        return found
+
+    def counts(self, level: str = "archive", primary: bool = False) -> dict[str, int]:
+        """
+        Counts the papers in every tag or archive.
+
+        Args:
+            level (str): 'tag' or 'archive'.
+            primary (bool): Only count the primary category of every paper.
+
+        Returns:
+            dict[str, int]: Number of papers per tag or archive, in decreasing
+                order (those without papers are left out).
+        """
+        labels = self.labels(level)
+        if primary:
+            codes = self.primary() if level == "tag" else self.primary_archive()
+            codes = codes[codes != UNKNOWN]
+        else:
+            codes = self.incidence(level)[1]
+        totals = np.bincount(codes, minlength=len(labels))
+        order = np.argsort(-totals, kind="stable")
+        return {labels[code]: int(totals[code]) for code in order[totals[order] > 0].tolist()}
+
+    def cooccurrence(self, level: str = "archive") -> np.ndarray:
+        """
+        Counts the papers shared by every pair of tags or archives.
+
+        Args:
+            level (str): 'tag' or 'archive'.
+
+        Returns:
+            np.ndarray: Symmetric matrix indexed by the codes of `labels(level)`,
+                with the number of papers in both; the diagonal holds the number
+                of papers in each.
+        """
+        size = len(self.labels(level))
+        offsets, codes = self.incidence(level)
+        # Same computation as the co-authorship graph, with categories for authors
+        pair_offsets, pairs, shared = coauthorship(offsets, codes, size, max_authors=size)
+        matrix = np.zeros((size, size), dtype=np.int64)
+        matrix[np.repeat(np.arange(size), np.diff(pair_offsets)), pairs] = shared
+        matrix[np.diag_indices(size)] = np.bincount(codes, minlength=size)
+        return matrix
+
+    def to_pandas(self) -> "DataFrame":
+        """
+        Exports the categorical columns of every paper as a DataFrame.
+
+        Returns:
+            pandas.DataFrame: One row per paper with 'primary_tag',
+                'primary_archive' and 'domain' (categoricals built from the
+                codes), 'cross_listed' and 'tag_count'.
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            "primary_tag": pd.Categorical.from_codes(self.primary(), categories=self.tags),
+            "primary_archive": pd.Categorical.from_codes(self.primary_archive(), categories=list(ARCHIVES)),
+            "domain": pd.Categorical.from_codes(self.domain(), categories=list(DOMAINS)),
+            "cross_listed": self.cross_listed(),
+            "tag_count": self.sizes,
+        })
+
+    def to_scipy(self, level: str = "tag"):
+        """
+        Exports the incidence matrix as a SciPy sparse array (requires `scipy`).
+
+        Args:
+            level (str): 'tag' or 'archive'.
+
+        Returns:
+            scipy.sparse.csr_array: Papers × `labels(level)` matrix of ones.
+
+        Raises:
+            ImportError: If `scipy` is not installed.
+        """
+        try:
+            from scipy import sparse
+        except ImportError as e:
+            raise ImportError("Sparse matrix export requires scipy: pip install scipy") from e
+        offsets, codes = self.incidence(level)
+        return sparse.csr_array((np.ones(len(codes), dtype=np.int8), codes, offsets),
+                                shape=(len(self), len(self.labels(level))))
+
+
+if __name__ == "__main__":
+    print("This module provides vectorised post-processing of paper tags and categories.")
@@ -8,16 +8,65 @@ It uses modular helper functions for URL construction, HTML parsing, and data ex
 Main features:
 ---------------
 - Retrieves metadata (index, title, tags, authors, abstract) for papers in a given category/date range.
-- Handles pagination automatically (200 results per page).
-- Saves the collected data to a CSV file and returns a Pandas DataFrame.
-- Can be executed either via CLI or programmatically by importing the `main()` function.
+- Optionally projects the records onto some fields, skipping their extractors and, without
+  abstracts, requesting lighter result pages.
+- Harvests several categories in one run, sharing the workers and rate limit, into
+  a merged (deduplicated) output or one file per category.
+- Handles pagination automatically (200 results per page), downloading pages
+  concurrently under a shared token-bucket rate limit.
+- Optionally splits large queries into date shards that fit under the search result cap.
+- Alternatively harvests the same fields in bulk from the arXiv OAI-PMH interface
+  (`source='oai'`, see `iter_oai()`).
+- Streams the records page by page (`iter_arxiv()`), writing each page to a CSV,
+  JSON Lines or Parquet file as soon as it is parsed, and optionally returns a
+  Pandas DataFrame.
+- Optionally journals completed pages to disk so interrupted runs can be resumed.
+- Optionally harvests incrementally, only downloading what was announced since the last run.
+- Keeps an optional full-text search index (BM25) of the harvested papers up to
+  date, queried with the `search` subcommand (`search_arxiv()`).
+- Keeps an optional author index (papers and collaborators of every author),
+  queried with the `authors` subcommand.
+- Merges harvest files into one output without exact (any version) or near
+  (MinHash/LSH) duplicates with the `dedup` subcommand.
+- Stores records, and optionally the raw result pages, in a compressed chunked
+  archive ('.arxz') with lookups by identifier and month, managed with the
+  `archive` subcommand.
+- Distributes back-fills over workers on several hosts sharing a SQLite job
+  queue and the politeness budget (`distributed`, `queue` subcommand).
+- Optionally adapts the pace of the requests to the server (`--adaptive`): it speeds
+  up while responses are healthy and backs off on throttling, errors and latency.
+- Offers an asyncio counterpart of the streaming API in `asyncscraper` (`aiter_arxiv()`,
+  `ascrape_arxiv()`), with cooperative rate limiting, cancellation and timeouts.
+- Can be executed either via CLI (`python arxivscraper.py`, `python -m arxivscraper` or the
+  installed `arxivscraper` command) or programmatically by importing the `main()` function.
 
 Modules required:
 -----------------
 - usercli.usercli         → Parses and validates command-line arguments.
 - webtools.url_finder     → Builds search URLs for arXiv queries.
-- webtools.beascraper    → Fetches and parses HTML using BeautifulSoup.
+- webtools.httpclient    → Pooled keep-alive HTTP client with retry and backoff.
+- webtools.asyncclient   → Asyncio HTTP client and rate limiter (aiohttp, optional).
+- webtools.cache         → On-disk cache of raw result pages.
+- webtools.fetcher       → Downloads result pages concurrently.
+- webtools.ratelimit     → Token-bucket rate limiter shared by all downloads.
+- webtools.pacing        → Adaptive (AIMD) rate limiter driven by latency and errors.
+- webtools.sharding      → Splits large queries into date shards under the result cap.
+- webtools.oaipmh        → Bulk metadata harvesting through the OAI-PMH interface.
 - scrapertools.scrapertools → Extracts information from HTML elements.
+- scrapertools.fastextract → Single-pass extraction engine (optional, faster).
+- scrapertools.parallel  → Multi-process parse stage.
+- storage.checkpoint     → Journal of completed pages used to resume interrupted runs.
+- storage.state          → Watermarks and known identifiers of incremental harvests.
+- storage.sinks          → Incremental CSV / JSON Lines / Parquet / SQLite / archive writers.
+- storage.corpus         → SQLite corpus store with upserts on the arXiv identifier.
+- storage.search         → Full-text search index with BM25 ranking and filters.
+- storage.columnar       → Compact columnar container of records (Arrow layout).
+- storage.authors        → Author postings and co-authorship graph (SQLite, memory-mapped).
+- storage.jobqueue       → SQLite job queue with leases shared by distributed workers.
+- storage.dedup          → Version-aware and near-duplicate removal across harvests.
+- storage.archive        → Compressed chunked archive of records and raw pages (random access).
+- monitoring.metrics     → Per-stage timings, counters and run reports (JSON / Prometheus).
+- analysis.categories    → Vectorised primary categories, cross-lists and tag counts (NumPy).
 
 Authors:
     - Alejandro Cano Jones (acanojo@uoc.edu)
@@ -27,23 +76,568 @@ Subject:
     M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
 """
 
-from usercli.usercli import parse_arguments
-from webtools.url_finder import get_url
-from webtools.beascraper import get_soup
-from scrapertools.scrapertools import *
+from __future__ import annotations
 
-from tqdm import tqdm
-from time import sleep
-from pandas import DataFrame
-from typing import Optional
-from collections.abc import Mapping
+import json
+import os
+import sys
+import time
+from functools import partial
+from itertools import islice
+from contextlib import ExitStack, nullcontext
+from typing import TYPE_CHECKING, Optional, Union
+from collections.abc import Iterator, Mapping, Sequence
+
+if not __package__:
+    # Executed as a script (`python arxivscraper.py`): make the package importable. Its parent
+    # directory goes first, as this file would otherwise shadow the package of the same name.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Only light modules are imported here, so `--help` and argument validation stay fast;
+# the fetch (requests), parse (bs4), progress (tqdm) and export (numpy, pandas) stacks
+# are imported by the functions that use them.
+from arxivscraper.usercli.usercli import (parse_archive_arguments, parse_arguments, parse_authors_arguments,
+                                          parse_dedup_arguments, parse_queue_arguments, parse_search_arguments)
+from arxivscraper.webtools.url_finder import get_url
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.ratelimit import TokenBucket
+from arxivscraper.webtools.sharding import Shard, plan_shards
+from arxivscraper.webtools.oaipmh import list_records_url, parse_list_records
+from arxivscraper.storage.checkpoint import Checkpoint
+from arxivscraper.storage.state import HarvestState, base_id
+from arxivscraper.storage.sinks import open_sink, read_records
+from arxivscraper.storage.search import SearchIndex
+from arxivscraper.monitoring.metrics import RunMetrics, profile_run, projection_saving
+from arxivscraper.config.config import (RECORD_FIELDS, REQUIRED_FIELDS, ARXIV_BASE_URL, CACHE_TTL, DEFAULT_PARSER,
+                                        FETCH_WORKERS, MAX_SEARCH_RESULTS, PARSE_WORKERS, RATE_LIMIT_PERIOD,
+                                        RATE_LIMIT_REQUESTS, ADAPTIVE_MIN_INTERVAL, RESULTS_PER_PAGE,
+                                        SEARCH_INDEX_PATH, DEFAULT_SOURCE, OAI_BASE_URL, SOURCES)
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+    from arxivscraper.storage.columnar import ColumnarRecords
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+
+def iter_arxiv(start_date: str,
+               end_date: str,
+               category: Union[str, Sequence[str]],
+               cross_list: bool = False,
+               client: Optional[HTTPClient] = None,
+               workers: int = FETCH_WORKERS,
+               parser: str = DEFAULT_PARSER,
+               checkpoint: Optional[str] = None,
+               resume: bool = False,
+               keep_checkpoint: bool = False,
+               base_url: str = ARXIV_BASE_URL,
+               shard: bool = False,
+               max_results: int = MAX_SEARCH_RESULTS,
+               progress: bool = True,
+               with_category: bool = False,
+               state: Optional[str] = None,
+               metrics: Optional[RunMetrics] = None,
+               parse_workers: int = PARSE_WORKERS,
+               fields: Optional[Sequence[str]] = None) -> Iterator[list[dict]]:
+    """
+    Iterate over the result pages of an arXiv search, yielding their records.
+
+    Pages are yielded in result order as soon as they are parsed, so callers can
+    write them out incrementally and memory does not grow with the harvest.
+    Several categories can be harvested at once: the pages of every category are
+    scheduled on the same workers, connection pool and rate limit.
+
+    Parameters
+    ----------
+    start_date : str
+        Start date for the search in 'YYYY-MM-DD' format.
+    end_date : str
+        End date for the search in 'YYYY-MM-DD' format.
+    category : str or sequence of str
+        ArXiv category code (e.g., 'gr-qc', 'cs', 'math'), or several of them.
+        Papers found in more than one category are only yielded once.
+    cross_list : bool, optional
+        Whether to include cross-listed papers. Defaults to False.
+    client : HTTPClient, optional
+        HTTP client used for every page. Defaults to a new client rate-limited
+        with the configured defaults (closed when the iteration ends).
+    workers : int, optional
+        Number of result pages downloaded concurrently. Defaults to `FETCH_WORKERS`.
+    parser : str, optional
+        Extraction engine: 'bs4' or 'fast'. Defaults to `DEFAULT_PARSER`.
+    checkpoint : str, optional
+        Path of a journal file where completed pages are appended as they finish.
+        The journal is deleted once every page has been yielded, unless
+        `keep_checkpoint` is set.
+    resume : bool, optional
+        Whether to replay an existing `checkpoint` journal and only download the
+        pages that are missing from it. Defaults to False.
+    keep_checkpoint : bool, optional
+        Whether to leave the journal in place once every page has been yielded,
+        for callers that delete it themselves once the records are safely
+        written. Defaults to False.
+    base_url : str, optional
+        Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`.
+    shard : bool, optional
+        Whether to split the date range into shards holding at most `max_results`
+        results each (see `webtools.sharding`). Results of all shards are merged
+        and deduplicated on 'index'. Defaults to False.
+    max_results : int, optional
+        Deepest result offset reachable through the search pagination.
+        Defaults to `MAX_SEARCH_RESULTS`.
+    progress : bool, optional
+        Whether to show a progress bar. Defaults to True.
+    with_category : bool, optional
+        Whether to yield (category, records) pairs instead of records only.
+        Defaults to False.
+    state : str, optional
+        Path of the SQLite state file of incremental harvests (see
+        `storage.state`). When given, each category starts from the newest date
+        covered by the previous runs, only papers not harvested before are
+        yielded, and pagination stops at the first known paper. The state is
+        updated once every page has been yielded; a category skipped because
+        its number of results could not be parsed keeps its previous watermark.
+    metrics : RunMetrics, optional
+        Collector of stage timings, counters and per-page metrics. Network
+        metrics are only recorded by clients created with the same collector.
+    parse_workers : int, optional
+        Number of processes parsing the downloaded pages. With more than one,
+        pages are parsed on a process pool while this process only downloads
+        and yields records (per-extractor timings are then not recorded).
+        Defaults to `PARSE_WORKERS`.
+    fields : sequence of str, optional
+        Fields of the records (see `select_fields`). Defaults to every field of
+        `RECORD_FIELDS`. Without 'abstract', pages are requested with their
+        abstracts hidden, which makes them several times lighter.
+
+    Yields
+    ------
+    list[dict]
+        The records of one result page, with the keys listed in `fields`.
+
+    Raises
+    ------
+    ValueError
+        If no results are found for a single category (outside incremental runs),
+        if the total number of results cannot be parsed, if the checkpoint
+        being resumed belongs to a different query, if `resume` is set without
+        a `checkpoint`, or if `fields` is invalid.
+    ConnectionError
+        If a page cannot be retrieved from arXiv.org after all retries.
+    """
+    from tqdm import tqdm
+    from arxivscraper.scrapertools.parallel import ParsedPage, parse_pages
+    from arxivscraper.scrapertools.scrapertools import parse_page
+    from arxivscraper.webtools.fetcher import fetch_pages
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+    if resume and not checkpoint:
+        raise ValueError("Resuming a run requires its checkpoint journal.")
+    fields = select_fields(fields)
+    categories = [category] if isinstance(category, str) else list(category)
+    owns_client = client is None
+    if owns_client:
+        client = HTTPClient(limiter=TokenBucket(), metrics=metrics)
+    # Downloads are timed per page when collecting metrics
+    fetch = client.fetch if metrics is None else partial(metrics.timed_fetch, client.fetch)
+
+    # Completed pages are journaled to disk when checkpointing
+    query = {"start_date": start_date, "end_date": end_date,
+             "category": category if isinstance(category, str) else categories,
+             "cross_list": cross_list, "shard": shard}
+    if fields != RECORD_FIELDS:
+        query["fields"] = list(fields)
+    journal = Checkpoint(checkpoint, query, resume=resume) if checkpoint else None
+    resumed = bool(journal and journal.pages)
+    # Bytes and results of the pages downloaded by this run, to report what a projection saved
+    traffic = {"bytes": 0, "records": 0}
+
+    def page_url(window_category: str, window: Shard, start: int) -> str:
+        return get_url(start_date=window.start_date, end_date=window.end_date, category=window_category,
+                       start=start, cross_list=cross_list, base_url=base_url, abstracts="abstract" in fields)
+
+    def plan(window_category: str) -> list[Shard]:
+        # The first page of a window gives its number of results
+        def probe(window_start: str, window_end: str) -> tuple[Optional[int], list[dict]]:
+            url = page_url(window_category, Shard(window_start, window_end, 0), 0)
+            content = fetch(url)
+            total, records = parse_page(content, engine=parser, metrics=metrics, fields=fields)
+            traffic["bytes"] += len(content)
+            traffic["records"] += len(records)
+            return total, records
+
+        # Incremental runs start from the newest date covered by the previous run
+        window_start = harvest.start_date(window_category, cross_list, start_date) if harvest else start_date
+        if window_start > end_date:
+            print(f"Category {window_category} is already up to date until {window_start}")
+            return []
+        try:
+            if shard:
+                windows = plan_shards(window_start, end_date, probe, max_results=max_results)
+            else:
+                total_results, first_page = probe(window_start, end_date)
+                if total_results is None:
+                    raise ValueError("Unable to parse the number of results.")
+                windows = [Shard(window_start, end_date, total_results, first_page)] if total_results else []
+        except ValueError as e:
+            # An unparsable page (error page, changed markup) skips the category without
+            # planning it, so an incremental run does not move its watermark past the window
+            if len(categories) == 1 and not harvest:
+                raise
+            print(f"Warning: skipping category {window_category}: {e}")
+            return []
+        if not windows:
+            # A single query without results is an error, but not one category among
+            # several, nor a day without new announcements in an incremental run
+            if len(categories) == 1 and not harvest:
+                raise ValueError("No results found.")
+            print(f"Category {window_category}: no results")
+            return [Shard(window_start, end_date, 0)]
+        return windows
+
+    # Reuse one pooled client for every page; close it at the end if we created it.
+    # The incremental state is only committed if every page is consumed.
+    with (client if owns_client else nullcontext(client)), (journal or nullcontext()), \
+            (HarvestState(state) if state else nullcontext()) as harvest:
+        # Date windows of every category, as (category, shard) pairs
+        if journal and journal.plan is not None:
+            windows = [(entry[0], Shard(*entry[1:])) for entry in journal.plan]
+        else:
+            windows = [(window_category, window) for window_category in categories for window in plan(window_category)]
+
+        # First pages downloaded while planning, identified by (window number, start offset)
+        first_pages = {(number, 0): window.first_page for number, (_, window) in enumerate(windows)
+                       if window.first_page is not None}
+        if journal:
+            journal.set_plan([[window_category, window.start_date, window.end_date, window.total]
+                              for window_category, window in windows])
+            for page, records in first_pages.items():
+                journal.add_page(page, records)
+            first_pages = {}
+
+        print(f"Total results found: {sum(window.total for _, window in windows)}")
+        if shard:
+            print(f"Query split into {len(windows)} date shard(s)")
+
+        # Every page of every window
+        pages = [(number, start) for number, (_, window) in enumerate(windows)
+                 for start in range(0, min(window.total, max_results), RESULTS_PER_PAGE)]
+        done = set(journal.pages) if journal else set()
+        missing = [page for page in pages if page not in done and page not in first_pages]
+        if resumed:
+            print(f"Resuming from checkpoint: {len(done)} of {len(pages)} pages already completed")
+
+        # Windows whose remaining pages are already known from previous runs
+        stopped = set()
+        scheduled = set()
+
+        def missing_urls() -> Iterator[str]:
+            # Generated lazily, so pages of a stopped window are no longer requested
+            for page in missing:
+                if page[0] not in stopped:
+                    scheduled.add(page)
+                    yield page_url(*windows[page[0]], page[1])
+
+        # Download the remaining pages ahead while the current one is parsed and consumed;
+        # pages of different categories and shards share the same workers and rate limit
+        downloads = fetch_pages(missing_urls(), fetch=fetch, workers=workers)
+
+        def parse_downloads() -> Iterator[tuple[str, ParsedPage]]:
+            # Parse in this process, timing each extractor when collecting metrics
+            for url, content in downloads:
+                parse_start = time.perf_counter()
+                total, records = parse_page(content, engine=parser, metrics=metrics, fields=fields)
+                yield url, ParsedPage(total, records, len(content), time.perf_counter() - parse_start)
+
+        # Downloaded pages are parsed ahead on a process pool when several parse workers are used
+        if parse_workers > 1:
+            parsed = iter(parse_pages(downloads, engine=parser, processes=parse_workers, fields=fields))
+        else:
+            parsed = iter(parse_downloads())
+        seen = set()
+        with tqdm(total=len(pages), desc="Scraping pages", disable=not progress) as bar:
+            for page in pages:
+                bar.update()
+                if page[0] in stopped:
+                    # Discard pages that were already downloading when the window stopped
+                    if page in scheduled:
+                        next(parsed)
+                    continue
+
+                result = None
+                if page in done:
+                    source = "checkpoint"
+                    records = journal.records(page)
+                else:
+                    if page in first_pages:
+                        source = "probe"
+                        records = first_pages.pop(page)
+                    else:
+                        source = "download"
+                        result = next(parsed)[1]
+                        records = result.records
+                        traffic["bytes"] += result.size
+                        traffic["records"] += len(records)
+                        if metrics is not None and parse_workers > 1:
+                            metrics.add_time("parse", result.seconds)
+                    if journal:
+                        journal.add_page(page, records)
+
+                # Results are sorted from the newest announcement to the oldest, so
+                # the first known paper means the rest of the window is known too
+                page_category = windows[page[0]][0]
+                if harvest:
+                    known = harvest.known(page_category, cross_list, (record["index"] for record in records))
+                    if known:
+                        stopped.add(page[0])
+                        records = [record for record in records if base_id(record["index"]) not in known]
+
+                # Windows are disjoint per category, but papers cross-listed in several
+                # categories (or shifting between pages while paginating) can repeat
+                if len(windows) > 1:
+                    records = [record for record in records if record["index"] not in seen]
+                    seen.update(record["index"] for record in records)
+
+                if metrics is not None:
+                    metrics.increment("records", len(records))
+                    metrics.add_page(url=page_url(*windows[page[0]], page[1]), category=page_category,
+                                     window=page[0], start=page[1], source=source, records=len(records),
+                                     bytes=result.size if result is not None else None,
+                                     parse_seconds=result.seconds if result is not None else None)
+                yield (page_category, records) if with_category else records
+
+                if harvest:
+                    harvest.add(page_category, cross_list, (record["index"] for record in records))
+
+        if harvest:
+            # Only planned categories: one skipped on an unparsable page is harvested again next run
+            for window_category in dict.fromkeys(window_category for window_category, _ in windows):
+                harvest.set_watermark(window_category, cross_list, end_date)
+
+    if "abstract" not in fields and traffic["records"]:
+        print(projection_saving(traffic["bytes"], traffic["records"]))
+
+    # Every page has been consumed, so the journal is no longer needed
+    if journal and not keep_checkpoint:
+        journal.remove()
+
+
+def iter_oai(start_date: str,
+             end_date: str,
+             category: Union[str, Sequence[str]],
+             cross_list: bool = False,
+             client: Optional[HTTPClient] = None,
+             base_url: str = OAI_BASE_URL,
+             progress: bool = True,
+             with_category: bool = False,
+             state: Optional[str] = None,
+             metrics: Optional[RunMetrics] = None,
+             fields: Optional[Sequence[str]] = None) -> Iterator[list[dict]]:
+    """
+    Iterate over the ListRecords responses of the arXiv OAI-PMH interface.
+
+    This is the bulk counterpart of `iter_arxiv()`: each response holds up to a
+    thousand records, mapped onto the same schema, and the next one is requested
+    with the resumption token of the previous one. Categories are harvested one
+    after the other through the same client and rate limit.
+
+    Parameters
+    ----------
+    start_date : str
+        First datestamp in 'YYYY-MM-DD' format (OAI-PMH selects records by the
+        date of their last metadata change, not by announcement date).
+    end_date : str
+        Last datestamp in 'YYYY-MM-DD' format, inclusive.
+    category : str or sequence of str
+        ArXiv category code, or several of them. Papers found in more than one
+        category are only yielded once.
+    cross_list : bool, optional
+        Whether to include papers whose primary category is another one.
+        Defaults to False.
+    client : HTTPClient, optional
+        HTTP client used for every request. Defaults to a new client rate-limited
+        with the configured defaults (closed when the iteration ends).
+    base_url : str, optional
+        OAI-PMH endpoint. Defaults to `OAI_BASE_URL`.
+    progress : bool, optional
+        Whether to show a progress bar. Defaults to True.
+    with_category : bool, optional
+        Whether to yield (category, records) pairs instead of records only.
+        Defaults to False.
+    state : str, optional
+        Path of the SQLite state file of incremental harvests. When given, each
+        category starts from the newest date covered by the previous runs and
+        only papers not harvested before are yielded.
+    metrics : RunMetrics, optional
+        Collector of stage timings, counters and per-response metrics.
+    fields : sequence of str, optional
+        Fields of the records (see `select_fields`). OAI-PMH responses always
+        carry every field, so the others are only dropped from the records.
+
+    Yields
+    ------
+    list[dict]
+        The records of one response, with the keys listed in `fields`.
+
+    Raises
+    ------
+    ValueError
+        If a response is malformed or reports an OAI-PMH error, or if `fields`
+        is invalid.
+    ConnectionError
+        If a response cannot be retrieved after all retries.
+    """
+    from tqdm import tqdm
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+    fields = select_fields(fields)
+    categories = [category] if isinstance(category, str) else list(category)
+    owns_client = client is None
+    if owns_client:
+        client = HTTPClient(limiter=TokenBucket(), metrics=metrics)
+    fetch = client.fetch if metrics is None else partial(metrics.timed_fetch, client.fetch)
+
+    with (client if owns_client else nullcontext(client)), \
+            (HarvestState(state) if state else nullcontext()) as harvest:
+        seen = set()
+        for harvest_category in categories:
+            window_start = harvest.start_date(harvest_category, cross_list, start_date) if harvest else start_date
+            if window_start > end_date:
+                print(f"Category {harvest_category} is already up to date until {window_start}")
+                continue
+
+            url = list_records_url(harvest_category, window_start, end_date, base_url=base_url)
+            with tqdm(desc=f"Harvesting {harvest_category}", unit=" records", disable=not progress) as bar:
+                while url is not None:
+                    content = fetch(url)
+                    parse_start = time.perf_counter()
+                    page = parse_list_records(content)
+                    parse_seconds = time.perf_counter() - parse_start
+                    if page.complete_size is not None:
+                        bar.total = page.complete_size
+                    bar.update(len(page.records))
+
+                    # Sets also list papers cross-listed from other categories
+                    records = page.records
+                    if not cross_list:
+                        records = [record for record in records if record["tags"] and
+                                   (record["tags"][0] == harvest_category or
+                                    record["tags"][0].startswith(harvest_category + "."))]
+                    if harvest:
+                        known = harvest.known(harvest_category, cross_list, (record["index"] for record in records))
+                        records = [record for record in records if base_id(record["index"]) not in known]
+                    if len(categories) > 1:
+                        records = [record for record in records if record["index"] not in seen]
+                        seen.update(record["index"] for record in records)
+                    if fields != RECORD_FIELDS:
+                        records = [{field: record[field] for field in fields} for record in records]
+
+                    if metrics is not None:
+                        metrics.add_time("parse", parse_seconds)
+                        metrics.increment("records", len(records))
+                        metrics.add_page(url=url, category=harvest_category, source="oai", records=len(records),
+                                         bytes=len(content), parse_seconds=parse_seconds)
+                    yield (harvest_category, records) if with_category else records
+
+                    if harvest:
+                        harvest.add(harvest_category, cross_list, (record["index"] for record in records))
+                    # Follow the resumption token until the last response
+                    url = list_records_url(token=page.token, base_url=base_url) if page.token else None
+
+        if harvest:
+            for harvest_category in categories:
+                harvest.set_watermark(harvest_category, cross_list, end_date)
+
+
+def category_output(output: str, category: str) -> str:
+    """
+    Build the output path of one category when results are split per category.
+
+    Parameters
+    ----------
+    output : str
+        Output path given by the user. A '{category}' placeholder is replaced by
+        the category code; otherwise the code is appended to the file name.
+    category : str
+        ArXiv category code.
+
+    Returns
+    -------
+    str
+        Output path of the category (e.g., 'arxiv_data_gr-qc.csv').
+    """
+    if "{category}" in output:
+        return output.replace("{category}", category)
+    stem, extension = os.path.splitext(output)
+    return f"{stem}_{category}{extension}"
+
+
+def select_fields(fields: Optional[Sequence[str]] = None) -> tuple[str, ...]:
+    """
+    Validate a projection of the record fields.
+
+    Parameters
+    ----------
+    fields : sequence of str, optional
+        Fields to keep. Defaults to every field of `RECORD_FIELDS`.
+
+    Returns
+    -------
+    tuple of str
+        The fields, without repetitions and in the order of `RECORD_FIELDS`.
+
+    Raises
+    ------
+    ValueError
+        If a field is unknown or one of `REQUIRED_FIELDS` is missing.
+    """
+    if fields is None:
+        return RECORD_FIELDS
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    unknown = [field for field in fields if field not in RECORD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown record field(s): {', '.join(unknown)}. Expected some of {RECORD_FIELDS}")
+    missing = [field for field in REQUIRED_FIELDS if field not in fields]
+    if missing:
+        raise ValueError(f"The record fields must include: {', '.join(missing)}")
+    return tuple(field for field in RECORD_FIELDS if field in fields)
 
 
 def scrape_arxiv(start_date: str,
                   end_date: str,
-                  category: str,
+                  category: Union[str, Sequence[str]],
                   output: str = "arxiv_data.csv",
-                  cross_list: bool = False) -> Optional[DataFrame]:
+                  cross_list: bool = False,
+                  workers: int = FETCH_WORKERS,
+                  max_requests: int = RATE_LIMIT_REQUESTS,
+                  period: float = RATE_LIMIT_PERIOD,
+                  limiter: Optional[TokenBucket] = None,
+                  adaptive: bool = False,
+                  min_interval: float = ADAPTIVE_MIN_INTERVAL,
+                  client: Optional[HTTPClient] = None,
+                  base_url: str = ARXIV_BASE_URL,
+                  checkpoint: Optional[str] = None,
+                  resume: bool = False,
+                  cache_dir: Optional[str] = None,
+                  cache_ttl: float = CACHE_TTL,
+                  offline: bool = False,
+                  parser: str = DEFAULT_PARSER,
+                  output_format: Optional[str] = None,
+                  return_dataframe: bool = True,
+                  shard: bool = False,
+                  max_results: int = MAX_SEARCH_RESULTS,
+                  split_output: bool = False,
+                  state: Optional[str] = None,
+                  metrics: Optional[RunMetrics] = None,
+                  metrics_json: Optional[str] = None,
+                  metrics_prometheus: Optional[str] = None,
+                  profile: Optional[str] = None,
+                  parse_workers: int = PARSE_WORKERS,
+                  index: Optional[str] = None,
+                  columnar: bool = False,
+                  source: str = DEFAULT_SOURCE,
+                  oai_url: str = OAI_BASE_URL,
+                  author_index: Optional[str] = None,
+                  fields: Optional[Sequence[str]] = None) -> Optional[Union[DataFrame, ColumnarRecords]]:
     """
     Scrape arXiv.org for papers in a given category and date range.
 
@@ -57,76 +651,531 @@ def scrape_arxiv(start_date: str,
         Start date for the search in 'YYYY-MM-DD' format.
     end_date : str
         End date for the search in 'YYYY-MM-DD' format.
-    category : str
-        ArXiv category code (e.g., 'gr-qc', 'cs', 'math').
+    category : str or sequence of str
+        ArXiv category code (e.g., 'gr-qc', 'cs', 'math'), or several of them.
+        All categories share the same workers, HTTP client and rate limit.
     output : str, optional
-        File path to save the results as a CSV file. Defaults to 'arxiv_data.csv'.
+        File path to save the results. Defaults to 'arxiv_data.csv'.
     cross_list : bool, optional
         Whether to include cross-listed papers. Defaults to False.
+    workers : int, optional
+        Number of result pages downloaded concurrently. Defaults to `FETCH_WORKERS`.
+    max_requests : int, optional
+        Requests allowed per rate-limit window. Defaults to `RATE_LIMIT_REQUESTS`.
+    period : float, optional
+        Length of the rate-limit window in seconds. Defaults to `RATE_LIMIT_PERIOD`.
+    limiter : TokenBucket, optional
+        Shared rate limiter; overrides `max_requests`, `period` and `adaptive` when given.
+    adaptive : bool, optional
+        Whether to adapt the pace to the server (see `webtools.pacing`): starting
+        from `max_requests` per `period`, requests speed up while responses are
+        fast and healthy, and slow down (with fewer of them in flight) on
+        throttling, server errors, timeouts or rising latency. Defaults to False.
+    min_interval : float, optional
+        Hard floor of the interval between requests in seconds when `adaptive`
+        is set. Defaults to `ADAPTIVE_MIN_INTERVAL`.
+    client : HTTPClient, optional
+        Pooled HTTP client reused for every page. A new one is created (and
+        closed at the end of the run) if omitted; when given, its own limiter
+        and cache are used instead of `limiter` and `cache_dir`.
+    base_url : str, optional
+        Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`.
+    checkpoint : str, optional
+        Path of a journal file where completed pages are appended as they finish.
+        The journal is deleted once the output has been written.
+    resume : bool, optional
+        Whether to replay an existing `checkpoint` journal and only download the
+        pages that are missing from it. Without `checkpoint`, the journal is
+        `output` + '.checkpoint.jsonl', as on the command line. Defaults to False.
+    cache_dir : str, optional
+        Directory of the on-disk response cache. Pages found there are reused
+        (and revalidated once older than `cache_ttl`) instead of downloaded again.
+    cache_ttl : float, optional
+        Seconds during which a cached page is reused without revalidation.
+        Defaults to `CACHE_TTL`.
+    offline : bool, optional
+        Serve every page from `cache_dir` without using the network. Defaults to False.
+    parser : str, optional
+        Extraction engine: 'bs4' (BeautifulSoup reference) or 'fast' (single-pass
+        extractor, backed by lxml when installed). Defaults to `DEFAULT_PARSER`.
+    output_format : str, optional
+        'csv', 'jsonl', 'parquet' or 'sqlite'. Inferred from the `output` extension
+        if omitted. A SQLite corpus is updated in place instead of overwritten.
+    return_dataframe : bool, optional
+        Whether to also collect the records into a DataFrame. Set it to False to
+        keep memory flat on large harvests. Defaults to True. Records are
+        collected in a compact `ColumnarRecords` container while scraping.
+    shard : bool, optional
+        Whether to split the date range into shards that fit under the search
+        result cap; results are merged and deduplicated. Defaults to False.
+    max_results : int, optional
+        Result cap used when sharding. Defaults to `MAX_SEARCH_RESULTS`.
+    split_output : bool, optional
+        Whether to write each category to its own file (see `category_output`)
+        instead of one merged output. Defaults to False.
+    state : str, optional
+        Path of the SQLite state file used for incremental harvests. When given,
+        only papers announced since the previous run (and not harvested before)
+        are scraped and written to `output`.
+    metrics : RunMetrics, optional
+        Collector of stage timings, counters and per-page metrics. One is created
+        when `metrics_json` or `metrics_prometheus` is given.
+    metrics_json : str, optional
+        Path of a JSON report of the run metrics, written even if the run fails.
+    metrics_prometheus : str, optional
+        Path of a Prometheus text file with the run metrics.
+    profile : str, optional
+        Path where cProfile statistics of the run are saved.
+    parse_workers : int, optional
+        Number of processes parsing pages. Use several to spread parsing over
+        the CPU cores, e.g. when re-parsing a cached harvest with `offline`.
+        Defaults to `PARSE_WORKERS`.
+    index : str, optional
+        Path of a full-text search index (see `search_arxiv`) updated with every
+        page as it is written, created if missing.
+    columnar : bool, optional
+        Whether to return the `ColumnarRecords` container itself instead of a
+        DataFrame, e.g. to hold large corpora in memory or export them to Arrow
+        (`to_arrow()`, `to_pandas(zero_copy=True)`) without copying. Defaults to False.
+    source : str, optional
+        Where the metadata comes from: 'html' (search result pages, see
+        `iter_arxiv`) or 'oai' (bulk OAI-PMH records, see `iter_oai`; dates then
+        refer to metadata datestamps, and sharding, parsing and checkpoint
+        options do not apply). Defaults to `DEFAULT_SOURCE`.
+    oai_url : str, optional
+        OAI-PMH endpoint used by the 'oai' source. Defaults to `OAI_BASE_URL`.
+    author_index : str, optional
+        Directory of an author index (see `storage.authors`) extended with the
+        authors of every page, and saved once the run completes.
+    fields : sequence of str, optional
+        Fields to scrape and write, e.g. ('index', 'title', 'tags') for a quick
+        pass over new announcements. 'index' is mandatory. Extractors of the
+        other fields are skipped and, without 'abstract', pages are requested
+        with their abstracts hidden, so far fewer bytes are downloaded (the run
+        ends by printing them, with the estimated saving). Defaults to every field
+        of `RECORD_FIELDS`; a SQLite output and the search index need them all,
+        and the author index needs 'authors'.
 
     Returns
     -------
-    pandas.DataFrame or None
-        A DataFrame containing the scraped data, or None if no data is found.
+    pandas.DataFrame, ColumnarRecords or None
+        A DataFrame (or, with `columnar`, a `ColumnarRecords`) containing the
+        scraped data, or None if `return_dataframe` is False.
 
     Raises
     ------
     ValueError
-        If no results are found or if the total number of results cannot be parsed.
+        If no results are found for a single category, if the total number of
+        results cannot be parsed, if the checkpoint being resumed belongs to a
+        different query, if `offline` is requested without a `cache_dir`, if
+        the source is unknown or does not support checkpoints, or if `fields`
+        is invalid or lacks a field needed by the output or an index.
     ConnectionError
-        If there are issues retrieving pages from arXiv.org.
+        If a page cannot be retrieved from arXiv.org after all retries.
 
     Notes
     -----
     - Each page on arXiv lists up to 200 results; this function paginates automatically.
-    - A polite delay (15 seconds) is used between page requests to respect arXiv’s servers.
-    - The resulting CSV contains columns: 'index', 'title', 'tags', 'authors', 'abstract'.
-    """
-    
-    # Build the first query URL and get the corresponding page (soup)
-    first_url = get_url(start_date=start_date, end_date=end_date, category=category, cross_list=cross_list)
-    soup = get_soup(first_url)
-
-    # Determine the total number of results from the first page
-    total_results = number_of_results(soup)
-    if total_results is None:
-        raise ValueError("No results found or unable to parse the number of results.")
-
-    print(f"Total results found: {total_results}")
-                    
-    # Calculate pagination indexes (200 results per page)
-    page_indexes = [i for i in range(0, total_results, 200)]
-                    
-    # Initialize storage for the scraped data
-    data = {
-        "index": [],
-        "title": [],
-        "tags": [],
-        "authors": [],
-        "abstract": []
-    }
-                    
-    # Loop through all result pages
-    for start in tqdm(page_indexes, desc="Scraping pages"):
-        url = get_url(start_date=start_date, end_date=end_date, category=category, start=start, cross_list=cross_list)
-        soup = get_soup(url)
-        results = soup.select('li.arxiv-result')
-      
-        # Extract and append data for each paper in the page
+    - Pages are downloaded by a pool of `workers` threads sharing one token-bucket
+      rate limit (by default one request every 15 seconds), so the next page
+      downloads while the current one is parsed and no time is spent sleeping
+      after the last page.
+    - Each page is written and flushed to `output` as soon as it is parsed, so the
+      file can be read while the scrape is still running.
+    - The output contains columns: 'index', 'title', 'tags', 'authors', 'abstract'
+      (or those of `fields`).
+    - When several categories are scraped, a paper listed in more than one of
+      them is only written once, to the output of the first category it appears in.
+    """
+    from arxivscraper.storage.authors import AuthorIndexBuilder
+    from arxivscraper.storage.columnar import ColumnarRecords
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source: {source}. Expected one of {SOURCES}")
+    if source == "oai" and (checkpoint or resume):
+        raise ValueError("Checkpoints are only supported by the 'html' source.")
+    if resume and not checkpoint:
+        checkpoint = output + ".checkpoint.jsonl"
+    fields = select_fields(fields)
+    if fields != RECORD_FIELDS:
+        # The search index always holds complete records
+        if index:
+            raise ValueError("The search index requires every record field.")
+        if author_index and "authors" not in fields:
+            raise ValueError("The author index requires the 'authors' field.")
+    if metrics is None and (metrics_json or metrics_prometheus):
+        metrics = RunMetrics()
+    if limiter is None and adaptive:
+        from arxivscraper.webtools.pacing import AdaptiveTokenBucket
+        limiter = AdaptiveTokenBucket(requests=max_requests, period=period, min_interval=min_interval,
+                                      max_concurrency=workers, metrics=metrics)
+    elif limiter is None:
+        limiter = TokenBucket(requests=max_requests, period=period)
+    if client is None:
+        cache = ResponseCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+        client = HTTPClient(limiter=limiter, cache=cache, offline=offline, metrics=metrics)
+        owns_client = True
+    else:
+        owns_client = False
+
+    categories = [category] if isinstance(category, str) else list(category)
+    collected = ColumnarRecords(fields) if return_dataframe else None
+    timer = metrics.timer if metrics is not None else (lambda stage: nullcontext())
+    try:
+        with (profile_run(profile) if profile else nullcontext()), \
+                (client if owns_client else nullcontext(client)), ExitStack() as sinks:
+            # One sink per category when splitting, opened as soon as its first page arrives
+            split = split_output and len(categories) > 1
+            outputs = {} if split else {None: sinks.enter_context(open_sink(output, output_format, fields))}
+            search_index = sinks.enter_context(SearchIndex(index)) if index else None
+            authors = sinks.enter_context(AuthorIndexBuilder(author_index)) if author_index else None
+            if source == "oai":
+                pages = iter_oai(start_date, end_date, category, cross_list=cross_list, client=client,
+                                 base_url=oai_url, with_category=True, state=state, metrics=metrics, fields=fields)
+            else:
+                pages = iter_arxiv(start_date, end_date, category, cross_list=cross_list, client=client,
+                                   workers=workers, parser=parser, checkpoint=checkpoint, resume=resume,
+                                   keep_checkpoint=True, base_url=base_url, shard=shard, max_results=max_results,
+                                   with_category=True, state=state, metrics=metrics, parse_workers=parse_workers,
+                                   fields=fields)
+            for page_category, records in pages:
+                key = page_category if split else None
+                with timer("write"):
+                    if key not in outputs:
+                        path = output if key is None else category_output(output, key)
+                        outputs[key] = sinks.enter_context(open_sink(path, output_format, fields))
+                    outputs[key].write(records)
+                    if search_index is not None:
+                        search_index.add(records)
+                    if authors is not None:
+                        authors.add(records)
+                if collected is not None:
+                    collected.extend(records)
+    except BaseException:
+        if metrics is not None:
+            metrics.increment("failed_runs")
+        raise
+    finally:
+        # Reports are also written for failed runs, to see where they stopped
+        if metrics is not None:
+            metrics.finish()
+            print(metrics.report())
+            if metrics_json:
+                metrics.write_json(metrics_json)
+                print(f"Metrics saved to {metrics_json}")
+            if metrics_prometheus:
+                metrics.write_prometheus(metrics_prometheus)
+                print(f"Metrics saved to {metrics_prometheus}")
+
+    # The journal outlives the pages until the sinks are closed (Parquet footer, SQLite commit, last flush)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    for sink in outputs.values():
+        print(f"Data saved to {sink.path}")
+    if adaptive and hasattr(limiter, "decisions"):
+        print(f"Adaptive pacing: {len(limiter.decisions)} decisions, ending at one request every "
+              f"{limiter.interval:.2f} s with {limiter.concurrency} in flight")
+    if index:
+        print(f"Search index updated: {index}")
+    if author_index:
+        print(f"Author index updated: {author_index}")
+    if collected is None or columnar:
+        return collected
+    return collected.to_pandas()
+
+
+def search_arxiv(query: str = "",
+                 index: str = SEARCH_INDEX_PATH,
+                 tags: Optional[Sequence[str]] = None,
+                 authors: Optional[Sequence[str]] = None,
+                 since: Optional[str] = None,
+                 until: Optional[str] = None,
+                 limit: int = 10,
+                 raw: bool = False) -> DataFrame:
+    """
+    Search the full-text index of harvested papers.
+
+    The index is built by `scrape_arxiv(index=...)` as pages are scraped, or from
+    existing output files with `arxivscraper search --add FILE`.
+
+    Parameters
+    ----------
+    query : str, optional
+        Words that must all appear in the title or abstract, or an SQLite FTS5
+        query if `raw` is True. Without words, every paper passing the filters
+        matches, newest first.
+    index : str, optional
+        Path of the search index. Defaults to `SEARCH_INDEX_PATH`.
+    tags : sequence of str, optional
+        Only papers with one of these tags or of their subcategories.
+    authors : sequence of str, optional
+        Only papers with all of these authors (case-insensitive, part of the name).
+    since, until : str, optional
+        Only papers submitted within these months (YYYY-MM), inclusive.
+    limit : int, optional
+        Maximum number of results. Defaults to 10.
+    raw : bool, optional
+        Whether `query` is passed to FTS5 untouched. Defaults to False.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The matches ranked by BM25, with columns 'index', 'title', 'tags',
+        'authors', 'abstract', 'month', 'score' and 'snippet'.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the index does not exist.
+    ValueError
+        If a date filter or a raw query is invalid.
+    """
+    from pandas import DataFrame
+
+    if not os.path.exists(index):
+        raise FileNotFoundError(f"Search index not found: {index}")
+    with SearchIndex(index) as search_index:
+        results = search_index.search(query, tags=tags, authors=authors, since=since, until=until,
+                                      limit=limit, raw=raw)
+    return DataFrame(results, columns=list(RECORD_FIELDS) + ["month", "score", "snippet"])
+
+
+def run_search(argv=None) -> None:
+    """
+    Entry point of the `search` subcommand.
+
+    Adds the given output files to the index, if any, then prints the results
+    of the query.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments after 'search'. Read from the command line if None.
+    """
+    args = parse_search_arguments(argv)
+    with SearchIndex(args.index) as search_index:
+        if args.add:
+            for path in args.add:
+                # One transaction per thousand papers keeps memory flat on large files
+                records = read_records(path, args.format)
+                added = 0
+                while batch := list(islice(records, 1000)):
+                    added += search_index.add(batch)
+                print(f"Indexed {added} papers from {path}")
+            search_index.optimize()
+            print(f"Search index {args.index} holds {len(search_index)} papers")
+            if not (args.query or args.tag or args.author or args.since or args.until):
+                return
+
+        start = time.perf_counter()
+        results = search_index.search(args.query, tags=args.tag, authors=args.author, since=args.since,
+                                      until=args.until, limit=args.limit, raw=args.raw)
+        elapsed = time.perf_counter() - start
+
+    if args.json:
         for result in results:
-            data["index"].append(get_index(result))
-            data["title"].append(get_title(result))
-            data["tags"].append(get_tags(result))
-            data["authors"].append(get_authors(result))
-            data["abstract"].append(get_abstract(result))
-          
-        sleep(15)  # polite delay to avoid overwhelming the server
-      
-    # Convert collected data to a DataFrame and export it to CSV
-    dataframe = DataFrame(data)
-    dataframe.to_csv(output, index=False)
-    print(f"Data saved to {output}")
-    return dataframe
+            print(json.dumps(result, ensure_ascii=False))
+        return
+    for rank, result in enumerate(results, 1):
+        score = f"  (score {result['score']:.2f})" if result["score"] is not None else ""
+        authors = ", ".join(result["authors"][:5]) + (", et al." if len(result["authors"]) > 5 else "")
+        print(f"{rank}. [{result['index']}] {result['title']}{score}")
+        print(f"   {authors} | {', '.join(result['tags'])} | {result['month']}")
+        if result["snippet"]:
+            print(f"   {result['snippet']}")
+    print(f"{len(results)} results in {elapsed * 1000:.1f} ms")
+
+
+def run_authors(argv=None) -> None:
+    """
+    Entry point of the `authors` subcommand.
+
+    Adds the given output files to the author index, if any, then prints the
+    papers and top collaborators of the requested author.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments after 'authors'. Read from the command line if None.
+    """
+    args = parse_authors_arguments(argv)
+    from arxivscraper.storage.authors import AuthorIndex, AuthorIndexBuilder
+
+    if args.add:
+        with AuthorIndexBuilder(args.index) as builder:
+            for path in args.add:
+                print(f"Indexed the authors of {builder.add(read_records(path, args.format))} papers from {path}")
+        counts = builder.counts()
+        print(f"Author index {args.index} holds {counts['authors']} authors and {counts['papers']} papers")
+        if not args.name:
+            return
+
+    with AuthorIndex(args.index) as index:
+        author = index.author_id(args.name)
+        if author is None:
+            print(f"Author not found: {args.name}")
+            return
+        name = index.name(author)
+        papers = index.papers_of(author)
+        coauthors = index.coauthors(author, top=args.coauthors)
+
+    if args.json:
+        print(json.dumps({"author": name, "papers": papers,
+                          "coauthors": [{"name": name, "papers": count} for name, count in coauthors]},
+                         ensure_ascii=False))
+        return
+    print(f"{name}: {len(papers)} papers")
+    print("  " + ", ".join(papers))
+    print("Top collaborators:")
+    for name, count in coauthors:
+        print(f"  {name:<40} {count} shared papers")
+
+
+def run_dedup(argv=None) -> None:
+    """
+    Entry point of the `dedup` subcommand.
+
+    Merges the given harvest files into one output, keeping the latest version
+    of every paper once and reporting (or dropping) near duplicates.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments after 'dedup'. Read from the command line if None.
+    """
+    args = parse_dedup_arguments(argv)
+    from arxivscraper.storage.dedup import merge_harvests
+
+    start = time.perf_counter()
+    stats = merge_harvests(args.inputs, args.output, output_format=args.format, input_format=args.input_format,
+                           report=args.report, state=args.state, drop_near_duplicates=args.drop_near_duplicates,
+                           threshold=args.threshold)
+    elapsed = time.perf_counter() - start
+    print(f"Read {stats['read']} records from {len(args.inputs)} files in {elapsed:.1f} s")
+    print(f"Dropped {stats['older_versions']} older versions and {stats['duplicates']} repeated papers")
+    action = "dropped" if args.drop_near_duplicates else "kept"
+    print(f"Found {stats['near_duplicates']} near duplicates ({action})"
+          + (f", listed in {args.report}" if args.report else ""))
+    print(f"Wrote {stats['written']} records to {args.output}")
+
+
+def run_archive(argv=None) -> None:
+    """
+    Entry point of the `archive` subcommand.
+
+    Appends the given output files and cached result pages to the archive, if
+    any, then prints the requested papers, exports its records or, with no
+    other action, summarizes its contents.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments after 'archive'. Read from the command line if None.
+    """
+    args = parse_archive_arguments(argv)
+    import gzip
+    from arxivscraper.storage.archive import ArchiveReader, ArchiveWriter
+
+    if args.add or args.pages:
+        if os.path.exists(args.archive):
+            with ArchiveReader(args.archive) as archive:
+                fields = archive.fields
+        else:
+            fields = RECORD_FIELDS
+        with ArchiveWriter(args.archive, fields, codec=args.codec) as writer:
+            for path in args.add or ():
+                count = 0
+                records = read_records(path, args.format)
+                while batch := list(islice(records, RESULTS_PER_PAGE)):
+                    writer.write(batch)
+                    count += len(batch)
+                print(f"Archived {count} records from {path}")
+            if args.pages:
+                pages = ResponseCache(args.pages).page_files()
+                for url, page_path in pages:
+                    with open(page_path, "rb") as file:
+                        writer.add_page(url, gzip.decompress(file.read()))
+                print(f"Archived {len(pages)} pages from {args.pages}")
+
+    with ArchiveReader(args.archive) as archive:
+        if args.get:
+            records = {paper_id: archive.get(paper_id) for paper_id in args.get}
+            if args.json:
+                print(json.dumps(records, ensure_ascii=False))
+            else:
+                for paper_id, record in records.items():
+                    if record is None:
+                        print(f"Paper not found: {paper_id}")
+                        continue
+                    for field in archive.fields:
+                        print(f"{field:<9} {record[field]}")
+                    print()
+        if args.export:
+            with open_sink(args.export, fields=archive.fields) as sink:
+                records = archive.records(args.month)
+                while batch := list(islice(records, RESULTS_PER_PAGE)):
+                    sink.write(batch)
+            print(f"Exported {sink.count} records to {args.export}")
+        if args.get or args.export:
+            return
+
+        kinds = [chunk["kind"] for chunk in archive.chunks]
+        info = {"records": len(archive), "record_chunks": kinds.count("records"), "pages": kinds.count("page"),
+                "fields": list(archive.fields), "months": archive.months(), "codec": archive.codec,
+                "bytes": os.path.getsize(args.archive)}
+    if args.json:
+        print(json.dumps(info))
+        return
+    print(f"{args.archive}: {info['records']} records in {info['record_chunks']} chunks, {info['pages']} pages")
+    print(f"Fields: {', '.join(info['fields'])}")
+    if info["months"]:
+        print(f"Months: {info['months'][0]} to {info['months'][-1]} ({len(info['months'])} months)")
+    print(f"Codec: {info['codec']}, {info['bytes']} bytes")
+
+
+def run_queue(argv=None) -> None:
+    """
+    Entry point of the `queue` subcommand (distributed harvests).
+
+    Plans the pages of a search into the job queue, processes them as a
+    worker, prints the progress of the queue or collects its records,
+    depending on the action given.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Arguments after 'queue'. Read from the command line if None.
+    """
+    args = parse_queue_arguments(argv)
+    from arxivscraper.distributed import collect_harvest, open_queue, plan_harvest, run_worker
+
+    if args.action == "plan":
+        added = plan_harvest(args.queue, args.start_date, args.end_date, args.category, cross_list=args.cross_list,
+                             parser=args.parser, base_url=args.base_url or ARXIV_BASE_URL, shard=args.shard,
+                             max_results=args.max_results, fields=args.fields, max_requests=args.max_requests,
+                             period=args.period, lease_timeout=args.lease_timeout, max_attempts=args.max_attempts)
+        print(f"Queued {added} pages in {args.queue}")
+    elif args.action == "work":
+        run_worker(args.queue, name=args.name, cache_dir=args.cache_dir, cache_ttl=args.cache_ttl,
+                   offline=args.offline, max_jobs=args.max_jobs, poll=args.poll)
+    elif args.action == "collect":
+        stats = collect_harvest(args.queue, args.output, output_format=args.format, partial=args.partial)
+        print(f"Wrote {stats['records']} records from {stats['pages']} pages to {args.output}")
+    else:
+        with open_queue(args.queue) as jobs:
+            if args.retry_failed:
+                print(f"Put {jobs.retry_failed()} failed pages back in the queue")
+            status = {"jobs": jobs.counts(), "workers": jobs.active_workers(), "failures": jobs.failures()}
+        if args.json:
+            print(json.dumps(status))
+            return
+        counts = status["jobs"]
+        print(f"{args.queue}: {sum(counts.values())} pages, "
+              + ", ".join(f"{count} {name}" for name, count in counts.items()))
+        print(f"Active workers: {status['workers']}")
+        for url, error in status["failures"]:
+            print(f"  failed: {url} ({error})")
 
 
 def main(argv=None):
@@ -141,13 +1190,17 @@ def main(argv=None):
     ----------
     argv : None | argparse.Namespace | Mapping, optional
         - If None: arguments are read from the command line (default behavior).
+          A first argument 'search', 'authors', 'dedup', 'archive' or 'queue'
+          runs the corresponding subcommand (`run_search()`, `run_authors()`,
+          `run_dedup()`, `run_archive()`, `run_queue()`).
         - If Mapping: dictionary-like object containing keys 'start_date', 'end_date', 'category', etc.
         - If argparse.Namespace: arguments parsed via argparse.
 
     Returns
     -------
-    pandas.DataFrame
-        The DataFrame returned by `scrape_arxiv()`.
+    pandas.DataFrame or None
+        The DataFrame returned by `scrape_arxiv()`. When arguments come from the
+        command line, records are only written to the output file and None is returned.
 
     Raises
     ------
@@ -156,14 +1209,60 @@ def main(argv=None):
     TypeError
         If the provided argv type is unsupported.
     """
+    if argv is None and sys.argv[1:2] == ["search"]:
+        # `arxivscraper search ...` queries the full-text index instead of scraping
+        run_search(sys.argv[2:])
+        return None
+    if argv is None and sys.argv[1:2] == ["authors"]:
+        run_authors(sys.argv[2:])
+        return None
+    if argv is None and sys.argv[1:2] == ["dedup"]:
+        run_dedup(sys.argv[2:])
+        return None
+    if argv is None and sys.argv[1:2] == ["archive"]:
+        run_archive(sys.argv[2:])
+        return None
+    if argv is None and sys.argv[1:2] == ["queue"]:
+        run_queue(sys.argv[2:])
+        return None
+
     if argv is None:
         # When executed as a script: parse CLI arguments
         args = parse_arguments()
         start_date = args.start_date
         end_date = args.end_date
-        category = args.category
+        # A single category keeps the historical (single-query) behaviour
+        category = args.category[0] if len(args.category) == 1 else args.category
         output = getattr(args, 'output', 'arxiv_data.csv')
         cross_list = getattr(args, 'cross_list', False)
+        workers = getattr(args, 'workers', FETCH_WORKERS)
+        max_requests = getattr(args, 'max_requests', RATE_LIMIT_REQUESTS)
+        period = getattr(args, 'period', RATE_LIMIT_PERIOD)
+        adaptive = getattr(args, 'adaptive', False)
+        min_interval = getattr(args, 'min_interval', ADAPTIVE_MIN_INTERVAL)
+        checkpoint = getattr(args, 'checkpoint', None)
+        resume = getattr(args, 'resume', False)
+        cache_dir = getattr(args, 'cache_dir', None)
+        cache_ttl = getattr(args, 'cache_ttl', CACHE_TTL)
+        offline = getattr(args, 'offline', False)
+        parser = getattr(args, 'parser', DEFAULT_PARSER)
+        output_format = getattr(args, 'format', None)
+        # The CLI only needs the output file, so records are not kept in memory
+        return_dataframe = False
+        shard = getattr(args, 'shard', False)
+        max_results = getattr(args, 'max_results', MAX_SEARCH_RESULTS)
+        split_output = getattr(args, 'split_output', False)
+        state = args.state if getattr(args, 'incremental', False) else None
+        metrics_json = getattr(args, 'metrics', None)
+        metrics_prometheus = getattr(args, 'prometheus', None)
+        profile = getattr(args, 'profile', None)
+        parse_workers = getattr(args, 'parse_workers', PARSE_WORKERS)
+        index = getattr(args, 'index', None)
+        columnar = False
+        source = getattr(args, 'source', DEFAULT_SOURCE)
+        oai_url = getattr(args, 'oai_url', OAI_BASE_URL)
+        author_index = getattr(args, 'author_index', None)
+        fields = getattr(args, 'fields', None)
 
     elif isinstance(argv, Mapping):
         # When executed programmatically: use a dictionary-like mapping
@@ -177,6 +1276,33 @@ def main(argv=None):
         category = argv.get('category')
         output = argv.get('output', 'arxiv_data.csv')
         cross_list = argv.get('cross_list', False)
+        workers = argv.get('workers', FETCH_WORKERS)
+        max_requests = argv.get('max_requests', RATE_LIMIT_REQUESTS)
+        period = argv.get('period', RATE_LIMIT_PERIOD)
+        adaptive = argv.get('adaptive', False)
+        min_interval = argv.get('min_interval', ADAPTIVE_MIN_INTERVAL)
+        checkpoint = argv.get('checkpoint')
+        resume = argv.get('resume', False)
+        cache_dir = argv.get('cache_dir')
+        cache_ttl = argv.get('cache_ttl', CACHE_TTL)
+        offline = argv.get('offline', False)
+        parser = argv.get('parser', DEFAULT_PARSER)
+        output_format = argv.get('output_format')
+        return_dataframe = argv.get('return_dataframe', True)
+        shard = argv.get('shard', False)
+        max_results = argv.get('max_results', MAX_SEARCH_RESULTS)
+        split_output = argv.get('split_output', False)
+        state = argv.get('state')
+        metrics_json = argv.get('metrics_json')
+        metrics_prometheus = argv.get('metrics_prometheus')
+        profile = argv.get('profile')
+        parse_workers = argv.get('parse_workers', PARSE_WORKERS)
+        index = argv.get('index')
+        columnar = argv.get('columnar', False)
+        source = argv.get('source', DEFAULT_SOURCE)
+        oai_url = argv.get('oai_url', OAI_BASE_URL)
+        author_index = argv.get('author_index')
+        fields = argv.get('fields')
 
     else:
         raise TypeError("Unsupported argv type for main(); expected None, argparse.Namespace, or Mapping")
@@ -186,7 +1312,34 @@ def main(argv=None):
                         end_date=end_date,
                         category=category,
                         output=output,
-                        cross_list=cross_list)
+                        cross_list=cross_list,
+                        workers=workers,
+                        max_requests=max_requests,
+                        period=period,
+                        adaptive=adaptive,
+                        min_interval=min_interval,
+                        checkpoint=checkpoint,
+                        resume=resume,
+                        cache_dir=cache_dir,
+                        cache_ttl=cache_ttl,
+                        offline=offline,
+                        parser=parser,
+                        output_format=output_format,
+                        return_dataframe=return_dataframe,
+                        shard=shard,
+                        max_results=max_results,
+                        split_output=split_output,
+                        state=state,
+                        metrics_json=metrics_json,
+                        metrics_prometheus=metrics_prometheus,
+                        profile=profile,
+                        parse_workers=parse_workers,
+                        index=index,
+                        columnar=columnar,
+                        source=source,
+                        oai_url=oai_url,
+                        author_index=author_index,
+                        fields=fields)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,378 @@
+"""
+asyncscraper.py
+
+This module provides the asyncio API of the arXiv scraper, for services that
+already run an event loop (web backends, asyncio task queues, notebooks) and
+cannot afford to block it with the thread-based `iter_arxiv()`.
+
+Main features:
+---------------
+- `aiter_arxiv()` is an asynchronous iterator over the result pages of a search,
+  yielding the same records as `iter_arxiv()` in the same order. Pages are
+  downloaded ahead by at most `concurrency` tasks, so a slow consumer stops the
+  downloads instead of piling pages up in memory.
+- `ascrape_arxiv()` writes the pages to a CSV, JSON Lines, Parquet, SQLite or archive
+  output as they arrive and optionally returns a DataFrame.
+- Requests go through `webtools.asyncclient.AsyncHTTPClient` (aiohttp): rate-limit
+  and backoff waits are awaited, every request has its own timeout and
+  `run_timeout` bounds the whole run.
+- Cancelling the consuming task (or leaving the iteration early) cancels every
+  download in flight and closes the client if it was created here.
+
+URLs are built with `webtools.url_finder.get_url()` and pages are parsed with
+`scrapertools.scrapertools.parse_page()` in a worker thread, so records are
+identical to those of the synchronous API. Date sharding, checkpoints and
+incremental state are only available through `iter_arxiv()` / `scrape_arxiv()`.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from contextlib import ExitStack, nullcontext
+from typing import TYPE_CHECKING, Optional, Union
+
+from arxivscraper.arxivscraper import select_fields
+from arxivscraper.config.config import (ARXIV_BASE_URL, CACHE_TTL, DEFAULT_PARSER, FETCH_WORKERS,
+                                        MAX_SEARCH_RESULTS, RESULTS_PER_PAGE)
+from arxivscraper.monitoring.metrics import RunMetrics, projection_saving
+from arxivscraper.scrapertools.scrapertools import parse_page
+from arxivscraper.storage.sinks import open_sink
+from arxivscraper.webtools.asyncclient import AsyncHTTPClient, AsyncTokenBucket
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.url_finder import get_url
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+async def aiter_arxiv(start_date: str,
+                      end_date: str,
+                      category: Union[str, Sequence[str]],
+                      cross_list: bool = False,
+                      client: Optional[AsyncHTTPClient] = None,
+                      concurrency: int = FETCH_WORKERS,
+                      parser: str = DEFAULT_PARSER,
+                      base_url: str = ARXIV_BASE_URL,
+                      max_results: int = MAX_SEARCH_RESULTS,
+                      with_category: bool = False,
+                      run_timeout: Optional[float] = None,
+                      metrics: Optional[RunMetrics] = None,
+                      fields: Optional[Sequence[str]] = None) -> AsyncIterator[list[dict]]:
+    """
+    Asynchronously iterate over the result pages of an arXiv search, yielding their records.
+
+    Pages are yielded in result order as soon as they are parsed. The first page
+    of every category is requested concurrently to learn the number of results,
+    then the remaining pages are downloaded by at most `concurrency` tasks.
+
+    Parameters
+    ----------
+    start_date : str
+        Start date for the search in 'YYYY-MM-DD' format.
+    end_date : str
+        End date for the search in 'YYYY-MM-DD' format.
+    category : str or sequence of str
+        ArXiv category code (e.g., 'gr-qc', 'cs', 'math'), or several of them.
+        Papers found in more than one category are only yielded once.
+    cross_list : bool, optional
+        Whether to include cross-listed papers. Defaults to False.
+    client : AsyncHTTPClient, optional
+        HTTP client used for every page. Defaults to a new client rate-limited
+        with the configured defaults (closed when the iteration ends).
+    concurrency : int, optional
+        Maximum number of result pages downloaded or parsed ahead of the consumer.
+        Defaults to `FETCH_WORKERS`.
+    parser : str, optional
+        Extraction engine: 'bs4' or 'fast'. Defaults to `DEFAULT_PARSER`.
+    base_url : str, optional
+        Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`.
+    max_results : int, optional
+        Deepest result offset reachable through the search pagination.
+        Defaults to `MAX_SEARCH_RESULTS`.
+    with_category : bool, optional
+        Whether to yield (category, records) pairs instead of records only.
+        Defaults to False.
+    run_timeout : float, optional
+        Seconds allowed for the whole iteration (time spent by the consumer
+        included). Defaults to no limit; each request is still bounded by the
+        timeout of the client.
+    metrics : RunMetrics, optional
+        Collector of stage timings, counters and per-page metrics. Network
+        metrics are only recorded by clients created with the same collector.
+    fields : sequence of str, optional
+        Fields of the records (see `select_fields`). Defaults to every field of
+        `RECORD_FIELDS`; without 'abstract', abstracts are not downloaded and the run
+        ends by printing the bytes downloaded and the estimated saving.
+
+    Yields
+    ------
+    list[dict]
+        The records of one result page, with the keys listed in `fields`.
+
+    Raises
+    ------
+    ValueError
+        If `concurrency` is lower than 1, if `fields` is invalid, if no results
+        are found for a single category, or if the total number of results
+        cannot be parsed.
+    ConnectionError
+        If a page cannot be retrieved from arXiv.org after all retries.
+    TimeoutError
+        If the run takes longer than `run_timeout`.
+    """
+    if concurrency < 1:
+        raise ValueError("The number of concurrent downloads must be at least 1.")
+    fields = select_fields(fields)
+
+    categories = [category] if isinstance(category, str) else list(category)
+    owns_client = client is None
+    if owns_client:
+        client = AsyncHTTPClient(limiter=AsyncTokenBucket(), metrics=metrics)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + run_timeout if run_timeout is not None else None
+
+    async def within_deadline(awaitable):
+        # The remaining time of the run bounds every wait of the consumer
+        if deadline is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"The scrape did not finish within {run_timeout} seconds.") from None
+
+    def page_url(page_category: str, start: int) -> str:
+        return get_url(start_date=start_date, end_date=end_date, category=page_category,
+                       start=start, cross_list=cross_list, base_url=base_url, abstracts="abstract" in fields)
+
+    async def download(url: str) -> tuple[Optional[int], list[dict], int, float]:
+        # Download without blocking the loop, then parse in a worker thread
+        fetch_start = time.perf_counter()
+        content = await client.fetch(url)
+        fetch_seconds = time.perf_counter() - fetch_start
+        if metrics is not None:
+            metrics.add_time("fetch", fetch_seconds)
+        total, records = await asyncio.to_thread(parse_page, content, parser, metrics, fields)
+        return total, records, len(content), fetch_seconds
+
+    async def probe(page_category: str):
+        # The first page of a category gives its number of results
+        try:
+            result = await download(page_url(page_category, 0))
+            if not result[0]:
+                raise ValueError("No results found or unable to parse the number of results.")
+        except ValueError as e:
+            # A single query without results is an error, but not one category among several
+            if len(categories) == 1:
+                raise
+            print(f"Warning: skipping category {page_category}: {e}")
+            return None
+        return result
+
+    pending = deque()
+    probes = [asyncio.ensure_future(probe(page_category)) for page_category in categories]
+    try:
+        results = await within_deadline(asyncio.gather(*probes))
+        first_pages = {page_category: result for page_category, result in zip(categories, results)
+                       if result is not None}
+        print(f"Total results found: {sum(result[0] for result in first_pages.values())}")
+
+        # Every page of every category, the first ones already downloaded
+        pages = [(page_category, start) for page_category, result in first_pages.items()
+                 for start in range(0, min(result[0], max_results), RESULTS_PER_PAGE)]
+        missing = iter([page for page in pages if page[1] > 0])
+
+        def schedule() -> None:
+            # Keep at most `concurrency` downloads ahead of the consumer
+            while len(pending) < concurrency:
+                page = next(missing, None)
+                if page is None:
+                    return
+                pending.append((page, asyncio.ensure_future(download(page_url(*page)))))
+
+        seen = set()
+        downloaded = listed = 0
+        schedule()
+        for page_category, start in pages:
+            if start == 0:
+                source = "probe"
+                result = first_pages.pop(page_category)
+            else:
+                source = "download"
+                task = pending.popleft()[1]
+                schedule()
+                result = await within_deadline(task)
+            records = result[1]
+            downloaded += result[2]
+            listed += len(records)
+
+            # Papers cross-listed in several categories (or shifting between pages) can repeat
+            if len(categories) > 1:
+                records = [record for record in records if record["index"] not in seen]
+                seen.update(record["index"] for record in records)
+
+            if metrics is not None:
+                metrics.increment("records", len(records))
+                metrics.add_page(url=page_url(page_category, start), category=page_category, start=start,
+                                 source=source, records=len(records), bytes=result[2],
+                                 fetch_seconds=result[3])
+            yield (page_category, records) if with_category else records
+
+            if deadline is not None and loop.time() > deadline:
+                raise TimeoutError(f"The scrape did not finish within {run_timeout} seconds.")
+
+        if "abstract" not in fields and listed:
+            print(projection_saving(downloaded, listed))
+    finally:
+        # Stop the downloads still in flight (early exit, cancellation, error or timeout)
+        tasks = [task for task in probes if not task.done()] + [task for _, task in pending]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_client:
+            await client.close()
+
+
+async def ascrape_arxiv(start_date: str,
+                        end_date: str,
+                        category: Union[str, Sequence[str]],
+                        output: Optional[str] = "arxiv_data.csv",
+                        cross_list: bool = False,
+                        concurrency: int = FETCH_WORKERS,
+                        limiter: Optional[AsyncTokenBucket] = None,
+                        client: Optional[AsyncHTTPClient] = None,
+                        base_url: str = ARXIV_BASE_URL,
+                        cache_dir: Optional[str] = None,
+                        cache_ttl: float = CACHE_TTL,
+                        offline: bool = False,
+                        parser: str = DEFAULT_PARSER,
+                        output_format: Optional[str] = None,
+                        return_dataframe: bool = True,
+                        max_results: int = MAX_SEARCH_RESULTS,
+                        request_timeout: Optional[float] = None,
+                        run_timeout: Optional[float] = None,
+                        metrics: Optional[RunMetrics] = None,
+                        fields: Optional[Sequence[str]] = None) -> Optional[DataFrame]:
+    """
+    Asynchronously scrape arXiv.org for papers in a given category and date range.
+
+    Asyncio counterpart of `scrape_arxiv()` (see `aiter_arxiv()`). Each page is
+    written and flushed to `output` as soon as it is parsed.
+
+    Parameters
+    ----------
+    start_date : str
+        Start date for the search in 'YYYY-MM-DD' format.
+    end_date : str
+        End date for the search in 'YYYY-MM-DD' format.
+    category : str or sequence of str
+        ArXiv category code (e.g., 'gr-qc', 'cs', 'math'), or several of them.
+    output : str, optional
+        File path to save the results, or None to only return them.
+        Defaults to 'arxiv_data.csv'.
+    cross_list : bool, optional
+        Whether to include cross-listed papers. Defaults to False.
+    concurrency : int, optional
+        Maximum number of result pages downloaded concurrently. Defaults to `FETCH_WORKERS`.
+    limiter : AsyncTokenBucket, optional
+        Shared rate limiter. Defaults to one with the configured limits.
+    client : AsyncHTTPClient, optional
+        HTTP client reused for every page. A new one is created (and closed at
+        the end of the run) if omitted; when given, its own limiter, cache and
+        timeout are used instead of `limiter`, `cache_dir` and `request_timeout`.
+    base_url : str, optional
+        Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`.
+    cache_dir : str, optional
+        Directory of the on-disk response cache.
+    cache_ttl : float, optional
+        Seconds during which a cached page is reused without revalidation.
+        Defaults to `CACHE_TTL`.
+    offline : bool, optional
+        Serve every page from `cache_dir` without using the network. Defaults to False.
+    parser : str, optional
+        Extraction engine: 'bs4' or 'fast'. Defaults to `DEFAULT_PARSER`.
+    output_format : str, optional
+        'csv', 'jsonl', 'parquet' or 'sqlite'. Inferred from the `output` extension if omitted.
+    return_dataframe : bool, optional
+        Whether to also collect the records into a DataFrame. Defaults to True.
+    max_results : int, optional
+        Deepest result offset reachable through the search pagination.
+        Defaults to `MAX_SEARCH_RESULTS`.
+    request_timeout : float, optional
+        Seconds allowed for each request. Defaults to `HTTP_TIMEOUT`.
+    run_timeout : float, optional
+        Seconds allowed for the whole run. Defaults to no limit.
+    metrics : RunMetrics, optional
+        Collector of stage timings, counters and per-page metrics.
+    fields : sequence of str, optional
+        Fields to scrape and write (see `scrape_arxiv()`). Defaults to every field.
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        A DataFrame containing the scraped data, or None if `return_dataframe` is False.
+
+    Raises
+    ------
+    ValueError
+        If no results are found for a single category, if the total number of
+        results cannot be parsed, if `fields` is invalid, or if `offline` is
+        requested without a `cache_dir`.
+    ConnectionError
+        If a page cannot be retrieved from arXiv.org after all retries.
+    TimeoutError
+        If the run takes longer than `run_timeout`.
+    """
+    fields = select_fields(fields)
+    owns_client = client is None
+    if owns_client:
+        cache = ResponseCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+        options = {"timeout": request_timeout} if request_timeout is not None else {}
+        client = AsyncHTTPClient(limiter=limiter or AsyncTokenBucket(), cache=cache, offline=offline,
+                                 metrics=metrics, **options)
+
+    collected = [] if return_dataframe else None
+    timer = metrics.timer if metrics is not None else (lambda stage: nullcontext())
+    try:
+        with ExitStack() as sinks:
+            sink = sinks.enter_context(open_sink(output, output_format, fields)) if output else None
+            pages = aiter_arxiv(start_date, end_date, category, cross_list=cross_list, client=client,
+                                concurrency=concurrency, parser=parser, base_url=base_url,
+                                max_results=max_results, run_timeout=run_timeout, metrics=metrics,
+                                fields=fields)
+            try:
+                async for records in pages:
+                    if sink is not None:
+                        with timer("write"):
+                            sink.write(records)
+                    if collected is not None:
+                        collected.extend(records)
+            finally:
+                # Cancel the downloads in flight now rather than when the generator is collected
+                await pages.aclose()
+    finally:
+        if owns_client:
+            await client.close()
+
+    if sink is not None:
+        print(f"Data saved to {sink.path}")
+    if collected is None:
+        return None
+
+    from pandas import DataFrame
+
+    return DataFrame(collected, columns=list(fields))
+
+
+if __name__ == "__main__":
+    print("This module provides the asyncio API of the arXiv scraper (aiter_arxiv, ascrape_arxiv).")
@@ -7,8 +7,10 @@ This module defines all global configuration constants used throughout the
 
 - arXiv subject categories (physics and non-physics)
 - Mapping for non-physics category names
+- Fields of every scraped record
 - Base URL for the arXiv website
-- Custom HTTP headers for `requests` sessions
+- Custom HTTP headers and retry policy for `requests` sessions
+- Rate limiting (fixed or adaptive) and concurrency settings for page downloads
 
 Authors:
     - Alejandro Cano Jones (acanojo@uoc.edu)
@@ -49,6 +51,27 @@ NON_PHYSICS_MAP = {
 }
 
 
+# ------------------------------------------------------------------------------------
+# RECORD SCHEMA
+# ------------------------------------------------------------------------------------
+
+# Fields extracted for every paper, in the order they are written to the output.
+RECORD_FIELDS = ("index", "title", "tags", "authors", "abstract")
+
+# Fields every projection must keep: the identifier is needed to deduplicate,
+# checkpoint and harvest incrementally.
+REQUIRED_FIELDS = ("index",)
+
+# Average bytes of the abstract block of one result (short and full abstract with
+# their More/Less links) on a page requested with abstracts=show, measured over the
+# papers of the sample dataset. Used to estimate what runs without abstracts save.
+SHOWN_ABSTRACT_BYTES = 1900
+
+# Extraction engine used by default: 'bs4' (BeautifulSoup reference implementation)
+# or 'fast' (single-pass extractor, backed by lxml when it is installed).
+DEFAULT_PARSER = "bs4"
+
+
 # ------------------------------------------------------------------------------------
 # NETWORK AND HTTP HEADERS CONFIGURATION
 # ------------------------------------------------------------------------------------
@@ -56,6 +79,14 @@ NON_PHYSICS_MAP = {
 # Base URL for all arXiv web requests.
 ARXIV_BASE_URL = "https://arxiv.org"
 
+# Endpoint of the arXiv OAI-PMH interface, used by the bulk metadata source.
+OAI_BASE_URL = "https://oaipmh.arxiv.org/oai"
+
+# Sources of paper metadata: scraped search result pages ('html') or OAI-PMH
+# 'arXiv' metadata records ('oai').
+SOURCES = ("html", "oai")
+DEFAULT_SOURCE = "html"
+
 # Custom headers used for making polite web requests to arXiv.
 # The 'From' field includes both authors’ emails as contact points.
 REQUESTS_HEADER = {
@@ -65,6 +96,93 @@ REQUESTS_HEADER = {
 }
 
 
+# Timeout (in seconds) for a single HTTP request.
+HTTP_TIMEOUT = 30.0
+
+# Retry policy for transient failures (connection errors, 429 and 5xx responses).
+# Waits grow exponentially from HTTP_BACKOFF_BASE up to HTTP_BACKOFF_MAX seconds,
+# with random jitter, unless the server asks for a longer wait via 'Retry-After'.
+HTTP_MAX_RETRIES = 5
+HTTP_BACKOFF_BASE = 2.0
+HTTP_BACKOFF_MAX = 120.0
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Maximum number of keep-alive connections opened to a single host.
+HTTP_POOL_SIZE = 4
+
+# Response cache: cached pages younger than CACHE_TTL seconds are reused without
+# contacting arXiv; older ones are revalidated with a conditional request.
+# The least recently used pages are evicted once the cache exceeds CACHE_MAX_BYTES.
+CACHE_TTL = 24 * 60 * 60
+CACHE_MAX_BYTES = 1024 ** 3
+
+
+# ------------------------------------------------------------------------------------
+# STORAGE AND INDEXES
+# ------------------------------------------------------------------------------------
+
+# SQLite file where incremental runs keep, per category and cross-list setting,
+# the newest announced date harvested and the identifiers already seen.
+STATE_PATH = "arxiv_state.sqlite"
+
+# SQLite file of the full-text search index of harvested titles and abstracts.
+SEARCH_INDEX_PATH = "arxiv_index.sqlite"
+
+# Directory of the author and co-authorship index (a memory-mapped SQLite file).
+AUTHOR_INDEX_PATH = "arxiv_authors"
+
+# Estimated Jaccard similarity (MinHash over title and abstract shingles) from
+# which two papers with different identifiers are flagged as near duplicates.
+DEDUP_THRESHOLD = 0.8
+
+# Shared job queue of distributed harvests (SQLite): a worker that does not
+# report a leased page within JOB_LEASE_TIMEOUT seconds is presumed lost and the
+# page is handed to another worker; pages failing JOB_MAX_ATTEMPTS times are
+# set aside. Idle workers check for new pages every JOB_POLL_INTERVAL seconds.
+JOB_QUEUE_PATH = "arxiv_jobs.sqlite"
+JOB_LEASE_TIMEOUT = 600.0
+JOB_MAX_ATTEMPTS = 5
+JOB_POLL_INTERVAL = 10.0
+
+# Records per compressed chunk of an archive ('.arxz'): larger chunks compress
+# better, smaller ones make lookups by identifier decode less data.
+ARCHIVE_CHUNK_RECORDS = 1000
+
+
+# ------------------------------------------------------------------------------------
+# RATE LIMITING AND CONCURRENCY
+# ------------------------------------------------------------------------------------
+
+# Number of results requested per search page (maximum allowed by arXiv).
+RESULTS_PER_PAGE = 200
+
+# Deepest result offset reachable through the advanced search pagination.
+# Larger queries are split into date shards that fit under this cap.
+MAX_SEARCH_RESULTS = 10000
+
+# Politeness budget shared by all downloads: at most RATE_LIMIT_REQUESTS requests
+# every RATE_LIMIT_PERIOD seconds (the default matches one page every 15 seconds).
+RATE_LIMIT_REQUESTS = 1
+RATE_LIMIT_PERIOD = 15.0
+
+# Adaptive pacing: the interval between requests starts from the rate limit and
+# stays between ADAPTIVE_MIN_INTERVAL (hard floor) and ADAPTIVE_MAX_INTERVAL
+# seconds. Every healthy response adds ADAPTIVE_RATE_STEP requests per minute to
+# the rate; throttling (429 and 5xx responses, connection errors) or an average
+# latency above ADAPTIVE_LATENCY_TARGET seconds multiplies it by ADAPTIVE_BACKOFF_FACTOR.
+ADAPTIVE_MIN_INTERVAL = 3.0
+ADAPTIVE_MAX_INTERVAL = 300.0
+ADAPTIVE_RATE_STEP = 1.0
+ADAPTIVE_BACKOFF_FACTOR = 0.5
+ADAPTIVE_LATENCY_TARGET = 5.0
+
+# Number of worker threads downloading result pages concurrently.
+FETCH_WORKERS = 2
+
+# Number of processes parsing result pages (1 parses in the main process).
+PARSE_WORKERS = 1
+
+
 # ------------------------------------------------------------------------------------
 # MODULE ENTRY POINT
 # ------------------------------------------------------------------------------------
@@ -0,0 +1,425 @@
+"""
+distributed.py
+
+This module spreads a harvest over several worker processes or hosts, each
+with its own IP and share of the politeness budget, coordinated through a
+durable job queue (`storage.jobqueue.JobQueue`, a single SQLite file).
+
+Main features:
+---------------
+- `plan_harvest()` (coordinator) probes every category (and date shard) with
+  `get_url()` and the number of results of its first page, and queues one job
+  per result page. First pages are committed right away with the records
+  parsed while probing.
+- `run_worker()` leases jobs one at a time, downloads and parses their page and
+  commits the records back. A background thread renews the lease while the
+  page is processed, so a slow page is not handed to another worker. Jobs of
+  workers that stop reporting are leased again once their lease expires, and
+  commits are idempotent, so a page processed twice is stored once.
+- The rate limit stored with the queue is a global budget: every worker limits
+  itself to its share, recomputed from the number of active workers each time
+  it leases a job. A worker starts with an empty bucket, so workers starting
+  together do not add up their bursts.
+- `collect_harvest()` writes the committed records, in query order and without
+  repeated papers, to a CSV, JSON Lines, Parquet, SQLite or archive output.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional, Union
+
+from arxivscraper.arxivscraper import select_fields
+from arxivscraper.config.config import (ARXIV_BASE_URL, CACHE_TTL, DEFAULT_PARSER, JOB_LEASE_TIMEOUT,
+                                        JOB_MAX_ATTEMPTS, JOB_POLL_INTERVAL, MAX_SEARCH_RESULTS,
+                                        RATE_LIMIT_PERIOD, RATE_LIMIT_REQUESTS, RESULTS_PER_PAGE)
+from arxivscraper.scrapertools.scrapertools import parse_page
+from arxivscraper.storage.jobqueue import Job, JobQueue
+from arxivscraper.storage.sinks import open_sink
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.ratelimit import TokenBucket
+from arxivscraper.webtools.sharding import Shard, plan_shards
+from arxivscraper.webtools.url_finder import get_url
+
+if TYPE_CHECKING:
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+
+def open_queue(path: str) -> JobQueue:
+    """
+    Opens the job queue of a harvest with the lease policy chosen by its coordinator.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite file of the queue.
+
+    Returns
+    -------
+    JobQueue
+        The open queue.
+
+    Raises
+    ------
+    ValueError
+        If the file does not hold a planned harvest.
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"Job queue not found: {path}")
+    queue = JobQueue(path)
+    settings = queue.settings()
+    if not settings:
+        queue.close()
+        raise ValueError(f"The job queue {path} has no planned harvest.")
+    queue.lease_timeout = settings["lease_timeout"]
+    queue.max_attempts = settings["max_attempts"]
+    return queue
+
+
+class _LeaseRenewal:
+    """
+    Background thread renewing the lease of the job a worker is processing,
+    every third of the lease timeout. It has its own connection to the queue,
+    as SQLite connections are not shared between threads.
+
+    Parameters
+    ----------
+    queue : str
+        Path of the SQLite file of the queue.
+    worker : str
+        Name of the worker.
+    lease_timeout : float
+        Lease timeout of the queue, in seconds.
+    """
+
+    def __init__(self, queue: str, worker: str, lease_timeout: float):
+        self.queue = queue
+        self.worker = worker
+        self.lease_timeout = lease_timeout
+        self._job = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-renewal-{worker}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        with JobQueue(self.queue, lease_timeout=self.lease_timeout) as jobs:
+            while not self._stop.wait(self.lease_timeout / 3):
+                # The lock keeps the job from being finished while its lease is renewed
+                with self._lock:
+                    job = self._job
+                    if job is None:
+                        continue
+                    try:
+                        renewed = jobs.renew(job, self.worker)
+                    except sqlite3.Error as e:
+                        print(f"Warning: could not renew the lease of job {job.id}: {e}")
+                        continue
+                    if not renewed:
+                        self._job = None
+                        print(f"Warning: the lease of job {job.id} was lost; another worker may process it again")
+
+    @contextmanager
+    def holding(self, job: Job) -> Iterator[None]:
+        """Renews the lease of `job` until the block ends."""
+        with self._lock:
+            self._job = job
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._job = None
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def plan_harvest(queue: str,
+                 start_date: str,
+                 end_date: str,
+                 category: Union[str, Sequence[str]],
+                 cross_list: bool = False,
+                 client: Optional[HTTPClient] = None,
+                 parser: str = DEFAULT_PARSER,
+                 base_url: str = ARXIV_BASE_URL,
+                 shard: bool = False,
+                 max_results: int = MAX_SEARCH_RESULTS,
+                 fields: Optional[Sequence[str]] = None,
+                 max_requests: int = RATE_LIMIT_REQUESTS,
+                 period: float = RATE_LIMIT_PERIOD,
+                 lease_timeout: float = JOB_LEASE_TIMEOUT,
+                 max_attempts: int = JOB_MAX_ATTEMPTS) -> int:
+    """
+    Queues one job per result page of a search (coordinator side).
+
+    The queue can be planned again with other dates or categories while
+    workers run; pages already queued are not added twice.
+
+    Parameters
+    ----------
+    queue : str
+        Path of the SQLite file of the queue (created if missing).
+    start_date, end_date : str
+        Date range of the search in 'YYYY-MM-DD' format.
+    category : str or sequence of str
+        ArXiv category code, or several of them.
+    cross_list : bool, optional
+        Whether to include cross-listed papers. Defaults to False.
+    client : HTTPClient, optional
+        HTTP client used to probe the number of results. Defaults to a new
+        client limited to `max_requests` per `period`.
+    parser : str, optional
+        Extraction engine of the workers: 'bs4' or 'fast'. Defaults to `DEFAULT_PARSER`.
+    base_url : str, optional
+        Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`.
+    shard : bool, optional
+        Whether to split the date range into shards holding at most
+        `max_results` results each. Defaults to False.
+    max_results : int, optional
+        Deepest result offset reachable through the search pagination.
+        Defaults to `MAX_SEARCH_RESULTS`.
+    fields : sequence of str, optional
+        Fields of the records (see `select_fields`). Defaults to every field.
+    max_requests, period : optional
+        Global politeness budget split between the workers: `max_requests`
+        requests every `period` seconds.
+    lease_timeout : float, optional
+        Seconds a worker keeps a job before it is handed to another one.
+        Defaults to `JOB_LEASE_TIMEOUT`.
+    max_attempts : int, optional
+        Leases of a job before it is set aside as failed. Defaults to `JOB_MAX_ATTEMPTS`.
+
+    Returns
+    -------
+    int
+        Number of jobs added to the queue.
+
+    Raises
+    ------
+    ValueError
+        If no results are found for a single category, or if the queue was
+        planned before with other settings.
+    """
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+    fields = select_fields(fields)
+    categories = [category] if isinstance(category, str) else list(category)
+    owns_client = client is None
+    if owns_client:
+        client = HTTPClient(limiter=TokenBucket(requests=max_requests, period=period))
+
+    def page_url(window_category: str, window: Shard, start: int) -> str:
+        return get_url(start_date=window.start_date, end_date=window.end_date, category=window_category,
+                       start=start, cross_list=cross_list, base_url=base_url, abstracts="abstract" in fields)
+
+    added = 0
+    try:
+        with JobQueue(queue, lease_timeout=lease_timeout, max_attempts=max_attempts) as jobs:
+            jobs.configure({"cross_list": cross_list, "parser": parser, "fields": list(fields),
+                            "max_requests": max_requests, "period": period,
+                            "lease_timeout": lease_timeout, "max_attempts": max_attempts})
+            for window_category in categories:
+                def probe(window_start: str, window_end: str) -> tuple[Optional[int], list[dict]]:
+                    url = page_url(window_category, Shard(window_start, window_end, 0), 0)
+                    return parse_page(client.fetch(url), engine=parser, fields=fields)
+
+                try:
+                    if shard:
+                        windows = plan_shards(start_date, end_date, probe, max_results=max_results)
+                    else:
+                        total, first_page = probe(start_date, end_date)
+                        if not total:
+                            raise ValueError("No results found or unable to parse the number of results.")
+                        windows = [Shard(start_date, end_date, total, first_page)]
+                except ValueError as e:
+                    if len(categories) == 1:
+                        raise
+                    print(f"Warning: skipping category {window_category}: {e}")
+                    continue
+
+                for window in windows:
+                    starts = range(0, min(window.total, max_results), RESULTS_PER_PAGE)
+                    ids = jobs.add((page_url(window_category, window, start), window_category,
+                                    window.start_date, window.end_date, start) for start in starts)
+                    # The first page was downloaded while probing: commit it right away
+                    if ids and ids[0] is not None and window.first_page is not None:
+                        jobs.complete(ids[0], window.first_page)
+                    added += sum(job_id is not None for job_id in ids)
+                print(f"Category {window_category}: {sum(window.total for window in windows)} results "
+                      f"in {len(windows)} window(s)")
+    finally:
+        if owns_client:
+            client.close()
+    return added
+
+
+def run_worker(queue: str,
+               name: Optional[str] = None,
+               client: Optional[HTTPClient] = None,
+               cache_dir: Optional[str] = None,
+               cache_ttl: float = CACHE_TTL,
+               offline: bool = False,
+               max_jobs: Optional[int] = None,
+               poll: float = JOB_POLL_INTERVAL,
+               sleep=time.sleep) -> int:
+    """
+    Processes jobs of a queue until none is left (worker side).
+
+    Each job is leased, its page downloaded and parsed, and its records
+    committed back. The lease is renewed while the page is processed, however
+    long the rate limiter and the retries make it. Errors give the job back to
+    the queue for another attempt. While the remaining jobs are all leased by other workers, the
+    worker waits `poll` seconds and asks again, taking over jobs whose lease
+    expires.
+
+    Parameters
+    ----------
+    queue : str
+        Path of the SQLite file of the queue.
+    name : str, optional
+        Name of the worker in the queue. Defaults to 'host:pid'.
+    client : HTTPClient, optional
+        HTTP client used for every page. Defaults to a new client, whose rate
+        limiter starts empty; the rate limiter of the client (if any) is set to
+        the share of the global budget.
+    cache_dir : str, optional
+        Directory of the on-disk response cache of a new client.
+    cache_ttl : float, optional
+        Seconds a cached page is reused before revalidation. Defaults to `CACHE_TTL`.
+    offline : bool, optional
+        Whether a new client serves every page from `cache_dir` only.
+    max_jobs : int, optional
+        Stop after this number of jobs. Defaults to no limit.
+    poll : float, optional
+        Seconds between two requests for a job while none is available.
+        Defaults to `JOB_POLL_INTERVAL`.
+    sleep : callable, optional
+        Sleep function (injectable for testing).
+
+    Returns
+    -------
+    int
+        Number of jobs whose records this worker committed.
+
+    Raises
+    ------
+    ValueError
+        If the queue does not exist or holds no planned harvest.
+    """
+    from arxivscraper.webtools.httpclient import HTTPClient
+
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    committed = failed = 0
+    with open_queue(queue) as jobs:
+        settings = jobs.settings()
+        fields = tuple(settings["fields"])
+        owns_client = client is None
+        if owns_client:
+            cache = ResponseCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+            # An empty bucket: a full one would let every worker starting now send a burst of the whole budget
+            limiter = TokenBucket(requests=settings["max_requests"], period=settings["period"], initial=0)
+            client = HTTPClient(limiter=limiter, cache=cache, offline=offline)
+        renewal = _LeaseRenewal(queue, name, jobs.lease_timeout)
+        try:
+            while max_jobs is None or committed + failed < max_jobs:
+                job = jobs.lease(name)
+                if job is None:
+                    if not jobs.unfinished():
+                        break
+                    sleep(poll)
+                    continue
+
+                # Share of the global budget, as the number of active workers changes
+                if client.limiter is not None:
+                    workers = max(1, jobs.active_workers())
+                    client.limiter.set_rate(settings["max_requests"] / workers, settings["period"])
+
+                try:
+                    with renewal.holding(job):
+                        _, records = parse_page(client.fetch(job.url), engine=settings["parser"], fields=fields)
+                except (ConnectionError, ValueError) as e:
+                    jobs.fail(job, f"{type(e).__name__}: {e}")
+                    failed += 1
+                    print(f"Warning: job {job.id} failed: {e}")
+                    continue
+                except BaseException:
+                    # Interrupted: give the job back right away rather than at lease expiry
+                    jobs.fail(job, "worker stopped")
+                    raise
+                if jobs.complete(job.id, records):
+                    committed += 1
+        finally:
+            renewal.stop()
+            jobs.leave(name)
+            if owns_client:
+                client.close()
+    print(f"Worker {name} committed {committed} pages ({failed} failed attempts)")
+    return committed
+
+
+def collect_harvest(queue: str,
+                    output: str,
+                    output_format: Optional[str] = None,
+                    partial: bool = False) -> dict:
+    """
+    Writes the records committed to a queue to an output file.
+
+    Pages are written in the order they were queued; papers found in more than
+    one category or window are written once.
+
+    Parameters
+    ----------
+    queue : str
+        Path of the SQLite file of the queue.
+    output : str
+        Output file path.
+    output_format : str, optional
+        Output format (see `storage.sinks`); inferred from `output` by default.
+    partial : bool, optional
+        Whether to write the records committed so far even if some jobs are
+        unfinished or failed. Defaults to False.
+
+    Returns
+    -------
+    dict
+        Number of pages read and of records written.
+
+    Raises
+    ------
+    ValueError
+        If the queue does not exist, or if `partial` is False and some jobs are
+        not done.
+    """
+    with open_queue(queue) as jobs:
+        counts = jobs.counts()
+        unfinished = counts["pending"] + counts["leased"] + counts["failed"]
+        if unfinished and not partial:
+            raise ValueError(f"{unfinished} of {sum(counts.values())} jobs are not done "
+                             f"({counts['failed']} failed).")
+        seen = set()
+        pages = 0
+        with open_sink(output, output_format, tuple(jobs.settings()["fields"])) as sink:
+            for _, records in jobs.results():
+                records = [record for record in records if record["index"] not in seen]
+                seen.update(record["index"] for record in records)
+                sink.write(records)
+                pages += 1
+    return {"pages": pages, "records": sink.count}
+
+
+if __name__ == "__main__":
+    print("This module distributes arXiv harvests over workers sharing a job queue.")
@@ -0,0 +1,305 @@
+"""
+metrics.py
+----------
+
+This module collects structured metrics of a scraping run.
+
+A `RunMetrics` instance is shared by every component of a run (HTTP client,
+fetch workers, extraction and output) and records:
+
+- the time spent in each stage: rate-limit waits, network requests, retry
+  backoff, parsing, each extractor of the reference engine and writing;
+- counters such as requests, retries, cache hits and bytes downloaded;
+- one entry per result page with its download and parse times, size and
+  number of records.
+
+`summary()` returns everything as a dict, which can be written as a JSON report
+(`write_json()`) or as a Prometheus text file (`write_prometheus()`), e.g. for
+the node-exporter textfile collector. `profile_run()` is an opt-in cProfile
+hook for a single run, and `projection_saving()` summarizes the traffic of a
+run without abstracts, with or without metrics.
+
+Recording a metric only takes a lock and a couple of additions, so the
+overhead is negligible next to downloading and parsing a page.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import cProfile
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# --- Import the size of the abstracts from the configuration ---
+from arxivscraper.config.config import SHOWN_ABSTRACT_BYTES
+
+
+class RunMetrics:
+    """
+    Thread-safe collector of stage timings, counters and per-page metrics.
+
+    Args:
+        clock (callable): Monotonic clock used for timings (injectable for testing).
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._start = clock()
+        self._end = None
+        self.stages = {}
+        self.counters = {}
+        self.pages = []
+        self._fetch_times = {}
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Times the enclosed block and adds it to a stage.
+
+        Args:
+            stage (str): Name of the stage (e.g., 'parse', 'write').
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.add_time(stage, self._clock() - start)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        Adds one measurement to a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            seconds (float): Time spent.
+        """
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """
+        Increments a counter.
+
+        Args:
+            counter (str): Name of the counter (e.g., 'retries', 'bytes_downloaded').
+            value (int): Amount to add.
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def timed_fetch(self, fetch, url: str) -> bytes:
+        """
+        Calls `fetch(url)` and remembers its duration for the page entry.
+
+        Args:
+            fetch (callable): Download function (e.g., `HTTPClient.fetch`).
+            url (str): URL to download.
+
+        Returns:
+            bytes: The value returned by `fetch`.
+        """
+        start = self._clock()
+        content = fetch(url)
+        elapsed = self._clock() - start
+        self.add_time("fetch", elapsed)
+        with self._lock:
+            self._fetch_times[url] = elapsed
+        return content
+
+    def add_page(self, url: str | None = None, **values) -> None:
+        """
+        Records the metrics of one result page.
+
+        The download time measured by `timed_fetch()` for `url`, if any, is
+        added to the entry as 'fetch_seconds'.
+
+        Args:
+            url (str | None): URL of the page.
+            **values: Other metrics of the page (e.g., records, parse_seconds).
+        """
+        with self._lock:
+            entry = {"url": url, "fetch_seconds": self._fetch_times.pop(url, None)}
+            entry.update(values)
+            self.pages.append(entry)
+
+    def finish(self) -> None:
+        """Marks the end of the run (the summary otherwise uses the current time)."""
+        self._end = self._clock()
+
+    def summary(self) -> dict:
+        """
+        Summarises the run.
+
+        Returns:
+            dict: Duration, throughput, stage timings, counters and page entries.
+        """
+        with self._lock:
+            end = self._end if self._end is not None else self._clock()
+            duration = end - self._start
+            records = self.counters.get("records", 0)
+            downloaded = self.counters.get("bytes_downloaded", 0)
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": duration,
+                "pages": len(self.pages),
+                "records": records,
+                "records_per_second": records / duration if duration > 0 else None,
+                "bytes_per_record": downloaded / records if records and downloaded else None,
+                "stages": {stage: dict(entry) for stage, entry in self.stages.items()},
+                "counters": dict(self.counters),
+                "page_metrics": [dict(page) for page in self.pages],
+            }
+
+    def write_json(self, path: str) -> None:
+        """
+        Writes the summary as a JSON report.
+
+        Args:
+            path (str): Output file path.
+        """
+        _makedirs(path)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def prometheus_text(self, prefix: str = "arxivscraper") -> str:
+        """
+        Formats the summary in the Prometheus text exposition format.
+
+        Per-page entries are not exported; stage timings and counters are.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The exposition text.
+        """
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_run_duration_seconds Duration of the scraping run.",
+            f"# TYPE {prefix}_run_duration_seconds gauge",
+            f"{prefix}_run_duration_seconds {summary['duration_seconds']:.6f}",
+            f"# HELP {prefix}_run_started_timestamp_seconds Start time of the scraping run.",
+            f"# TYPE {prefix}_run_started_timestamp_seconds gauge",
+            f"{prefix}_run_started_timestamp_seconds {summary['started_at']:.3f}",
+            f"# HELP {prefix}_pages_total Result pages processed.",
+            f"# TYPE {prefix}_pages_total counter",
+            f"{prefix}_pages_total {summary['pages']}",
+            f"# HELP {prefix}_records_per_second Records scraped per second of run time.",
+            f"# TYPE {prefix}_records_per_second gauge",
+            f"{prefix}_records_per_second {summary['records_per_second'] or 0:.6f}",
+            f"# HELP {prefix}_stage_seconds_total Time spent in each stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{stage}"}} {entry["seconds"]:.6f}'
+                  for stage, entry in sorted(summary["stages"].items())]
+        lines += [f"# HELP {prefix}_stage_calls_total Measurements recorded for each stage.",
+                  f"# TYPE {prefix}_stage_calls_total counter"]
+        lines += [f'{prefix}_stage_calls_total{{stage="{stage}"}} {entry["count"]}'
+                  for stage, entry in sorted(summary["stages"].items())]
+        for counter, value in sorted(summary["counters"].items()):
+            lines += [f"# TYPE {prefix}_{counter}_total counter", f"{prefix}_{counter}_total {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Writes the Prometheus text file atomically (as the textfile collector expects).
+
+        Args:
+            path (str): Output file path (usually with a '.prom' extension).
+        """
+        _makedirs(path)
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.prometheus_text())
+        os.replace(temporary, path)
+
+    def report(self) -> str:
+        """
+        Builds a short human-readable report of the run.
+
+        Returns:
+            str: One line with the totals (and the bytes downloaded) and one per stage.
+        """
+        summary = self.summary()
+        lines = [f"Scraped {summary['records']} records from {summary['pages']} pages in "
+                 f"{summary['duration_seconds']:.1f} s ({summary['records_per_second'] or 0:.1f} records/s)"]
+        if summary["bytes_per_record"] is not None:
+            # Bytes moved per paper, e.g. to compare field projections
+            lines.append(f"Downloaded {summary['counters']['bytes_downloaded']} bytes "
+                         f"({summary['bytes_per_record']:.0f} bytes per record)")
+        for stage, entry in sorted(summary["stages"].items(), key=lambda item: -item[1]["seconds"]):
+            lines.append(f"  {stage:<24} {entry['seconds']:10.3f} s  ({entry['count']} calls)")
+        return "\n".join(lines)
+
+
+def projection_saving(downloaded: int, records: int) -> str:
+    """
+    Builds the end-of-run line of a run whose pages were requested without abstracts.
+
+    Args:
+        downloaded (int): Bytes of the result pages downloaded.
+        records (int): Number of results listed in those pages.
+
+    Returns:
+        str: The bytes downloaded and the estimated saving against the same
+            pages requested with abstracts=show (see `SHOWN_ABSTRACT_BYTES`).
+    """
+    saved = records * SHOWN_ABSTRACT_BYTES
+    share = saved / (downloaded + saved) if downloaded + saved else 0.0
+    return (f"Downloaded {downloaded:,} bytes for {records} records without abstracts, "
+            f"about {saved:,} bytes ({share:.0%}) less than with abstracts=show")
+
+
+def _makedirs(path: str) -> None:
+    """Creates the directory of an output file if missing."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextmanager
+def profile_run(path: str, top: int = 20) -> Iterator[cProfile.Profile]:
+    """
+    Profiles the enclosed block with cProfile.
+
+    The statistics are saved to `path` (readable with `pstats` or snakeviz) and
+    the `top` functions by cumulative time are printed. Only the calling thread
+    is profiled: time spent by the fetch workers appears as waits.
+
+    Args:
+        path (str): Output file of the profile statistics.
+        top (int): Number of functions printed.
+
+    Yields:
+        cProfile.Profile: The active profiler.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _makedirs(path)
+        profiler.dump_stats(path)
+        print(f"Profile saved to {path}")
+        # Imported here: pstats is slow to import and only needed by profiled runs
+        import pstats
+
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+
+
+if __name__ == "__main__":
+    print("This module collects timings, counters and per-page metrics of scraping runs.")
@@ -0,0 +1,413 @@
+"""
+fastextract.py
+--------------
+
+Single-pass extraction engine for arXiv search result pages.
+
+The reference implementation in `scrapertools.py` parses each page with
+BeautifulSoup's pure-Python `html.parser` and then runs five separate CSS
+queries per result. This module produces exactly the same records while
+visiting the document only once:
+
+- with `lxml` installed, the page is parsed by libxml2 (C) and each
+  `li.arxiv-result` element is walked once, dispatching on tag and class;
+- otherwise, a streaming `html.parser.HTMLParser` subclass extracts every
+  field as the markup goes by, without building a tree at all.
+
+Text is normalised the same way as `get_text(strip=True)`: every text segment
+between two pieces of markup is stripped and the non-empty segments are joined
+without separator. `check_parity()` compares both engines on a given page.
+
+When only some fields are requested, the markup of the other ones is skipped
+instead of collected, and they are not required to be on the page.
+
+Authors:
+    Alejandro Cano Jones (acanojo@uoc.edu)
+    Christian López Vicente (clopezvice@uoc.edu)
+"""
+
+import re
+from html.parser import HTMLParser
+
+# Import the record schema from the configuration module
+from arxivscraper.config.config import RECORD_FIELDS
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+# Regular expression capturing the total from "Showing 1–200 of 1,254 results"
+_RESULTS_RE = re.compile(r'of ([0-9,]+) results')
+
+# Heading of a search without results ("Sorry, your query returned no results")
+_NO_RESULTS = 'no results'
+
+# Elements that never have children in HTML
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+              "link", "meta", "param", "source", "track", "wbr"}
+
+# Elements whose content is never part of the extracted text
+_SKIP_TAGS = {"script", "style", "template"}
+
+
+def _parse_total(text: str) -> int | None:
+    """Extracts the total number of results from the page heading text (0 for a search without results)."""
+    match = _RESULTS_RE.search(text)
+    if match:
+        return int(match.group(1).replace(',', ''))
+    if _NO_RESULTS in text:
+        return 0
+    return None
+
+
+def _parse_index(text: str) -> str:
+    """Extracts the arXiv identifier from the text of the 'list-title' paragraph."""
+    return text.split(':')[1].split('[')[0]
+
+
+def _keep_tag(text: str) -> bool:
+    """Filters out 'doi' labels and DOI numbers, like `get_tags()`."""
+    return text.lower() != 'doi' and not text.startswith('10.')
+
+
+def _new_record() -> dict:
+    """Creates an empty record (with the field order of `RECORD_FIELDS`)."""
+    return {"index": None, "title": None, "tags": [], "authors": [], "abstract": None}
+
+
+# ---------------------------------------------------------------------
+# lxml engine
+# ---------------------------------------------------------------------
+
+def _classes(element) -> list[str]:
+    """Returns the CSS classes of an lxml element."""
+    return element.get("class", "").split()
+
+
+def _lxml_text(element, skip: str | None = None) -> str:
+    """
+    Equivalent of `get_text(strip=True)` for an lxml element.
+
+    Args:
+        element: lxml element.
+        skip (str | None): Tag whose subtrees are excluded (their tail text is kept).
+
+    Returns:
+        str: The concatenated stripped text segments.
+    """
+    parts = []
+
+    def walk(node):
+        if node.text:
+            text = node.text.strip()
+            if text:
+                parts.append(text)
+        for child in node:
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str) and child.tag != skip and child.tag not in _SKIP_TAGS:
+                walk(child)
+            if child.tail:
+                text = child.tail.strip()
+                if text:
+                    parts.append(text)
+
+    walk(element)
+    return ''.join(parts)
+
+
+def _extract_lxml(content: bytes, fields: tuple[str, ...]) -> tuple[int | None, list[dict]]:
+    """Extracts the total and the records of a page with lxml."""
+    want_title, want_tags = "title" in fields, "tags" in fields
+    want_authors, want_abstract = "authors" in fields, "abstract" in fields
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    root = lxml.html.fromstring(content, parser=parser)
+
+    total = None
+    for heading in root.iter("h1"):
+        classes = _classes(heading)
+        if "title" in classes and "is-clearfix" in classes:
+            total = _parse_total(_lxml_text(heading))
+            break
+
+    records = []
+    for result in root.iter("li"):
+        if "arxiv-result" not in _classes(result):
+            continue
+
+        record = _new_record()
+        for element in result.iter("p", "span"):
+            classes = _classes(element)
+            if element.tag == "span":
+                if want_tags and "tag" in classes:
+                    text = _lxml_text(element)
+                    if _keep_tag(text):
+                        record["tags"].append(text)
+            elif "list-title" in classes:
+                if record["index"] is None:
+                    record["index"] = _parse_index(_lxml_text(element))
+            elif "title" in classes:
+                if want_title and record["title"] is None:
+                    record["title"] = _lxml_text(element)
+            elif "authors" in classes:
+                if want_authors:
+                    record["authors"].extend(_lxml_text(author) for author in element.iter("a"))
+            elif want_abstract and "abstract" in classes and record["abstract"] is None:
+                for span in element.iter("span"):
+                    if "abstract-full" in _classes(span):
+                        record["abstract"] = _lxml_text(span, skip="a")
+                        break
+
+        _check_record(record, fields)
+        records.append(record)
+    return total, records
+
+
+# ---------------------------------------------------------------------
+# Streaming html.parser engine
+# ---------------------------------------------------------------------
+
+class _ResultsParser(HTMLParser):
+    """
+    Streaming parser that extracts the records of a results page in one pass.
+
+    A stack of open elements is kept to know the context of every text segment.
+    Each element that starts a field pushes a capture buffer, which collects the
+    stripped text segments until the element is closed.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = RECORD_FIELDS):
+        super().__init__(convert_charrefs=True)
+        self.fields = fields
+        self._wanted = set(fields)
+        self.total = None
+        self.records = []
+        self._record = None
+        self._stack = []       # (tag, capture name or None, flags) for each open element
+        self._captures = []    # [name, parts] for each capture in progress
+        self._authors = 0      # number of open p.authors elements
+        self._abstract_p = 0   # number of open p.abstract elements
+        self._suppress = 0     # number of open <a> inside the abstract capture
+        self._skip = 0         # number of open script/style elements
+        self._heading_done = False
+
+    def _start_capture(self, name: str) -> str:
+        self._captures.append([name, []])
+        return name
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+
+        classes = []
+        for key, value in attrs:
+            if key == "class" and value:
+                classes = value.split()
+                break
+
+        capture = None
+        flags = set()
+        record = self._record
+
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+            flags.add("skip")
+        elif tag == "li" and "arxiv-result" in classes:
+            self._record = _new_record()
+            flags.add("result")
+        elif record is not None:
+            wanted = self._wanted
+            if tag == "span" and "tag" in classes:
+                if "tags" in wanted:
+                    capture = self._start_capture("tag")
+            elif tag == "p" and "list-title" in classes and record["index"] is None \
+                    and "index" in wanted and not self._capturing("index"):
+                capture = self._start_capture("index")
+            elif tag == "p" and "title" in classes and record["title"] is None \
+                    and "title" in wanted and not self._capturing("title"):
+                capture = self._start_capture("title")
+            elif tag == "a" and self._authors:
+                if "authors" in wanted:
+                    capture = self._start_capture("author")
+            elif tag == "a" and self._capturing("abstract"):
+                self._suppress += 1
+                flags.add("suppress")
+            elif tag == "span" and "abstract-full" in classes and self._abstract_p and "abstract" in wanted \
+                    and record["abstract"] is None and not self._capturing("abstract"):
+                capture = self._start_capture("abstract")
+
+            if tag == "p" and "authors" in classes:
+                self._authors += 1
+                flags.add("authors")
+            if tag == "p" and "abstract" in classes:
+                self._abstract_p += 1
+                flags.add("abstract_p")
+        elif tag == "h1" and not self._heading_done and "title" in classes and "is-clearfix" in classes:
+            capture = self._start_capture("heading")
+
+        self._stack.append((tag, capture, flags))
+
+    def handle_endtag(self, tag):
+        # Close every element up to the most recent one with this tag (if any)
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position][0] == tag:
+                while len(self._stack) > position:
+                    self._close(self._stack.pop())
+                return
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing syntax (<x/>) opens and closes the element at once
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        text = data.strip()
+        if not text:
+            return
+        for name, parts in self._captures:
+            if name == "abstract" and self._suppress:
+                continue
+            parts.append(text)
+
+    def _capturing(self, name: str) -> bool:
+        return any(capture[0] == name for capture in self._captures)
+
+    def _close(self, frame) -> None:
+        tag, capture, flags = frame
+
+        if capture is not None:
+            # Captures are properly nested, so the innermost one matches this frame
+            for position in range(len(self._captures) - 1, -1, -1):
+                if self._captures[position][0] == capture:
+                    _, parts = self._captures.pop(position)
+                    break
+            self._store(capture, ''.join(parts))
+
+        if "skip" in flags:
+            self._skip -= 1
+        if "suppress" in flags:
+            self._suppress -= 1
+        if "authors" in flags:
+            self._authors -= 1
+        if "abstract_p" in flags:
+            self._abstract_p -= 1
+        if "result" in flags:
+            _check_record(self._record, self.fields)
+            self.records.append(self._record)
+            self._record = None
+
+    def _store(self, capture: str, text: str) -> None:
+        record = self._record
+        if capture == "heading":
+            self.total = _parse_total(text)
+            self._heading_done = True
+        elif capture == "index":
+            record["index"] = _parse_index(text)
+        elif capture == "title":
+            record["title"] = text
+        elif capture == "tag":
+            if _keep_tag(text):
+                record["tags"].append(text)
+        elif capture == "author":
+            record["authors"].append(text)
+        elif capture == "abstract":
+            record["abstract"] = text
+
+    def close(self):
+        super().close()
+        # Unclosed elements at the end of the document are closed implicitly
+        while self._stack:
+            self._close(self._stack.pop())
+
+
+def _extract_htmlparser(content: bytes, fields: tuple[str, ...]) -> tuple[int | None, list[dict]]:
+    """Extracts the total and the records of a page with the streaming parser."""
+    parser = _ResultsParser(fields)
+    parser.feed(content.decode("utf-8", errors="replace"))
+    parser.close()
+    return parser.total, parser.records
+
+
+# ---------------------------------------------------------------------
+# Public interface
+# ---------------------------------------------------------------------
+
+def _check_record(record: dict, fields: tuple[str, ...] = RECORD_FIELDS) -> None:
+    """Rejects results missing a mandatory element, like the reference engine does."""
+    for field in ("index", "title", "abstract"):
+        if field in fields and record[field] is None:
+            raise ValueError(f"Malformed arXiv result: missing {field} (index: {record['index']})")
+
+
+def extract_page_fast(content: bytes, backend: str | None = None,
+                      fields: tuple[str, ...] = RECORD_FIELDS) -> tuple[int | None, list[dict]]:
+    """
+    Extracts the total number of results and every record of a results page.
+
+    Args:
+        content (bytes): Raw HTML of the arXiv search results page (UTF-8).
+        backend (str | None): 'lxml' or 'html.parser'. Defaults to 'lxml' when
+            it is installed, and to the streaming 'html.parser' engine otherwise.
+        fields (tuple[str, ...]): Fields of the records, a subset of `RECORD_FIELDS`.
+
+    Returns:
+        tuple[int | None, list[dict]]: The total number of results (None if the
+            heading is missing) and the records, identical to those of
+            `scrapertools.extract_records()`.
+
+    Raises:
+        ValueError: If a result lacks its identifier, title or abstract (among
+            the requested fields), or if the backend is unknown or not installed.
+    """
+    if backend is None:
+        backend = "lxml" if lxml is not None else "html.parser"
+    if backend == "lxml":
+        if lxml is None:
+            raise ValueError("The 'lxml' backend requires the lxml package.")
+        total, records = _extract_lxml(content, fields)
+    elif backend == "html.parser":
+        total, records = _extract_htmlparser(content, fields)
+    else:
+        raise ValueError(f"Unknown extraction backend: {backend}")
+    if tuple(fields) != RECORD_FIELDS:
+        records = [{field: record[field] for field in fields} for record in records]
+    return total, records
+
+
+def check_parity(content: bytes, backend: str | None = None) -> list[str]:
+    """
+    Compares the fast engine with the BeautifulSoup reference on one page.
+
+    Args:
+        content (bytes): Raw HTML of an arXiv search results page.
+        backend (str | None): Backend of the fast engine to check.
+
+    Returns:
+        list[str]: Human-readable differences; empty when both engines agree.
+    """
+    from bs4 import BeautifulSoup
+    from arxivscraper.scrapertools.scrapertools import extract_records, number_of_results
+
+    soup = BeautifulSoup(content, "html.parser")
+    expected_total = number_of_results(soup)
+    expected = extract_records(soup)
+    total, records = extract_page_fast(content, backend=backend)
+
+    differences = []
+    if total != expected_total:
+        differences.append(f"total: {total!r} != {expected_total!r}")
+    if len(records) != len(expected):
+        differences.append(f"number of records: {len(records)} != {len(expected)}")
+    for position, (record, reference) in enumerate(zip(records, expected)):
+        for field, value in reference.items():
+            if record[field] != value:
+                differences.append(f"record {position} ({reference['index']}) {field}: {record[field]!r} != {value!r}")
+    return differences
+
+
+if __name__ == "__main__":
+    print("This module provides a single-pass extraction engine for arXiv result pages.")
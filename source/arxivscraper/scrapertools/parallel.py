@@ -0,0 +1,168 @@
+"""
+parallel.py
+-----------
+
+Multi-process parse stage for arXiv result pages.
+
+Parsing and extraction are CPU-bound pure-Python code that holds the GIL, so
+once pages are downloaded concurrently or served from a cache, a single core
+becomes the ceiling. `parse_pages()` hands raw page bytes (or the path of a
+saved page, which the worker reads itself) to a pool of processes that run
+`parse_page()` and send back compact record batches: tuples in the order of
+`RECORD_FIELDS` instead of dicts. The calling process only does I/O and
+writing, and results come back in input order.
+
+At most `backlog` pages are in flight at any time, so memory stays bounded
+however long the input is. `reparse_cache()` uses it to re-extract every page
+of a response cache on all cores.
+
+Authors:
+    Alejandro Cano Jones (acanojo@uoc.edu)
+    Christian López Vicente (clopezvice@uoc.edu)
+"""
+
+import gzip
+import multiprocessing
+import os
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+# Import the record schema and the parser from sibling modules.
+from arxivscraper.config.config import RECORD_FIELDS
+from arxivscraper.scrapertools.scrapertools import parse_page
+from arxivscraper.webtools.cache import ResponseCache
+
+
+class ParsedPage(NamedTuple):
+    """Result of parsing one page in a worker process."""
+    total: int | None
+    records: list[dict]
+    size: int
+    seconds: float
+
+
+def _parse_task(content: bytes | str, engine: str,
+                fields: tuple[str, ...] = RECORD_FIELDS) -> tuple[int | None, list[tuple], int, float]:
+    """
+    Parses one page in a worker process.
+
+    Args:
+        content (bytes | str): Raw page, or path of a saved page (gzip-compressed
+            if it ends with '.gz').
+        engine (str): Extraction engine passed to `parse_page()`.
+        fields (tuple[str, ...]): Fields extracted, passed to `parse_page()`.
+
+    Returns:
+        tuple: The total number of results, the records as tuples in the order of
+            `fields`, the size of the page and the parse time in seconds.
+    """
+    if isinstance(content, str):
+        opener = gzip.open if content.endswith(".gz") else open
+        with opener(content, "rb") as file:
+            content = file.read()
+    start = time.perf_counter()
+    total, records = parse_page(content, engine=engine, fields=fields)
+    elapsed = time.perf_counter() - start
+    return total, [tuple(record[field] for field in fields) for record in records], len(content), elapsed
+
+
+def _unpack(result: tuple[int | None, list[tuple], int, float], fields: tuple[str, ...] = RECORD_FIELDS) -> ParsedPage:
+    """Turns the compact batch sent by a worker back into records."""
+    total, rows, size, seconds = result
+    return ParsedPage(total, [dict(zip(fields, row)) for row in rows], size, seconds)
+
+
+def parse_pages(pages: Iterable[tuple[Any, bytes | str]],
+                engine: str = "fast",
+                processes: int | None = None,
+                backlog: int | None = None,
+                fields: tuple[str, ...] = RECORD_FIELDS) -> Iterator[tuple[Any, ParsedPage]]:
+    """
+    Parses pages on a pool of processes, yielding the results in input order.
+
+    The input is consumed lazily: at most `backlog` pages are being parsed or
+    waiting to be consumed at any time.
+
+    Args:
+        pages (Iterable[tuple[Any, bytes | str]]): (key, content) pairs, where the
+            content is the raw page or the path of a saved page. Keys are passed
+            through untouched (e.g., URLs or page numbers).
+        engine (str): Extraction engine: 'bs4' or 'fast'.
+        processes (int | None): Number of worker processes. Defaults to the
+            number of CPUs; 1 parses in the calling process without a pool.
+        backlog (int | None): Maximum number of pages in flight. Defaults to
+            twice the number of processes.
+        fields (tuple[str, ...]): Fields of the records (see `parse_page()`).
+
+    Yields:
+        tuple[Any, ParsedPage]: The key and the parsed page.
+
+    Raises:
+        ValueError: If `processes` is lower than 1, or propagated from the
+            extraction of a malformed page.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError("The number of parse processes must be at least 1.")
+
+    if processes == 1:
+        for key, content in pages:
+            yield key, _unpack(_parse_task(content, engine, fields), fields)
+        return
+
+    backlog = backlog or 2 * processes
+    page_iter = iter(pages)
+    # Workers are spawned rather than forked: the caller may be running threads
+    # (e.g., the fetch workers), and forking a multi-threaded process is unsafe
+    pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    pending = deque()
+    try:
+        for key, content in page_iter:
+            pending.append((key, pool.submit(_parse_task, content, engine, fields)))
+            if len(pending) >= backlog:
+                break
+
+        while pending:
+            key, future = pending.popleft()
+
+            # Keep the workers busy: submit the next page before waiting on this one
+            following = next(page_iter, None)
+            if following is not None:
+                pending.append((following[0], pool.submit(_parse_task, following[1], engine, fields)))
+
+            yield key, _unpack(future.result(), fields)
+    finally:
+        # Drop queued pages if the consumer stops early or a page fails
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def reparse_cache(cache_dir: str,
+                  engine: str = "fast",
+                  processes: int | None = None) -> Iterator[tuple[str, list[dict]]]:
+    """
+    Re-extracts the records of every page stored in a response cache.
+
+    Pages are read and parsed by the worker processes, so this scales to all
+    cores on large archives of saved pages (e.g., after fixing an extractor).
+
+    Args:
+        cache_dir (str): Directory of the response cache.
+        engine (str): Extraction engine: 'bs4' or 'fast'.
+        processes (int | None): Number of worker processes (all CPUs by default).
+
+    Yields:
+        tuple[str, list[dict]]: The URL of each page and its records, in URL order.
+    """
+    files = ResponseCache(cache_dir).page_files()
+    for url, parsed in parse_pages(files, engine=engine, processes=processes):
+        yield url, parsed.records
+
+
+if __name__ == "__main__":
+    print("This module parses arXiv result pages on a pool of processes.")
@@ -6,6 +6,9 @@ Utility functions for extracting structured data from arXiv search result pages
 using BeautifulSoup. These functions parse key metadata such as titles, authors,
 categories (tags), abstracts, and the total number of results.
 
+They are the reference extraction engine; `parse_page()` can also dispatch to
+the faster single-pass engine in `fastextract.py`, which yields the same records.
+
 This module is part of the UOC Data Science project on web scraping.
 
 Authors:
@@ -14,8 +17,16 @@ Authors:
 """
 
 from bs4 import BeautifulSoup, element
+from contextlib import nullcontext
 import re
 
+# Import the record schema from the configuration module.
+from arxivscraper.config.config import RECORD_FIELDS
+from arxivscraper.scrapertools.fastextract import extract_page_fast
+
+
+# Available extraction engines: the BeautifulSoup reference and the single-pass extractor
+PARSER_ENGINES = ("bs4", "fast")
 
 def number_of_results(soup: BeautifulSoup) -> int | None:
     """
@@ -25,10 +36,14 @@ def number_of_results(soup: BeautifulSoup) -> int | None:
         soup (BeautifulSoup): Parsed HTML of the arXiv search results page.
 
     Returns:
-        int | None: The total number of search results if found, otherwise None.
+        int | None: The total number of search results if found (0 on the page
+            of a search without results), otherwise None.
     """
     # Find the main title element containing the result count text (e.g. "Showing 1–200 of 1,254 results")
-    result_number = soup.select_one('h1.title.is-clearfix').get_text(strip=True)
+    heading = soup.select_one('h1.title.is-clearfix')
+    if heading is None:
+        return None
+    result_number = heading.get_text(strip=True)
 
     # Use regex to capture the total number from the text
     match = re.search(r'of ([0-9,]+) results', result_number)
@@ -36,6 +51,9 @@ def number_of_results(soup: BeautifulSoup) -> int | None:
         # Remove commas and convert to integer
         total_results = int(match.group(1).replace(',', ''))
         return total_results
+    # A search without results says so in the heading ("Sorry, your query returned no results")
+    if 'no results' in result_number:
+        return 0
     return None
 
 def get_index(result: element.Tag) -> str:
@@ -120,3 +138,76 @@ def get_abstract(result: element.Tag) ->str:
     # Return the clean text
     abstract = abstract_full.get_text(strip=True)
     return abstract
+
+# Extractor of every record field, in the order of `RECORD_FIELDS`
+EXTRACTORS = {
+    "index": get_index,
+    "title": get_title,
+    "tags": get_tags,
+    "authors": get_authors,
+    "abstract": get_abstract,
+}
+
+def extract_records(soup: BeautifulSoup, metrics=None, fields: tuple[str, ...] = RECORD_FIELDS) -> list[dict]:
+    """
+    Extracts the metadata of every paper listed in a search results page.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML of the arXiv search results page.
+        metrics (RunMetrics | None): If given, the time spent in each extractor
+            is recorded as the 'extract.<function name>' stage.
+        fields (tuple[str, ...]): Fields to extract; the extractors of the other
+            fields are not run.
+
+    Returns:
+        list[dict]: One record per paper, with the keys listed in `fields`.
+    """
+    extractors = [(field, EXTRACTORS[field]) for field in fields]
+    records = []
+    for result in soup.select('li.arxiv-result'):
+        record = {}
+        for field, extractor in extractors:
+            if metrics is None:
+                record[field] = extractor(result)
+            else:
+                with metrics.timer(f"extract.{extractor.__name__}"):
+                    record[field] = extractor(result)
+        records.append(record)
+    return records
+
+def parse_page(content: bytes, engine: str = "bs4", metrics=None,
+               fields: tuple[str, ...] = RECORD_FIELDS) -> tuple[int | None, list[dict]]:
+    """
+    Parses a raw results page and extracts its records.
+
+    Args:
+        content (bytes): Raw HTML of the arXiv search results page.
+        engine (str): 'bs4' for the BeautifulSoup reference implementation or
+            'fast' for the single-pass extractor (lxml when available).
+        metrics (RunMetrics | None): If given, parsing is recorded as the 'parse'
+            stage and, with the reference engine, each extractor separately (the
+            single-pass engine extracts while parsing, so it is all 'parse').
+        fields (tuple[str, ...]): Fields of the records, a subset of `RECORD_FIELDS`.
+            Fields left out are not extracted (nor required to be on the page).
+
+    Returns:
+        tuple[int | None, list[dict]]: The total number of results reported by
+            the page (None if missing) and the records of its papers.
+
+    Raises:
+        ValueError: If the engine or a field is unknown.
+    """
+    unknown = [field for field in fields if field not in RECORD_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown record field(s): {', '.join(unknown)}. Expected some of {RECORD_FIELDS}")
+    timer = metrics.timer if metrics is not None else (lambda stage: nullcontext())
+    if engine == "bs4":
+        with timer("parse"):
+            soup = BeautifulSoup(content, "html.parser")
+        with timer("extract.number_of_results"):
+            total = number_of_results(soup)
+        return total, extract_records(soup, metrics, fields)
+    if engine == "fast":
+        with timer("parse"):
+            return extract_page_fast(content, fields=fields)
+    raise ValueError(f"Unknown parser engine: {engine}. Expected one of {PARSER_ENGINES}")
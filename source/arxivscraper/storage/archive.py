@@ -0,0 +1,553 @@
+"""
+archive.py
+----------
+
+This module provides the native archive format of the scraper: a single file
+of compressed chunks of records (and, optionally, of the raw result pages they
+were parsed from) with an index by arXiv identifier and month at the end.
+
+Layout of an archive ('.arxz'):
+
+- a header: magic bytes, format version, codec and the record fields;
+- chunks, each with a small header (kind, sizes, number of records) followed
+  by its compressed payload: up to `ARCHIVE_CHUNK_RECORDS` records in the
+  order of the fields, or one raw page with its URL;
+- a footer: the compressed chunk table (offset, kind, number of records and
+  submission months of every chunk), then an uncompressed index of every
+  identifier (sorted) with the number of its chunk;
+- a fixed-size trailer pointing to the footer.
+
+`ArchiveReader` memory-maps the file and only decompresses the chunks it needs:
+`get()` binary-searches the identifier index directly in the mapped footer and
+`records(months=...)` skips the chunks without papers of those months.
+
+`ArchiveWriter` creates an archive or appends to an existing one (e.g. from
+incremental runs): new chunks replace the old footer and a new one is written
+on `close()`. If a writer is interrupted before that, the chunks written so far
+are still complete and self-describing, so the footer is rebuilt by scanning
+them the next time the archive is opened.
+
+Chunks are compressed with zstd (`zstandard` package) when it is installed and
+with zlib otherwise; the codec is recorded in the header.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import heapq
+import importlib.util
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Iterable, Iterator
+
+# --- Import the record schema and helpers from sibling modules ---
+from arxivscraper.config.config import ARCHIVE_CHUNK_RECORDS, RECORD_FIELDS
+from arxivscraper.storage.search import id_month
+from arxivscraper.storage.state import split_version
+
+
+MAGIC = b"ARXA"
+CHUNK_MAGIC = b"ARXC"
+TRAILER_MAGIC = b"ARXF"
+FORMAT_VERSION = 1
+
+# Magic, format version, codec number and length of the fields (JSON)
+_HEADER = struct.Struct("<4sBBH")
+# Magic, kind, compressed size, uncompressed size and number of records
+_CHUNK = struct.Struct("<4sB3xIII")
+# Offset of the chunk table, offset of the identifier index, number of identifiers and magic
+_TRAILER = struct.Struct("<QQQ4s")
+
+# Kinds of chunks
+RECORDS, PAGE = 0, 1
+_KINDS = {RECORDS: "records", PAGE: "page"}
+
+# Compression codecs, by the number stored in the header, and their default levels
+CODECS = {1: "zlib", 2: "zstd"}
+_LEVELS = {"zlib": 6, "zstd": 9}
+
+
+def _import_zstandard():
+    """Imports zstandard, which is only needed by zstd archives."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd archives require zstandard: pip install zstandard") from e
+    return zstandard
+
+
+def default_codec() -> str:
+    """Returns 'zstd' when the zstandard package is installed, 'zlib' otherwise."""
+    return "zstd" if importlib.util.find_spec("zstandard") is not None else "zlib"
+
+
+class _Codec:
+    """Compresses and decompresses chunk payloads with zlib or zstd."""
+
+    def __init__(self, name: str, level: int | None = None):
+        if name not in _LEVELS:
+            raise ValueError(f"Unknown archive codec: {name}. Expected one of {tuple(_LEVELS)}")
+        self.name = name
+        self.number = next(number for number, codec in CODECS.items() if codec == name)
+        level = _LEVELS[name] if level is None else level
+        if name == "zstd":
+            zstandard = _import_zstandard()
+            self._compressor = zstandard.ZstdCompressor(level=level)
+            self._decompressor = zstandard.ZstdDecompressor()
+        else:
+            self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._compressor.compress(data)
+        return zlib.compress(data, self._level)
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        if self.name == "zstd":
+            return self._decompressor.decompress(data, max_output_size=size)
+        return zlib.decompress(data)
+
+
+def _uint32(data: memoryview) -> memoryview | array:
+    """Views little-endian unsigned 32-bit integers without copying them (when possible)."""
+    if sys.byteorder == "little":
+        return data.cast("I")
+    values = array("I", bytes(data))
+    values.byteswap()
+    return values
+
+
+def _to_bytes(values: array) -> bytes:
+    """Serialises unsigned 32-bit integers in little-endian order."""
+    if sys.byteorder != "little":
+        values = array("I", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _Layout:
+    """
+    Header, chunk table and identifier index of an archive.
+
+    `data` is a memoryview of the mapped file: the identifier index is used in
+    place, without copying it.
+    """
+
+    def __init__(self, data: memoryview, level: int | None = None):
+        if len(data) < _HEADER.size:
+            raise ValueError("Not an arXiv scraper archive.")
+        magic, version, codec_number, fields_size = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an arXiv scraper archive.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported archive version: {version}")
+        if codec_number not in CODECS:
+            raise ValueError(f"Unknown archive codec number: {codec_number}")
+        self.codec = _Codec(CODECS[codec_number], level)
+        self.fields = tuple(json.loads(bytes(data[_HEADER.size:_HEADER.size + fields_size])))
+        self.data_start = _HEADER.size + fields_size
+
+        self.chunks = []
+        self.ids = None
+        self.id_chunks = None
+        self.id_offsets = None
+        self.complete = self._read_footer(data)
+        if not self.complete:
+            self._scan(data)
+
+    def _read_footer(self, data) -> bool:
+        """Reads the footer; returns False if it is missing (interrupted write)."""
+        size = len(data)
+        if size < self.data_start + _TRAILER.size:
+            return False
+        table_offset, index_offset, count, magic = _TRAILER.unpack_from(data, size - _TRAILER.size)
+        if magic != TRAILER_MAGIC or not self.data_start <= table_offset <= index_offset <= size - _TRAILER.size:
+            return False
+        table = self.codec.decompress(bytes(data[table_offset:index_offset]), 1 << 31)
+        self.chunks = json.loads(table)
+        self.end = table_offset
+
+        offsets_end = index_offset + 4 * (count + 1)
+        chunks_end = offsets_end + 4 * count
+        self.id_offsets = _uint32(data[index_offset:offsets_end])
+        self.id_chunks = _uint32(data[offsets_end:chunks_end])
+        self.ids = data[chunks_end:size - _TRAILER.size]
+        return True
+
+    def _scan(self, data) -> None:
+        """Rebuilds the chunk table and the identifier index from the chunks themselves."""
+        position = self.data_start
+        entries = []
+        while position + _CHUNK.size <= len(data):
+            magic, kind, compressed, size, count = _CHUNK.unpack_from(data, position)
+            payload_start = position + _CHUNK.size
+            if magic != CHUNK_MAGIC or kind not in _KINDS or payload_start + compressed > len(data):
+                break
+            try:
+                payload = self.codec.decompress(bytes(data[payload_start:payload_start + compressed]), size)
+            except Exception:
+                # A chunk cut short by the interruption
+                break
+            entry = _chunk_entry(position, kind, count, payload, self.fields)
+            number = len(self.chunks)
+            self.chunks.append(entry)
+            if kind == RECORDS:
+                entries.extend((row[0].encode("utf-8"), number) for row in json.loads(payload))
+            position = payload_start + compressed
+        self.end = position
+
+        entries.sort()
+        self.id_offsets, self.id_chunks, self.ids = _build_index(entries)
+
+    def id_count(self) -> int:
+        return len(self.id_chunks)
+
+    def copy_index(self) -> tuple[array, array, bytes]:
+        """Copies the identifier index out of the mapped file."""
+        offsets, chunks = array("I"), array("I")
+        offsets.frombytes(bytes(self.id_offsets))
+        chunks.frombytes(bytes(self.id_chunks))
+        return offsets, chunks, bytes(self.ids)
+
+    def release(self) -> None:
+        """Releases the views of the mapped file, so it can be closed."""
+        for view in (self.id_offsets, self.id_chunks, self.ids):
+            if isinstance(view, memoryview):
+                view.release()
+
+    def id_at(self, position: int) -> bytes:
+        return bytes(self.ids[self.id_offsets[position]:self.id_offsets[position + 1]])
+
+
+def _index_entries(offsets: array, chunks: array, ids: bytes) -> Iterator[tuple[bytes, int]]:
+    """Yields every (identifier, chunk number) pair of an identifier index, in order."""
+    for position, chunk in enumerate(chunks):
+        yield ids[offsets[position]:offsets[position + 1]], chunk
+
+
+def _chunk_entry(offset: int, kind: int, count: int, payload: bytes, fields: tuple[str, ...]) -> dict:
+    """Builds the chunk table entry of a chunk from its uncompressed payload."""
+    entry = {"offset": offset, "kind": _KINDS[kind], "count": count}
+    if kind == RECORDS:
+        entry["months"] = sorted({month for row in json.loads(payload) if (month := id_month(row[0]))})
+    else:
+        entry["url"] = payload.split(b"\n", 1)[0].decode("utf-8")
+    return entry
+
+
+def _build_index(entries: Iterable[tuple[bytes, int]]) -> tuple[array, array, bytes]:
+    """Builds the identifier index (offsets, chunk numbers, identifiers) from sorted pairs."""
+    offsets, chunks, ids = array("I", [0]), array("I"), bytearray()
+    for paper_id, chunk in entries:
+        ids += paper_id
+        offsets.append(len(ids))
+        chunks.append(chunk)
+    return offsets, chunks, bytes(ids)
+
+
+class ArchiveWriter:
+    """
+    Writes records (and raw pages) to an archive, creating or appending to it.
+
+    Records are buffered and written in chunks of `chunk_records`; the footer
+    is written by `close()` (or when leaving the `with` block).
+
+    Args:
+        path (str): Archive file path (its directory is created if missing).
+        fields (tuple[str, ...]): Fields of the records, in order. Must match
+            those of an existing archive.
+        codec (str | None): 'zstd' or 'zlib' for a new archive. Defaults to zstd
+            when the zstandard package is installed. Existing archives keep theirs.
+        level (int | None): Compression level. Defaults to the codec default.
+        chunk_records (int): Number of records per chunk.
+
+    Raises:
+        ValueError: If the file is not an archive, its fields differ or do not
+            start with 'index', the codec is unknown or `chunk_records` is not positive.
+        ImportError: If the codec is zstd and `zstandard` is not installed.
+    """
+
+    def __init__(self,
+                 path: str,
+                 fields: tuple[str, ...] = RECORD_FIELDS,
+                 codec: str | None = None,
+                 level: int | None = None,
+                 chunk_records: int = ARCHIVE_CHUNK_RECORDS):
+        if chunk_records < 1:
+            raise ValueError("The number of records per chunk must be at least 1.")
+        if not fields or fields[0] != "index":
+            raise ValueError("The first field of an archive must be 'index'.")
+        self.path = path
+        self.fields = tuple(fields)
+        self.chunk_records = chunk_records
+        self._pending = []
+        self._new_entries = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+                layout = _Layout(view, level)
+                # Copy the old index: the footer is overwritten by the new chunks
+                self._old_index = layout.copy_index()
+                layout.release()
+            if layout.fields != self.fields:
+                self._file.close()
+                raise ValueError(f"The archive holds the fields {layout.fields}, not {self.fields}.")
+            self._codec = layout.codec
+            self.chunks = layout.chunks
+            self._file.truncate(layout.end)
+            self._file.seek(layout.end)
+        else:
+            self._codec = _Codec(codec or default_codec(), level)
+            self.chunks = []
+            self._old_index = (array("I", [0]), array("I"), b"")
+            self._file = open(path, "wb")
+            fields_json = json.dumps(list(self.fields)).encode("utf-8")
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self._codec.number, len(fields_json)) + fields_json)
+
+    @property
+    def codec(self) -> str:
+        """Name of the compression codec of the archive."""
+        return self._codec.name
+
+    def _write_chunk(self, kind: int, payload: bytes, count: int) -> int:
+        """Compresses and appends one chunk; returns its number."""
+        compressed = self._codec.compress(payload)
+        offset = self._file.tell()
+        self._file.write(_CHUNK.pack(CHUNK_MAGIC, kind, len(compressed), len(payload), count))
+        self._file.write(compressed)
+        self.chunks.append(_chunk_entry(offset, kind, count, payload, self.fields))
+        return len(self.chunks) - 1
+
+    def write(self, records: list[dict]) -> None:
+        """
+        Adds records, writing a chunk every `chunk_records` records.
+
+        Args:
+            records (list[dict]): Records with the keys listed in `fields`.
+        """
+        self._pending.extend([record[field] for field in self.fields] for record in records)
+        while len(self._pending) >= self.chunk_records:
+            self._write_records(self._pending[:self.chunk_records])
+            del self._pending[:self.chunk_records]
+
+    def _write_records(self, rows: list[list]) -> None:
+        payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        number = self._write_chunk(RECORDS, payload, len(rows))
+        self._new_entries.extend((row[0].encode("utf-8"), number) for row in rows)
+
+    def add_page(self, url: str, content: bytes) -> None:
+        """
+        Adds the raw content of a result page, e.g. to re-parse it later.
+
+        Args:
+            url (str): URL of the page.
+            content (bytes): Raw (uncompressed) page.
+        """
+        if "\n" in url:
+            raise ValueError("Page URLs cannot contain line breaks.")
+        self._write_chunk(PAGE, url.encode("utf-8") + b"\n" + content, 0)
+
+    def flush(self) -> None:
+        """Writes the buffered records as a (possibly smaller) chunk."""
+        if self._pending:
+            self._write_records(self._pending)
+            self._pending = []
+        self._file.flush()
+
+    def close(self) -> None:
+        """Writes the remaining records and the footer, then closes the file."""
+        if self._file.closed:
+            return
+        try:
+            self.flush()
+            table_offset = self._file.tell()
+            table = json.dumps(self.chunks, separators=(",", ":")).encode("utf-8")
+            self._file.write(self._codec.compress(table))
+
+            # Old and new identifiers, both sorted, merged into one index
+            self._new_entries.sort()
+            offsets, chunks, ids = _build_index(heapq.merge(_index_entries(*self._old_index), self._new_entries))
+            index_offset = self._file.tell()
+            self._file.write(_to_bytes(offsets) + _to_bytes(chunks) + ids)
+            self._file.write(_TRAILER.pack(table_offset, index_offset, len(chunks), TRAILER_MAGIC))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ArchiveReader:
+    """
+    Reads an archive through a memory map, decompressing only the chunks needed.
+
+    An archive whose writer was interrupted (no footer) can still be read: its
+    complete chunks are scanned when it is opened.
+
+    Args:
+        path (str): Archive file path.
+
+    Raises:
+        ValueError: If the file is not an archive.
+        ImportError: If the archive is compressed with zstd and `zstandard` is not installed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._data)
+        self._layout = _Layout(self._view)
+        self.fields = self._layout.fields
+        self.chunks = self._layout.chunks
+        self._cached = (None, None)
+
+    @property
+    def codec(self) -> str:
+        """Name of the compression codec of the archive."""
+        return self._layout.codec.name
+
+    def __len__(self) -> int:
+        return sum(chunk["count"] for chunk in self.chunks)
+
+    def _payload(self, number: int) -> bytes:
+        offset = self.chunks[number]["offset"]
+        _, _, compressed, size, _ = _CHUNK.unpack_from(self._data, offset)
+        start = offset + _CHUNK.size
+        return self._layout.codec.decompress(self._view[start:start + compressed], size)
+
+    def chunk_records(self, number: int) -> list[dict]:
+        """
+        Decodes the records of one chunk.
+
+        Args:
+            number (int): Chunk number (position in `chunks`).
+
+        Returns:
+            list[dict]: The records of the chunk.
+        """
+        if self._cached[0] != number:
+            rows = json.loads(self._payload(number))
+            self._cached = (number, [dict(zip(self.fields, row)) for row in rows])
+        return self._cached[1]
+
+    def _find(self, key: bytes) -> int:
+        """Position of the first identifier not lower than `key` in the index."""
+        low, high = 0, self._layout.id_count()
+        while low < high:
+            middle = (low + high) // 2
+            if self._layout.id_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _matches(self, low: bytes, high: bytes | None = None) -> list[tuple[bytes, int]]:
+        """Index entries equal to `low`, or within [low, high) if `high` is given."""
+        layout = self._layout
+        matches = []
+        position = self._find(low)
+        while position < layout.id_count():
+            paper_id = layout.id_at(position)
+            if (paper_id >= high) if high is not None else (paper_id != low):
+                break
+            matches.append((paper_id, layout.id_chunks[position]))
+            position += 1
+        return matches
+
+    def get(self, paper_id: str) -> dict | None:
+        """
+        Looks up a paper by arXiv identifier.
+
+        Args:
+            paper_id (str): Identifier with a version ('2507.08819v2') or without
+                one, in which case the latest version in the archive is returned.
+
+        Returns:
+            dict | None: The record (its latest copy if archived several times),
+                or None if the paper is not in the archive.
+        """
+        key = paper_id.encode("utf-8")
+        matches = self._matches(key)
+        if split_version(paper_id)[1] is None:
+            matches += self._matches(key + b"v", key + b"w")
+        if not matches:
+            return None
+        best_id, chunk = max(matches, key=lambda match: (split_version(match[0].decode("utf-8"))[1] or 0, match[1]))
+        best_id = best_id.decode("utf-8")
+        for record in reversed(self.chunk_records(chunk)):
+            if record[self.fields[0]] == best_id:
+                return record
+        return None
+
+    def records(self, months: Iterable[str] | None = None) -> Iterator[dict]:
+        """
+        Yields the archived records, in the order they were written.
+
+        Args:
+            months (Iterable[str] | None): Only decode the chunks holding papers
+                submitted in these months (YYYY-MM), and only yield those papers.
+
+        Yields:
+            dict: One record per archived paper copy.
+        """
+        months = set(months) if months is not None else None
+        for number, chunk in enumerate(self.chunks):
+            if chunk["kind"] != "records" or (months is not None and months.isdisjoint(chunk["months"])):
+                continue
+            for record in self.chunk_records(number):
+                if months is None or id_month(record[self.fields[0]]) in months:
+                    yield record
+
+    def pages(self) -> Iterator[tuple[str, bytes]]:
+        """
+        Yields the raw pages stored in the archive.
+
+        Yields:
+            tuple[str, bytes]: URL and raw content of every page.
+        """
+        for number, chunk in enumerate(self.chunks):
+            if chunk["kind"] == "page":
+                url, content = self._payload(number).split(b"\n", 1)
+                yield url.decode("utf-8"), content
+
+    def months(self) -> list[str]:
+        """Returns the submission months (YYYY-MM) of the archived papers."""
+        return sorted({month for chunk in self.chunks for month in chunk.get("months", ())})
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._layout.release()
+        self._view.release()
+        self._cached = (None, None)
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides the compressed, chunked archive format of scraped records and pages.")
@@ -0,0 +1,382 @@
+"""
+authors.py
+----------
+
+This module builds and queries an index of authors and co-authorships.
+
+Author names are normalised into keys (`author_key()`): accents and case are
+folded and given names are reduced to initials, so 'Stephen W. Hawking',
+'S. W. Hawking' and 'Hawking, S.W.' are the same author. Every key gets a
+stable integer id, in order of first appearance.
+
+`AuthorIndexBuilder` receives the records page by page while a scrape runs and
+adds them to an index kept in a SQLite file of its directory (`authors.sqlite`):
+
+- `authors`: key and display name (as first listed) of every author id;
+- `papers`: arXiv identifier of every paper, numbered in indexing order;
+- `paper_authors`: postings, the papers of every author;
+- `coauthors`: sparse co-authorship adjacency, with the number of papers shared
+  by each pair (papers with more than `MAX_COAUTHORS` authors are left out).
+
+Every table is a B-tree keyed by what lookups search for (the author key, or
+the author id first), so finding an author, its papers or its collaborators
+reads a handful of pages of the file, which `AuthorIndex` maps in memory,
+whatever the size of the corpus. Nothing is loaded when an index is opened,
+and extending it with a new run only inserts the rows of the new papers.
+
+`coauthorship()` builds the same adjacency from papers in CSR (offsets +
+values) form with NumPy, for in-memory analyses.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import os
+import re
+import sqlite3
+import unicodedata
+from collections.abc import Iterable
+from urllib.request import pathname2url
+
+import numpy as np
+
+# --- Import helpers from sibling modules ---
+from arxivscraper.storage.state import base_id
+
+
+# Papers with more authors than this (large collaborations) are indexed in the
+# postings but left out of the co-authorship graph, whose size grows with the
+# square of the number of authors per paper.
+MAX_COAUTHORS = 100
+
+# Words of a name; hyphenated names ('García-López', 'Jean-Pierre') are one word
+_WORD_RE = re.compile(r"[^\W_]+(?:-[^\W_]+)*")
+_SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+_PARTICLES = {"van", "von", "der", "den", "de", "del", "della", "di", "da", "dos", "du", "la", "le", "ten", "ter"}
+_GROUP_RE = re.compile(r"\b(collaboration|consortium|team|group|survey|project)\b")
+
+# File of the index within its directory
+INDEX_FILE = "authors.sqlite"
+
+# Bytes of the index file mapped in memory by readers
+_MMAP_SIZE = 1 << 30
+
+# Maximum number of values bound in one IN (...) lookup
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY,
+    key       TEXT    NOT NULL UNIQUE,
+    name      TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS papers (
+    paper    INTEGER PRIMARY KEY,
+    paper_id TEXT    NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS paper_authors (
+    author INTEGER NOT NULL,
+    paper  INTEGER NOT NULL,
+    PRIMARY KEY (author, paper)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coauthors (
+    author   INTEGER NOT NULL,
+    coauthor INTEGER NOT NULL,
+    papers   INTEGER NOT NULL,
+    PRIMARY KEY (author, coauthor)
+) WITHOUT ROWID;
+"""
+
+
+def _fold(text: str) -> str:
+    """Lower-cases a text and removes its accents."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def author_key(name: str) -> str:
+    """
+    Normalises an author name into the key used to identify the author.
+
+    Accents and case are folded, the surname is kept whole (with particles such
+    as 'van der', and hyphens) and given names are reduced to their initials. Collaborations
+    ('ATLAS Collaboration') keep their full folded name.
+
+    Args:
+        name (str): Author name as listed (e.g., 'Stephen W. Hawking' or 'Hawking, S. W.').
+
+    Returns:
+        str: The key (e.g., 'hawking sw'), empty if the name has no letters.
+    """
+    folded = _fold(name)
+    if _GROUP_RE.search(folded):
+        return " ".join(_WORD_RE.findall(folded))
+
+    # 'Surname, Given names' order, as used by bibliographic databases
+    surname, _, given = folded.partition(",") if "," in folded else ("", "", folded)
+    words = [word for word in _WORD_RE.findall(given) if word not in _SUFFIXES]
+    if surname:
+        surname_words = _WORD_RE.findall(surname)
+    else:
+        if len(words) < 2:
+            return " ".join(words)
+        # The surname is the last word, with the particles that precede it
+        split = len(words) - 1
+        while split > 1 and words[split - 1] in _PARTICLES:
+            split -= 1
+        surname_words, words = words[split:], words[:split]
+    initials = "".join(part[0] for word in words for part in word.split("-"))
+    return " ".join(surname_words) + (f" {initials}" if initials else "")
+
+
+def coauthorship(offsets: np.ndarray, authors: np.ndarray, size: int,
+                 max_authors: int = MAX_COAUTHORS) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Builds the sparse co-authorship adjacency of a CSR mapping of papers to authors.
+
+    Args:
+        offsets (np.ndarray): Paper offsets (length papers + 1).
+        authors (np.ndarray): Author ids of every paper, concatenated.
+        size (int): Number of authors.
+        max_authors (int): Papers with more authors are left out.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Offsets per author, ids of the
+            co-authors (increasing within each author) and number of shared papers.
+    """
+    sizes = np.diff(offsets)
+    eligible = (sizes >= 2) & (sizes <= max_authors)
+    # Every author of an eligible paper is paired with every author of the same paper
+    paper_of = np.repeat(np.arange(len(sizes)), sizes)
+    elements = np.flatnonzero(eligible[paper_of])
+    lengths = sizes[paper_of[elements]]
+    starts = np.repeat(offsets[:-1][paper_of[elements]], lengths)
+    within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    left = np.repeat(authors[elements], lengths).astype(np.int64)
+    right = authors[starts + within].astype(np.int64)
+
+    pairs, counts = np.unique(left[left != right] * size + right[left != right], return_counts=True)
+    sources = pairs // size
+    adjacency_offsets = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=size)))).astype(np.int64)
+    return adjacency_offsets, (pairs % size).astype(np.int32), counts.astype(np.int32)
+
+
+class AuthorIndexBuilder:
+    """
+    Adds the authors of scraped records to the author index.
+
+    An existing index in `directory` is extended, so successive runs keep author
+    ids stable; papers already indexed are skipped. Only the authors and papers
+    of the records added are looked up, and saving appends their rows, so an
+    incremental run costs the size of its own records, not of the corpus. The
+    builder can be used as a context manager, which saves the index on success
+    and discards the additions otherwise.
+
+    Args:
+        directory (str): Directory of the index (created if missing).
+        max_authors (int): Papers with more authors are left out of the co-authorship graph.
+    """
+
+    def __init__(self, directory: str, max_authors: int = MAX_COAUTHORS):
+        self.directory = directory
+        self.max_authors = max_authors
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, INDEX_FILE))
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # Authors met in this run, by key
+        self._ids = {}
+        self._next_author = self._db.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+        self._next_paper = self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def _author_ids(self, names: Iterable[str]) -> dict[str, int]:
+        """Returns the id of every author key, assigning ids to new authors."""
+        keys = {}
+        for name in names:
+            keys.setdefault(author_key(name), name.strip())
+        keys.pop("", None)
+        names = keys
+        missing = [key for key in names if key not in self._ids]
+        for start in range(0, len(missing), _BATCH):
+            batch = missing[start:start + _BATCH]
+            self._ids.update(self._db.execute(
+                f"SELECT key, author_id FROM authors WHERE key IN ({', '.join('?' * len(batch))})", batch))
+        new = [(key, name) for key, name in names.items() if key not in self._ids]
+        for key, name in new:
+            self._ids[key] = self._next_author
+            self._next_author += 1
+        self._db.executemany("INSERT INTO authors (author_id, key, name) VALUES (?, ?, ?)",
+                             ((self._ids[key], key, name) for key, name in new))
+        return {key: self._ids[key] for key in names}
+
+    def add(self, records: Iterable[dict]) -> int:
+        """
+        Adds the authors of records, e.g. the records of one result page.
+
+        Args:
+            records (Iterable[dict]): Records with 'index' and 'authors' keys.
+
+        Returns:
+            int: Number of papers added (papers already indexed are skipped).
+        """
+        papers = {}
+        for record in records:
+            papers.setdefault(base_id(record["index"]), record["authors"])
+        known = set()
+        paper_ids = list(papers)
+        for start in range(0, len(paper_ids), _BATCH):
+            batch = paper_ids[start:start + _BATCH]
+            known.update(row[0] for row in self._db.execute(
+                f"SELECT paper_id FROM papers WHERE paper_id IN ({', '.join('?' * len(batch))})", batch))
+        papers = {paper_id: authors for paper_id, authors in papers.items() if paper_id not in known}
+        ids = self._author_ids(name for authors in papers.values() for name in authors)
+
+        for paper_id, authors in papers.items():
+            paper = self._next_paper
+            self._next_paper += 1
+            # An author listed twice in the same paper counts once
+            members = list(dict.fromkeys(ids[key] for key in map(author_key, authors) if key))
+            self._db.execute("INSERT INTO papers (paper, paper_id) VALUES (?, ?)", (paper, paper_id))
+            self._db.executemany("INSERT INTO paper_authors (author, paper) VALUES (?, ?)",
+                                 ((author, paper) for author in members))
+            if 2 <= len(members) <= self.max_authors:
+                self._db.executemany("INSERT INTO coauthors (author, coauthor, papers) VALUES (?, ?, 1) "
+                                     "ON CONFLICT (author, coauthor) DO UPDATE SET papers = papers + 1",
+                                     ((left, right) for left in members for right in members if left != right))
+        return len(papers)
+
+    def counts(self) -> dict[str, int]:
+        """Returns the number of authors and papers in the index."""
+        return {"authors": self._next_author, "papers": self._next_paper}
+
+    def save(self) -> None:
+        """Commits the authors and papers added since the index was opened or last saved."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Closes the index, discarding the additions not saved."""
+        self._db.rollback()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.save()
+        self.close()
+
+
+class AuthorIndex:
+    """
+    Read-only author index saved by `AuthorIndexBuilder`.
+
+    Args:
+        directory (str): Directory of the index.
+
+    Raises:
+        FileNotFoundError: If the directory does not hold an author index.
+    """
+
+    def __init__(self, directory: str):
+        path = os.path.join(directory, INDEX_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Author index not found: {directory}")
+        self.directory = directory
+        self._db = sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+        # Pages are read through a memory map and only when a lookup touches them
+        self._db.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
+
+    def author_id(self, name: str) -> int | None:
+        """
+        Looks up an author.
+
+        Args:
+            name (str): Author name in any supported form (see `author_key()`).
+
+        Returns:
+            int | None: The author id, or None if the author is not indexed.
+        """
+        row = self._db.execute("SELECT author_id FROM authors WHERE key = ?", (author_key(name),)).fetchone()
+        return row[0] if row else None
+
+    def name(self, author: str | int) -> str:
+        """
+        Returns the display name of an author (as first listed).
+
+        Args:
+            author (str | int): Author name or id.
+
+        Returns:
+            str: The display name.
+
+        Raises:
+            KeyError: If the author is not indexed.
+        """
+        number = self._resolve(author)
+        return self._db.execute("SELECT name FROM authors WHERE author_id = ?", (number,)).fetchone()[0]
+
+    def _resolve(self, author: str | int) -> int:
+        """Returns the id of an author given by name or id."""
+        number = author if isinstance(author, (int, np.integer)) else self.author_id(author)
+        if number is None or not 0 <= number < len(self):
+            raise KeyError(f"Unknown author: {author}")
+        return int(number)
+
+    def papers_of(self, author: str | int) -> list[str]:
+        """
+        Returns the papers of an author.
+
+        Args:
+            author (str | int): Author name or id.
+
+        Returns:
+            list[str]: ArXiv identifiers, in indexing order.
+
+        Raises:
+            KeyError: If the author is not indexed.
+        """
+        number = self._resolve(author)
+        return [row[0] for row in self._db.execute(
+            "SELECT paper_id FROM paper_authors JOIN papers USING (paper) WHERE author = ? ORDER BY paper", (number,))]
+
+    def coauthors(self, author: str | int, top: int | None = 10) -> list[tuple[str, int]]:
+        """
+        Returns the collaborators of an author, by number of shared papers.
+
+        Args:
+            author (str | int): Author name or id.
+            top (int | None): Maximum number of collaborators (all if None).
+
+        Returns:
+            list[tuple[str, int]]: Display name and number of shared papers of each
+                collaborator, most frequent first.
+
+        Raises:
+            KeyError: If the author is not indexed.
+        """
+        number = self._resolve(author)
+        return self._db.execute("SELECT name, papers FROM coauthors JOIN authors ON authors.author_id = coauthor "
+                                "WHERE author = ? ORDER BY papers DESC, coauthor LIMIT ?",
+                                (number, -1 if top is None else top)).fetchall()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module builds and queries a memory-mapped index of authors and co-authorships.")
@@ -0,0 +1,159 @@
+"""
+checkpoint.py
+-------------
+
+This module implements the checkpoint journal used to make long scraping runs
+crash-safe and resumable.
+
+The journal is an append-only JSON Lines file. Its first line describes the
+query (dates, categories, cross-list option) so a journal is never resumed
+against a different search. Every following line records either the plan of
+the run (the category and date windows of the query and their number of
+results) or one completed page (its window number, its `start` offset and the
+parsed records). Lines are flushed and synced to disk as soon as each page
+finishes, so after a crash only the pages that were in flight need to be
+downloaded again.
+Only the position of each page in the file is kept in memory; records are read
+back from disk when a resumed run replays them.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import json
+import os
+
+
+class Checkpoint:
+    """
+    Append-only journal of the pages completed by a scraping run.
+
+    Opening an existing journal replays it: completed pages and the plan of the
+    run are restored, and a partially written last line (left by a crash
+    in the middle of a write) is discarded.
+
+    Args:
+        path (str): Path of the journal file.
+        query (dict): Parameters identifying the search (must be JSON-serialisable).
+        resume (bool): If True, an existing journal for the same query is replayed;
+            if False, any existing journal is overwritten.
+
+    Raises:
+        ValueError: If `resume` is True and the journal belongs to a different query.
+
+    Attributes:
+        plan (list | None): Date windows of the run as [category, start_date,
+            end_date, total] lists, once known.
+        pages (dict[tuple[int, int], int]): Byte position in the journal of each
+            completed page, keyed by (window number, page `start` offset).
+    """
+
+    def __init__(self, path: str, query: dict, resume: bool = True):
+        self.path = path
+        self.query = query
+        self.plan = None
+        self.pages = {}
+
+        if resume and os.path.exists(path):
+            self._replay()
+            self._file = open(path, "a+b")
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "w+b")
+            self._write({"query": query})
+
+    def _replay(self) -> None:
+        """Loads the journal from disk and truncates any incomplete trailing line."""
+        valid_size = 0
+        with open(self.path, "rb") as file:
+            for number, line in enumerate(file):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Incomplete write from an interrupted run: drop it and everything after
+                    break
+                if number == 0:
+                    if entry.get("query") != self.query:
+                        raise ValueError(f"Checkpoint {self.path} belongs to a different query: {entry.get('query')}")
+                elif "plan" in entry:
+                    self.plan = entry["plan"]
+                else:
+                    self.pages[tuple(entry["page"])] = valid_size
+                valid_size += len(line)
+
+        if valid_size == 0:
+            raise ValueError(f"Checkpoint {self.path} is empty or corrupted.")
+        with open(self.path, "r+b") as file:
+            file.truncate(valid_size)
+
+    def _write(self, entry: dict) -> int:
+        """Appends one entry, forces it to disk and returns its byte position."""
+        self._file.seek(0, os.SEEK_END)
+        position = self._file.tell()
+        self._file.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return position
+
+    def set_plan(self, plan: list[list]) -> None:
+        """
+        Records the date windows of the run and their number of results.
+
+        Args:
+            plan (list[list]): [category, start_date, end_date, total] for every window.
+        """
+        if self.plan != plan:
+            self.plan = plan
+            self._write({"plan": plan})
+
+    def add_page(self, page: tuple[int, int], records: list[dict]) -> None:
+        """
+        Records a completed page.
+
+        Args:
+            page (tuple[int, int]): Window number and offset of the page.
+            records (list[dict]): Records extracted from the page.
+        """
+        self.pages[tuple(page)] = self._write({"page": list(page), "records": records})
+
+    def records(self, page: tuple[int, int]) -> list[dict]:
+        """
+        Reads back the records of a completed page.
+
+        Args:
+            page (tuple[int, int]): Window number and offset of the page.
+
+        Returns:
+            list[dict]: Records saved for that page.
+
+        Raises:
+            KeyError: If the page is not in the journal.
+        """
+        self._file.seek(self.pages[tuple(page)])
+        return json.loads(self._file.readline())["records"]
+
+    def close(self) -> None:
+        """Closes the journal file."""
+        self._file.close()
+
+    def remove(self) -> None:
+        """Closes and deletes the journal (used once the output has been written)."""
+        self.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._file.closed:
+            self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides the checkpoint journal used to resume scraping runs.")
@@ -0,0 +1,319 @@
+"""
+columnar.py
+-----------
+
+This module provides a compact in-memory container for scraped records.
+
+A list of record dicts holds several separate Python objects per paper (a dict,
+three `str`, two lists and one `str` per tag and author), and a DataFrame built
+from it adds object columns on top. `ColumnarRecords` stores the same data in a
+few contiguous NumPy buffers instead, laid out like Apache Arrow arrays:
+
+- text columns (`index`, `title`, `abstract`): the UTF-8 bytes of every value
+  concatenated in one buffer, plus an array of offsets;
+- list columns (`tags`, `authors`): dictionary-encoded, i.e. one `int32` code
+  per element pointing into a table of distinct values (a tag or an author is
+  stored once however many papers it appears in), plus an array of offsets.
+
+Buffers grow geometrically, so appending a page is amortised O(page).
+`to_arrow()` wraps the buffers into a `pyarrow.Table` without copying them, and
+`to_pandas(zero_copy=True)` exposes that table as Arrow-backed pandas columns.
+Since a prefix of a buffer is never modified once written, tables exported
+earlier stay valid while more records are appended.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+# --- Import the record schema from the configuration and sinks modules ---
+from arxivscraper.config.config import RECORD_FIELDS
+from arxivscraper.storage.sinks import LIST_FIELDS
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+def _import_pyarrow():
+    """Imports pyarrow, which is only needed to export the columns."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Arrow export requires pyarrow: pip install pyarrow") from e
+    return pa
+
+
+class GrowableArray:
+    """
+    One-dimensional NumPy array with amortised O(1) appends.
+
+    Args:
+        dtype: NumPy dtype of the elements.
+        capacity (int): Initial number of allocated elements.
+    """
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def extend(self, values) -> None:
+        """
+        Appends values at the end of the array.
+
+        Args:
+            values: Array-like of values convertible to the dtype.
+        """
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            # Reallocate instead of resizing in place: views handed out earlier
+            # (e.g., to Arrow) keep pointing to the old, unchanged buffer
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:end] = values
+        self._size = end
+
+    def view(self) -> np.ndarray:
+        """Returns the filled part of the array, without copying."""
+        return self._data[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated size in bytes."""
+        return self._data.nbytes
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class StringColumn:
+    """Column of strings stored as concatenated UTF-8 bytes and int64 offsets."""
+
+    def __init__(self):
+        self.data = GrowableArray(np.uint8, 64 * 1024)
+        self.offsets = GrowableArray(np.int64)
+        self.offsets.extend([0])
+
+    def extend(self, values: Sequence[str]) -> None:
+        """
+        Appends strings to the column.
+
+        Args:
+            values (Sequence[str]): Values to append.
+        """
+        encoded = [value.encode("utf-8") for value in values]
+        self.data.extend(np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        self.offsets.extend(self.offsets.view()[-1] + np.cumsum([len(value) for value in encoded], dtype=np.int64))
+
+    def __getitem__(self, position: int) -> str:
+        offsets = self.offsets.view()
+        return self.data.view()[offsets[position]:offsets[position + 1]].tobytes().decode("utf-8")
+
+    def to_list(self) -> list[str]:
+        """Decodes every value of the column."""
+        data = self.data.view().tobytes()
+        offsets = self.offsets.view().tolist()
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def to_arrow(self):
+        """Wraps the column into a `pyarrow.LargeStringArray`, without copying."""
+        pa = _import_pyarrow()
+        return pa.LargeStringArray.from_buffers(len(self), pa.py_buffer(self.offsets.view()),
+                                                pa.py_buffer(self.data.view()))
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated size of the buffers in bytes."""
+        return self.data.nbytes + self.offsets.nbytes
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class DictionaryListColumn:
+    """
+    Column of lists of strings, dictionary-encoded.
+
+    Every distinct string gets a code (its position in `dictionary`), and each
+    row is the slice `codes[offsets[i]:offsets[i + 1]]`: together, the codes and
+    offsets are a CSR sparse matrix of rows by distinct values.
+    """
+
+    def __init__(self):
+        self.dictionary = []
+        self._lookup = {}
+        self.codes = GrowableArray(np.int32)
+        self.offsets = GrowableArray(np.int64)
+        self.offsets.extend([0])
+
+    def code(self, value: str) -> int:
+        """Returns the code of a value, adding it to the dictionary if new."""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        return code
+
+    def extend(self, rows: Sequence[Sequence[str]]) -> None:
+        """
+        Appends lists to the column.
+
+        Args:
+            rows (Sequence[Sequence[str]]): One list of strings per row.
+        """
+        self.codes.extend([self.code(value) for row in rows for value in row])
+        self.offsets.extend(self.offsets.view()[-1] + np.cumsum([len(row) for row in rows], dtype=np.int64))
+
+    def __getitem__(self, position: int) -> list[str]:
+        offsets = self.offsets.view()
+        return [self.dictionary[code] for code in self.codes.view()[offsets[position]:offsets[position + 1]].tolist()]
+
+    def to_list(self) -> list[list[str]]:
+        """Decodes every row of the column (the strings themselves are shared)."""
+        dictionary = self.dictionary
+        codes = self.codes.view().tolist()
+        offsets = self.offsets.view().tolist()
+        return [[dictionary[code] for code in codes[start:end]] for start, end in zip(offsets, offsets[1:])]
+
+    def to_arrow(self):
+        """
+        Wraps the column into a `pyarrow.LargeListArray` of dictionary-encoded
+        strings. The codes and offsets are not copied; the dictionary is.
+        """
+        pa = _import_pyarrow()
+        values = pa.DictionaryArray.from_arrays(pa.array(self.codes.view()),
+                                                pa.array(self.dictionary, type=pa.string()))
+        return pa.LargeListArray.from_arrays(pa.array(self.offsets.view()), values)
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated size of the buffers in bytes (the dictionary strings are not counted)."""
+        return self.codes.nbytes + self.offsets.nbytes
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class ColumnarRecords:
+    """
+    Compact, append-only container of scraped records.
+
+    List fields (see `LIST_FIELDS`) are stored as `DictionaryListColumn` and
+    the other fields as `StringColumn`, available through `columns`.
+
+    Args:
+        fields (tuple[str, ...]): Fields of the records, in order.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = RECORD_FIELDS):
+        self.fields = tuple(fields)
+        self.columns = {field: DictionaryListColumn() if field in LIST_FIELDS else StringColumn()
+                        for field in self.fields}
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], fields: tuple[str, ...] = RECORD_FIELDS) -> "ColumnarRecords":
+        """
+        Builds a container from records.
+
+        Args:
+            records (Iterable[dict]): Records with the keys listed in `fields`.
+            fields (tuple[str, ...]): Fields of the records, in order.
+
+        Returns:
+            ColumnarRecords: The filled container.
+        """
+        container = cls(fields)
+        records = iter(records)
+        # Append in batches, so a lazy iterable is never fully materialised
+        while batch := list(islice(records, 1000)):
+            container.extend(batch)
+        return container
+
+    def extend(self, records: Iterable[dict]) -> None:
+        """
+        Appends records, e.g. the records of one result page.
+
+        Args:
+            records (Iterable[dict]): Records with the keys listed in `fields`.
+        """
+        records = records if isinstance(records, Sequence) else list(records)
+        for field, column in self.columns.items():
+            column.extend([record[field] for record in records])
+        self._size += len(records)
+
+    def append(self, record: dict) -> None:
+        """
+        Appends one record.
+
+        Args:
+            record (dict): Record with the keys listed in `fields`.
+        """
+        self.extend([record])
+
+    def __getitem__(self, position: int) -> dict:
+        if not -self._size <= position < self._size:
+            raise IndexError("record index out of range")
+        position %= self._size
+        return {field: column[position] for field, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[dict]:
+        columns = [column.to_list() for column in self.columns.values()]
+        for values in zip(*columns):
+            yield dict(zip(self.fields, values))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated size of the column buffers in bytes."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def to_arrow(self):
+        """
+        Exports the records as a `pyarrow.Table` sharing the column buffers.
+
+        Returns:
+            pyarrow.Table: One column per field: `large_string` for text fields
+                and `large_list<dictionary<int32, string>>` for list fields.
+
+        Raises:
+            ImportError: If `pyarrow` is not installed.
+        """
+        pa = _import_pyarrow()
+        return pa.table([column.to_arrow() for column in self.columns.values()], names=list(self.fields))
+
+    def to_pandas(self, zero_copy: bool = False) -> "DataFrame":
+        """
+        Exports the records as a DataFrame.
+
+        Args:
+            zero_copy (bool): If True, the columns are Arrow-backed
+                (`pandas.ArrowDtype`) and share the buffers of the container
+                (requires `pyarrow`). Otherwise, the DataFrame has the historical
+                layout: one Python object per value, with lists for list fields.
+
+        Returns:
+            pandas.DataFrame: One row per record, with the columns in `fields` order.
+        """
+        import pandas as pd
+
+        if zero_copy:
+            return self.to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+        return pd.DataFrame({field: column.to_list() for field, column in self.columns.items()},
+                         columns=list(self.fields))
+
+
+if __name__ == "__main__":
+    print("This module provides a compact columnar container for scraped records.")
@@ -0,0 +1,240 @@
+"""
+corpus.py
+---------
+
+This module implements an embedded SQLite store for scraped papers, as an
+alternative to the flat CSV export.
+
+Records are normalised into four tables:
+
+- `papers`: one row per paper, keyed by its arXiv identifier without version,
+  with the latest known version, primary category, title and abstract.
+- `authors`: one row per distinct author name.
+- `paper_authors` and `paper_tags`: the ordered authors and subject tags of
+  every paper.
+
+Writes are upserts: storing a paper that is already in the corpus replaces its
+metadata, authors and tags, unless the stored copy comes from a newer version
+(e.g., `2507.08819v2` is never overwritten by `2507.08819v1`). Each call to
+`upsert()` runs in a single transaction, so merging a new run into an existing
+corpus never requires loading either of them in memory, and an interrupted
+write leaves the previous state intact. Papers are read back with the stored
+version in their identifier, as they were scraped.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+
+# --- Import the identifier helpers from the state module ---
+from arxivscraper.storage.state import split_version
+
+
+# Maximum number of parameters bound in a single lookup query
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    paper_id   TEXT PRIMARY KEY,
+    version    INTEGER,
+    category   TEXT,
+    title      TEXT NOT NULL,
+    abstract   TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_category ON papers (category);
+
+CREATE TABLE IF NOT EXISTS authors (
+    author_id INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS paper_authors (
+    paper_id  TEXT    NOT NULL REFERENCES papers (paper_id) ON DELETE CASCADE,
+    position  INTEGER NOT NULL,
+    author_id INTEGER NOT NULL REFERENCES authors (author_id),
+    PRIMARY KEY (paper_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_authors_author ON paper_authors (author_id, paper_id);
+
+CREATE TABLE IF NOT EXISTS paper_tags (
+    paper_id TEXT    NOT NULL REFERENCES papers (paper_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag      TEXT    NOT NULL,
+    PRIMARY KEY (paper_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS paper_tags_tag ON paper_tags (tag, paper_id);
+"""
+
+
+class CorpusStore:
+    """
+    SQLite corpus of papers with upsert semantics on the arXiv identifier.
+
+    The store can be used as a context manager, which closes it on exit.
+
+    Args:
+        path (str): Path of the SQLite file (created if missing).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def _author_ids(self, names: set[str]) -> dict[str, int]:
+        """Returns the ids of the given author names, creating the missing ones."""
+        self._db.executemany("INSERT OR IGNORE INTO authors (name) VALUES (?)", ((name,) for name in names))
+        names = list(names)
+        ids = {}
+        for offset in range(0, len(names), _LOOKUP_BATCH):
+            batch = names[offset:offset + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            ids.update(self._db.execute(f"SELECT name, author_id FROM authors WHERE name IN ({placeholders})", batch))
+        return ids
+
+    def upsert(self, records: Iterable[dict]) -> int:
+        """
+        Inserts or updates papers in a single transaction.
+
+        A record replaces the stored paper unless the stored version is newer.
+        Records without a version suffix (as listed by the search pages) are
+        treated as the current version and keep the stored version number.
+
+        Args:
+            records (Iterable[dict]): Records with the keys listed in `RECORD_FIELDS`.
+
+        Returns:
+            int: Number of papers inserted or updated.
+        """
+        # Keep the latest version of each paper within the batch
+        latest = {}
+        for record in records:
+            paper_id, version = split_version(record["index"])
+            previous = latest.get(paper_id)
+            if previous is None or (version or 0) >= (previous[0] or 0):
+                latest[paper_id] = (version, record)
+        if not latest:
+            return 0
+
+        now = time.time()
+        written = 0
+        with self._db:
+            author_ids = self._author_ids({author for _, record in latest.values() for author in record["authors"]})
+            for paper_id, (version, record) in latest.items():
+                row = self._db.execute("SELECT version FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+                if row is not None:
+                    stored = row[0]
+                    if version is not None and stored is not None and version < stored:
+                        continue
+                    if version is None:
+                        version = stored
+
+                tags = record["tags"]
+                self._db.execute("INSERT INTO papers VALUES (?, ?, ?, ?, ?, ?) "
+                                 "ON CONFLICT (paper_id) DO UPDATE SET version = excluded.version, "
+                                 "category = excluded.category, title = excluded.title, "
+                                 "abstract = excluded.abstract, updated_at = excluded.updated_at",
+                                 (paper_id, version, tags[0] if tags else None, record["title"],
+                                  record["abstract"], now))
+                self._db.execute("DELETE FROM paper_authors WHERE paper_id = ?", (paper_id,))
+                self._db.execute("DELETE FROM paper_tags WHERE paper_id = ?", (paper_id,))
+                self._db.executemany("INSERT INTO paper_authors VALUES (?, ?, ?)",
+                                     ((paper_id, position, author_ids[author])
+                                      for position, author in enumerate(record["authors"])))
+                self._db.executemany("INSERT INTO paper_tags VALUES (?, ?, ?)",
+                                     ((paper_id, position, tag) for position, tag in enumerate(tags)))
+                written += 1
+        return written
+
+    def _record(self, paper_id: str, version: int | None, title: str, abstract: str) -> dict:
+        """Rebuilds the record of a stored paper, with the version suffix when it is known."""
+        tags = [row[0] for row in self._db.execute(
+            "SELECT tag FROM paper_tags WHERE paper_id = ? ORDER BY position", (paper_id,))]
+        authors = [row[0] for row in self._db.execute(
+            "SELECT name FROM paper_authors JOIN authors USING (author_id) WHERE paper_id = ? ORDER BY position",
+            (paper_id,))]
+        index = paper_id if version is None else f"{paper_id}v{version}"
+        return {"index": index, "title": title, "tags": tags, "authors": authors, "abstract": abstract}
+
+    def get(self, paper_id: str) -> dict | None:
+        """
+        Reads a paper back as a record.
+
+        Args:
+            paper_id (str): ArXiv identifier (the version suffix is ignored).
+
+        Returns:
+            dict | None: The record (with the keys listed in `RECORD_FIELDS`, and
+                the stored version in its 'index'), or None if the paper is not
+                in the corpus.
+        """
+        paper_id = split_version(paper_id)[0]
+        row = self._db.execute("SELECT version, title, abstract FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+        return self._record(paper_id, *row) if row else None
+
+    def records(self, category: str | None = None) -> Iterator[dict]:
+        """
+        Iterates over the stored papers, ordered by identifier.
+
+        Args:
+            category (str | None): If given, only papers tagged with this category
+                or one of its subcategories (e.g., 'astro-ph' matches 'astro-ph.GA').
+
+        Yields:
+            dict: One record per paper.
+        """
+        if category is None:
+            rows = self._db.execute("SELECT paper_id, version, title, abstract FROM papers ORDER BY paper_id")
+        else:
+            rows = self._db.execute("SELECT paper_id, version, title, abstract FROM papers WHERE paper_id IN "
+                                    "(SELECT paper_id FROM paper_tags WHERE tag = ? OR tag GLOB ?) ORDER BY paper_id",
+                                    (category, category + ".*"))
+        for row in rows:
+            yield self._record(*row)
+
+    def version(self, paper_id: str) -> int | None:
+        """
+        Returns the latest version stored for a paper.
+
+        Args:
+            paper_id (str): ArXiv identifier (the version suffix is ignored).
+
+        Returns:
+            int | None: The version number, or None if unknown or not stored.
+        """
+        row = self._db.execute("SELECT version FROM papers WHERE paper_id = ?",
+                               (split_version(paper_id)[0],)).fetchone()
+        return row[0] if row else None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides an SQLite corpus store with upserts on the arXiv identifier.")
@@ -0,0 +1,401 @@
+"""
+dedup.py
+--------
+
+This module removes duplicate papers across harvests.
+
+Overlapping date windows, cross-listed runs and multi-category jobs list the
+same paper several times, sometimes under different versions ('2507.08819v1'
+and '2507.08819v2'), and a paper can also come back under a new identifier
+(e.g., a replacement submitted as a new paper). Two levels of deduplication are
+applied:
+
+- exact: records are grouped by arXiv identifier without version, and only the
+  latest version of each paper is kept (the first copy of it, if repeated);
+- near-duplicate: the title and abstract of every paper are reduced to word
+  shingles and summarised by a MinHash signature. Locality-sensitive hashing
+  (LSH) over bands of the signature finds the candidate pairs, which are
+  flagged when their estimated Jaccard similarity reaches the threshold.
+
+Signatures, LSH buckets and identifiers live in an SQLite file rather than in
+Python objects, so memory stays bounded however many years of harvests are
+merged. Keeping that file (`state`) between merges makes them incremental:
+papers merged before are recognised in later harvests.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import tempfile
+import zlib
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from typing import NamedTuple
+
+import numpy as np
+
+# --- Import helpers from the configuration and sibling modules ---
+from arxivscraper.config.config import DEDUP_THRESHOLD
+from arxivscraper.storage.sinks import open_sink, read_records
+from arxivscraper.storage.state import split_version
+
+
+# Default MinHash/LSH parameters: 32 bands of 4 rows find pairs above a Jaccard
+# similarity of about (1/32)^(1/4) = 0.42, which are then checked against the threshold
+NUM_PERM = 128
+BANDS = 32
+SHINGLE_SIZE = 3
+
+_WORD_RE = re.compile(r"\w+")
+
+# Records processed per batch of identifier lookups
+_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    paper_id     TEXT PRIMARY KEY,
+    version      INTEGER,
+    duplicate_of TEXT,
+    signature    BLOB
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    key      INTEGER NOT NULL,
+    paper_id TEXT    NOT NULL,
+    PRIMARY KEY (key, paper_id)
+) WITHOUT ROWID;
+"""
+
+
+class Verdict(NamedTuple):
+    """
+    Outcome of checking one record.
+
+    status is one of:
+        'new': first time the paper is seen;
+        'newer_version': a newer version of a paper already seen (`match`
+            is set if that paper was a near duplicate);
+        'duplicate': a copy of a paper already seen (same or older version);
+            `match` is set if that paper was a near duplicate;
+        'near_duplicate': a different identifier whose title and abstract
+            match those of `match`.
+    """
+    status: str
+    paper_id: str
+    match: str | None = None
+    similarity: float | None = None
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hashes the word shingles (overlapping runs of `size` words) of a text.
+
+    Every word is hashed once (CRC-32), and the hash of a shingle combines the
+    hashes of its words, so no shingle string is built.
+
+    Args:
+        text (str): Text to split (case and punctuation are ignored).
+        size (int): Number of words per shingle.
+
+    Returns:
+        np.ndarray: The distinct 32-bit shingle hashes, as uint64 (a single
+            shingle if the text is shorter than `size`, none if it has no words).
+    """
+    words = _WORD_RE.findall(text.casefold())
+    hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+    count = max(len(words) - size + 1, 1) if words else 0
+    combined = hashes[:count].copy()
+    for shift in range(1, min(size, len(words))):
+        # FNV-style combination, kept below 2**32 so products stay in 64 bits
+        combined = ((combined * np.uint64(0x01000193)) ^ hashes[shift:shift + count]) & np.uint64(0xFFFFFFFF)
+    return np.unique(combined)
+
+
+class Deduplicator:
+    """
+    Streaming exact and near-duplicate detection backed by SQLite.
+
+    `check()` classifies records one at a time and remembers the new ones;
+    `find_latest_copies()` and `copies()` are the two passes of a merge over
+    harvest files. The deduplicator can be used as a context manager, which
+    commits and closes it.
+
+    Args:
+        path (str | None): SQLite file of the deduplication state, kept between
+            merges. A temporary file is used (and deleted on close) if None.
+        threshold (float): Estimated Jaccard similarity from which two papers
+            are near duplicates.
+        num_perm (int): Number of MinHash permutations.
+        bands (int): Number of LSH bands (must divide `num_perm`).
+        shingle_size (int): Number of words per shingle.
+        seed (int): Seed of the MinHash permutations. Signatures stored in a state
+            file are only comparable with the same seed and number of permutations.
+
+    Raises:
+        ValueError: If `bands` does not divide `num_perm` or the threshold is not in (0, 1].
+    """
+
+    def __init__(self,
+                 path: str | None = None,
+                 threshold: float = DEDUP_THRESHOLD,
+                 num_perm: int = NUM_PERM,
+                 bands: int = BANDS,
+                 shingle_size: int = SHINGLE_SIZE,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("The number of LSH bands must divide the number of permutations.")
+        if not 0 < threshold <= 1:
+            raise ValueError("The similarity threshold must be in (0, 1].")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        # Multiply-shift hash functions h(x) = ((a * x + b) mod 2**64) >> 32, with odd a
+        self._a = generator.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+
+        self._temporary = None
+        if path is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix="arxiv_dedup_")
+            path = os.path.join(self._temporary.name, "dedup.sqlite")
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """
+        Computes the MinHash signature of a text.
+
+        Args:
+            text (str): Text to summarise (e.g., title and abstract).
+
+        Returns:
+            np.ndarray | None: `num_perm` 32-bit minimum hashes, or None if the
+                text has no words.
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        # Unsigned arithmetic on arrays wraps around, i.e. it is modulo 2**64
+        permuted = (self._a * hashes + self._b) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _bucket_keys(self, signature: np.ndarray) -> list[int]:
+        """Returns the LSH bucket of every band of a signature."""
+        rows = signature.astype(np.uint64).reshape(self.bands, -1)
+        # Polynomial hash of the band number and its rows, wrapping around 2**64
+        keys = np.arange(self.bands, dtype=np.uint64)
+        for column in rows.T:
+            keys = keys * np.uint64(0x100000001B3) + column
+        return keys.view(np.int64).tolist()
+
+    def _nearest(self, signature: np.ndarray, keys: list[int]) -> tuple[str | None, float]:
+        """Finds the most similar stored paper among those sharing an LSH bucket."""
+        placeholders = ",".join("?" * len(keys))
+        candidates = self._db.execute(
+            "SELECT paper_id, signature FROM papers WHERE paper_id IN "
+            f"(SELECT paper_id FROM buckets WHERE key IN ({placeholders})) ORDER BY paper_id", keys).fetchall()
+        best, best_similarity = None, 0.0
+        for candidate, stored in candidates:
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint32) == signature))
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        return best, best_similarity
+
+    def check(self, record: dict) -> Verdict:
+        """
+        Classifies a record and remembers it if it is a new paper.
+
+        Args:
+            record (dict): Record with 'index', 'title' and 'abstract' keys.
+
+        Returns:
+            Verdict: The status of the record and, for near duplicates, the
+                identifier of the matching paper and their estimated similarity.
+        """
+        paper_id, version = split_version(record["index"])
+        row = self._db.execute("SELECT version, duplicate_of FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+        if row is not None:
+            stored, duplicate_of = row
+            if version is not None and (stored is None or version > stored):
+                self._db.execute("UPDATE papers SET version = ? WHERE paper_id = ?", (version, paper_id))
+                return Verdict("newer_version", paper_id, duplicate_of)
+            return Verdict("duplicate", paper_id, duplicate_of)
+
+        signature = self.signature(f"{record['title']} {record['abstract']}")
+        if signature is None:
+            self._db.execute("INSERT INTO papers VALUES (?, ?, NULL, NULL)", (paper_id, version))
+            return Verdict("new", paper_id)
+
+        keys = self._bucket_keys(signature)
+        match, similarity = self._nearest(signature, keys)
+        if match is not None and similarity >= self.threshold:
+            # Near duplicates are remembered, but not added to the buckets
+            self._db.execute("INSERT INTO papers VALUES (?, ?, ?, NULL)", (paper_id, version, match))
+            return Verdict("near_duplicate", paper_id, match, similarity)
+
+        self._db.execute("INSERT INTO papers VALUES (?, ?, NULL, ?)", (paper_id, version, signature.tobytes()))
+        self._db.executemany("INSERT OR IGNORE INTO buckets VALUES (?, ?)", ((key, paper_id) for key in keys))
+        return Verdict("new", paper_id)
+
+    def find_latest_copies(self, sources: Sequence[tuple[str, str | None]]) -> None:
+        """
+        First pass of a merge: finds, for every paper of the sources, the
+        position of the first copy of its latest version.
+
+        Args:
+            sources (Sequence[tuple[str, str | None]]): Harvest files and their
+                formats (None to infer them from the extensions).
+        """
+        self._db.execute("DROP TABLE IF EXISTS temp.latest")
+        self._db.execute("CREATE TEMP TABLE latest (paper_id TEXT PRIMARY KEY, version INTEGER, position INTEGER)")
+        position = 0
+        for path, input_format in sources:
+            records = read_records(path, input_format)
+            while batch := list(islice(records, _BATCH)):
+                rows = []
+                for record in batch:
+                    paper_id, version = split_version(record["index"])
+                    rows.append((paper_id, version, position))
+                    position += 1
+                self._db.executemany("INSERT INTO latest VALUES (?, ?, ?) ON CONFLICT (paper_id) DO UPDATE SET "
+                                     "version = excluded.version, position = excluded.position "
+                                     "WHERE COALESCE(excluded.version, 0) > COALESCE(latest.version, 0)", rows)
+
+    def copies(self, sources: Sequence[tuple[str, str | None]]) -> Iterator[tuple[dict, str]]:
+        """
+        Second pass of a merge, after `find_latest_copies()` on the same sources.
+
+        Args:
+            sources (Sequence[tuple[str, str | None]]): Harvest files and their formats.
+
+        Yields:
+            tuple[dict, str]: Every record and whether it is the copy to keep
+                ('keep'), an older version ('older_version') or a repeated copy
+                of the latest version ('duplicate').
+        """
+        position = 0
+        for path, input_format in sources:
+            records = read_records(path, input_format)
+            while batch := list(islice(records, _BATCH)):
+                paper_ids = [split_version(record["index"])[0] for record in batch]
+                placeholders = ",".join("?" * len(paper_ids))
+                latest = {paper_id: (version, kept) for paper_id, version, kept in self._db.execute(
+                    f"SELECT paper_id, version, position FROM latest WHERE paper_id IN ({placeholders})", paper_ids)}
+                for record, paper_id in zip(batch, paper_ids):
+                    version, kept = latest[paper_id]
+                    if position == kept:
+                        yield record, "keep"
+                    elif (split_version(record["index"])[1] or 0) < (version or 0):
+                        yield record, "older_version"
+                    else:
+                        yield record, "duplicate"
+                    position += 1
+
+    def commit(self) -> None:
+        """Persists the papers checked so far."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Closes the state (removing it if temporary)."""
+        self._db.close()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+
+def merge_harvests(inputs: Iterable[str],
+                   output: str,
+                   output_format: str | None = None,
+                   input_format: str | None = None,
+                   report: str | None = None,
+                   state: str | None = None,
+                   drop_near_duplicates: bool = False,
+                   threshold: float = DEDUP_THRESHOLD) -> dict:
+    """
+    Merges harvest files into one deduplicated output.
+
+    The inputs are read twice, one record at a time: the first pass finds the
+    latest version of every paper and the second one writes it (once), checking
+    it for near duplicates.
+
+    Args:
+        inputs (Iterable[str]): Harvest files (CSV, JSON Lines, Parquet, SQLite or archive).
+        output (str): Output file; its format is inferred from the extension
+            unless `output_format` is given.
+        output_format (str | None): Format of the output (see `storage.sinks`).
+        input_format (str | None): Format of every input (inferred from each
+            extension by default).
+        report (str | None): CSV file listing the near duplicates found, with
+            their matching paper and estimated similarity.
+        state (str | None): SQLite file of a `Deduplicator` kept between merges,
+            so papers written by previous merges are not written again (unless
+            in a newer version).
+        drop_near_duplicates (bool): Whether near duplicates are left out of the
+            output instead of only being reported.
+        threshold (float): Estimated Jaccard similarity of near duplicates.
+
+    Returns:
+        dict: Number of records read and written, older versions and repeated
+            copies dropped, and near duplicates found.
+    """
+    sources = [(path, input_format) for path in inputs]
+    stats = {"read": 0, "written": 0, "older_versions": 0, "duplicates": 0, "near_duplicates": 0}
+    with Deduplicator(state, threshold=threshold) as deduplicator, \
+            open_sink(output, output_format) as sink, \
+            (open(report, "w", encoding="utf-8", newline="") if report else open(os.devnull, "w")) as report_file:
+        report_writer = csv.writer(report_file)
+        report_writer.writerow(("index", "duplicate_of", "similarity"))
+        deduplicator.find_latest_copies(sources)
+
+        page = []
+        for record, copy in deduplicator.copies(sources):
+            stats["read"] += 1
+            if copy == "older_version":
+                stats["older_versions"] += 1
+                continue
+            verdict = deduplicator.check(record) if copy == "keep" else Verdict("duplicate", record["index"])
+            if verdict.status == "duplicate":
+                stats["duplicates"] += 1
+                continue
+            if verdict.status == "near_duplicate":
+                stats["near_duplicates"] += 1
+                report_writer.writerow((verdict.paper_id, verdict.match,
+                                        f"{verdict.similarity:.3f}" if verdict.similarity is not None else ""))
+                if drop_near_duplicates:
+                    continue
+            page.append(record)
+            if len(page) >= _BATCH:
+                sink.write(page)
+                stats["written"] += len(page)
+                page = []
+                deduplicator.commit()
+        sink.write(page)
+        stats["written"] += len(page)
+    return stats
+
+
+if __name__ == "__main__":
+    print("This module removes exact and near-duplicate papers across harvests.")
@@ -0,0 +1,344 @@
+"""
+jobqueue.py
+-----------
+
+This module implements the durable job queue shared by the coordinator and the
+workers of a distributed harvest (see `distributed`).
+
+The queue is a single SQLite file, so it needs no broker: every process opens
+it directly (on a local disk, or a shared volume for workers on other hosts).
+A job is one result page, identified by its URL, with the category and date
+window it belongs to. Its life cycle:
+
+- `pending`: added by the coordinator, waiting for a worker;
+- `leased`: taken by a worker until `lease_until`. The worker renews the
+  lease while it processes the job; a worker that stops reporting (crash,
+  lost host) lets its lease expire, and the job is handed to the next worker
+  asking for one;
+- `done`: its records were committed. Commits are idempotent: the first one
+  wins and later ones (from a worker whose lease had expired) change nothing;
+- `failed`: it failed `max_attempts` times. Failed jobs can be put back with
+  `retry_failed()`.
+
+Leases are taken in an immediate transaction, so two workers never lease the
+same job at once. Workers also record a heartbeat, which lets them split the
+politeness budget stored with the queue evenly between those active.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+# --- Import the default lease policy from the configuration module ---
+from arxivscraper.config.config import JOB_LEASE_TIMEOUT, JOB_MAX_ATTEMPTS
+
+# Statuses of a job
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT    NOT NULL UNIQUE,
+    category    TEXT    NOT NULL,
+    start_date  TEXT    NOT NULL,
+    end_date    TEXT    NOT NULL,
+    start       INTEGER NOT NULL,
+    status      TEXT    NOT NULL DEFAULT 'pending',
+    worker      TEXT,
+    lease       TEXT,
+    lease_until REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    records     INTEGER,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS results (
+    job     INTEGER PRIMARY KEY REFERENCES jobs (id),
+    records TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    name      TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+"""
+
+
+class Job(NamedTuple):
+    """A leased result page: `lease` identifies this lease of the job."""
+    id: int
+    url: str
+    category: str
+    start_date: str
+    end_date: str
+    start: int
+    lease: str
+
+
+class JobQueue:
+    """
+    SQLite queue of result pages shared by a coordinator and its workers.
+
+    Args:
+        path (str): Path of the SQLite file (created if missing).
+        lease_timeout (float): Seconds a leased job stays assigned to its worker.
+        max_attempts (int): Leases of a job before it is marked as failed.
+        clock (callable): Wall-clock time source, shared by every host (injectable for testing).
+
+    Raises:
+        ValueError: If `lease_timeout` or `max_attempts` are not positive.
+    """
+
+    def __init__(self,
+                 path: str,
+                 lease_timeout: float = JOB_LEASE_TIMEOUT,
+                 max_attempts: int = JOB_MAX_ATTEMPTS,
+                 clock=time.time):
+        if lease_timeout <= 0 or max_attempts < 1:
+            raise ValueError("The lease timeout and the number of attempts must be positive.")
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self._clock = clock
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Transactions are explicit, so leases can take the write lock up front
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.executescript(_SCHEMA)
+
+    def _transaction(self) -> "sqlite3.Connection":
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def settings(self) -> dict:
+        """Returns the settings stored by the coordinator (empty for a new queue)."""
+        return {key: json.loads(value) for key, value in self._db.execute("SELECT key, value FROM settings")}
+
+    def configure(self, settings: dict) -> None:
+        """
+        Stores the settings of the harvest, shared by every worker.
+
+        Args:
+            settings (dict): JSON-serialisable values. Keys already stored must
+                keep their value.
+
+        Raises:
+            ValueError: If a setting differs from the one already stored.
+        """
+        current = self.settings()
+        changed = [key for key, value in settings.items() if key in current and current[key] != value]
+        if changed:
+            raise ValueError(f"The queue {self.path} was created with other settings: {', '.join(changed)}")
+        db = self._transaction()
+        try:
+            db.executemany("INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)",
+                           [(key, json.dumps(value)) for key, value in settings.items()])
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def add(self, jobs: Iterable[tuple[str, str, str, str, int]]) -> list[int | None]:
+        """
+        Adds result pages to the queue, ignoring those already in it.
+
+        Args:
+            jobs (Iterable[tuple]): (url, category, start_date, end_date, start) of every page.
+
+        Returns:
+            list[int | None]: Id of every new job, or None for pages already queued.
+        """
+        db = self._transaction()
+        try:
+            ids = []
+            for job in jobs:
+                cursor = db.execute("INSERT OR IGNORE INTO jobs (url, category, start_date, end_date, start) "
+                                    "VALUES (?, ?, ?, ?, ?)", job)
+                ids.append(cursor.lastrowid if cursor.rowcount else None)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return ids
+
+    def lease(self, worker: str) -> Job | None:
+        """
+        Assigns the oldest available job to a worker: a pending job, or one
+        whose lease expired.
+
+        Args:
+            worker (str): Name of the worker.
+
+        Returns:
+            Job | None: The leased job, or None if no job is available now.
+        """
+        now = self._clock()
+        db = self._transaction()
+        try:
+            db.execute("INSERT OR REPLACE INTO workers (name, last_seen) VALUES (?, ?)", (worker, now))
+            # Expired leases of jobs out of attempts are not handed out again
+            db.execute("UPDATE jobs SET status = ?, error = COALESCE(error, 'lease expired') "
+                       "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                       (FAILED, LEASED, now, self.max_attempts))
+            row = db.execute("SELECT id, url, category, start_date, end_date, start FROM jobs "
+                             "WHERE status = ? OR (status = ? AND lease_until < ?) ORDER BY id LIMIT 1",
+                             (PENDING, LEASED, now)).fetchone()
+            job = None
+            if row is not None:
+                job = Job(*row, lease=uuid.uuid4().hex)
+                db.execute("UPDATE jobs SET status = ?, worker = ?, lease = ?, lease_until = ?, "
+                           "attempts = attempts + 1 WHERE id = ?",
+                           (LEASED, worker, job.lease, now + self.lease_timeout, job.id))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return job
+
+    def renew(self, job: Job, worker: str) -> bool:
+        """
+        Extends the lease of a job still being processed by `lease_timeout`
+        seconds from now, and records the heartbeat of its worker.
+
+        Args:
+            job (Job): The leased job.
+            worker (str): Name of the worker holding it.
+
+        Returns:
+            bool: True if the lease was extended, False if the job is no longer
+            held with this lease (leased again by another worker, or finished).
+        """
+        now = self._clock()
+        db = self._transaction()
+        try:
+            db.execute("INSERT OR REPLACE INTO workers (name, last_seen) VALUES (?, ?)", (worker, now))
+            cursor = db.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND lease = ? AND status = ?",
+                                (now + self.lease_timeout, job.id, job.lease, LEASED))
+            renewed = cursor.rowcount == 1
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return renewed
+
+    def complete(self, job_id: int, records: list[dict]) -> bool:
+        """
+        Commits the records of a job. Only the first commit of a job counts, so
+        a job processed twice (after its lease expired) is stored once.
+
+        Args:
+            job_id (int): Id of the job.
+            records (list[dict]): Records parsed from its page.
+
+        Returns:
+            bool: True if the records were stored, False if the job was already done.
+        """
+        db = self._transaction()
+        try:
+            cursor = db.execute("UPDATE jobs SET status = ?, records = ?, finished_at = ?, error = NULL "
+                                "WHERE id = ? AND status != ?",
+                                (DONE, len(records), self._clock(), job_id, DONE))
+            stored = cursor.rowcount == 1
+            if stored:
+                db.execute("INSERT OR REPLACE INTO results (job, records) VALUES (?, ?)",
+                           (job_id, json.dumps(records, ensure_ascii=False)))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return stored
+
+    def fail(self, job: Job, error: str) -> None:
+        """
+        Gives a leased job back after an error: it becomes pending again, or
+        failed once it has used every attempt. Ignored if the job was leased
+        again by another worker in the meantime.
+
+        Args:
+            job (Job): The leased job.
+            error (str): Description of the error.
+        """
+        db = self._transaction()
+        try:
+            db.execute("UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                       "error = ?, lease = NULL, lease_until = NULL WHERE id = ? AND lease = ? AND status = ?",
+                       (self.max_attempts, FAILED, PENDING, error, job.id, job.lease, LEASED))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def retry_failed(self) -> int:
+        """Puts the failed jobs back in the queue with fresh attempts; returns their number."""
+        db = self._transaction()
+        try:
+            count = db.execute("UPDATE jobs SET status = ?, attempts = 0 WHERE status = ?", (PENDING, FAILED)).rowcount
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return count
+
+    def active_workers(self) -> int:
+        """Returns the number of workers that asked for a job or renewed a lease within the lease timeout."""
+        return self._db.execute("SELECT COUNT(*) FROM workers WHERE last_seen >= ?",
+                                (self._clock() - self.lease_timeout,)).fetchone()[0]
+
+    def leave(self, worker: str) -> None:
+        """Removes the heartbeat of a worker that stops, so the others take over its budget."""
+        self._db.execute("DELETE FROM workers WHERE name = ?", (worker,))
+
+    def counts(self) -> dict[str, int]:
+        """Returns the number of jobs in every status."""
+        counts = dict.fromkeys((PENDING, LEASED, DONE, FAILED), 0)
+        counts.update(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return counts
+
+    def unfinished(self) -> int:
+        """Returns the number of jobs still pending or leased."""
+        return self._db.execute("SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (PENDING, LEASED)).fetchone()[0]
+
+    def failures(self) -> list[tuple[str, str]]:
+        """Returns the URL and last error of every failed job."""
+        return self._db.execute("SELECT url, error FROM jobs WHERE status = ? ORDER BY id", (FAILED,)).fetchall()
+
+    def results(self) -> Iterator[tuple[str, list[dict]]]:
+        """
+        Yields the committed records, page by page in the order the jobs were added.
+
+        Yields:
+            tuple[str, list[dict]]: Category and records of every done job.
+        """
+        cursor = self._db.execute("SELECT jobs.category, results.records FROM results "
+                                  "JOIN jobs ON jobs.id = results.job ORDER BY jobs.id")
+        for category, records in cursor:
+            yield category, json.loads(records)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides the SQLite job queue of distributed harvests.")
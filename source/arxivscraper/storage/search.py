@@ -0,0 +1,316 @@
+"""
+search.py
+---------
+
+This module implements a persistent full-text search index over scraped papers.
+
+The index is an SQLite file holding an FTS5 inverted index over the title and
+abstract of every paper, ranked with BM25, plus small side tables of tags and
+authors used as filters. Papers are also dated by the year and month encoded in
+their arXiv identifier ('2507.08819' was submitted in July 2025), which allows
+date filters without storing the announcement date.
+
+The index is updated incrementally: `add()` upserts one batch of records in a
+single transaction (a newer version of a paper replaces the older one, never
+the reverse), so it can be fed page by page while a scrape runs, or from
+existing output files. Queries only touch the matching postings and rows, so
+they answer in milliseconds without loading the corpus into memory.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterable, Sequence
+
+# --- Import the identifier helpers from the state module ---
+from arxivscraper.storage.state import split_version
+
+
+# Year and month of new-style ('2507.08819') and old-style ('hep-th/9901001') identifiers
+_NEW_ID_RE = re.compile(r'^([0-9]{2})([0-9]{2})\.[0-9]{4,5}')
+_OLD_ID_RE = re.compile(r'^[a-zA-Z.-]+/([0-9]{2})([0-9]{2})[0-9]{3}')
+
+# Terms of a plain query: words, optionally followed by '*' for a prefix search
+_TERM_RE = re.compile(r'\w+\*?')
+
+# Accepted date filters: a month or a day (only the month is used)
+_DATE_RE = re.compile(r'^([0-9]{4})-([0-9]{2})(-[0-9]{2})?$')
+
+# BM25 weights of the title and abstract columns: a hit in the title counts more
+TITLE_WEIGHT = 3.0
+ABSTRACT_WEIGHT = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id   INTEGER PRIMARY KEY,
+    paper_id TEXT    NOT NULL UNIQUE,
+    version  INTEGER,
+    month    TEXT,
+    title    TEXT    NOT NULL,
+    abstract TEXT    NOT NULL,
+    tags     TEXT    NOT NULL,
+    authors  TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_month ON documents (month);
+
+CREATE TABLE IF NOT EXISTS document_tags (
+    doc_id INTEGER NOT NULL,
+    tag    TEXT    NOT NULL,
+    PRIMARY KEY (doc_id, tag)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS document_tags_tag ON document_tags (tag, doc_id);
+
+CREATE TABLE IF NOT EXISTS document_authors (
+    doc_id INTEGER NOT NULL,
+    author TEXT    NOT NULL,
+    PRIMARY KEY (doc_id, author)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    title, abstract,
+    content = 'documents', content_rowid = 'doc_id',
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+
+-- Keep the inverted index in sync with the documents table
+CREATE TRIGGER IF NOT EXISTS documents_insert AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, title, abstract) VALUES (new.doc_id, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_delete AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, abstract)
+    VALUES ('delete', old.doc_id, old.title, old.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_update AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, title, abstract)
+    VALUES ('delete', old.doc_id, old.title, old.abstract);
+    INSERT INTO documents_fts (rowid, title, abstract) VALUES (new.doc_id, new.title, new.abstract);
+END;
+"""
+
+
+def id_month(paper_id: str) -> str | None:
+    """
+    Returns the submission month encoded in an arXiv identifier.
+
+    Args:
+        paper_id (str): Identifier, new style ('2507.08819v2') or old style ('hep-th/9901001').
+
+    Returns:
+        str | None: Month in YYYY-MM format, or None if the identifier is not recognised.
+    """
+    match = _NEW_ID_RE.match(paper_id) or _OLD_ID_RE.match(paper_id)
+    if match is None:
+        return None
+    year, month = int(match.group(1)), match.group(2)
+    # Old-style identifiers started in August 1991
+    return f"{1900 + year if year >= 91 else 2000 + year}-{month}"
+
+
+def _month(date: str | None) -> str | None:
+    """Validates a YYYY-MM or YYYY-MM-DD date filter and reduces it to its month."""
+    if date is None:
+        return None
+    match = _DATE_RE.match(date)
+    if match is None or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError(f"Invalid date filter: {date}. Expected YYYY-MM or YYYY-MM-DD.")
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+def plain_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query matching documents with every word.
+
+    Words are quoted, so punctuation and FTS5 operators in the text are taken
+    literally; a trailing '*' keeps its meaning of a prefix search.
+
+    Args:
+        text (str): Free-text query (e.g., 'black hole entrop*').
+
+    Returns:
+        str: The FTS5 query (e.g., '"black" "hole" "entrop"*'), empty if the text has no words.
+    """
+    terms = []
+    for term in _TERM_RE.findall(text):
+        prefix = term.endswith("*")
+        terms.append(f'"{term.rstrip("*")}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """
+    Full-text index of papers with BM25 ranking and tag, author and date filters.
+
+    The index can be used as a context manager, which closes it on exit.
+
+    Args:
+        path (str): Path of the SQLite file (created if missing).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def add(self, records: Iterable[dict]) -> int:
+        """
+        Adds or updates papers in a single transaction.
+
+        A record replaces the indexed paper unless the indexed version is newer.
+        Records without a version suffix are treated as the current version.
+
+        Args:
+            records (Iterable[dict]): Records with the keys listed in `RECORD_FIELDS`.
+
+        Returns:
+            int: Number of papers added or updated.
+        """
+        # Keep the latest version of each paper within the batch
+        latest = {}
+        for record in records:
+            paper_id, version = split_version(record["index"])
+            previous = latest.get(paper_id)
+            if previous is None or (version or 0) >= (previous[0] or 0):
+                latest[paper_id] = (version, record)
+
+        written = 0
+        with self._db:
+            for paper_id, (version, record) in latest.items():
+                row = self._db.execute("SELECT doc_id, version FROM documents WHERE paper_id = ?",
+                                       (paper_id,)).fetchone()
+                if row is not None:
+                    stored = row[1]
+                    if version is not None and stored is not None and version < stored:
+                        continue
+                    if version is None:
+                        version = stored
+
+                self._db.execute("INSERT INTO documents (paper_id, version, month, title, abstract, tags, authors) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                                 "ON CONFLICT (paper_id) DO UPDATE SET version = excluded.version, "
+                                 "title = excluded.title, abstract = excluded.abstract, "
+                                 "tags = excluded.tags, authors = excluded.authors",
+                                 (paper_id, version, id_month(paper_id), record["title"], record["abstract"],
+                                  json.dumps(record["tags"], ensure_ascii=False),
+                                  json.dumps(record["authors"], ensure_ascii=False)))
+                doc_id = row[0] if row is not None else self._db.execute(
+                    "SELECT doc_id FROM documents WHERE paper_id = ?", (paper_id,)).fetchone()[0]
+
+                self._db.execute("DELETE FROM document_tags WHERE doc_id = ?", (doc_id,))
+                self._db.execute("DELETE FROM document_authors WHERE doc_id = ?", (doc_id,))
+                self._db.executemany("INSERT OR IGNORE INTO document_tags VALUES (?, ?)",
+                                     ((doc_id, tag) for tag in record["tags"]))
+                self._db.executemany("INSERT OR IGNORE INTO document_authors VALUES (?, ?)",
+                                     ((doc_id, author) for author in record["authors"]))
+                written += 1
+        return written
+
+    def search(self,
+               query: str = "",
+               tags: Sequence[str] | None = None,
+               authors: Sequence[str] | None = None,
+               since: str | None = None,
+               until: str | None = None,
+               limit: int = 10,
+               raw: bool = False) -> list[dict]:
+        """
+        Searches the index.
+
+        Matches are ranked by BM25 over the title and abstract. Without query
+        text, every paper passing the filters matches, newest first.
+
+        Args:
+            query (str): Words that must all appear in the title or abstract
+                (see `plain_query()`), or an FTS5 query if `raw` is True (e.g.,
+                'title:"dark matter" OR axion*').
+            tags (Sequence[str] | None): Only papers with at least one of these
+                tags or of their subcategories (e.g., 'astro-ph' matches 'astro-ph.GA').
+            authors (Sequence[str] | None): Only papers with every one of these
+                authors; case-insensitive and matching part of a name ('Hawking').
+            since (str | None): Only papers submitted in or after this month (YYYY-MM or YYYY-MM-DD).
+            until (str | None): Only papers submitted in or before this month (YYYY-MM or YYYY-MM-DD).
+            limit (int): Maximum number of results.
+            raw (bool): Whether `query` is passed to FTS5 untouched.
+
+        Returns:
+            list[dict]: The matches, best first, as records with the keys listed
+                in `RECORD_FIELDS` plus 'month', 'score' (higher is better, None
+                without query text) and 'snippet' (the abstract around the hit).
+
+        Raises:
+            ValueError: If a date filter is malformed or a raw query is invalid.
+        """
+        match = query.strip() if raw else plain_query(query)
+        conditions, parameters = [], []
+        if tags:
+            conditions.append("EXISTS (SELECT 1 FROM document_tags t WHERE t.doc_id = d.doc_id AND ("
+                              + " OR ".join("t.tag = ? OR t.tag GLOB ?" for _ in tags) + "))")
+            for tag in tags:
+                parameters += [tag, tag + ".*"]
+        for author in authors or ():
+            pattern = author.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("EXISTS (SELECT 1 FROM document_authors a WHERE a.doc_id = d.doc_id "
+                              "AND a.author LIKE ? ESCAPE '\\')")
+            parameters.append(f"%{pattern}%")
+        for operator, date in ((">=", _month(since)), ("<=", _month(until))):
+            if date is not None:
+                conditions.append(f"d.month {operator} ?")
+                parameters.append(date)
+
+        columns = "d.paper_id, d.title, d.tags, d.authors, d.abstract, d.month"
+        if match:
+            weights = f"{TITLE_WEIGHT}, {ABSTRACT_WEIGHT}"
+            sql = (f"SELECT {columns}, -bm25(documents_fts, {weights}), "
+                   "snippet(documents_fts, 1, '[', ']', '...', 24) "
+                   "FROM documents_fts JOIN documents d ON d.doc_id = documents_fts.rowid "
+                   "WHERE documents_fts MATCH ?" + "".join(f" AND {c}" for c in conditions)
+                   + f" ORDER BY bm25(documents_fts, {weights}) LIMIT ?")
+            parameters = [match] + parameters
+        else:
+            sql = (f"SELECT {columns}, NULL, NULL FROM documents d"
+                   + (" WHERE " + " AND ".join(conditions) if conditions else "")
+                   + " ORDER BY d.month DESC, d.paper_id DESC LIMIT ?")
+
+        try:
+            rows = self._db.execute(sql, parameters + [limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query: {query}. {e}") from e
+
+        return [{"index": paper_id, "title": title, "tags": json.loads(tags), "authors": json.loads(authors),
+                 "abstract": abstract, "month": month, "score": score, "snippet": snippet}
+                for paper_id, title, tags, authors, abstract, month, score, snippet in rows]
+
+    def optimize(self) -> None:
+        """Merges the segments of the inverted index (worth running after a bulk load)."""
+        with self._db:
+            self._db.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides a full-text search index of scraped papers with BM25 ranking.")
@@ -0,0 +1,281 @@
+"""
+sinks.py
+--------
+
+This module provides incremental writers ("sinks") for scraped records.
+
+Each sink receives the records of one result page at a time through `write()`
+and flushes them to disk straight away, so memory stays flat regardless of the
+size of the harvest and other processes can start reading the output while the
+scrape is still running.
+
+Available formats:
+
+- `csv`: same layout as the historical `DataFrame.to_csv` export
+  (list columns written as Python list literals).
+- `jsonl`: one JSON object per line, with real JSON arrays for list columns.
+- `parquet`: one row group per page (requires `pyarrow`).
+- `sqlite`: normalised SQLite corpus (see `corpus.py`), upserted one page per
+  transaction. Unlike the file formats, an existing corpus is updated rather
+  than overwritten, so successive runs merge into it.
+- `archive`: compressed, chunked archive indexed by identifier and month (see
+  `archive.py`). An existing archive is appended to.
+
+`read_records()` reads any of these outputs back, one record at a time.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import ast
+import csv
+import json
+import os
+from collections.abc import Iterator
+
+# --- Import the record schema from the configuration module ---
+from arxivscraper.config.config import RECORD_FIELDS
+
+
+# Columns holding lists of strings
+LIST_FIELDS = ("tags", "authors")
+
+
+class RecordSink:
+    """
+    Base class of the incremental record writers.
+
+    Subclasses implement `write()` and, if needed, `close()`. Sinks can be used
+    as context managers.
+
+    Args:
+        path (str): Output file path (its directory is created if missing).
+        fields (tuple[str, ...]): Columns to write, in order.
+    """
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        self.path = path
+        self.fields = tuple(fields)
+        self.count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, records: list[dict]) -> None:
+        """
+        Writes and flushes the records of one page.
+
+        Args:
+            records (list[dict]): Records to append.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finalises the output file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CSVSink(RecordSink):
+    """Writes records as CSV rows, matching the layout of `DataFrame.to_csv(index=False)`."""
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        super().__init__(path, fields)
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+        self._writer.writerow(self.fields)
+        self._file.flush()
+
+    def write(self, records: list[dict]) -> None:
+        self._writer.writerows([str(record[field]) if field in LIST_FIELDS else record[field]
+                                for field in self.fields] for record in records)
+        self._file.flush()
+        self.count += len(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JSONLinesSink(RecordSink):
+    """Writes one JSON object per record."""
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        super().__init__(path, fields)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: list[dict]) -> None:
+        self._file.writelines(json.dumps({field: record[field] for field in self.fields}, ensure_ascii=False) + "\n"
+                              for record in records)
+        self._file.flush()
+        self.count += len(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """
+    Writes records to a Parquet file, one row group per page.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+    """
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+
+        super().__init__(path, fields)
+        self._pa = pa
+        self._schema = pa.schema([(field, pa.list_(pa.string()) if field in LIST_FIELDS else pa.string())
+                                  for field in self.fields])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, records: list[dict]) -> None:
+        if not records:
+            return
+        columns = {field: [record[field] for record in records] for field in self.fields}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+        self.count += len(records)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class SQLiteSink(RecordSink):
+    """
+    Upserts records into a SQLite corpus, in one transaction per page.
+
+    Raises:
+        ValueError: If `fields` is not the complete `RECORD_FIELDS` schema.
+    """
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        from arxivscraper.storage.corpus import CorpusStore
+
+        if tuple(fields) != RECORD_FIELDS:
+            raise ValueError("A SQLite corpus requires every record field.")
+        super().__init__(path, fields)
+        self._store = CorpusStore(path)
+
+    def write(self, records: list[dict]) -> None:
+        self._store.upsert(records)
+        self.count += len(records)
+
+    def close(self) -> None:
+        self._store.close()
+
+
+class ArchiveSink(RecordSink):
+    """Appends records to a compressed archive, one chunk every `ARCHIVE_CHUNK_RECORDS` records."""
+
+    def __init__(self, path: str, fields: tuple[str, ...] = RECORD_FIELDS):
+        from arxivscraper.storage.archive import ArchiveWriter
+
+        super().__init__(path, fields)
+        self._writer = ArchiveWriter(path, self.fields)
+
+    def write(self, records: list[dict]) -> None:
+        self._writer.write(records)
+        self.count += len(records)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+# Output formats and the file extensions that select them
+SINKS = {"csv": CSVSink, "jsonl": JSONLinesSink, "parquet": ParquetSink, "sqlite": SQLiteSink,
+         "archive": ArchiveSink}
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet",
+              ".sqlite": "sqlite", ".sqlite3": "sqlite", ".db": "sqlite", ".arxz": "archive"}
+
+
+def open_sink(path: str, output_format: str | None = None, fields: tuple[str, ...] = RECORD_FIELDS) -> RecordSink:
+    """
+    Creates the sink for an output file.
+
+    Args:
+        path (str): Output file path.
+        output_format (str | None): One of the keys of `SINKS`. If omitted, it is
+            inferred from the file extension (CSV by default).
+        fields (tuple[str, ...]): Columns to write, in order.
+
+    Returns:
+        RecordSink: An open sink.
+
+    Raises:
+        ValueError: If the format is unknown, or if a SQLite corpus is opened
+            with only some of the fields.
+    """
+    if output_format is None:
+        output_format = EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+    if output_format not in SINKS:
+        raise ValueError(f"Unknown output format: {output_format}. Expected one of {tuple(SINKS)}")
+    return SINKS[output_format](path, fields)
+
+
+def read_records(path: str, input_format: str | None = None) -> Iterator[dict]:
+    """
+    Reads back the records of an output file, one at a time.
+
+    Args:
+        path (str): File written by one of the sinks.
+        input_format (str | None): One of the keys of `SINKS`. If omitted, it is
+            inferred from the file extension (CSV by default).
+
+    Yields:
+        dict: One record per paper, with list columns as lists.
+
+    Raises:
+        ValueError: If the format is unknown.
+        ImportError: If reading Parquet and `pyarrow` is not installed.
+    """
+    if input_format is None:
+        input_format = EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+    if input_format not in SINKS:
+        raise ValueError(f"Unknown input format: {input_format}. Expected one of {tuple(SINKS)}")
+
+    if input_format == "csv":
+        with open(path, encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                for field in LIST_FIELDS:
+                    if field in row:
+                        row[field] = ast.literal_eval(row[field])
+                yield row
+    elif input_format == "jsonl":
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif input_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet input requires pyarrow: pip install pyarrow") from e
+        for batch in pq.ParquetFile(path).iter_batches():
+            yield from batch.to_pylist()
+    elif input_format == "archive":
+        from arxivscraper.storage.archive import ArchiveReader
+
+        with ArchiveReader(path) as archive:
+            yield from archive.records()
+    else:
+        from arxivscraper.storage.corpus import CorpusStore
+
+        with CorpusStore(path) as store:
+            yield from store.records()
+
+
+if __name__ == "__main__":
+    print("This module provides incremental CSV, JSON Lines, Parquet and SQLite writers for scraped records.")
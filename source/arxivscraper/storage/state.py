@@ -0,0 +1,218 @@
+"""
+state.py
+--------
+
+This module keeps the state of incremental ("since last run") harvests in a
+small SQLite file.
+
+For every category and cross-list setting it records the newest announced date
+covered by a completed run (the watermark) and the arXiv identifiers already
+harvested. The next run starts from the watermark instead of the requested
+start date and, since results are sorted from the newest announcement to the
+oldest, stops paginating a date window as soon as it reaches a known paper, so
+a daily update only costs a page or two per category.
+
+Identifiers found during a run are written inside a single transaction that is
+only committed when the run completes. An interrupted run therefore leaves the
+state untouched, and no page is skipped because a previous attempt had already
+seen its papers.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import datetime
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Iterable
+
+# Version suffix of an arXiv identifier (e.g., the 'v2' of '2507.08819v2')
+_VERSION_RE = re.compile(r'v([0-9]+)$')
+
+# Maximum number of parameters bound in a single lookup query
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    category   TEXT    NOT NULL,
+    cross_list INTEGER NOT NULL,
+    last_date  TEXT    NOT NULL,
+    updated_at REAL    NOT NULL,
+    PRIMARY KEY (category, cross_list)
+);
+CREATE TABLE IF NOT EXISTS known_ids (
+    category   TEXT    NOT NULL,
+    cross_list INTEGER NOT NULL,
+    paper_id   TEXT    NOT NULL,
+    run        INTEGER NOT NULL,
+    PRIMARY KEY (category, cross_list, paper_id)
+) WITHOUT ROWID;
+"""
+
+
+def split_version(paper_id: str) -> tuple[str, int | None]:
+    """
+    Splits an arXiv identifier into its base identifier and version number.
+
+    Args:
+        paper_id (str): Identifier, with or without version (e.g., '2507.08819v2').
+
+    Returns:
+        tuple[str, int | None]: The base identifier (e.g., '2507.08819') and the
+            version (e.g., 2), or None if the identifier has no version suffix.
+    """
+    paper_id = paper_id.strip()
+    match = _VERSION_RE.search(paper_id)
+    if match is None:
+        return paper_id, None
+    return paper_id[:match.start()], int(match.group(1))
+
+
+def base_id(paper_id: str) -> str:
+    """
+    Removes the version suffix of an arXiv identifier.
+
+    Args:
+        paper_id (str): Identifier, with or without version (e.g., '2507.08819v2').
+
+    Returns:
+        str: The identifier without version (e.g., '2507.08819').
+    """
+    return split_version(paper_id)[0]
+
+
+class HarvestState:
+    """
+    SQLite store of watermarks and known identifiers for incremental harvests.
+
+    Every instance is one run: identifiers added through `add()` are only
+    visible to `known()` in later runs, and are persisted by `commit()`.
+    Closing the state without committing discards them. The state can be used
+    as a context manager, which commits on success and rolls back on error.
+
+    Args:
+        path (str): Path of the SQLite file (created if missing).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self.run = self._db.execute("SELECT COALESCE(MAX(run), 0) + 1 FROM known_ids").fetchone()[0]
+
+    def watermark(self, category: str, cross_list: bool) -> str | None:
+        """
+        Returns the newest announced date covered by the previous runs.
+
+        Args:
+            category (str): ArXiv category code.
+            cross_list (bool): Cross-list setting of the query.
+
+        Returns:
+            str | None: Date in YYYY-MM-DD format, or None if the query was never harvested.
+        """
+        row = self._db.execute("SELECT last_date FROM watermarks WHERE category = ? AND cross_list = ?",
+                               (category, int(cross_list))).fetchone()
+        return row[0] if row else None
+
+    def start_date(self, category: str, cross_list: bool, start_date: str) -> str:
+        """
+        Returns the first day an incremental run needs to scrape.
+
+        The watermark day itself is scraped again, because more papers may have
+        been announced on it after the previous run; its known papers stop the
+        pagination straight away.
+
+        Args:
+            category (str): ArXiv category code.
+            cross_list (bool): Cross-list setting of the query.
+            start_date (str): Start date requested by the user (YYYY-MM-DD).
+
+        Returns:
+            str: The later of `start_date` and the watermark.
+        """
+        watermark = self.watermark(category, cross_list)
+        return max(start_date, watermark) if watermark else start_date
+
+    def known(self, category: str, cross_list: bool, paper_ids: Iterable[str]) -> set[str]:
+        """
+        Looks up which identifiers were harvested by previous runs.
+
+        Args:
+            category (str): ArXiv category code.
+            cross_list (bool): Cross-list setting of the query.
+            paper_ids (Iterable[str]): Identifiers to check (versions are ignored).
+
+        Returns:
+            set[str]: The base identifiers that are already known.
+        """
+        ids = list({base_id(paper_id) for paper_id in paper_ids})
+        found = set()
+        for offset in range(0, len(ids), _LOOKUP_BATCH):
+            batch = ids[offset:offset + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(f"SELECT paper_id FROM known_ids WHERE category = ? AND cross_list = ? "
+                                    f"AND run < ? AND paper_id IN ({placeholders})",
+                                    (category, int(cross_list), self.run, *batch))
+            found.update(row[0] for row in rows)
+        return found
+
+    def add(self, category: str, cross_list: bool, paper_ids: Iterable[str]) -> None:
+        """
+        Records identifiers harvested by this run (persisted by `commit()`).
+
+        Args:
+            category (str): ArXiv category code.
+            cross_list (bool): Cross-list setting of the query.
+            paper_ids (Iterable[str]): Identifiers of the new papers.
+        """
+        self._db.executemany("INSERT OR IGNORE INTO known_ids VALUES (?, ?, ?, ?)",
+                             ((category, int(cross_list), base_id(paper_id), self.run) for paper_id in paper_ids))
+
+    def set_watermark(self, category: str, cross_list: bool, end_date: str) -> None:
+        """
+        Advances the watermark of a query once it has been fully harvested.
+
+        Dates in the future are clipped to today, since nothing can have been
+        announced on them yet. The watermark never moves backwards.
+
+        Args:
+            category (str): ArXiv category code.
+            cross_list (bool): Cross-list setting of the query.
+            end_date (str): Last day covered by this run (YYYY-MM-DD).
+        """
+        end_date = min(end_date, datetime.date.today().isoformat())
+        previous = self.watermark(category, cross_list)
+        if previous is None or end_date > previous:
+            self._db.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?, ?)",
+                             (category, int(cross_list), end_date, time.time()))
+
+    def commit(self) -> None:
+        """Persists the identifiers and watermarks recorded by this run."""
+        self._db.commit()
+
+    def close(self) -> None:
+        """Closes the state file, discarding anything not committed."""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.commit()
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module stores watermarks and known identifiers for incremental arXiv harvests.")
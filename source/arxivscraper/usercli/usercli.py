@@ -9,8 +9,14 @@ Functions included:
     - check_dates(): Validates the format and order of date inputs.
     - check_categories(): Ensures the provided category exists in the config.
     - check_output_path(): Verifies or creates the output directory if needed.
+    - check_rate_limit(): Ensures the concurrency and rate-limit settings are positive.
     - validate_inputs(): Runs all input checks and raises errors when invalid.
     - parse_arguments(): Builds the CLI, parses user arguments, and validates them.
+    - parse_search_arguments(): Builds and validates the CLI of the `search` subcommand.
+    - parse_authors_arguments(): Builds and validates the CLI of the `authors` subcommand.
+    - parse_dedup_arguments(): Builds and validates the CLI of the `dedup` subcommand.
+    - parse_archive_arguments(): Builds and validates the CLI of the `archive` subcommand.
+    - parse_queue_arguments(): Builds and validates the CLI of the `queue` subcommand (distributed harvests).
 
 Authors:
     Alejandro Cano Jones (acanojo@uoc.edu)
@@ -19,22 +25,16 @@ Authors:
 
 import argparse
 import datetime
+import os
 
-# Attempt to import valid categories from configuration.
-# If the import fails (e.g., in Google Colab), fix the module path dynamically.
-try:
-    from arxivscraper.config.config import CATEGORIES
-except Exception:
-    import os
-    import sys
-
-    _this = os.path.abspath(__file__)
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(_this)))
-    if PROJECT_ROOT not in sys.path:
-        sys.path.insert(0, PROJECT_ROOT)
-
-    from arxivscraper.config.config import CATEGORIES
-
+# Valid categories and defaults from the configuration (only light modules are
+# imported here, so parsing and validating arguments stays fast)
+from arxivscraper.config.config import (ADAPTIVE_MIN_INTERVAL, AUTHOR_INDEX_PATH, CATEGORIES, CACHE_TTL,
+                                        DEDUP_THRESHOLD, DEFAULT_PARSER, DEFAULT_SOURCE, OAI_BASE_URL, SOURCES,
+                                        FETCH_WORKERS, JOB_LEASE_TIMEOUT, JOB_MAX_ATTEMPTS, JOB_POLL_INTERVAL,
+                                        JOB_QUEUE_PATH, MAX_SEARCH_RESULTS, PARSE_WORKERS, RECORD_FIELDS,
+                                        REQUIRED_FIELDS, RATE_LIMIT_PERIOD, RATE_LIMIT_REQUESTS, SEARCH_INDEX_PATH,
+                                        STATE_PATH)
 
 
 def check_dates(start_date: str, end_date: str) -> bool:
@@ -86,6 +86,21 @@ def check_output_path(output_path: str) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
+def check_rate_limit(workers: int, max_requests: int, period: float) -> bool:
+    """
+    Validates the concurrency and rate-limit settings.
+
+    Args:
+        workers (int): Number of concurrent downloads.
+        max_requests (int): Requests allowed per rate-limit window.
+        period (float): Length of the rate-limit window in seconds.
+
+    Returns:
+        bool: True if all values are positive, False otherwise.
+    """
+    return workers >= 1 and max_requests >= 1 and period > 0
+
+
 def validate_inputs(args) -> None:
     """
     Runs validation checks for all command-line arguments.
@@ -95,12 +110,31 @@ def validate_inputs(args) -> None:
         args: Parsed command-line arguments from argparse.
 
     Raises:
-        ValueError: If date range or category is invalid.
+        ValueError: If date range, category or rate-limit settings are invalid.
     """
     if not check_dates(args.start_date, args.end_date):
         raise ValueError("Invalid date range provided.")
-    if not check_categories(args.category):
-        raise ValueError("Invalid category provided.")
+    invalid = [category for category in args.category if not check_categories(category)]
+    if invalid:
+        raise ValueError(f"Invalid category provided: {', '.join(invalid)}")
+    if not check_rate_limit(args.workers, args.max_requests, args.period) or args.parse_workers < 1:
+        raise ValueError("Invalid concurrency or rate-limit settings provided.")
+    if args.min_interval <= 0:
+        raise ValueError("Invalid minimum interval between requests provided.")
+    if args.max_results < 1:
+        raise ValueError("Invalid maximum number of results provided.")
+    if args.offline and not args.cache_dir:
+        raise ValueError("Offline mode requires --cache_dir.")
+    if args.source == "oai" and (args.checkpoint or args.resume):
+        raise ValueError("Checkpoints are only supported by the html source.")
+    if args.fields is not None:
+        missing = [field for field in REQUIRED_FIELDS if field not in args.fields]
+        if missing:
+            raise ValueError(f"--fields must include: {', '.join(missing)}")
+        if args.index and set(args.fields) != set(RECORD_FIELDS):
+            raise ValueError("--index requires every record field.")
+        if args.author_index and "authors" not in args.fields:
+            raise ValueError("--author_index requires the 'authors' field.")
     check_output_path(args.output)
 
 
@@ -114,15 +148,369 @@ def parse_arguments():
     parser = argparse.ArgumentParser(description="ArXiv Scraper. Scrapes ArXiv for papers within a date range.")
     parser.add_argument("--start_date", type=str, required=True, help="Start date in YYYY-MM-DD format")
     parser.add_argument("--end_date", type=str, required=True, help="End date in YYYY-MM-DD format")
-    parser.add_argument("--category", type=str, required=True, help="Category to filter by")
+    parser.add_argument("--category", type=str, nargs="+", required=True,
+                        help="One or more categories to filter by, or 'all' for every category")
     parser.add_argument("--cross_list", action="store_true", help="Include cross-listed papers")
-    parser.add_argument("--output", type=str, nargs="?", default="arxiv_data.csv", help="Output CSV file path")
+    parser.add_argument("--output", type=str, nargs="?", default="arxiv_data.csv", help="Output file path")
+    parser.add_argument("--split_output", action="store_true",
+                        help="Write each category to its own file ('{category}' in --output, or a suffix)")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Output format (inferred from the output file extension by default)")
+    parser.add_argument("--source", type=str, choices=SOURCES, default=DEFAULT_SOURCE,
+                        help="Metadata source: search result pages (html) or bulk OAI-PMH records (oai)")
+    parser.add_argument("--oai_url", type=str, default=OAI_BASE_URL, help="OAI-PMH endpoint used by --source oai")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS, help="Number of pages downloaded concurrently")
+    parser.add_argument("--parse_workers", type=int, default=PARSE_WORKERS,
+                        help="Number of processes parsing pages (1 parses in the main process)")
+    parser.add_argument("--max_requests", type=int, default=RATE_LIMIT_REQUESTS,
+                        help="Requests allowed per rate-limit window")
+    parser.add_argument("--period", type=float, default=RATE_LIMIT_PERIOD,
+                        help="Length of the rate-limit window in seconds")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Adapt the pace to the server: speed up while responses are fast, back off on "
+                             "throttling, errors and rising latency (starting from --max_requests per --period)")
+    parser.add_argument("--min_interval", type=float, default=ADAPTIVE_MIN_INTERVAL,
+                        help="Shortest interval between requests in seconds with --adaptive")
+    parser.add_argument("--shard", action="store_true",
+                        help="Split the date range into shards that fit under the search result cap")
+    parser.add_argument("--max_results", type=int, default=MAX_SEARCH_RESULTS,
+                        help="Maximum number of results reachable per query (used when sharding)")
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="Journal file where completed pages are saved as they finish")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted run from its checkpoint journal")
+    parser.add_argument("--cache_dir", type=str, default=None,
+                        help="Directory of the on-disk cache of downloaded pages")
+    parser.add_argument("--cache_ttl", type=float, default=CACHE_TTL,
+                        help="Seconds a cached page is reused before revalidation")
+    parser.add_argument("--parser", type=str, choices=("bs4", "fast"), default=DEFAULT_PARSER,
+                        help="Extraction engine: BeautifulSoup reference or fast single-pass extractor")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve every page from the cache without using the network")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only scrape papers announced since the previous incremental run")
+    parser.add_argument("--state", type=str, default=STATE_PATH, help="State file of incremental runs")
+    parser.add_argument("--metrics", type=str, default=None, help="Write a JSON report of the run metrics to this file")
+    parser.add_argument("--prometheus", type=str, default=None,
+                        help="Write the run metrics to this Prometheus text file")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Profile the run with cProfile and save the statistics here")
+    parser.add_argument("--index", type=str, default=None,
+                        help="Also add the scraped papers to this full-text search index")
+    parser.add_argument("--author_index", type=str, default=None,
+                        help="Also add the scraped papers to the author index in this directory")
+    parser.add_argument("--fields", type=str, nargs="+", choices=RECORD_FIELDS, default=None,
+                        help="Only scrape these fields ('index' is required); without 'abstract', "
+                             "pages are requested with their abstracts hidden")
 
-    # Parse and validate user inputs
+    # Parse and validate user inputs; 'all' expands to every arXiv category
     args = parser.parse_args()
+    if "all" in args.category:
+        args.category = sorted(CATEGORIES)
+    # Repeated categories are only scraped once
+    args.category = list(dict.fromkeys(args.category))
     validate_inputs(args)
 
+    # Resuming needs a journal: default to one stored next to the output file
+    if args.resume and args.checkpoint is None:
+        args.checkpoint = args.output + ".checkpoint.jsonl"
+
+    return args
+
+
+def parse_search_arguments(argv=None):
+    """
+    Parses and validates the arguments of the `search` subcommand.
+
+    Args:
+        argv (list[str] | None): Arguments after 'search' (read from the command line if None).
+
+    Returns:
+        argparse.Namespace: Object containing validated search arguments.
+
+    Raises:
+        ValueError: If the index is missing, the limit is not positive, or there
+            is nothing to search or add.
+    """
+    parser = argparse.ArgumentParser(prog="arxivscraper search",
+                                     description="Full-text search over harvested titles and abstracts.")
+    parser.add_argument("query", type=str, nargs="*", help="Words that must appear in the title or abstract")
+    parser.add_argument("--index", type=str, default=SEARCH_INDEX_PATH, help="Path of the search index")
+    parser.add_argument("--add", type=str, nargs="+", default=None, metavar="FILE",
+                        help="Add the papers of these output files (CSV, JSON Lines, Parquet, SQLite or archive) "
+                             "to the index")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Format of the --add files (inferred from their extension by default)")
+    parser.add_argument("--tag", type=str, nargs="+", default=None,
+                        help="Only papers with one of these tags (or of their subcategories)")
+    parser.add_argument("--author", type=str, action="append", default=None,
+                        help="Only papers by this author (repeat for several; part of the name is enough)")
+    parser.add_argument("--since", type=str, default=None, help="Only papers submitted from this month (YYYY-MM)")
+    parser.add_argument("--until", type=str, default=None, help="Only papers submitted up to this month (YYYY-MM)")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of results")
+    parser.add_argument("--raw", action="store_true",
+                        help="Pass the query to SQLite FTS5 untouched (OR, NEAR, title:...)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON Lines")
+
+    args = parser.parse_args(argv)
+    args.query = " ".join(args.query)
+    if args.limit < 1:
+        raise ValueError("Invalid number of results provided.")
+    if not args.add and not os.path.exists(args.index):
+        raise ValueError(f"Search index not found: {args.index}. Build it with --add or scrape with --index.")
+    if not args.add and not (args.query or args.tag or args.author or args.since or args.until):
+        raise ValueError("Nothing to search: provide a query, a filter or files to --add.")
+    if args.add:
+        missing = [path for path in args.add if not os.path.exists(path)]
+        if missing:
+            raise ValueError(f"File not found: {', '.join(missing)}")
     return args
 
+
+def parse_authors_arguments(argv=None):
+    """
+    Parses and validates the arguments of the `authors` subcommand.
+
+    Args:
+        argv (list[str] | None): Arguments after 'authors' (read from the command line if None).
+
+    Returns:
+        argparse.Namespace: Object containing validated arguments.
+
+    Raises:
+        ValueError: If the index is missing, a count is not positive, or there
+            is nothing to look up or add.
+    """
+    parser = argparse.ArgumentParser(prog="arxivscraper authors",
+                                     description="Papers and collaborators of an author.")
+    parser.add_argument("name", type=str, nargs="*", help="Author name (e.g., 'Stephen W. Hawking' or 'Hawking, S.')")
+    parser.add_argument("--index", type=str, default=AUTHOR_INDEX_PATH, help="Directory of the author index")
+    parser.add_argument("--add", type=str, nargs="+", default=None, metavar="FILE",
+                        help="Add the papers of these output files (CSV, JSON Lines, Parquet, SQLite or archive) "
+                             "to the index")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Format of the --add files (inferred from their extension by default)")
+    parser.add_argument("--coauthors", type=int, default=10, help="Number of top collaborators shown")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+
+    args = parser.parse_args(argv)
+    args.name = " ".join(args.name)
+    if args.coauthors < 1:
+        raise ValueError("Invalid number of collaborators provided.")
+    if not args.add and not os.path.exists(os.path.join(args.index, "authors.sqlite")):
+        raise ValueError(f"Author index not found: {args.index}. Build it with --add or scrape with --author_index.")
+    if not args.add and not args.name:
+        raise ValueError("Nothing to look up: provide an author name or files to --add.")
+    if args.add:
+        missing = [path for path in args.add if not os.path.exists(path)]
+        if missing:
+            raise ValueError(f"File not found: {', '.join(missing)}")
+    return args
+
+
+def parse_dedup_arguments(argv=None):
+    """
+    Parses and validates the arguments of the `dedup` subcommand.
+
+    Args:
+        argv (list[str] | None): Arguments after 'dedup' (read from the command line if None).
+
+    Returns:
+        argparse.Namespace: Object containing validated arguments.
+
+    Raises:
+        ValueError: If an input is missing, the output is also an input, or the
+            threshold is not in (0, 1].
+    """
+    parser = argparse.ArgumentParser(prog="arxivscraper dedup",
+                                     description="Merge harvest files, removing duplicate papers.")
+    parser.add_argument("inputs", type=str, nargs="+", metavar="FILE",
+                        help="Harvest files to merge (CSV, JSON Lines, Parquet, SQLite or archive)")
+    parser.add_argument("--output", type=str, required=True, help="Merged output file")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Output format (inferred from the output extension by default)")
+    parser.add_argument("--input_format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"),
+                        default=None,
+                        help="Format of the input files (inferred from their extension by default)")
+    parser.add_argument("--report", type=str, default=None,
+                        help="CSV file listing the near duplicates found and the paper they match")
+    parser.add_argument("--state", type=str, default=None,
+                        help="SQLite file of the deduplication state, kept so later merges skip papers already merged")
+    parser.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD,
+                        help="Estimated Jaccard similarity of title and abstract from which papers are near duplicates")
+    parser.add_argument("--drop_near_duplicates", action="store_true",
+                        help="Leave near duplicates out of the output instead of only reporting them")
+
+    args = parser.parse_args(argv)
+    missing = [path for path in args.inputs if not os.path.exists(path)]
+    if missing:
+        raise ValueError(f"File not found: {', '.join(missing)}")
+    if any(os.path.abspath(path) == os.path.abspath(args.output) for path in args.inputs):
+        raise ValueError("The output file cannot be one of the inputs.")
+    if not 0 < args.threshold <= 1:
+        raise ValueError("The similarity threshold must be in (0, 1].")
+    check_output_path(args.output)
+    return args
+
+
+def parse_archive_arguments(argv=None):
+    """
+    Parses and validates the arguments of the `archive` subcommand.
+
+    Args:
+        argv (list[str] | None): Arguments after 'archive' (read from the command line if None).
+
+    Returns:
+        argparse.Namespace: Object containing validated arguments.
+
+    Raises:
+        ValueError: If the archive or an input is missing, a month is not in
+            YYYY-MM format, or the export file is also an input.
+    """
+    parser = argparse.ArgumentParser(prog="arxivscraper archive",
+                                     description="Build, inspect and export compressed archives of records and pages.")
+    parser.add_argument("archive", type=str, help="Archive file ('.arxz')")
+    parser.add_argument("--add", type=str, nargs="+", default=None, metavar="FILE",
+                        help="Append the records of these files (CSV, JSON Lines, Parquet, SQLite or archive)")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Format of the --add files (inferred from their extension by default)")
+    parser.add_argument("--pages", type=str, default=None, metavar="CACHE_DIR",
+                        help="Append the raw result pages stored in this response cache")
+    parser.add_argument("--codec", type=str, choices=("zstd", "zlib"), default=None,
+                        help="Compression of a new archive (zstd when zstandard is installed, zlib otherwise)")
+    parser.add_argument("--get", type=str, nargs="+", default=None, metavar="ID",
+                        help="Print these papers (an identifier without version gives the latest one)")
+    parser.add_argument("--month", type=str, nargs="+", default=None, metavar="YYYY-MM",
+                        help="Only export the papers submitted in these months")
+    parser.add_argument("--export", type=str, default=None, metavar="FILE",
+                        help="Write the records to this file (format inferred from its extension)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+
+    args = parser.parse_args(argv)
+    if not args.add and not args.pages and not os.path.exists(args.archive):
+        raise ValueError(f"Archive not found: {args.archive}. Build it with --add or --pages.")
+    if args.add:
+        missing = [path for path in args.add if not os.path.exists(path)]
+        if missing:
+            raise ValueError(f"File not found: {', '.join(missing)}")
+        if any(os.path.abspath(path) == os.path.abspath(args.archive) for path in args.add):
+            raise ValueError("The archive cannot be one of the files added to it.")
+    if args.pages and not os.path.isdir(args.pages):
+        raise ValueError(f"Cache directory not found: {args.pages}")
+    for month in args.month or ():
+        try:
+            datetime.datetime.strptime(month, "%Y-%m")
+        except ValueError:
+            raise ValueError(f"Invalid month provided: {month}. Use YYYY-MM format.")
+    if args.month and not args.export:
+        raise ValueError("--month filters the exported records: provide --export.")
+    if args.export:
+        if os.path.abspath(args.export) == os.path.abspath(args.archive):
+            raise ValueError("The export file cannot be the archive itself.")
+        check_output_path(args.export)
+    return args
+
+
+
+def parse_queue_arguments(argv=None):
+    """
+    Parses and validates the arguments of the `queue` subcommand.
+
+    Args:
+        argv (list[str] | None): Arguments after 'queue' (read from the command line if None).
+
+    Returns:
+        argparse.Namespace: Object containing validated arguments.
+
+    Raises:
+        ValueError: If an option required by the action is missing or invalid,
+            or the queue does not exist (except when planning).
+    """
+    parser = argparse.ArgumentParser(prog="arxivscraper queue",
+                                     description="Distributed harvests: a coordinator plans the result pages into "
+                                                 "a shared job queue, workers on any host process them, and "
+                                                 "the records are collected into one output.")
+    parser.add_argument("action", type=str, choices=("plan", "work", "status", "collect"),
+                        help="plan: queue the pages of a search; work: process queued pages; "
+                             "status: show the progress; collect: write the records")
+    parser.add_argument("--queue", type=str, default=JOB_QUEUE_PATH, help="SQLite file of the job queue")
+    # plan
+    parser.add_argument("--start_date", type=str, default=None, help="Start date in YYYY-MM-DD format (plan)")
+    parser.add_argument("--end_date", type=str, default=None, help="End date in YYYY-MM-DD format (plan)")
+    parser.add_argument("--category", type=str, nargs="+", default=None,
+                        help="One or more categories, or 'all' for every category (plan)")
+    parser.add_argument("--cross_list", action="store_true", help="Include cross-listed papers (plan)")
+    parser.add_argument("--shard", action="store_true",
+                        help="Split the date range into shards that fit under the search result cap (plan)")
+    parser.add_argument("--max_results", type=int, default=MAX_SEARCH_RESULTS,
+                        help="Maximum number of results reachable per query (plan)")
+    parser.add_argument("--fields", type=str, nargs="+", choices=RECORD_FIELDS, default=None,
+                        help="Only scrape these fields ('index' is required) (plan)")
+    parser.add_argument("--parser", type=str, choices=("bs4", "fast"), default=DEFAULT_PARSER,
+                        help="Extraction engine used by the workers (plan)")
+    parser.add_argument("--max_requests", type=int, default=RATE_LIMIT_REQUESTS,
+                        help="Requests allowed per rate-limit window, split between the active workers (plan)")
+    parser.add_argument("--period", type=float, default=RATE_LIMIT_PERIOD,
+                        help="Length of the rate-limit window in seconds (plan)")
+    parser.add_argument("--lease_timeout", type=float, default=JOB_LEASE_TIMEOUT,
+                        help="Seconds before the page of a silent worker is handed to another one (plan)")
+    parser.add_argument("--max_attempts", type=int, default=JOB_MAX_ATTEMPTS,
+                        help="Attempts per page before it is set aside as failed (plan)")
+    parser.add_argument("--base_url", type=str, default=None, help="Root URL of the arXiv site (plan)")
+    # work
+    parser.add_argument("--name", type=str, default=None, help="Name of the worker (host:pid by default) (work)")
+    parser.add_argument("--max_jobs", type=int, default=None, help="Stop after this number of pages (work)")
+    parser.add_argument("--poll", type=float, default=JOB_POLL_INTERVAL,
+                        help="Seconds between requests for a page while none is available (work)")
+    parser.add_argument("--cache_dir", type=str, default=None,
+                        help="Directory of the on-disk cache of downloaded pages (work)")
+    parser.add_argument("--cache_ttl", type=float, default=CACHE_TTL,
+                        help="Seconds a cached page is reused before revalidation (work)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve every page from the cache without using the network (work)")
+    # status
+    parser.add_argument("--retry_failed", action="store_true", help="Put the failed pages back in the queue (status)")
+    parser.add_argument("--json", action="store_true", help="Print the status as JSON (status)")
+    # collect
+    parser.add_argument("--output", type=str, default=None, help="Output file path (collect)")
+    parser.add_argument("--format", type=str, choices=("csv", "jsonl", "parquet", "sqlite", "archive"), default=None,
+                        help="Output format (inferred from the output extension by default) (collect)")
+    parser.add_argument("--partial", action="store_true",
+                        help="Write the records committed so far even if some pages are not done (collect)")
+
+    args = parser.parse_args(argv)
+    if args.action == "plan":
+        if not (args.start_date and args.end_date and args.category):
+            raise ValueError("Planning requires --start_date, --end_date and --category.")
+        if not check_dates(args.start_date, args.end_date):
+            raise ValueError("Invalid date range provided.")
+        if "all" in args.category:
+            args.category = sorted(CATEGORIES)
+        args.category = list(dict.fromkeys(args.category))
+        invalid = [category for category in args.category if not check_categories(category)]
+        if invalid:
+            raise ValueError(f"Invalid category provided: {', '.join(invalid)}")
+        if not check_rate_limit(1, args.max_requests, args.period) or args.max_results < 1:
+            raise ValueError("Invalid rate-limit settings provided.")
+        if args.lease_timeout <= 0 or args.max_attempts < 1:
+            raise ValueError("The lease timeout and the number of attempts must be positive.")
+        if args.fields is not None and any(field not in args.fields for field in REQUIRED_FIELDS):
+            raise ValueError(f"--fields must include: {', '.join(REQUIRED_FIELDS)}")
+        check_output_path(args.queue)
+    elif not os.path.exists(args.queue):
+        raise ValueError(f"Job queue not found: {args.queue}. Create it with 'queue plan'.")
+    if args.action == "work":
+        if args.max_jobs is not None and args.max_jobs < 1:
+            raise ValueError("Invalid maximum number of pages provided.")
+        if args.poll <= 0:
+            raise ValueError("The polling interval must be positive.")
+        if args.offline and not args.cache_dir:
+            raise ValueError("Offline mode requires --cache_dir.")
+    if args.action == "collect":
+        if not args.output:
+            raise ValueError("Collecting requires --output.")
+        check_output_path(args.output)
+    return args
+
+
 if __name__ == "__main__":
     print("This module provides a CLI for validating user inputs for the ArXiv scraper.")
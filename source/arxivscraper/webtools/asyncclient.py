@@ -0,0 +1,331 @@
+"""
+asyncclient.py
+--------------
+
+This module provides the asyncio counterparts of `TokenBucket` and `HTTPClient`,
+for services that run the scraper inside an event loop.
+
+`AsyncHTTPClient` is built on a pooled `aiohttp.ClientSession` and follows the
+same policy as `HTTPClient`: keep-alive connections limited per host, compressed
+responses, retries of transient failures (connection errors, timeouts, 429 and
+5xx responses) with exponential backoff and jitter honouring 'Retry-After', an
+optional shared rate limiter, an optional `ResponseCache` (offline mode
+included) and optional metrics. Every wait (rate limit, backoff, request) is
+awaited, so a cancelled task stops at once and the event loop is never blocked.
+
+`aiohttp` is an optional dependency, only imported when a client is used.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Mapping
+from typing import NamedTuple
+
+# --- Import request headers, retry policy and helpers from sibling modules ---
+from arxivscraper.config.config import (REQUESTS_HEADER, HTTP_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE,
+                                        HTTP_BACKOFF_MAX, HTTP_RETRY_STATUSES, HTTP_POOL_SIZE,
+                                        RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD)
+from arxivscraper.monitoring.metrics import RunMetrics
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.httpclient import parse_retry_after
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+
+def _import_aiohttp():
+    """Imports aiohttp, which is only needed by the asyncio API."""
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError("The asyncio API requires aiohttp: pip install aiohttp") from e
+    return aiohttp
+
+
+class AsyncTokenBucket(TokenBucket):
+    """
+    Token-bucket rate limiter for asyncio tasks.
+
+    Same budget as `TokenBucket`, but `acquire()` is a coroutine that waits with
+    `asyncio.sleep`, so other tasks keep running while a request waits for its
+    token. A task cancelled while waiting gives its token back. It must not be
+    passed to the (blocking) `HTTPClient`.
+
+    Args:
+        requests (int): Number of requests allowed per `period`.
+        period (float): Length of the rate-limit window in seconds.
+        burst (int | None): Maximum number of tokens that can accumulate.
+            Defaults to `requests`.
+        clock (callable): Monotonic time source (injectable for testing).
+        sleep (callable): Coroutine function used to wait (injectable for testing).
+
+    Raises:
+        ValueError: If `requests`, `period` or `burst` are not positive.
+    """
+
+    def __init__(self,
+                 requests: int = RATE_LIMIT_REQUESTS,
+                 period: float = RATE_LIMIT_PERIOD,
+                 burst: int | None = None,
+                 clock=time.monotonic,
+                 sleep=asyncio.sleep):
+        super().__init__(requests, period, burst, clock=clock, sleep=sleep)
+
+    async def acquire(self) -> float:
+        """
+        Takes one token from the bucket, waiting cooperatively until it becomes available.
+
+        Returns:
+            float: Number of seconds the caller had to wait.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await self._sleep(wait)
+            except asyncio.CancelledError:
+                # The request will not be sent, so its token can be used by another one
+                with self._lock:
+                    self._tokens += 1
+                raise
+        return wait
+
+
+class AsyncResponse(NamedTuple):
+    """
+    Status, body and headers of a response read by `AsyncHTTPClient`. The
+    headers are a case-insensitive `multidict.CIMultiDict`, as in aiohttp.
+    """
+    status: int
+    content: bytes
+    headers: Mapping[str, str]
+
+
+class AsyncHTTPClient:
+    """
+    Pooled keep-alive asyncio HTTP client with retry and backoff.
+
+    The client can be shared by the tasks of one event loop. Its session is
+    opened on first use; close it with `close()` or use the client as an
+    asynchronous context manager. Cache hits do not consume rate-limit tokens,
+    only actual network requests (including retries) do.
+
+    Args:
+        headers (dict): Headers sent with every request. Defaults to `REQUESTS_HEADER`.
+        timeout (float): Timeout in seconds for each request (connection and body).
+        max_retries (int): Number of retries after the first attempt.
+        backoff_base (float): Base wait in seconds for the exponential backoff.
+        backoff_max (float): Upper bound in seconds for a single backoff wait.
+        pool_size (int): Maximum number of connections per host.
+        limiter (AsyncTokenBucket | None): Rate limiter shared by every request, if any.
+        cache (ResponseCache | None): Cache of downloaded pages, if any.
+        offline (bool): If True, pages are served only from `cache` (stale
+            entries included) and the network is never used.
+        metrics (RunMetrics | None): Collector of request metrics, if any.
+        sleep (callable): Coroutine function used to wait (injectable for testing).
+
+    Raises:
+        ValueError: If `offline` is True but no cache is given.
+        ImportError: If `aiohttp` is not installed.
+    """
+
+    def __init__(self,
+                 headers: dict = REQUESTS_HEADER,
+                 timeout: float = HTTP_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE,
+                 backoff_max: float = HTTP_BACKOFF_MAX,
+                 pool_size: int = HTTP_POOL_SIZE,
+                 limiter: AsyncTokenBucket | None = None,
+                 cache: ResponseCache | None = None,
+                 offline: bool = False,
+                 metrics: RunMetrics | None = None,
+                 sleep=asyncio.sleep):
+        if offline and cache is None:
+            raise ValueError("Offline mode requires a response cache.")
+
+        self._aiohttp = _import_aiohttp()
+        self.headers = dict(headers)
+        self.limiter = limiter
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._sleep = sleep
+        self._session = None
+
+    @property
+    def session(self):
+        """The `aiohttp.ClientSession`, opened on first use (inside the running event loop)."""
+        if self._session is None or self._session.closed:
+            aiohttp = self._aiohttp
+            # Retries are handled by this class; aiohttp decompresses gzip/deflate (and brotli if installed)
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Computes the wait before the next retry (see `HTTPClient.backoff()`).
+
+        Args:
+            attempt (int): Number of the retry (0 for the first one).
+            retry_after (float | None): Wait requested by the server, if any.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def get(self, url: str, headers: dict | None = None) -> AsyncResponse:
+        """
+        Sends a GET request, retrying transient failures.
+
+        Args:
+            url (str): URL to request.
+            headers (dict | None): Extra headers for this request only.
+
+        Returns:
+            AsyncResponse: The final response (status 200, or 304 for conditional requests).
+
+        Raises:
+            ConnectionError: If the request keeps failing after all retries or
+                returns a non-retryable error status.
+        """
+        # multidict is installed with aiohttp
+        from multidict import CIMultiDict
+
+        aiohttp = self._aiohttp
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                waited = await self.limiter.acquire()
+                if metrics is not None:
+                    metrics.add_time("rate_limit_wait", waited)
+            if metrics is not None:
+                metrics.increment("requests")
+                if attempt:
+                    metrics.increment("retries")
+            start = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=headers) as response:
+                    status = response.status
+                    # Header names are case-insensitive: servers may send 'etag' or 'retry-after'
+                    response_headers = CIMultiDict(response.headers)
+                    content = await response.read() if status in (200, 304) else b""
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if metrics is not None:
+                    metrics.add_time("network", time.perf_counter() - start)
+                    metrics.increment("connection_errors")
+                if attempt >= self.max_retries:
+                    raise ConnectionError(f"An error occurred while fetching the URL: {url}. "
+                                          f"Error: {e!r}") from e
+                await self._wait(self.backoff(attempt))
+                attempt += 1
+                continue
+            if metrics is not None:
+                metrics.add_time("network", time.perf_counter() - start)
+
+            if status in (200, 304):
+                if metrics is not None:
+                    metrics.increment("bytes_downloaded", len(content))
+                return AsyncResponse(status, content, response_headers)
+
+            # Hold back every task sharing the limiter, not only the one that got the answer
+            retry_after = parse_retry_after(response_headers.get("Retry-After"))
+            if retry_after and self.limiter is not None:
+                self.limiter.pause(retry_after)
+
+            # Non-transient errors (e.g. 404) are reported straight away
+            if status not in HTTP_RETRY_STATUSES or attempt >= self.max_retries:
+                raise ConnectionError(f"Failed to retrieve URL: {url} with status code {status}")
+
+            if metrics is not None:
+                metrics.increment(f"http_{status}")
+            await self._wait(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    async def _wait(self, delay: float) -> None:
+        """Waits before a retry, reporting the wait to the metrics collector."""
+        if self.metrics is not None:
+            self.metrics.add_time("backoff", delay)
+        await self._sleep(delay)
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Downloads the body of a URL, going through the cache when one is configured.
+
+        Cache files are read and written in a worker thread, so the event loop
+        is not blocked by disk I/O. See `HTTPClient.fetch()`.
+
+        Args:
+            url (str): URL to download.
+
+        Returns:
+            bytes: The (decompressed) response body.
+
+        Raises:
+            ConnectionError: If the page cannot be retrieved (or, in offline
+                mode, if it is not cached).
+        """
+        if self.cache is None:
+            return (await self.get(url)).content
+
+        entry = await asyncio.to_thread(self.cache.get, url)
+        if entry is not None and (entry.fresh or self.offline):
+            if self.metrics is not None:
+                self.metrics.increment("cache_hits")
+            return entry.content
+        if self.offline:
+            raise ConnectionError(f"URL not available in the cache (offline mode): {url}")
+
+        # Ask the server to send the page only if it changed since it was cached
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        response = await self.get(url, headers=headers or None)
+        if response.status == 304 and entry is not None:
+            if self.metrics is not None:
+                self.metrics.increment("not_modified")
+            await asyncio.to_thread(self.cache.touch, url)
+            return entry.content
+
+        await asyncio.to_thread(self.cache.put, url, response.content, response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"))
+        return response.content
+
+    async def close(self) -> None:
+        """Closes every pooled connection and saves the cache access times."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.flush)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides an asyncio HTTP client and rate limiter for arXiv requests.")
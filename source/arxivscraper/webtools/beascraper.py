@@ -7,6 +7,8 @@ from arXiv pages (or other websites) using the `requests` library and BeautifulS
 
 It defines a single function, `get_soup()`, which retrieves the HTML content
 from a given URL, handles possible HTTP errors, and returns a parsed BeautifulSoup object.
+Requests go through a pooled `HTTPClient` (see `webtools.httpclient`), which reuses
+connections and retries transient failures before giving up.
 
 Authors:
     - Alejandro Cano Jones (acanojo@uoc.edu)
@@ -17,44 +19,34 @@ Subject:
 """
 
 
-import requests
 from bs4 import BeautifulSoup
 
 
 # ---------------------------------------------------------------------
-# Import global request headers from the configuration module.
-# If the import fails (e.g., due to path issues in Google Colab),
-# the script adjusts the Python path dynamically.
+# Import the shared HTTP client from the webtools package.
 # ---------------------------------------------------------------------
 
-try:
-    from arxivscraper.config.config import REQUESTS_HEADER
-except Exception:
-    import os
-    import sys
-
-    _this = os.path.abspath(__file__)
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(_this)))
-    if PROJECT_ROOT not in sys.path:
-        sys.path.insert(0, PROJECT_ROOT)
-
-    from arxivscraper.config.config import REQUESTS_HEADER
+from arxivscraper.webtools.httpclient import HTTPClient, get_default_client
 
 
 # ---------------------------------------------------------------------
 # HTML Retrieval and Parsing Function
 # ---------------------------------------------------------------------
 
-def get_soup(url: str) -> BeautifulSoup | None:
+def get_soup(url: str, client: HTTPClient | None = None) -> BeautifulSoup | None:
     """
     Fetches and parses the HTML content of a given URL using BeautifulSoup.
 
     This function sends an HTTP GET request to the specified URL with
     the configured headers. If the request is successful (status code 200),
     it returns a BeautifulSoup object representing the parsed HTML document.
+    Transient failures (connection errors, 429 and 5xx responses) are retried
+    with exponential backoff by the HTTP client.
 
     Args:
         url (str): The full URL of the page to scrape.
+        client (HTTPClient | None): Client used for the request. Defaults to
+            the shared client returned by `get_default_client()`.
 
     Returns:
         BeautifulSoup | None:
@@ -62,7 +54,8 @@ def get_soup(url: str) -> BeautifulSoup | None:
             - None if an error occurred.
 
     Raises:
-        ConnectionError: If the request fails or returns a non-200 status code.
+        ConnectionError: If the request still fails after all retries or returns
+            a non-retryable error status.
 
     Example:
         >>> soup = get_soup("https://arxiv.org/search/advanced?
@@ -72,16 +65,9 @@ def get_soup(url: str) -> BeautifulSoup | None:
         date-date_type=announced_date_first&abstracts=show&size=50&order=-announced_date_first")
         >>> print(soup.title.string)
     """
-    try:
-        response = requests.get(url, headers=REQUESTS_HEADER)
-        
-        # Ensure the request was successful
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, "html.parser")
-            return soup
-
-        # Raise an explicit error for unexpected status codes
-        else:
-            raise ConnectionError(f"Failed to retrieve URL: {url} with status code {response.status_code}")
-    except requests.RequestException as e:
-        raise ConnectionError(f"An error occurred while fetching the URL: {url}. Error: {e}")
+    if client is None:
+        client = get_default_client()
+
+    content = client.fetch(url)
+    soup = BeautifulSoup(content, "html.parser")
+    return soup
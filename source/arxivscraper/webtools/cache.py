@@ -0,0 +1,299 @@
+"""
+cache.py
+--------
+
+This module implements a local on-disk cache of raw arXiv result pages.
+
+Entries are keyed by a hash of the normalised request URL (scheme and host
+lower-cased, query parameters sorted), so the same category/date window always
+maps to the same entry. Each entry stores the gzip-compressed page together
+with a small JSON metadata file holding the original URL, the 'ETag' and
+'Last-Modified' validators and the fetch and access times.
+
+Entries younger than the TTL are served without touching the network; older
+ones are revalidated by `HTTPClient` with a conditional request. When the
+cache grows beyond its size limit, the least recently used entries are evicted.
+Hits only update the access time kept in memory, and are read and decompressed
+outside the lock, so concurrent hits neither wait for each other nor write to
+disk; access times are saved with the next `put()` or by `flush()`.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# --- Import cache limits from the configuration module ---
+from arxivscraper.config.config import CACHE_TTL, CACHE_MAX_BYTES
+
+
+class CacheEntry(NamedTuple):
+    """A cached page and its validators."""
+    url: str
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    fresh: bool
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalises a URL so equivalent queries share a cache entry.
+
+    Args:
+        url (str): URL to normalise.
+
+    Returns:
+        str: The URL with lower-case scheme and host, sorted query parameters
+            and no fragment.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of compressed pages stored on disk.
+
+    The instance keeps a small in-memory index (entry size and last access time)
+    so lookups and evictions never need to scan the directory. It is safe to
+    share between threads. Call `flush()` (or `close()`, or use the cache as a
+    context manager) to save the access times of the latest hits.
+
+    Args:
+        directory (str): Directory where the cache is stored (created if missing).
+        ttl (float): Seconds during which an entry is served without revalidation.
+        max_bytes (int): Maximum total size of the compressed pages.
+    """
+
+    def __init__(self, directory: str, ttl: float = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = {}
+        self._size = 0
+        # Keys whose access time changed since it was last saved
+        self._accessed = set()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        """Returns the page and metadata paths of a key."""
+        base = os.path.join(self.directory, key[:2], key)
+        return base + ".html.gz", base + ".json"
+
+    def _load_index(self) -> None:
+        """Builds the in-memory index from the metadata files on disk."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(root, name), encoding="utf-8") as file:
+                        meta = json.load(file)
+                except (OSError, ValueError):
+                    continue
+                key = name[:-len(".json")]
+                self._index[key] = [meta["size"], meta["accessed"]]
+                self._size += meta["size"]
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Writes a file through a temporary name so readers never see partial data."""
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+
+    def _read_meta(self, key: str) -> dict | None:
+        """Reads the metadata of a key, or returns None if it is missing."""
+        try:
+            with open(self._paths(key)[1], encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key: str, meta: dict) -> None:
+        """Stores the metadata of a key."""
+        self._write_atomic(self._paths(key)[1], json.dumps(meta).encode("utf-8"))
+
+    def _forget(self, key: str) -> None:
+        """Drops a key from the index (lock held)."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._size -= entry[0]
+        self._accessed.discard(key)
+
+    def _save_access_times(self) -> None:
+        """Writes the access times of the latest hits to their metadata (lock held)."""
+        for key in self._accessed:
+            meta = self._read_meta(key)
+            if meta is not None and key in self._index:
+                meta["accessed"] = self._index[key][1]
+                self._write_meta(key, meta)
+        self._accessed.clear()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the size limit is met (lock held)."""
+        if self._size <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][1]):
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._forget(key)
+            if self._size <= self.max_bytes:
+                break
+
+    # ---------------------------------------------------------------------
+    # Public interface
+    # ---------------------------------------------------------------------
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Computes the cache key of a URL.
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            str: SHA-256 hex digest of the normalised URL.
+        """
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> CacheEntry | None:
+        """
+        Looks up a page and marks it as recently used (in memory only).
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            CacheEntry | None: The cached page (fresh or stale), or None if it is not cached.
+        """
+        key = self.key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index[key][1] = time.time()
+            self._accessed.add(key)
+
+        # Files are replaced atomically, so they can be read without the lock
+        meta = self._read_meta(key)
+        try:
+            with open(self._paths(key)[0], "rb") as file:
+                content = gzip.decompress(file.read())
+        except (OSError, EOFError, gzip.BadGzipFile):
+            meta = None
+        if meta is None:
+            # Entry damaged, evicted or removed behind our back: forget it
+            with self._lock:
+                self._forget(key)
+            return None
+
+        fresh = time.time() - meta["fetched_at"] < self.ttl
+        return CacheEntry(meta["url"], content, meta.get("etag"), meta.get("last_modified"), meta["fetched_at"], fresh)
+
+    def put(self, url: str, content: bytes, etag: str | None = None, last_modified: str | None = None) -> None:
+        """
+        Stores a page, evicting old entries if the cache becomes too large.
+
+        Args:
+            url (str): Request URL.
+            content (bytes): Page body.
+            etag (str | None): Value of the 'ETag' response header.
+            last_modified (str | None): Value of the 'Last-Modified' response header.
+        """
+        key = self.key(url)
+        compressed = gzip.compress(content)
+        now = time.time()
+        meta = {"url": url, "etag": etag, "last_modified": last_modified,
+                "fetched_at": now, "accessed": now, "size": len(compressed)}
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self._paths(key)[0]), exist_ok=True)
+            self._write_atomic(self._paths(key)[0], compressed)
+            self._write_meta(key, meta)
+            self._forget(key)
+            self._index[key] = [len(compressed), now]
+            self._size += len(compressed)
+            self._evict()
+            self._save_access_times()
+
+    def touch(self, url: str) -> None:
+        """
+        Marks a cached page as fresh again after a successful revalidation (304).
+
+        Args:
+            url (str): Request URL.
+        """
+        key = self.key(url)
+        with self._lock:
+            meta = self._read_meta(key)
+            if meta is not None:
+                meta["fetched_at"] = meta["accessed"] = time.time()
+                self._write_meta(key, meta)
+                if key in self._index:
+                    self._index[key][1] = meta["accessed"]
+                self._accessed.discard(key)
+
+    def page_files(self) -> list[tuple[str, str]]:
+        """
+        Lists the cached pages without reading them.
+
+        Returns:
+            list[tuple[str, str]]: (URL, path of the gzip-compressed page) for
+                every entry, sorted by URL.
+        """
+        with self._lock:
+            keys = list(self._index)
+        files = []
+        for key in keys:
+            meta = self._read_meta(key)
+            if meta is not None:
+                files.append((meta["url"], self._paths(key)[0]))
+        return sorted(files)
+
+    def flush(self) -> None:
+        """Saves the access times of the latest hits, so the LRU order survives the process."""
+        with self._lock:
+            self._save_access_times()
+
+    def close(self) -> None:
+        """Saves the pending access times. The cache remains usable."""
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("This module provides an on-disk cache of arXiv result pages.")
@@ -0,0 +1,106 @@
+"""
+fetcher.py
+----------
+
+This module schedules the download of arXiv result pages on a bounded pool of
+worker threads. All workers share a single `TokenBucket` (either passed here or
+held by the `HTTPClient` used by `fetch`), so the politeness limit holds
+globally while page N+1 is already downloading as page N is parsed.
+
+Results are yielded in the same order as the input URLs, and at most `workers`
+downloads are kept in flight, which bounds the memory used by pages waiting to
+be consumed.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# --- Import defaults and helpers from sibling modules ---
+from arxivscraper.config.config import FETCH_WORKERS
+from arxivscraper.webtools.beascraper import get_soup
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+
+def fetch_pages(urls: Iterable[str],
+                fetch: Callable[[str], Any] = get_soup,
+                limiter: TokenBucket | None = None,
+                workers: int = FETCH_WORKERS) -> Iterator[tuple[str, Any]]:
+    """
+    Downloads pages concurrently while respecting a shared rate limit.
+
+    When `limiter` is given, each worker takes a token from it before calling
+    `fetch`, so the number of requests per window never exceeds the configured
+    budget no matter how many workers are used, and reports how long the call
+    took (and whether it failed) back to it. Pass no limiter when `fetch`
+    already goes through a rate-limited `HTTPClient`. Pages are yielded in
+    input order.
+
+    Args:
+        urls (Iterable[str]): URLs to download.
+        fetch (Callable[[str], Any]): Function that downloads (and optionally
+            parses) a URL. Defaults to `get_soup`.
+        limiter (TokenBucket | None): Shared rate limiter applied to every call
+            to `fetch`, if any.
+        workers (int): Maximum number of concurrent downloads.
+
+    Yields:
+        tuple[str, Any]: The URL and the value returned by `fetch` for it.
+
+    Raises:
+        ValueError: If `workers` is lower than 1.
+        ConnectionError: Propagated from `fetch` when a page cannot be retrieved.
+    """
+    if workers < 1:
+        raise ValueError("The number of workers must be at least 1.")
+
+    def task(url: str) -> Any:
+        if limiter is None:
+            return fetch(url)
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            page = fetch(url)
+        except BaseException:
+            limiter.observe(time.perf_counter() - start, None)
+            raise
+        limiter.observe(time.perf_counter() - start, 200)
+        return page
+
+    url_iter = iter(urls)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arxiv-fetch")
+    pending = deque()
+    try:
+        # Fill the pipeline with the first batch of downloads
+        for url in url_iter:
+            pending.append((url, pool.submit(task, url)))
+            if len(pending) >= workers:
+                break
+
+        while pending:
+            url, future = pending.popleft()
+
+            # Keep the pool busy: schedule the next download before waiting on this one
+            next_url = next(url_iter, None)
+            if next_url is not None:
+                pending.append((next_url, pool.submit(task, next_url)))
+
+            yield url, future.result()
+    finally:
+        # Cancel queued downloads if the consumer stops early or an error occurs
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    print("This module schedules concurrent, rate-limited downloads of arXiv pages.")
@@ -0,0 +1,310 @@
+"""
+httpclient.py
+-------------
+
+This module provides `HTTPClient`, a reusable HTTP client for arXiv requests
+built on a pooled `requests.Session`.
+
+Compared to calling `requests.get` for every page, the client:
+
+- keeps connections alive and reuses them (no new TCP+TLS handshake per page),
+- negotiates compressed responses (gzip, deflate and brotli when available),
+- limits the number of connections opened to a single host,
+- retries transient failures (connection errors, 429 and 5xx responses) with
+  exponential backoff and jitter, honouring the server's 'Retry-After' header,
+  which also pauses the shared rate limiter so every other worker waits too,
+- takes a token from an optional shared rate limiter before every network request,
+  and reports the latency and status of the request back to it (for adaptive pacing),
+- optionally serves pages from a `ResponseCache`, revalidating stale entries
+  with conditional requests ('If-None-Match' / 'If-Modified-Since'),
+- optionally reports rate-limit waits, request times, retries, cache hits and
+  bytes downloaded to a `RunMetrics` collector.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# --- Import request headers and retry policy from the configuration module ---
+from arxivscraper.config.config import (REQUESTS_HEADER, HTTP_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE,
+                                        HTTP_BACKOFF_MAX, HTTP_RETRY_STATUSES, HTTP_POOL_SIZE)
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.ratelimit import TokenBucket
+from arxivscraper.monitoring.metrics import RunMetrics
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses the value of a 'Retry-After' header.
+
+    Args:
+        value (str | None): Header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        float | None: Number of seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class HTTPClient:
+    """
+    Pooled keep-alive HTTP client with retry and backoff.
+
+    A single instance can be shared by several threads; the underlying
+    connection pool blocks once `pool_size` connections to a host are in use.
+    Cache hits do not consume rate-limit tokens, only actual network requests
+    (including retries) do.
+
+    Args:
+        headers (dict): Headers sent with every request. Defaults to `REQUESTS_HEADER`.
+        timeout (float): Timeout in seconds for each request.
+        max_retries (int): Number of retries after the first attempt.
+        backoff_base (float): Base wait in seconds for the exponential backoff.
+        backoff_max (float): Upper bound in seconds for a single backoff wait.
+        pool_size (int): Maximum number of connections per host.
+        limiter (TokenBucket | None): Rate limiter shared by every request, if any.
+        cache (ResponseCache | None): Cache of downloaded pages, if any.
+        offline (bool): If True, pages are served only from `cache` (stale
+            entries included) and the network is never used.
+        metrics (RunMetrics | None): Collector of request metrics, if any.
+        sleep (callable): Sleep function (injectable for testing).
+
+    Raises:
+        ValueError: If `offline` is True but no cache is given.
+    """
+
+    def __init__(self,
+                 headers: dict = REQUESTS_HEADER,
+                 timeout: float = HTTP_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_base: float = HTTP_BACKOFF_BASE,
+                 backoff_max: float = HTTP_BACKOFF_MAX,
+                 pool_size: int = HTTP_POOL_SIZE,
+                 limiter: TokenBucket | None = None,
+                 cache: ResponseCache | None = None,
+                 offline: bool = False,
+                 metrics: RunMetrics | None = None,
+                 sleep=time.sleep):
+        if offline and cache is None:
+            raise ValueError("Offline mode requires a response cache.")
+
+        self.limiter = limiter
+        self.cache = cache
+        self.offline = offline
+        self.metrics = metrics
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # Advertise every encoding urllib3 can decode (brotli only if installed)
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+        # Retries are handled by this class, so the adapter itself never retries
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Computes the wait before the next retry.
+
+        Uses exponential backoff with full jitter; a 'Retry-After' value sent by
+        the server is always honoured as the minimum wait.
+
+        Args:
+            attempt (int): Number of the retry (0 for the first one).
+            retry_after (float | None): Wait requested by the server, if any.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get(self, url: str, headers: dict | None = None) -> requests.Response:
+        """
+        Sends a GET request, retrying transient failures.
+
+        Args:
+            url (str): URL to request.
+            headers (dict | None): Extra headers for this request only.
+
+        Returns:
+            requests.Response: The final response (status 200, or 304 for conditional requests).
+
+        Raises:
+            ConnectionError: If the request keeps failing after all retries or
+                returns a non-retryable error status.
+        """
+        metrics = self.metrics
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                waited = self.limiter.acquire()
+                if metrics is not None:
+                    metrics.add_time("rate_limit_wait", waited)
+            if metrics is not None:
+                metrics.increment("requests")
+                if attempt:
+                    metrics.increment("retries")
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                latency = time.perf_counter() - start
+                if self.limiter is not None:
+                    self.limiter.observe(latency, None)
+                if metrics is not None:
+                    metrics.add_time("network", latency)
+                    metrics.increment("connection_errors")
+                if attempt >= self.max_retries:
+                    raise ConnectionError(f"An error occurred while fetching the URL: {url}. Error: {e}")
+                self._wait(self.backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # Interrupted: the token is still reported, so adaptive limiters free its slot
+                if self.limiter is not None:
+                    self.limiter.observe(time.perf_counter() - start, None)
+                raise
+            latency = time.perf_counter() - start
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if self.limiter is not None:
+                self.limiter.observe(latency, response.status_code, retry_after)
+                # Hold back every worker sharing the limiter, not only the one that got the answer
+                if retry_after:
+                    self.limiter.pause(retry_after)
+            if metrics is not None:
+                metrics.add_time("network", latency)
+
+            if response.status_code in (200, 304):
+                if metrics is not None:
+                    metrics.increment("bytes_downloaded", len(response.content))
+                return response
+
+            # Non-transient errors (e.g. 404) are reported straight away
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt >= self.max_retries:
+                raise ConnectionError(f"Failed to retrieve URL: {url} with status code {response.status_code}")
+
+            if metrics is not None:
+                metrics.increment(f"http_{response.status_code}")
+            response.close()
+            self._wait(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    def _wait(self, delay: float) -> None:
+        """Sleeps before a retry, reporting the wait to the metrics collector."""
+        if self.metrics is not None:
+            self.metrics.add_time("backoff", delay)
+        self._sleep(delay)
+
+    def fetch(self, url: str) -> bytes:
+        """
+        Downloads the body of a URL, going through the cache when one is configured.
+
+        Fresh cache entries are returned directly. Stale entries are revalidated
+        with a conditional request and reused if the server answers 304.
+
+        Args:
+            url (str): URL to download.
+
+        Returns:
+            bytes: The (decompressed) response body.
+
+        Raises:
+            ConnectionError: If the page cannot be retrieved (or, in offline
+                mode, if it is not cached).
+        """
+        if self.cache is None:
+            return self.get(url).content
+
+        entry = self.cache.get(url)
+        if entry is not None and (entry.fresh or self.offline):
+            if self.metrics is not None:
+                self.metrics.increment("cache_hits")
+            return entry.content
+        if self.offline:
+            raise ConnectionError(f"URL not available in the cache (offline mode): {url}")
+
+        # Ask the server to send the page only if it changed since it was cached
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.get(url, headers=headers or None)
+        if response.status_code == 304 and entry is not None:
+            if self.metrics is not None:
+                self.metrics.increment("not_modified")
+            self.cache.touch(url)
+            return entry.content
+
+        self.cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.content
+
+    def close(self) -> None:
+        """Closes every pooled connection and saves the cache access times."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ---------------------------------------------------------------------
+# Shared default client
+# ---------------------------------------------------------------------
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HTTPClient:
+    """
+    Returns the process-wide `HTTPClient`, creating it on first use.
+
+    Returns:
+        HTTPClient: The shared client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
+
+
+if __name__ == "__main__":
+    print("This module provides a pooled HTTP client with retry and backoff for arXiv requests.")
@@ -0,0 +1,179 @@
+"""
+oaipmh.py
+---------
+
+This module harvests paper metadata through the arXiv OAI-PMH interface, as a
+bulk alternative to scraping the search result pages.
+
+A `ListRecords` request with the 'arXiv' metadata format returns up to a
+thousand records per response as compact XML, and a resumption token to request
+the next batch. Responses are parsed incrementally with `iterparse`, clearing
+each record once it has been converted, and mapped onto the same schema as the
+scraped pages (see `RECORD_FIELDS`):
+
+- index: the arXiv identifier (e.g., '2507.08819'),
+- title: with its line breaks and indentation collapsed,
+- abstract: likewise, except for paragraph breaks (an indented line in the
+  metadata), kept as '\\n  ' like on the search pages,
+- tags: the categories of the paper, primary category first,
+- authors: 'forenames keyname suffix' of every author.
+
+Note that OAI-PMH selects records by datestamp (last change of the metadata),
+not by announcement date, so a date range can also return older papers whose
+metadata was updated within it.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+# --- Import necessary constants from the configuration module ---
+from arxivscraper.config.config import OAI_BASE_URL, PHYSICS_CATEGORIES
+
+
+# XML namespaces of the OAI-PMH envelope and of the 'arXiv' metadata format
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+METADATA_PREFIX = "arXiv"
+
+# Paragraph break in an abstract: a new line starting with an indentation
+_PARAGRAPH_RE = re.compile(r'\n[ \t]+')
+
+
+class OAIPage(NamedTuple):
+    """Records of one ListRecords response and the token of the next one."""
+    records: list[dict]
+    token: str | None
+    complete_size: int | None
+
+
+def oai_set(category: str) -> str:
+    """
+    Returns the OAI-PMH set of an arXiv category.
+
+    Args:
+        category (str): Category code (e.g., 'gr-qc', 'math').
+
+    Returns:
+        str: The set spec (e.g., 'physics:gr-qc', 'math').
+    """
+    return f"physics:{category}" if category in PHYSICS_CATEGORIES else category
+
+
+def list_records_url(category: str | None = None,
+                     start_date: str | None = None,
+                     end_date: str | None = None,
+                     token: str | None = None,
+                     base_url: str = OAI_BASE_URL) -> str:
+    """
+    Builds the URL of a ListRecords request.
+
+    Args:
+        category (str | None): Category whose set is harvested (all sets if None).
+        start_date (str | None): First datestamp (YYYY-MM-DD), inclusive.
+        end_date (str | None): Last datestamp (YYYY-MM-DD), inclusive.
+        token (str | None): Resumption token of a previous response. When given,
+            the other arguments are ignored, as the protocol requires.
+        base_url (str): OAI-PMH endpoint. Defaults to `OAI_BASE_URL`; can point to
+            a local server that replays recorded responses.
+
+    Returns:
+        str: The request URL.
+    """
+    if token is not None:
+        return f"{base_url}?{urlencode({'verb': 'ListRecords', 'resumptionToken': token})}"
+    parameters = {"verb": "ListRecords", "metadataPrefix": METADATA_PREFIX}
+    if category is not None:
+        parameters["set"] = oai_set(category)
+    if start_date is not None:
+        parameters["from"] = start_date
+    if end_date is not None:
+        parameters["until"] = end_date
+    return f"{base_url}?{urlencode(parameters)}"
+
+
+def _text(element: ET.Element | None) -> str:
+    """Returns the text of an element with its whitespace collapsed."""
+    if element is None or element.text is None:
+        return ""
+    return " ".join(element.text.split())
+
+
+def _abstract(element: ET.Element | None) -> str:
+    """Returns an abstract with its line wrapping collapsed and its paragraphs kept."""
+    if element is None or element.text is None:
+        return ""
+    paragraphs = _PARAGRAPH_RE.split(element.text.strip())
+    return "\n  ".join(" ".join(paragraph.split()) for paragraph in paragraphs)
+
+
+def _record(metadata: ET.Element) -> dict:
+    """Maps an 'arXiv' metadata element onto a scraped record."""
+    authors = []
+    for author in metadata.iterfind(f"{ARXIV_NS}authors/{ARXIV_NS}author"):
+        parts = (_text(author.find(f"{ARXIV_NS}{name}")) for name in ("forenames", "keyname", "suffix"))
+        authors.append(" ".join(part for part in parts if part))
+    return {
+        "index": _text(metadata.find(f"{ARXIV_NS}id")),
+        "title": _text(metadata.find(f"{ARXIV_NS}title")),
+        "tags": _text(metadata.find(f"{ARXIV_NS}categories")).split(),
+        "authors": authors,
+        "abstract": _abstract(metadata.find(f"{ARXIV_NS}abstract")),
+    }
+
+
+def parse_list_records(content: bytes) -> OAIPage:
+    """
+    Parses a ListRecords response incrementally.
+
+    Each record is converted and cleared as soon as its closing tag is read, so
+    the parsed tree never holds more than one record. Deleted records are skipped.
+
+    Args:
+        content (bytes): Raw XML response.
+
+    Returns:
+        OAIPage: The records, the resumption token (None on the last response)
+            and the complete list size announced by the server, if any.
+
+    Raises:
+        ValueError: If the response is not well-formed XML or reports an
+            OAI-PMH error other than 'noRecordsMatch'.
+    """
+    records = []
+    token = None
+    complete_size = None
+    try:
+        for _, element in ET.iterparse(io.BytesIO(content), events=("end",)):
+            if element.tag == f"{OAI_NS}record":
+                metadata = element.find(f"{OAI_NS}metadata/{ARXIV_NS}arXiv")
+                if metadata is not None:
+                    records.append(_record(metadata))
+                element.clear()
+            elif element.tag == f"{OAI_NS}resumptionToken":
+                # The last response carries an empty token
+                token = (element.text or "").strip() or None
+                size = element.get("completeListSize")
+                complete_size = int(size) if size and size.isdigit() else None
+            elif element.tag == f"{OAI_NS}error":
+                code = element.get("code")
+                if code == "noRecordsMatch":
+                    return OAIPage([], None, 0)
+                raise ValueError(f"OAI-PMH error {code}: {_text(element)}")
+    except ET.ParseError as e:
+        raise ValueError(f"Malformed OAI-PMH response: {e}") from e
+    return OAIPage(records, token, complete_size)
+
+
+if __name__ == "__main__":
+    print("This module harvests arXiv metadata records through the OAI-PMH interface.")
@@ -0,0 +1,226 @@
+"""
+pacing.py
+---------
+
+This module provides `AdaptiveTokenBucket`, a rate limiter that adapts the pace
+of the requests to how the server responds, instead of keeping a fixed rate.
+
+It is a `TokenBucket` driven by AIMD (additive increase, multiplicative
+decrease), the congestion control scheme of TCP. `HTTPClient` reports the
+latency and status of every request through `observe()`:
+
+- a healthy response (200/304 while the average latency stays under
+  `latency_target`) adds `step` requests per minute to the rate. After
+  `concurrency` healthy responses in a row, one more request may be in flight;
+- throttling (429 and 5xx responses, connection errors and timeouts) or an
+  average latency over `latency_target` multiplies the rate by `factor` and
+  halves the requests in flight. Requests sent before a decrease do not cause
+  another one, so a burst of errors from requests sent together counts once;
+- a 'Retry-After' header also pauses every request for the whole time asked.
+
+The steady interval between requests never goes below `min_interval` nor above
+`max_interval` (a 'Retry-After' pause is not capped), and no more than
+`max_concurrency` requests are in flight.
+Every decrease and pause, and the increases that change the concurrency or
+reach the floor, are logged (and kept in `decisions`). The number of
+increases, decreases and pauses is also reported to the metrics collector.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import threading
+import time
+from collections import deque
+
+# --- Import the pacing policy and the base limiter from sibling modules ---
+from arxivscraper.config.config import (ADAPTIVE_BACKOFF_FACTOR, ADAPTIVE_LATENCY_TARGET, ADAPTIVE_MAX_INTERVAL,
+                                        ADAPTIVE_MIN_INTERVAL, ADAPTIVE_RATE_STEP, HTTP_RETRY_STATUSES,
+                                        RATE_LIMIT_PERIOD, RATE_LIMIT_REQUESTS)
+from arxivscraper.monitoring.metrics import RunMetrics
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+# Weight of the latest response in the moving average of the latency
+_LATENCY_SMOOTHING = 0.3
+
+# Number of decisions kept in `decisions`
+_MAX_DECISIONS = 1000
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket whose rate and concurrency follow the health of the server.
+
+    The bucket holds a single token (requests are spread evenly), and
+    `acquire()` also waits for a free slot among the requests in flight; the
+    slot is freed when the outcome of the request is reported to `observe()`.
+
+    Args:
+        requests (int): Initial number of requests per `period`.
+        period (float): Length of the initial rate-limit window in seconds.
+        min_interval (float): Hard floor of the interval between requests, in seconds.
+        max_interval (float): Longest steady interval between requests, in
+            seconds. Pauses asked by 'Retry-After' headers may be longer.
+        max_concurrency (int): Maximum number of requests in flight (usually
+            the number of download workers). The initial concurrency.
+        step (float): Requests per minute added to the rate by a healthy response.
+        factor (float): Multiplier of the rate on throttling, in (0, 1).
+        latency_target (float): Average latency in seconds above which the
+            server is considered overloaded.
+        metrics (RunMetrics | None): Collector of the decision counters, if any.
+        log (callable | None): Function receiving a message for every logged
+            decision. Defaults to `print`; None disables it.
+        clock (callable): Monotonic time source (injectable for testing).
+        sleep (callable): Sleep function (injectable for testing).
+
+    Raises:
+        ValueError: If a limit is not positive, the intervals are not ordered
+            or `factor` is not in (0, 1).
+    """
+
+    def __init__(self,
+                 requests: int = RATE_LIMIT_REQUESTS,
+                 period: float = RATE_LIMIT_PERIOD,
+                 min_interval: float = ADAPTIVE_MIN_INTERVAL,
+                 max_interval: float = ADAPTIVE_MAX_INTERVAL,
+                 max_concurrency: int = 1,
+                 step: float = ADAPTIVE_RATE_STEP,
+                 factor: float = ADAPTIVE_BACKOFF_FACTOR,
+                 latency_target: float = ADAPTIVE_LATENCY_TARGET,
+                 metrics: RunMetrics | None = None,
+                 log=print,
+                 clock=time.monotonic,
+                 sleep=time.sleep):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("The pacing intervals must be positive, the minimum not above the maximum.")
+        if max_concurrency < 1 or step <= 0 or latency_target <= 0:
+            raise ValueError("The concurrency, rate step and latency target must be positive.")
+        if not 0 < factor < 1:
+            raise ValueError("The backoff factor must be in (0, 1).")
+        interval = min(max(period / requests, min_interval), max_interval) if requests > 0 else max_interval
+        super().__init__(requests=1, period=interval, burst=1, clock=clock, sleep=sleep)
+
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.step = step
+        self.factor = factor
+        self.latency_target = latency_target
+        self.metrics = metrics
+        self.latency = None
+        self.decisions = deque(maxlen=_MAX_DECISIONS)
+        self._log = log
+        self._healthy = 0
+        self._last_decrease = None
+        self._at_floor = interval <= min_interval
+        self._control = threading.Lock()
+        self._slots = threading.Condition()
+        self._in_flight = 0
+
+    @property
+    def interval(self) -> float:
+        """Current interval between requests, in seconds."""
+        return 1 / self.rate
+
+    def acquire(self) -> float:
+        """
+        Waits for a free slot among the requests in flight, then for a token.
+
+        Returns:
+            float: Number of seconds the caller had to wait.
+        """
+        start = self._clock()
+        with self._slots:
+            while self._in_flight >= self.concurrency:
+                self._slots.wait()
+            self._in_flight += 1
+        try:
+            super().acquire()
+        except BaseException:
+            self._release()
+            raise
+        return self._clock() - start
+
+    def _release(self) -> None:
+        with self._slots:
+            self._in_flight = max(0, self._in_flight - 1)
+            self._slots.notify_all()
+
+    def _count(self, counter: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(counter)
+
+    def _decide(self, action: str, reason: str) -> None:
+        """Records a decision and logs it."""
+        decision = {"action": action, "reason": reason, "interval": self.interval, "concurrency": self.concurrency}
+        self.decisions.append(decision)
+        if self._log is not None:
+            self._log(f"Adaptive pacing: {action} ({reason}): one request every {self.interval:.2f} s, "
+                      f"{self.concurrency} in flight")
+
+    def observe(self, latency: float, status: int | None, retry_after: float | None = None) -> None:
+        """
+        Adjusts the pace to the outcome of a request and frees its slot.
+
+        Args:
+            latency (float): Seconds the request took.
+            status (int | None): HTTP status, or None if the request failed
+                without a response (connection error, timeout).
+            retry_after (float | None): Seconds asked by a 'Retry-After' header, if any.
+        """
+        self._release()
+        with self._control:
+            if status in (200, 304):
+                self.latency = latency if self.latency is None else \
+                    (1 - _LATENCY_SMOOTHING) * self.latency + _LATENCY_SMOOTHING * latency
+                if self.latency > self.latency_target:
+                    self._decrease(latency, f"average latency {self.latency:.2f} s over {self.latency_target:.2f} s")
+                else:
+                    self._increase()
+            elif status is None or status in HTTP_RETRY_STATUSES:
+                self._decrease(latency, "connection error" if status is None else f"HTTP {status}")
+            if retry_after:
+                self.pause(retry_after)
+                self._count("pacing_pauses")
+                self._decide("pause", f"Retry-After {retry_after:.0f} s")
+
+    def _increase(self) -> None:
+        """Additive increase of the rate, and of the concurrency once per round of healthy responses."""
+        self._healthy += 1
+        rate = min(self.rate + self.step / 60, 1 / self.min_interval)
+        if rate > self.rate:
+            self.set_rate(1, 1 / rate, burst=1)
+            self._count("pacing_increases")
+        if self._healthy >= self.concurrency and self.concurrency < self.max_concurrency:
+            self._healthy = 0
+            with self._slots:
+                self.concurrency += 1
+                self._slots.notify_all()
+            self._decide("increase", "healthy responses")
+        elif not self._at_floor and self.interval <= self.min_interval:
+            self._at_floor = True
+            self._decide("increase", "interval floor reached")
+
+    def _decrease(self, latency: float, reason: str) -> None:
+        """Multiplicative decrease of the rate and the concurrency, once per congestion episode."""
+        self._healthy = 0
+        now = self._clock()
+        # Requests sent before the last decrease report the congestion it already answered
+        if self._last_decrease is not None and now - latency < self._last_decrease:
+            return
+        self._last_decrease = now
+        self._at_floor = False
+        self.set_rate(1, min(self.interval / self.factor, self.max_interval), burst=1)
+        with self._slots:
+            self.concurrency = max(1, self.concurrency // 2)
+        self._count("pacing_decreases")
+        self._decide("decrease", reason)
+
+
+if __name__ == "__main__":
+    print("This module provides the adaptive (AIMD) rate limiter used for arXiv requests.")
@@ -0,0 +1,158 @@
+"""
+ratelimit.py
+------------
+
+This module provides a thread-safe token-bucket rate limiter used to keep the
+scraper within arXiv's politeness budget.
+
+A single `TokenBucket` instance is meant to be shared by every worker that
+talks to arXiv, so the limit applies globally (requests per window) regardless
+of how many downloads are running concurrently. Callers only wait when the
+budget is actually exhausted, instead of sleeping a fixed amount after every page.
+The outcome of every request is reported back through `observe()`, which
+adaptive limiters use to change their pace (see `webtools.pacing`).
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import threading
+import time
+
+# --- Import default limits from the configuration module ---
+from arxivscraper.config.config import RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared between threads.
+
+    The bucket holds at most `burst` tokens and refills at `requests / period`
+    tokens per second. Each call to `acquire()` consumes one token, blocking
+    the calling thread until the token is available. Tokens are reserved under
+    the lock and the wait happens outside of it, so concurrent callers are
+    served in order without busy-waiting.
+
+    Args:
+        requests (int): Number of requests allowed per `period`.
+        period (float): Length of the rate-limit window in seconds.
+        burst (int | None): Maximum number of tokens that can accumulate.
+            Defaults to `requests`.
+        initial (float | None): Tokens in the bucket at start. Defaults to a
+            full bucket; 0 makes even the first request wait for its token.
+        clock (callable): Monotonic time source (injectable for testing).
+        sleep (callable): Sleep function (injectable for testing).
+
+    Raises:
+        ValueError: If `requests`, `period` or `burst` are not positive, or
+            `initial` is negative.
+    """
+
+    def __init__(self,
+                 requests: int = RATE_LIMIT_REQUESTS,
+                 period: float = RATE_LIMIT_PERIOD,
+                 burst: int | None = None,
+                 initial: float | None = None,
+                 clock=time.monotonic,
+                 sleep=time.sleep):
+        if requests <= 0 or period <= 0:
+            raise ValueError("Rate limit requests and period must be positive.")
+        if burst is not None and burst <= 0:
+            raise ValueError("Rate limit burst must be positive.")
+        if initial is not None and initial < 0:
+            raise ValueError("The initial number of tokens cannot be negative.")
+
+        self.rate = requests / period
+        self.capacity = float(burst if burst is not None else requests)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity if initial is None else min(float(initial), self.capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserves one token and returns the time to wait until it is available."""
+        with self._lock:
+            now = self._clock()
+            # Refill according to the time elapsed since the last update
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Reserve the token; a negative balance means the caller must wait for it
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def set_rate(self, requests: float, period: float, burst: int | None = None) -> None:
+        """
+        Changes the limit of a bucket already in use (e.g. the share of a
+        budget split between several processes). Tokens already accumulated are
+        kept, up to the new capacity.
+
+        Args:
+            requests (float): Number of requests allowed per `period`.
+            period (float): Length of the rate-limit window in seconds.
+            burst (int | None): Maximum number of tokens that can accumulate.
+                Defaults to `requests`, and at least 1.
+
+        Raises:
+            ValueError: If `requests`, `period` or `burst` are not positive.
+        """
+        if requests <= 0 or period <= 0:
+            raise ValueError("Rate limit requests and period must be positive.")
+        if burst is not None and burst <= 0:
+            raise ValueError("Rate limit burst must be positive.")
+        with self._lock:
+            now = self._clock()
+            # Tokens earned so far are counted at the old rate
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = requests / period
+            self.capacity = float(burst if burst is not None else max(1.0, requests))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hands out no token for the next `seconds` (e.g. after a 'Retry-After'
+        header). Callers already waiting longer are not affected.
+
+        Args:
+            seconds (float): Length of the pause.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # The next token is only earned `seconds` from now
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def observe(self, latency: float, status: int | None, retry_after: float | None = None) -> None:
+        """
+        Reports the outcome of a request made with a token. A fixed-rate bucket
+        ignores it; adaptive limiters (see `webtools.pacing`) adjust their pace.
+
+        Args:
+            latency (float): Seconds the request took.
+            status (int | None): HTTP status, or None if the request failed
+                without a response (connection error, timeout).
+            retry_after (float | None): Seconds asked by a 'Retry-After' header, if any.
+        """
+
+    def acquire(self) -> float:
+        """
+        Takes one token from the bucket, waiting until it becomes available.
+
+        Returns:
+            float: Number of seconds the caller had to wait.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+if __name__ == "__main__":
+    print("This module provides the token-bucket rate limiter used for arXiv requests.")
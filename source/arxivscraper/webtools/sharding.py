@@ -0,0 +1,111 @@
+"""
+sharding.py
+-----------
+
+This module splits a large arXiv query into date-window shards.
+
+The advanced search only lets clients page so deep into a result list, and very
+deep offsets are slow, so a large category over a long window cannot be
+harvested through a single query. `plan_shards()` probes the number of results
+of the requested window and bisects it until every sub-window fits under the
+cap. The probe of each final shard is its first result page, which is kept so
+it does not need to be downloaded again.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import datetime
+from collections.abc import Callable
+from typing import NamedTuple
+
+# --- Import the result cap from the configuration module ---
+from arxivscraper.config.config import MAX_SEARCH_RESULTS
+
+
+class Shard(NamedTuple):
+    """A date window of a query (both dates inclusive) and its number of results."""
+    start_date: str
+    end_date: str
+    total: int
+    first_page: list[dict] | None = None
+
+
+def split_window(start_date: str, end_date: str) -> tuple[tuple[str, str], tuple[str, str]]:
+    """
+    Splits a date window into two disjoint halves.
+
+    Args:
+        start_date (str): First day of the window (YYYY-MM-DD).
+        end_date (str): Last day of the window (YYYY-MM-DD), later than `start_date`.
+
+    Returns:
+        tuple: The two halves as (start_date, end_date) pairs.
+    """
+    start = datetime.date.fromisoformat(start_date)
+    end = datetime.date.fromisoformat(end_date)
+    middle = start + (end - start) // 2
+    return ((start.isoformat(), middle.isoformat()),
+            ((middle + datetime.timedelta(days=1)).isoformat(), end.isoformat()))
+
+
+def plan_shards(start_date: str,
+                end_date: str,
+                probe: Callable[[str, str], tuple[int | None, list[dict]]],
+                max_results: int = MAX_SEARCH_RESULTS) -> list[Shard]:
+    """
+    Splits a date range into shards whose result count fits under the cap.
+
+    Windows are bisected until they hold at most `max_results` results. A single
+    day that still exceeds the cap cannot be split any further; it is kept as is
+    and only its first `max_results` results will be reachable.
+
+    Args:
+        start_date (str): First day of the range (YYYY-MM-DD).
+        end_date (str): Last day of the range (YYYY-MM-DD).
+        probe (Callable): Function returning the total number of results and the
+            records of the first page for a (start_date, end_date) window.
+        max_results (int): Maximum number of results per shard.
+
+    Returns:
+        list[Shard]: Shards in chronological order; shards without results are dropped.
+
+    Raises:
+        ValueError: If the number of results of a window cannot be parsed (a
+            window without results reports 0).
+    """
+    total, first_page = probe(start_date, end_date)
+    if total is None:
+        raise ValueError("Unable to parse the number of results.")
+
+    shards = []
+    pending = [(start_date, end_date, total, first_page)]
+    while pending:
+        window_start, window_end, total, first_page = pending.pop()
+        if not total:
+            continue
+        if total <= max_results or window_start == window_end:
+            if total > max_results:
+                print(f"Warning: {total} results on {window_start} exceed the cap of {max_results}; "
+                      f"only the first {max_results} can be retrieved.")
+            shards.append(Shard(window_start, window_end, total, first_page))
+            continue
+
+        # Probe both halves; the later half is pushed first so shards come out in order
+        halves = split_window(window_start, window_end)
+        for half_start, half_end in reversed(halves):
+            half_total, half_page = probe(half_start, half_end)
+            # An unparsable page is not an empty window: dropping it would lose its papers
+            if half_total is None:
+                raise ValueError(f"Unable to parse the number of results from {half_start} to {half_end}.")
+            pending.append((half_start, half_end, half_total, half_page))
+
+    return shards
+
+
+if __name__ == "__main__":
+    print("This module splits large arXiv queries into date shards under the search result cap.")
@@ -16,22 +16,11 @@ Subject:
 """
 
 # --- Import necessary constants from the configuration module ---
-try:
-    from arxivscraper.config.config import ARXIV_BASE_URL, PHYSICS_CATEGORIES, NON_PHYSICS_MAP
-except Exception:
-    # Handle relative import issues when executed from different environments (e.g., Colab)
-    import os
-    import sys
+from arxivscraper.config.config import ARXIV_BASE_URL, PHYSICS_CATEGORIES, NON_PHYSICS_MAP, RESULTS_PER_PAGE
 
-    _this = os.path.abspath(__file__)
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(_this)))
-    if PROJECT_ROOT not in sys.path:
-        sys.path.insert(0, PROJECT_ROOT)
 
-    from arxivscraper.config.config import ARXIV_BASE_URL, PHYSICS_CATEGORIES, NON_PHYSICS_MAP
-
-
-def get_url(start_date: str = '2025-01-01', end_date: str = '2025-02-01', category: str = 'gr-qc', start: int = 0, cross_list: bool = False) -> str:
+def get_url(start_date: str = '2025-01-01', end_date: str = '2025-02-01', category: str = 'gr-qc', start: int = 0, cross_list: bool = False,
+            base_url: str = ARXIV_BASE_URL, abstracts: bool = True) -> str:
     """
     Builds an advanced search URL for arXiv based on the given parameters.
 
@@ -41,6 +30,11 @@ def get_url(start_date: str = '2025-01-01', end_date: str = '2025-02-01', catego
         category (str): The main arXiv category (e.g., 'gr-qc', 'math', 'cs').
         start (int): Index of the first result to fetch (for pagination).
         cross_list (bool): Whether to include cross-listed papers (True/False).
+        base_url (str): Root URL of the arXiv site. Defaults to `ARXIV_BASE_URL`;
+            can point to a local server that serves canned result pages.
+        abstracts (bool): Whether the results include their abstracts. Pages
+            without them (`abstracts=hide`) are much lighter, for jobs that do
+            not need the 'abstract' field.
 
     Returns:
         str: A fully formatted URL string ready to be used in an HTTP request.
@@ -52,7 +46,7 @@ def get_url(start_date: str = '2025-01-01', end_date: str = '2025-02-01', catego
     """
 
     # Initialize the base of the advanced search query
-    query_url = ARXIV_BASE_URL + "/search/advanced?"
+    query_url = base_url + "/search/advanced?"
     query_url += "advanced=1&terms-0-operator=AND&terms-0-term=&terms-0-field=title&"
 
     # Define category type (physics vs non-physics)
@@ -65,11 +59,12 @@ def get_url(start_date: str = '2025-01-01', end_date: str = '2025-02-01', catego
         query_url += f"classification-{classification}=y"
         
     # Include or exclude cross-listed papers
-    query_url += f"&classification-include_cross_list={"include" if cross_list else "exclude"}&"
+    query_url += f"&classification-include_cross_list={'include' if cross_list else 'exclude'}&"
     
     # Add date range, sorting, and pagination options
     query_url += f"date-year=&date-filter_by=date_range&date-from_date={start_date}&date-to_date={end_date}&date-date_type=announced_date_first&"
-    query_url += f"abstracts=show&size=200&order=-announced_date_first&start={start}"
+    query_url += f"abstracts={'show' if abstracts else 'hide'}&"
+    query_url += f"size={RESULTS_PER_PAGE}&order=-announced_date_first&start={start}"
     return query_url
 
 
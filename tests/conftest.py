@@ -0,0 +1,222 @@
+"""
+conftest.py
+-----------
+
+Shared fixtures of the test suite.
+
+The tests never talk to arXiv. `stand_in` starts a local HTTP server that
+answers every GET request with a function of the test, and `page_server`
+serves the recorded search result pages of `benchmarks/pages` through it, so
+the download, rate-limit and parsing stages run end to end against canned
+responses. `search_server` stands in for the advanced search itself, answering
+queries over a given set of papers with pages rendered like the recorded ones
+(`benchmarks/make_pages.py`), so whole scraping runs can be tested. All record
+the requests they receive (path and arrival time) and the highest number of
+requests served at once. Other recorded responses (e.g. OAI-PMH) are kept in
+`tests/fixtures`.
+
+Authors:
+    - Alejandro Cano Jones (acanojo@uoc.edu)
+    - Christian López Vicente (clopezvice@uoc.edu)
+
+Subject:
+    M2.851 - Tipología y ciclo de vida de los datos. Master in Data Science (UOC)
+"""
+
+import glob
+import gzip
+import importlib.util
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS_DIR = os.path.join(os.path.dirname(TESTS_DIR), "benchmarks")
+PAGES_DIR = os.path.join(BENCHMARKS_DIR, "pages")
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+
+# The page renderer of the benchmarks (a script, not a package)
+_spec = importlib.util.spec_from_file_location("make_pages", os.path.join(BENCHMARKS_DIR, "make_pages.py"))
+make_pages = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(make_pages)
+
+# A response of the stand-in server: status, headers and body
+Response = tuple[int, dict[str, str], bytes]
+
+
+def load_pages() -> dict[str, bytes]:
+    """Reads the recorded result pages of `benchmarks/pages`, by name."""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(PAGES_DIR, "*.html.gz"))):
+        with gzip.open(path, "rb") as file:
+            pages[os.path.basename(path)[:-len(".html.gz")]] = file.read()
+    return pages
+
+
+class FakeClock:
+    """Clock whose sleep advances the time instantly, shared by several threads."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local HTTP server answering GET requests with `respond(path, query)`.
+
+    Args:
+        respond (callable): Receives the path and the parsed query string of a
+            request and returns its status, headers and body.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, respond: Callable[[str, dict[str, list[str]]], Response]):
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self.respond = respond
+        self.requests = []
+        self.request_headers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def enter(self, path: str, headers: dict[str, str]) -> None:
+        with self._lock:
+            self.requests.append((time.monotonic(), path))
+            self.request_headers.append(headers)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.enter(self.path, dict(self.headers))
+        try:
+            parts = urlsplit(self.path)
+            status, headers, body = self.server.respond(parts.path, parse_qs(parts.query))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            self.server.leave()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in() -> Iterator[Callable[[Callable], StandInServer]]:
+    """Starts stand-in servers for a test, and stops them when it ends."""
+    servers = []
+
+    def start(respond: Callable[[str, dict[str, list[str]]], Response]) -> StandInServer:
+        server = StandInServer(respond)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def pages() -> dict[str, bytes]:
+    pages = load_pages()
+    if not pages:
+        pytest.skip(f"No recorded pages in {PAGES_DIR}; run benchmarks/make_pages.py first.")
+    return pages
+
+
+@pytest.fixture
+def page_server(stand_in, pages) -> StandInServer:
+    """
+    Serves the recorded pages at `/pages/<name>`. A `delay` query parameter
+    holds the response back for that many seconds; unknown pages get a 404.
+    """
+    def respond(path: str, query: dict[str, list[str]]) -> Response:
+        time.sleep(float(query.get("delay", ["0"])[0]))
+        name = path.rsplit("/", 1)[-1]
+        if not path.startswith("/pages/") or name not in pages:
+            return 404, {}, b""
+        return 200, {"Content-Type": "text/html; charset=utf-8"}, pages[name]
+
+    return stand_in(respond)
+
+
+@pytest.fixture(scope="session")
+def dataset() -> list[dict]:
+    """Papers of `dataset/arxiv_data.csv`, as records."""
+    return [{field: record[field] for field in ("index", "title", "tags", "authors", "abstract")}
+            for record in make_pages.load_dataset()]
+
+
+@pytest.fixture
+def search_server(stand_in) -> Callable[..., StandInServer]:
+    """
+    Starts stand-ins of the arXiv advanced search (at `/search/advanced`).
+
+    The server answers for `papers`, mapping a (physics) category to its
+    (announcement date, record) pairs from the newest to the oldest: the
+    results of a query are the papers of its category announced between its
+    dates, paged by its `start` and `size`. A query without results gets the
+    "no results" page of arXiv (`fixtures/html/no_results.html`), and the
+    categories of `broken` a page whose number of results cannot be parsed,
+    as after a change of markup. Other categories get a 404. Queries with
+    `abstracts=hide` get their results without the abstract paragraphs.
+    """
+    with open(os.path.join(FIXTURES_DIR, "html", "no_results.html"), "rb") as file:
+        no_results = file.read()
+
+    def start(papers: dict[str, list[tuple[str, dict]]], broken: tuple[str, ...] = ()) -> StandInServer:
+        def respond(path: str, query: dict[str, list[str]]) -> Response:
+            category = query.get("classification-physics_archives", [""])[0]
+            headers = {"Content-Type": "text/html; charset=utf-8"}
+            if category in broken:
+                return 200, headers, b"<html><body><h1 class='title is-clearfix'>Search</h1></body></html>"
+            if path != "/search/advanced" or category not in papers:
+                return 404, {}, b""
+            first, last = query["date-from_date"][0], query["date-to_date"][0]
+            results = [record for date, record in papers[category] if first <= date <= last]
+            if not results:
+                return 200, headers, no_results
+            offset, size = int(query["start"][0]), int(query["size"][0])
+            page = make_pages.render_page(results[offset:offset + size], len(results))
+            if query.get("abstracts") == ["hide"]:
+                page = re.sub(rb'<p class="abstract mathjax">.*?</p>\n', b"", page, flags=re.S)
+            return 200, headers, page
+
+        return stand_in(respond)
+
+    return start
@@ -0,0 +1,143 @@
+"""
+Tests of the compressed archive format (`storage.archive`) and of the
+`archive` subcommand.
+"""
+
+import json
+import os
+
+import pytest
+
+from arxivscraper.arxivscraper import run_archive
+from arxivscraper.storage.archive import ArchiveReader, ArchiveWriter, default_codec
+from arxivscraper.storage.sinks import open_sink, read_records
+
+
+def record(index: str, title: str = "Title") -> dict:
+    return {"index": index, "title": title, "tags": ["gr-qc", "astro-ph.CO"],
+            "authors": ["A. Author", "B. Author"], "abstract": "Abstract."}
+
+
+@pytest.mark.parametrize("codec", [
+    "zlib",
+    pytest.param("zstd", marks=pytest.mark.skipif(default_codec() != "zstd", reason="zstandard is not installed")),
+])
+def test_round_trip(tmp_path, codec):
+    path = str(tmp_path / "corpus.arxz")
+    papers = [record(f"2501.{number:05d}", title=f"Paper {number} — ünïcode") for number in range(7)]
+    with ArchiveWriter(path, codec=codec, chunk_records=3) as writer:
+        writer.write(papers[:4])
+        writer.add_page("https://arxiv.org/search/advanced?start=0", b"<html>page</html>")
+        writer.write(papers[4:])
+
+    with ArchiveReader(path) as archive:
+        assert archive.codec == codec
+        assert len(archive) == 7
+        assert list(archive.records()) == papers
+        assert [chunk["count"] for chunk in archive.chunks] == [3, 0, 3, 1]
+        assert list(archive.pages()) == [("https://arxiv.org/search/advanced?start=0", b"<html>page</html>")]
+        assert archive.get("2501.00005") == papers[5]
+        assert archive.get("2501.00009") is None
+        assert archive.months() == ["2025-01"]
+
+
+def test_get_finds_the_latest_version_after_an_append(tmp_path):
+    path = str(tmp_path / "corpus.arxz")
+    with ArchiveWriter(path) as writer:
+        writer.write([record("2501.00001v1", title="First"), record("2501.00002", title="Old copy")])
+    # An incremental run appends a newer version and a new copy
+    with ArchiveWriter(path) as writer:
+        writer.write([record("2501.00001v2", title="Second"), record("2501.00002", title="New copy")])
+
+    with ArchiveReader(path) as archive:
+        assert len(archive) == 4
+        assert len(archive.chunks) == 2
+        assert archive.get("2501.00001")["title"] == "Second"
+        assert archive.get("2501.00001v2")["title"] == "Second"
+        assert archive.get("2501.00001v1")["title"] == "First"
+        assert archive.get("2501.00001v3") is None
+        assert archive.get("2501.00002")["title"] == "New copy"
+        # A prefix of an identifier is not a match
+        assert archive.get("2501.0000") is None
+
+
+def test_records_skip_chunks_of_other_months(tmp_path, monkeypatch):
+    path = str(tmp_path / "corpus.arxz")
+    with ArchiveWriter(path, chunk_records=2) as writer:
+        writer.write([record("2412.00001"), record("2412.00002"),
+                      record("2501.00001"), record("2412.00003"),
+                      record("2502.00001"), record("2502.00002")])
+
+    with ArchiveReader(path) as archive:
+        assert [chunk["months"] for chunk in archive.chunks] == [["2024-12"], ["2024-12", "2025-01"], ["2025-02"]]
+        decoded = []
+        chunk_records = archive.chunk_records
+        monkeypatch.setattr(archive, "chunk_records", lambda number: decoded.append(number) or chunk_records(number))
+
+        assert [paper["index"] for paper in archive.records(["2025-01"])] == ["2501.00001"]
+        assert decoded == [1]
+        assert [paper["index"] for paper in archive.records(["2025-02", "2024-12"])] == \
+            ["2412.00001", "2412.00002", "2412.00003", "2502.00001", "2502.00002"]
+        assert archive.months() == ["2024-12", "2025-01", "2025-02"]
+
+
+def test_interrupted_archives_are_rebuilt_from_their_chunks(tmp_path):
+    path = str(tmp_path / "corpus.arxz")
+    papers = [record(f"2501.{number:05d}") for number in range(5)]
+    with ArchiveWriter(path, chunk_records=2) as writer:
+        writer.write(papers)
+    with ArchiveReader(path) as archive:
+        last_chunk = archive.chunks[-1]["offset"]
+    # The writer died while writing the last chunk: no footer, and a chunk cut short
+    os.truncate(path, last_chunk + 10)
+
+    with ArchiveReader(path) as archive:
+        assert list(archive.records()) == papers[:4]
+        assert archive.get("2501.00003") == papers[3]
+        assert archive.get("2501.00004") is None
+    # Appending drops the damaged chunk and writes a footer again
+    with ArchiveWriter(path, chunk_records=2) as writer:
+        writer.write(papers[4:])
+    with ArchiveReader(path) as archive:
+        assert list(archive.records()) == papers
+        assert archive.get("2501.00004") == papers[4]
+
+
+def test_archives_refuse_other_files_and_fields(tmp_path):
+    path = str(tmp_path / "corpus.arxz")
+    with ArchiveWriter(path) as writer:
+        writer.write([record("2501.00001")])
+
+    with pytest.raises(ValueError):
+        ArchiveWriter(path, fields=("index", "title"))
+    with pytest.raises(ValueError):
+        ArchiveWriter(str(tmp_path / "other.arxz"), fields=("title", "index"))
+    other = tmp_path / "other.csv"
+    other.write_text("index,title\n")
+    with pytest.raises(ValueError):
+        ArchiveReader(str(other))
+
+
+def test_archive_subcommand_imports_and_exports_csv(tmp_path, capsys):
+    harvest = str(tmp_path / "harvest.csv")
+    papers = [record("2412.00001", title="December"), record("2501.00001", title="January, with a comma"),
+              record("2501.00002v2", title="January \"quoted\"")]
+    with open_sink(harvest) as sink:
+        sink.write(papers)
+    archive = str(tmp_path / "corpus.arxz")
+
+    run_archive([archive, "--add", harvest, "--codec", "zlib"])
+    assert f"Archived 3 records from {harvest}" in capsys.readouterr().out
+
+    export = str(tmp_path / "january.csv")
+    run_archive([archive, "--month", "2025-01", "--export", export])
+    assert f"Exported 2 records to {export}" in capsys.readouterr().out
+    assert list(read_records(export)) == papers[1:]
+
+    run_archive([archive, "--get", "2501.00002", "2501.09999", "--json"])
+    assert json.loads(capsys.readouterr().out) == {"2501.00002": papers[2], "2501.09999": None}
+
+    with pytest.raises(ValueError):
+        run_archive([archive, "--add", archive])
+    with pytest.raises(ValueError):
+        run_archive([archive, "--month", "2025-01"])
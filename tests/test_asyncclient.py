@@ -0,0 +1,46 @@
+"""
+Tests of the asyncio HTTP client (`webtools.asyncclient`) against the local
+stand-in of arXiv.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from arxivscraper.webtools.asyncclient import AsyncHTTPClient
+from arxivscraper.webtools.cache import ResponseCache
+
+
+def test_retry_after_is_read_whatever_its_case(stand_in):
+    answers = [(429, {"retry-after": "3"}, b""), (200, {}, b"page")]
+    server = stand_in(lambda path, query: answers.pop(0))
+    waits = []
+
+    async def sleep(seconds):
+        waits.append(seconds)
+
+    async def run():
+        async with AsyncHTTPClient(backoff_base=0.01, backoff_max=0.01, sleep=sleep) as client:
+            return await client.get(f"{server.url}/page")
+
+    response = asyncio.run(run())
+    assert response.content == b"page"
+    assert waits == [3.0]
+    assert response.headers.get("Content-Length") == response.headers.get("content-length") == "4"
+
+
+def test_validators_are_cached_whatever_their_case(stand_in, tmp_path):
+    server = stand_in(lambda path, query: (200, {"etag": '"v1"', "last-modified": "Mon, 02 Jun 2025 00:00:00 GMT"},
+                                           b"page"))
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    url = f"{server.url}/page"
+
+    async def run():
+        async with AsyncHTTPClient(cache=cache) as client:
+            return await client.fetch(url)
+
+    assert asyncio.run(run()) == b"page"
+    entry = cache.get(url)
+    assert (entry.etag, entry.last_modified) == ('"v1"', "Mon, 02 Jun 2025 00:00:00 GMT")
@@ -0,0 +1,107 @@
+"""
+Tests of the author index (`storage.authors`).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from arxivscraper.storage.authors import INDEX_FILE, AuthorIndex, AuthorIndexBuilder, author_key, coauthorship
+
+
+def record(index: str, *authors: str) -> dict:
+    return {"index": index, "authors": list(authors)}
+
+
+@pytest.mark.parametrize("name", ["Stephen W. Hawking", "S. W. Hawking", "Hawking, S.W.", "STEPHEN W. HAWKING Jr"])
+def test_author_key_folds_name_forms(name):
+    assert author_key(name) == "hawking sw"
+
+
+def test_author_key_keeps_particles_and_collaborations():
+    assert author_key("Ludwig van der Waals") == "van der waals l"
+    assert author_key("José García-López") == "garcia-lopez j"
+    assert author_key("The ATLAS Collaboration") == "the atlas collaboration"
+
+
+def test_index_round_trip(tmp_path):
+    directory = str(tmp_path / "authors")
+    with AuthorIndexBuilder(directory) as builder:
+        assert builder.add([record("2501.00001v1", "Stephen W. Hawking", "Roger Penrose"),
+                            record("2501.00002", "S. W. Hawking", "R. Penrose", "Kip S. Thorne"),
+                            # Listed twice in the same paper, and a paper seen twice in the batch
+                            record("2501.00003", "Kip S. Thorne", "K. S. Thorne"),
+                            record("2501.00003v2", "Someone Else")]) == 3
+
+    with AuthorIndex(directory) as index:
+        assert len(index) == 3
+        hawking = index.author_id("Hawking, S. W.")
+        assert hawking == 0
+        assert index.name(hawking) == "Stephen W. Hawking"
+        assert index.papers_of("S. W. Hawking") == ["2501.00001", "2501.00002"]
+        assert index.papers_of("K. S. Thorne") == ["2501.00002", "2501.00003"]
+        assert index.coauthors(hawking) == [("Roger Penrose", 2), ("Kip S. Thorne", 1)]
+        assert index.coauthors(hawking, top=1) == [("Roger Penrose", 2)]
+        assert index.coauthors("Kip S. Thorne", top=None) == [("Stephen W. Hawking", 1), ("Roger Penrose", 1)]
+        assert index.author_id("Someone Else") is None
+        with pytest.raises(KeyError):
+            index.papers_of("Nobody")
+        with pytest.raises(KeyError):
+            index.coauthors(7)
+
+
+def test_later_runs_extend_the_index(tmp_path):
+    directory = str(tmp_path / "authors")
+    with AuthorIndexBuilder(directory) as builder:
+        builder.add([record("2501.00001", "A. Author", "B. Author")])
+    with AuthorIndexBuilder(directory) as builder:
+        # Papers already indexed are skipped, and known authors keep their id
+        assert builder.add([record("2501.00001v2", "A. Author", "B. Author"),
+                            record("2502.00001", "C. Author", "B. Author")]) == 1
+        assert builder.counts() == {"authors": 3, "papers": 2}
+
+    with AuthorIndex(directory) as index:
+        assert [index.author_id(name) for name in ("A. Author", "B. Author", "C. Author")] == [0, 1, 2]
+        assert index.coauthors("B. Author") == [("A. Author", 1), ("C. Author", 1)]
+
+
+def test_failed_runs_leave_the_index_unchanged(tmp_path):
+    directory = str(tmp_path / "authors")
+    with AuthorIndexBuilder(directory) as builder:
+        builder.add([record("2501.00001", "A. Author")])
+    with pytest.raises(RuntimeError):
+        with AuthorIndexBuilder(directory) as builder:
+            builder.add([record("2502.00001", "B. Author")])
+            raise RuntimeError("interrupted")
+
+    with AuthorIndex(directory) as index:
+        assert len(index) == 1
+        assert index.author_id("B. Author") is None
+
+
+def test_large_collaborations_are_left_out_of_the_graph(tmp_path):
+    directory = str(tmp_path / "authors")
+    names = [f"Member {number} Person" for number in range(5)]
+    with AuthorIndexBuilder(directory, max_authors=4) as builder:
+        builder.add([record("2501.00001", *names)])
+
+    with AuthorIndex(directory) as index:
+        assert index.papers_of(names[0]) == ["2501.00001"]
+        assert index.coauthors(names[0]) == []
+
+
+def test_missing_index(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        AuthorIndex(str(tmp_path))
+    assert not os.path.exists(tmp_path / INDEX_FILE)
+
+
+def test_coauthorship_of_csr_papers():
+    offsets = np.array([0, 2, 5, 6])
+    authors = np.array([0, 1, 0, 1, 2, 2])
+    adjacency_offsets, ids, counts = coauthorship(offsets, authors, 3)
+
+    assert adjacency_offsets.tolist() == [0, 2, 4, 6]
+    assert ids.tolist() == [1, 2, 0, 2, 0, 1]
+    assert counts.tolist() == [2, 1, 2, 1, 1, 1]
@@ -0,0 +1,98 @@
+"""
+Tests of the response cache (`webtools.cache`) on its own and behind the HTTP
+client: TTL freshness, revalidation, LRU eviction and offline mode.
+"""
+
+import os
+
+import pytest
+
+from arxivscraper.webtools.cache import ResponseCache
+from arxivscraper.webtools.httpclient import HTTPClient
+
+
+def test_entries_are_fresh_until_the_ttl(tmp_path):
+    ResponseCache(str(tmp_path), ttl=3600).put("https://arxiv.org/a", b"page", etag='"v1"')
+
+    entry = ResponseCache(str(tmp_path), ttl=3600).get("https://arxiv.org/a")
+    assert (entry.content, entry.etag, entry.fresh) == (b"page", '"v1"', True)
+    # Same entry, reloaded from disk, but past its TTL
+    assert ResponseCache(str(tmp_path), ttl=0).get("https://arxiv.org/a").fresh is False
+    assert ResponseCache(str(tmp_path)).get("https://arxiv.org/missing") is None
+
+
+def test_stale_entries_are_revalidated_with_a_conditional_request(stand_in, tmp_path):
+    def respond(path, query):
+        if server.request_headers[-1].get("If-None-Match") == '"v1"':
+            return 304, {}, b""
+        return 200, {"ETag": '"v1"'}, b"page"
+
+    server = stand_in(respond)
+    cache = ResponseCache(str(tmp_path), ttl=0)
+
+    with HTTPClient(cache=cache) as client:
+        assert client.fetch(f"{server.url}/a") == b"page"
+        fetched_at = cache.get(f"{server.url}/a").fetched_at
+        # Stale: the server answers 304 and the cached body is served
+        assert client.fetch(f"{server.url}/a") == b"page"
+
+    assert len(server.requests) == 2
+    assert server.request_headers[1]["If-None-Match"] == '"v1"'
+    cache.ttl = 3600
+    entry = cache.get(f"{server.url}/a")
+    assert entry.fresh and entry.fetched_at > fetched_at
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # Random bytes do not compress, so every entry takes a bit more than 1000 bytes
+    cache = ResponseCache(str(tmp_path), max_bytes=2500)
+    cache.put("https://arxiv.org/a", os.urandom(1000))
+    cache.put("https://arxiv.org/b", os.urandom(1000))
+    assert cache.get("https://arxiv.org/a") is not None
+    cache.put("https://arxiv.org/c", os.urandom(1000))
+
+    assert cache.get("https://arxiv.org/b") is None
+    assert cache.get("https://arxiv.org/a") is not None
+    assert cache.get("https://arxiv.org/c") is not None
+    assert len(cache) == 2
+    assert len(cache.page_files()) == 2
+
+
+def test_hits_are_saved_lazily(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=2500)
+    cache.put("https://arxiv.org/a", os.urandom(1000))
+    cache.put("https://arxiv.org/b", os.urandom(1000))
+    meta_path = cache._paths(cache.key("https://arxiv.org/a"))[1]
+    with open(meta_path) as file:
+        meta = file.read()
+
+    # A hit does not write to disk...
+    assert cache.get("https://arxiv.org/a") is not None
+    with open(meta_path) as file:
+        assert file.read() == meta
+    # ...until the cache is closed, so the LRU order survives a restart
+    cache.close()
+    with open(meta_path) as file:
+        assert file.read() != meta
+
+    reloaded = ResponseCache(str(tmp_path), max_bytes=2500)
+    reloaded.put("https://arxiv.org/c", os.urandom(1000))
+    assert reloaded.get("https://arxiv.org/b") is None
+    assert reloaded.get("https://arxiv.org/a") is not None
+
+
+def test_offline_mode_serves_only_the_cache(stand_in, tmp_path):
+    server = stand_in(lambda path, query: (200, {}, b"page"))
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    with HTTPClient(cache=cache) as client:
+        client.fetch(f"{server.url}/a")
+
+    with HTTPClient(cache=cache, offline=True) as client:
+        # Stale entries are served as they are
+        assert client.fetch(f"{server.url}/a") == b"page"
+        with pytest.raises(ConnectionError):
+            client.fetch(f"{server.url}/b")
+
+    assert len(server.requests) == 1
+    with pytest.raises(ValueError):
+        HTTPClient(offline=True)
@@ -0,0 +1,126 @@
+"""
+Tests of the checkpoint journal (`storage.checkpoint`) and of resuming an
+interrupted run against the stand-in of the arXiv search.
+"""
+
+import csv
+import os
+
+import pytest
+
+from arxivscraper.arxivscraper import iter_arxiv, scrape_arxiv
+from arxivscraper.storage.checkpoint import Checkpoint
+from arxivscraper.storage.sinks import CSVSink
+from arxivscraper.webtools.httpclient import HTTPClient
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+QUERY = {"start_date": "2025-06-01", "end_date": "2025-06-30", "category": "gr-qc"}
+
+
+def record(index: str) -> dict:
+    return {"index": index, "title": "Title", "tags": ["gr-qc"], "authors": ["A. Author"], "abstract": "Abstract."}
+
+
+def test_journal_replays_its_pages(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    with Checkpoint(path, QUERY, resume=False) as journal:
+        journal.set_plan([["gr-qc", "2025-06-01", "2025-06-30", 400]])
+        journal.add_page((0, 0), [record("2506.00001")])
+        journal.add_page((0, 200), [record("2506.00002")])
+
+    with Checkpoint(path, QUERY) as journal:
+        assert journal.plan == [["gr-qc", "2025-06-01", "2025-06-30", 400]]
+        assert set(journal.pages) == {(0, 0), (0, 200)}
+        assert journal.records((0, 200)) == [record("2506.00002")]
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    with Checkpoint(path, QUERY, resume=False) as journal:
+        journal.add_page((0, 0), [record("2506.00001")])
+    size = os.path.getsize(path)
+    # A crash in the middle of writing the next page
+    with open(path, "ab") as file:
+        file.write(b'{"page": [0, 200], "records": [{"index": "2506.0')
+
+    with Checkpoint(path, QUERY) as journal:
+        assert set(journal.pages) == {(0, 0)}
+        assert os.path.getsize(path) == size
+        journal.add_page((0, 200), [record("2506.00002")])
+    with Checkpoint(path, QUERY) as journal:
+        assert journal.records((0, 200)) == [record("2506.00002")]
+
+
+def test_journal_of_another_query_is_refused(tmp_path):
+    path = str(tmp_path / "run.checkpoint.jsonl")
+    Checkpoint(path, QUERY, resume=False).close()
+    with pytest.raises(ValueError):
+        Checkpoint(path, dict(QUERY, category="hep-th"))
+
+
+@pytest.fixture
+def six_pages(search_server, dataset):
+    """A search of 1200 results: six pages of 200."""
+    return search_server({"gr-qc": [("2025-06-02", paper) for paper in dataset[:1200]]}), dataset[:1200]
+
+
+def interrupt(server, checkpoint: str, pages: int) -> None:
+    """Runs a scrape journaled to `checkpoint` and stops it after `pages` pages."""
+    with HTTPClient() as client:
+        run = iter_arxiv(**QUERY, client=client, workers=1, checkpoint=checkpoint, base_url=server.url,
+                         progress=False)
+        for _ in range(pages):
+            next(run)
+        run.close()
+
+
+def read_indexes(path: str) -> list[str]:
+    with open(path, encoding="utf-8", newline="") as file:
+        return [row["index"] for row in csv.DictReader(file)]
+
+
+def test_resume_downloads_only_the_missing_pages(six_pages, tmp_path):
+    server, papers = six_pages
+    output = str(tmp_path / "arxiv_data.csv")
+    # The journal the command line uses with --resume
+    checkpoint = output + ".checkpoint.jsonl"
+    interrupt(server, checkpoint, pages=4)
+    assert os.path.exists(checkpoint)
+
+    server.requests.clear()
+    scrape_arxiv(**QUERY, output=output, resume=True, base_url=server.url, workers=1,
+                 limiter=TokenBucket(requests=100, period=1.0), return_dataframe=False)
+
+    assert sorted(int(path.rsplit("start=", 1)[1]) for _, path in server.requests) == [800, 1000]
+    assert read_indexes(output) == [paper["index"] for paper in papers]
+    assert not os.path.exists(checkpoint)
+
+
+def test_journal_outlives_a_failure_to_close_the_output(six_pages, tmp_path, monkeypatch):
+    server, papers = six_pages
+    output = str(tmp_path / "arxiv_data.csv")
+    checkpoint = str(tmp_path / "run.checkpoint.jsonl")
+
+    def broken_close(sink):
+        sink._file.close()
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CSVSink, "close", broken_close)
+        with pytest.raises(OSError):
+            scrape_arxiv(**QUERY, output=output, checkpoint=checkpoint, base_url=server.url, workers=2,
+                         limiter=TokenBucket(requests=100, period=1.0), return_dataframe=False)
+    assert os.path.exists(checkpoint)
+
+    # Every page is in the journal, so resuming writes the output again without downloading
+    server.requests.clear()
+    scrape_arxiv(**QUERY, output=output, checkpoint=checkpoint, resume=True, base_url=server.url,
+                 limiter=TokenBucket(requests=100, period=1.0), return_dataframe=False)
+    assert server.requests == []
+    assert read_indexes(output) == [paper["index"] for paper in papers]
+    assert not os.path.exists(checkpoint)
+
+
+def test_resume_requires_a_journal():
+    with pytest.raises(ValueError):
+        next(iter_arxiv(**QUERY, resume=True))
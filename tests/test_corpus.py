@@ -0,0 +1,30 @@
+"""
+Tests of the SQLite corpus store (`storage.corpus`).
+"""
+
+from arxivscraper.storage.corpus import CorpusStore
+
+
+def record(index: str, title: str = "Title") -> dict:
+    return {"index": index, "title": title, "tags": ["gr-qc", "astro-ph.CO"],
+            "authors": ["A. Author", "B. Author"], "abstract": "Abstract."}
+
+
+def test_records_keep_their_version(tmp_path):
+    with CorpusStore(str(tmp_path / "corpus.sqlite")) as store:
+        store.upsert([record("2507.08819v2"), record("2507.00001")])
+
+        assert store.get("2507.08819")["index"] == "2507.08819v2"
+        assert store.get("2507.08819v1") == record("2507.08819v2")
+        assert [paper["index"] for paper in store.records()] == ["2507.00001", "2507.08819v2"]
+        assert [paper["index"] for paper in store.records("astro-ph")] == ["2507.00001", "2507.08819v2"]
+
+
+def test_older_versions_do_not_overwrite_newer_ones(tmp_path):
+    with CorpusStore(str(tmp_path / "corpus.sqlite")) as store:
+        store.upsert([record("2507.08819v2", title="New")])
+        store.upsert([record("2507.08819v1", title="Old")])
+        # A record without version is the current one, and keeps the stored version
+        store.upsert([record("2507.08819", title="Current")])
+
+        assert store.get("2507.08819") == record("2507.08819v2", title="Current")
@@ -0,0 +1,104 @@
+"""
+Tests of the deduplication of harvests (`storage.dedup`), on papers of
+`dataset/arxiv_data.csv`.
+"""
+
+import csv
+
+import pytest
+
+from arxivscraper.storage.dedup import Deduplicator, merge_harvests
+from arxivscraper.storage.sinks import open_sink, read_records
+
+
+def harvest(path, records: list[dict]) -> str:
+    with open_sink(str(path)) as sink:
+        sink.write(records)
+    return str(path)
+
+
+def copy(record: dict, index: str, **changes) -> dict:
+    return {**record, "index": index, **changes}
+
+
+def reworded(record: dict) -> dict:
+    """The same paper with one word of its abstract changed, as a resubmission would be."""
+    words = record["abstract"].split()
+    words[len(words) // 2] = "resubmitted"
+    return {**record, "abstract": " ".join(words)}
+
+
+def test_only_the_first_copy_of_the_latest_version_is_kept(tmp_path, dataset):
+    first, second, third = dataset[:3]
+    one = harvest(tmp_path / "one.jsonl", [copy(first, "2501.00001v1"), copy(second, "2501.00002"),
+                                           copy(third, "2501.00003v2", title="First copy")])
+    two = harvest(tmp_path / "two.csv", [copy(first, "2501.00001v2"), copy(second, "2501.00002"),
+                                         copy(third, "2501.00003v2", title="Second copy"),
+                                         copy(third, "2501.00003v1")])
+
+    stats = merge_harvests([one, two], str(tmp_path / "merged.jsonl"))
+
+    merged = list(read_records(str(tmp_path / "merged.jsonl")))
+    assert [record["index"] for record in merged] == ["2501.00002", "2501.00003v2", "2501.00001v2"]
+    assert merged[1]["title"] == "First copy"
+    assert stats == {"read": 7, "written": 3, "older_versions": 2, "duplicates": 2, "near_duplicates": 0}
+
+
+def test_near_duplicates_are_reported_or_dropped(tmp_path, dataset):
+    original, other = dataset[:2]
+    resubmission = copy(reworded(original), "2502.00001")
+    harvest_path = harvest(tmp_path / "harvest.jsonl", [original, other, resubmission])
+
+    report = str(tmp_path / "report.csv")
+    stats = merge_harvests([harvest_path], str(tmp_path / "merged.jsonl"), report=report)
+    assert stats["near_duplicates"] == 1
+    assert len(list(read_records(str(tmp_path / "merged.jsonl")))) == 3
+    with open(report, encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [(row["index"], row["duplicate_of"]) for row in rows] == [("2502.00001", original["index"])]
+    assert float(rows[0]["similarity"]) >= 0.8
+
+    stats = merge_harvests([harvest_path], str(tmp_path / "dropped.jsonl"), drop_near_duplicates=True)
+    assert stats["written"] == 2
+    assert [record["index"] for record in read_records(str(tmp_path / "dropped.jsonl"))] == \
+        [original["index"], other["index"]]
+
+
+def test_check_classifies_records(dataset):
+    original = dataset[0]
+    with Deduplicator(threshold=0.8) as deduplicator:
+        assert deduplicator.check(copy(original, "2501.00001v1")).status == "new"
+        assert deduplicator.check(copy(original, "2501.00001v1")).status == "duplicate"
+        assert deduplicator.check(copy(original, "2501.00001v2")).status == "newer_version"
+        verdict = deduplicator.check(copy(reworded(original), "2502.00001"))
+        assert (verdict.status, verdict.match) == ("near_duplicate", "2501.00001")
+        assert verdict.similarity >= 0.8
+        # Later copies of a near duplicate point to the paper it matched
+        assert deduplicator.check(copy(original, "2502.00001v2"))[:3] == ("newer_version", "2502.00001", "2501.00001")
+        assert deduplicator.check(dataset[1]).status == "new"
+
+    with pytest.raises(ValueError):
+        Deduplicator(bands=3)
+
+
+def test_merges_reusing_the_state_are_incremental(tmp_path, dataset):
+    first, second, third = dataset[:3]
+    state = str(tmp_path / "state" / "dedup.sqlite")
+    merge_harvests([harvest(tmp_path / "day1.jsonl", [first, second])], str(tmp_path / "merged1.jsonl"), state=state)
+
+    stats = merge_harvests([harvest(tmp_path / "day2.jsonl", [first, copy(second, second["index"] + "v2"), third])],
+                           str(tmp_path / "merged2.jsonl"), state=state)
+
+    # Papers merged before are not written again, unless in a newer version
+    assert [record["index"] for record in read_records(str(tmp_path / "merged2.jsonl"))] == \
+        [second["index"] + "v2", third["index"]]
+    assert stats == {"read": 3, "written": 2, "older_versions": 0, "duplicates": 1, "near_duplicates": 0}
+
+
+def test_the_merge_passes_can_be_run_again(tmp_path, dataset):
+    sources = [(harvest(tmp_path / "harvest.jsonl", [copy(dataset[0], "2501.00001v1"),
+                                                     copy(dataset[0], "2501.00001v2")]), None)]
+    with Deduplicator() as deduplicator:
+        for _ in range(2):
+            deduplicator.find_latest_copies(sources)
+            assert [copy_ for _, copy_ in deduplicator.copies(sources)] == ["older_version", "keep"]
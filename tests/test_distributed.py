@@ -0,0 +1,89 @@
+"""
+Tests of the job queue of distributed harvests (`storage.jobqueue`) and of the
+lease renewal of its workers (`distributed.run_worker`).
+"""
+
+import threading
+import time
+
+from arxivscraper.arxivscraper import select_fields
+from arxivscraper.distributed import run_worker
+from arxivscraper.storage.jobqueue import JobQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def add_job(queue: JobQueue, url: str) -> None:
+    queue.add([(url, "gr-qc", "2025-06-01", "2025-06-30", 0)])
+
+
+def test_renewed_leases_are_not_handed_out(tmp_path):
+    clock = FakeClock()
+    with JobQueue(str(tmp_path / "jobs.sqlite"), lease_timeout=10, clock=clock) as queue:
+        add_job(queue, "http://127.0.0.1/page")
+        job = queue.lease("first")
+
+        clock.now += 8
+        assert queue.renew(job, "first")
+        clock.now += 7
+        # Past the first lease, within the renewed one
+        assert queue.lease("second") is None
+        assert queue.active_workers() == 2
+
+        clock.now += 4
+        assert queue.lease("second") is not None
+        # The job now belongs to the second worker
+        assert not queue.renew(job, "first")
+
+
+def test_finished_jobs_are_not_renewed(tmp_path):
+    with JobQueue(str(tmp_path / "jobs.sqlite")) as queue:
+        add_job(queue, "http://127.0.0.1/page")
+        job = queue.lease("worker")
+        queue.complete(job.id, [])
+        assert not queue.renew(job, "worker")
+
+
+class SlowClient:
+    """Client whose downloads take longer than the lease timeout of the queue."""
+
+    limiter = None
+
+    def __init__(self, content: bytes, seconds: float):
+        self.content = content
+        self.seconds = seconds
+        self.started = threading.Event()
+
+    def fetch(self, url: str) -> bytes:
+        self.started.set()
+        time.sleep(self.seconds)
+        return self.content
+
+
+def test_worker_keeps_the_lease_of_a_slow_page(tmp_path, pages):
+    path = str(tmp_path / "jobs.sqlite")
+    lease_timeout = 0.3
+    with JobQueue(path, lease_timeout=lease_timeout) as queue:
+        queue.configure({"cross_list": False, "parser": "fast", "fields": list(select_fields()),
+                         "max_requests": 1, "period": 1.0, "lease_timeout": lease_timeout, "max_attempts": 5})
+        add_job(queue, "http://127.0.0.1/page")
+
+    client = SlowClient(next(iter(pages.values())), seconds=4 * lease_timeout)
+    worker = threading.Thread(target=run_worker, args=(path,), kwargs={"name": "slow", "client": client})
+    worker.start()
+    client.started.wait(5)
+    stolen = []
+    with JobQueue(path, lease_timeout=lease_timeout) as queue:
+        while worker.is_alive():
+            stolen.append(queue.lease("other"))
+            time.sleep(lease_timeout / 3)
+        worker.join()
+
+        assert not any(stolen)
+        assert queue.counts()["done"] == 1
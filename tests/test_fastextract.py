@@ -0,0 +1,56 @@
+"""
+Parity tests of the single-pass extraction engine (`scrapertools.fastextract`)
+with the BeautifulSoup reference, over the recorded pages of `benchmarks/pages`
+and the trimmed pages with the markup of arXiv itself of `tests/fixtures/html`.
+"""
+
+import os
+
+import pytest
+
+from arxivscraper.scrapertools.fastextract import check_parity, extract_page_fast, lxml
+from arxivscraper.scrapertools.scrapertools import parse_page
+from tests.conftest import FIXTURES_DIR, load_pages
+
+BACKENDS = [
+    "html.parser",
+    pytest.param("lxml", marks=pytest.mark.skipif(lxml is None, reason="lxml is not installed")),
+]
+
+
+def fixture_page(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, "html", name), "rb") as file:
+        return file.read()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", sorted(load_pages()))
+def test_fast_engine_matches_bs4(pages, name, backend):
+    assert check_parity(pages[name], backend=backend) == []
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", ["results.html", "no_results.html"])
+def test_fast_engine_matches_bs4_on_arxiv_pages(name, backend):
+    assert check_parity(fixture_page(name), backend=backend) == []
+
+
+@pytest.mark.parametrize("engine", ["bs4", "fast"])
+def test_arxiv_results_page(engine):
+    # Pagination links, result counters, DOI labels, cross-lists and comments must not leak into the records
+    total, records = parse_page(fixture_page("results.html"), engine=engine)
+
+    assert total == 1117
+    assert [record["index"] for record in records] == ["2505.24762", "2505.24761", "2505.24868", "2505.24794"]
+    assert records[1]["tags"] == ["math.FA", "math.CV"]
+    assert records[1]["title"].startswith("On Strong Markushevich bases $\\{t^{λ_n}\\}_{n=1}^{\\infty}$")
+    assert records[3]["authors"] == ["Benedek Kovács", "Zoltán Lóránt Nagy"]
+    assert "\\frac{1}{λ_n}<\\infty" in records[1]["abstract"]
+    for record in records:
+        assert not record["abstract"].endswith(("More", "Less"))
+        assert "Comments" not in record["abstract"] and "Submitted" not in record["abstract"]
+
+
+def test_arxiv_no_results_page():
+    assert extract_page_fast(fixture_page("no_results.html")) == (0, [])
+    assert parse_page(fixture_page("no_results.html")) == (0, [])
@@ -0,0 +1,99 @@
+"""
+Tests of the download scheduler (`webtools.fetcher`) and the token-bucket rate
+limiter (`webtools.ratelimit`) against the local stand-in of arXiv.
+"""
+
+import time
+
+import pytest
+
+from arxivscraper.webtools.fetcher import fetch_pages
+from arxivscraper.webtools.httpclient import HTTPClient
+from arxivscraper.webtools.ratelimit import TokenBucket
+from tests.conftest import FakeClock
+
+
+def test_pages_come_back_in_order_with_a_bounded_pool(page_server, pages):
+    names = list(pages) * 2
+    # Later pages answer faster, so they finish before the earlier ones
+    urls = [f"{page_server.url}/pages/{name}?delay={0.02 * (len(names) - position)}"
+            for position, name in enumerate(names)]
+
+    with HTTPClient() as client:
+        results = list(fetch_pages(urls, fetch=client.fetch, workers=3))
+
+    assert [url for url, _ in results] == urls
+    assert [content for _, content in results] == [pages[name] for name in names]
+    assert 1 < page_server.max_in_flight <= 3
+
+
+def test_pool_is_bounded_when_the_consumer_is_slow(page_server, pages):
+    urls = [f"{page_server.url}/pages/{name}" for name in pages] * 3
+
+    with HTTPClient() as client:
+        downloads = fetch_pages(urls, fetch=client.fetch, workers=2)
+        next(downloads)
+        time.sleep(0.2)
+        # The first page and at most `workers` more were requested while it was consumed
+        assert len(page_server.requests) <= 3
+        downloads.close()
+
+
+def test_invalid_number_of_workers():
+    with pytest.raises(ValueError):
+        list(fetch_pages(["http://127.0.0.1/"], workers=0))
+
+
+def test_token_bucket_enforces_requests_per_window():
+    clock = FakeClock()
+    bucket = TokenBucket(requests=3, period=1.0, clock=clock, sleep=clock.sleep)
+
+    times = []
+    for _ in range(9):
+        bucket.acquire()
+        times.append(clock())
+
+    # A full bucket serves its burst at once, then one request every period / requests
+    assert times == pytest.approx([0, 0, 0, 1 / 3, 2 / 3, 1, 4 / 3, 5 / 3, 2])
+    for start in times[3:]:
+        assert sum(start <= moment < start + 1.0 for moment in times) <= 3
+
+
+def test_token_bucket_is_shared_by_every_worker(page_server, pages):
+    requests, period = 2, 0.4
+    urls = [f"{page_server.url}/pages/{name}" for name in pages] + [f"{page_server.url}/pages/small"]
+    limiter = TokenBucket(requests=requests, period=period, burst=1)
+
+    with HTTPClient() as client:
+        list(fetch_pages(urls, fetch=client.fetch, limiter=limiter, workers=4))
+
+    arrivals = sorted(moment for moment, _ in page_server.requests)
+    assert len(arrivals) == len(urls)
+    # Slightly shorter windows absorb the jitter of the local network
+    for start in arrivals:
+        assert sum(start <= moment < start + period - 0.05 for moment in arrivals) <= requests
+    assert arrivals[-1] - arrivals[0] >= (len(urls) - 1) * period / requests - 0.05
+
+
+def test_no_sleep_after_the_last_page(page_server, pages):
+    clock = FakeClock()
+    limiter = TokenBucket(requests=1, period=10.0, burst=1, clock=clock, sleep=clock.sleep)
+    urls = [f"{page_server.url}/pages/{name}" for name in pages]
+
+    with HTTPClient() as client:
+        results = list(fetch_pages(urls, fetch=client.fetch, limiter=limiter, workers=1))
+
+    assert len(results) == len(urls)
+    # Every page but the first waited for its token; nothing waited once the last one was fetched
+    assert clock.sleeps == pytest.approx([10.0] * (len(urls) - 1))
+    assert clock() == pytest.approx(10.0 * (len(urls) - 1))
+
+
+def test_an_empty_token_bucket_makes_the_first_request_wait():
+    clock = FakeClock()
+    bucket = TokenBucket(requests=3, period=1.0, initial=0, clock=clock, sleep=clock.sleep)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == pytest.approx([1 / 3] * 3)
@@ -0,0 +1,84 @@
+"""
+Tests of the retry policy of the HTTP client (`webtools.httpclient`) against
+local stand-ins answering with scripted errors.
+"""
+
+import pytest
+
+from arxivscraper.webtools.httpclient import HTTPClient
+from arxivscraper.webtools.ratelimit import TokenBucket
+from tests.conftest import FakeClock
+
+
+def scripted(stand_in, *answers):
+    """Stand-in answering with the (status, headers) of `answers` in turn, then with a page."""
+    answers = list(answers)
+
+    def respond(path, query):
+        status, headers = answers.pop(0) if answers else (200, {})
+        return status, headers, b"page" if status == 200 else b""
+
+    return stand_in(respond)
+
+
+def test_transient_errors_are_retried_with_backoff(stand_in):
+    server = scripted(stand_in, (503, {}), (500, {}), (429, {}), (502, {}))
+    waits = []
+
+    with HTTPClient(backoff_base=0.5, backoff_max=3.0, sleep=waits.append) as client:
+        assert client.get(f"{server.url}/page").content == b"page"
+
+    assert len(server.requests) == 5
+    # Full jitter under an exponential bound: 0.5, 1, 2, then capped at 3 seconds
+    assert len(waits) == 4
+    for wait, bound in zip(waits, [0.5, 1.0, 2.0, 3.0]):
+        assert 0 <= wait <= bound
+
+
+def test_retry_after_is_honoured(stand_in):
+    server = scripted(stand_in, (429, {"Retry-After": "7"}), (503, {"Retry-After": "Thu, 01 Jan 1970 00:00:00 GMT"}))
+    waits = []
+
+    with HTTPClient(backoff_base=0.01, backoff_max=0.01, sleep=waits.append) as client:
+        assert client.get(f"{server.url}/page").content == b"page"
+
+    # A date in the past asks for no wait beyond the backoff
+    assert waits[0] == 7.0
+    assert waits[1] <= 0.01
+
+
+def test_retry_after_pauses_every_worker_of_the_limiter(stand_in):
+    server = scripted(stand_in, (429, {"Retry-After": "7"}))
+    clock = FakeClock()
+    limiter = TokenBucket(requests=10, period=1.0, clock=clock, sleep=clock.sleep)
+
+    with HTTPClient(limiter=limiter, max_retries=0, sleep=clock.sleep) as client:
+        with pytest.raises(ConnectionError):
+            client.get(f"{server.url}/page")
+
+    # Another worker sharing the bucket waits for the time asked, although it holds tokens
+    assert limiter.acquire() == pytest.approx(7.0)
+
+
+def test_client_errors_are_not_retried(stand_in):
+    server = scripted(stand_in, (404, {}))
+    waits = []
+
+    with HTTPClient(sleep=waits.append) as client:
+        with pytest.raises(ConnectionError, match="404"):
+            client.get(f"{server.url}/page")
+
+    assert len(server.requests) == 1
+    assert waits == []
+
+
+def test_retries_run_out(stand_in):
+    server = scripted(stand_in, *[(503, {})] * 10)
+    waits = []
+
+    with HTTPClient(max_retries=2, backoff_base=0.01, sleep=waits.append) as client:
+        with pytest.raises(ConnectionError, match="503"):
+            client.get(f"{server.url}/page")
+
+    assert len(server.requests) == 3
+    assert len(waits) == 2
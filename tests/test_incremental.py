@@ -0,0 +1,67 @@
+"""
+Tests of incremental harvests (`scrape_arxiv(state=...)`, `storage.state`)
+against the stand-in of the arXiv search.
+"""
+
+import csv
+
+from arxivscraper.arxivscraper import scrape_arxiv
+from arxivscraper.storage.state import HarvestState
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+
+def run(server, tmp_path, category, start_date: str, end_date: str) -> list[str]:
+    """Runs an incremental scrape and returns the identifiers it wrote."""
+    output = str(tmp_path / "new.csv")
+    scrape_arxiv(start_date, end_date, category, output=output, state=str(tmp_path / "state.sqlite"),
+                 base_url=server.url, workers=1, limiter=TokenBucket(requests=100, period=1.0),
+                 return_dataframe=False)
+    with open(output, encoding="utf-8", newline="") as file:
+        return [row["index"] for row in csv.DictReader(file)]
+
+
+def watermark(tmp_path, category: str) -> str | None:
+    with HarvestState(str(tmp_path / "state.sqlite")) as state:
+        return state.watermark(category, False)
+
+
+def starts(server) -> list[int]:
+    return [int(path.rsplit("start=", 1)[1]) for _, path in server.requests]
+
+
+def test_second_run_stops_at_the_known_papers(search_server, dataset, tmp_path):
+    old, new = dataset[:550], dataset[550:800]
+    papers = {"gr-qc": [("2025-06-02", paper) for paper in old]}
+    server = search_server(papers)
+
+    assert run(server, tmp_path, "gr-qc", "2025-06-01", "2025-06-02") == [paper["index"] for paper in old]
+    assert watermark(tmp_path, "gr-qc") == "2025-06-02"
+
+    # 250 papers announced the next day come first; the second page ends with known papers
+    papers["gr-qc"][:0] = [("2025-06-03", paper) for paper in new]
+    server.requests.clear()
+    assert run(server, tmp_path, "gr-qc", "2025-06-01", "2025-06-03") == [paper["index"] for paper in new]
+    assert watermark(tmp_path, "gr-qc") == "2025-06-03"
+    # The search restarted at the watermark day, and stopped before its last pages
+    assert all("date-from_date=2025-06-02" in path for _, path in server.requests)
+    assert 600 not in starts(server)
+
+
+def test_unparsable_category_keeps_its_watermark(search_server, dataset, tmp_path):
+    papers = {"gr-qc": [("2025-06-02", paper) for paper in dataset[:10]],
+              "hep-th": [("2025-06-02", paper) for paper in dataset[10:20]],
+              "astro-ph": []}
+    server = search_server(papers, broken=("hep-th",))
+
+    written = run(server, tmp_path, ["gr-qc", "hep-th", "astro-ph"], "2025-06-01", "2025-06-02")
+    assert written == [paper["index"] for paper in dataset[:10]]
+    # A real "no results" page counts as harvested; an unparsable page does not
+    assert watermark(tmp_path, "gr-qc") == "2025-06-02"
+    assert watermark(tmp_path, "astro-ph") == "2025-06-02"
+    assert watermark(tmp_path, "hep-th") is None
+
+    # Once the page parses again, the next daily run still covers the skipped window
+    server = search_server(papers)
+    written = run(server, tmp_path, ["gr-qc", "hep-th", "astro-ph"], "2025-06-01", "2025-06-03")
+    assert written == [paper["index"] for paper in dataset[10:20]]
+    assert watermark(tmp_path, "hep-th") == "2025-06-03"
@@ -0,0 +1,115 @@
+"""
+Tests of the OAI-PMH backend (`webtools.oaipmh` and `iter_oai`), replaying
+recorded ListRecords responses from a local stand-in server.
+
+The responses in `tests/fixtures/oai` follow the arXiv OAI-PMH interface: a
+`math` harvest split in two pages by a resumption token (the first one with a
+deleted record), a `physics:gr-qc` page with a paper cross-listed from
+math.DG, and the 'noRecordsMatch' and 'badResumptionToken' errors. The
+expected records are those of the same papers in the scraped sample dataset.
+"""
+
+import json
+import os
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from arxivscraper.arxivscraper import iter_oai, scrape_arxiv
+from arxivscraper.webtools.httpclient import HTTPClient
+from arxivscraper.webtools.oaipmh import OAIPage, parse_list_records
+from arxivscraper.webtools.ratelimit import TokenBucket
+from tests.conftest import FIXTURES_DIR
+
+OAI_DIR = os.path.join(FIXTURES_DIR, "oai")
+TOKEN = "6960524|1001"
+
+
+def recorded(name: str) -> bytes:
+    with open(os.path.join(OAI_DIR, name), "rb") as file:
+        return file.read()
+
+
+@pytest.fixture(scope="module")
+def expected() -> dict[str, list[dict]]:
+    with open(os.path.join(OAI_DIR, "expected_records.json"), encoding="utf-8") as file:
+        return json.load(file)
+
+
+@pytest.fixture
+def oai_server(stand_in):
+    """Replays the recorded responses at `/oai2`, chosen like the arXiv endpoint would."""
+    def respond(path: str, query: dict[str, list[str]]):
+        parameters = {key: values[0] for key, values in query.items()}
+        if path != "/oai2" or parameters.get("verb") != "ListRecords":
+            return 404, {}, b""
+        if "resumptionToken" in parameters:
+            name = "list_records_math_2.xml" if parameters["resumptionToken"] == TOKEN else "bad_resumption_token.xml"
+        elif parameters.get("set") == "math":
+            name = "list_records_math_1.xml"
+        elif parameters.get("set") == "physics:gr-qc" and parameters.get("from") == "2025-05-16":
+            name = "list_records_gr-qc.xml"
+        else:
+            name = "no_records_match.xml"
+        return 200, {"Content-Type": "text/xml; charset=utf-8"}, recorded(name)
+
+    server = stand_in(respond)
+    server.base_url = f"{server.url}/oai2"
+    return server
+
+
+def harvest(server, start_date: str, end_date: str, category: str, **options) -> list[list[dict]]:
+    with HTTPClient() as client:
+        return list(iter_oai(start_date, end_date, category, client=client, base_url=server.base_url,
+                             progress=False, **options))
+
+
+def test_records_are_mapped_onto_the_scraped_schema(expected):
+    page = parse_list_records(recorded("list_records_math_1.xml"))
+
+    # The deleted record is skipped
+    assert page == OAIPage(expected["math"][:2], TOKEN, 4)
+
+
+def test_last_page_has_no_token(expected):
+    assert parse_list_records(recorded("list_records_math_2.xml")) == OAIPage(expected["math"][2:], None, 4)
+
+
+def test_no_records_match_is_an_empty_page():
+    assert parse_list_records(recorded("no_records_match.xml")) == OAIPage([], None, 0)
+
+
+def test_other_errors_are_reported():
+    with pytest.raises(ValueError, match="badResumptionToken"):
+        parse_list_records(recorded("bad_resumption_token.xml"))
+    with pytest.raises(ValueError, match="Malformed"):
+        parse_list_records(recorded("list_records_math_1.xml")[:-200])
+
+
+def test_resumption_tokens_are_followed(oai_server, expected):
+    pages = harvest(oai_server, "2025-05-28", "2025-05-31", "math")
+
+    assert pages == [expected["math"][:2], expected["math"][2:]]
+    first, second = (parse_qs(urlsplit(path).query) for _, path in oai_server.requests)
+    assert first == {"verb": ["ListRecords"], "metadataPrefix": ["arXiv"], "set": ["math"],
+                     "from": ["2025-05-28"], "until": ["2025-05-31"]}
+    # Follow-up requests carry the token only, as the protocol requires
+    assert second == {"verb": ["ListRecords"], "resumptionToken": [TOKEN]}
+
+
+def test_cross_listed_papers_need_cross_list(oai_server, expected):
+    assert harvest(oai_server, "2025-05-16", "2025-05-17", "gr-qc") == [[]]
+    assert harvest(oai_server, "2025-05-16", "2025-05-17", "gr-qc", cross_list=True) == [expected["gr-qc"]]
+
+
+def test_empty_window(oai_server):
+    assert harvest(oai_server, "2025-05-24", "2025-05-25", "gr-qc") == [[]]
+
+
+def test_scrape_with_the_oai_source(oai_server, expected, tmp_path):
+    output = tmp_path / "math.jsonl"
+    scrape_arxiv("2025-05-28", "2025-05-31", "math", output=str(output), source="oai",
+                 oai_url=oai_server.base_url, limiter=TokenBucket(requests=10, period=1.0), return_dataframe=False)
+
+    with open(output, encoding="utf-8") as file:
+        assert [json.loads(line) for line in file] == expected["math"]
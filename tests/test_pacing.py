@@ -0,0 +1,93 @@
+"""
+Tests of the adaptive (AIMD) rate limiter (`webtools.pacing`) driven by an
+`HTTPClient` against local stand-ins that throttle and slow down.
+"""
+
+import time
+
+import pytest
+
+from arxivscraper.webtools.httpclient import HTTPClient
+from arxivscraper.webtools.pacing import AdaptiveTokenBucket
+from tests.conftest import FakeClock
+
+
+def scripted(stand_in, *answers):
+    """Stand-in answering with `answers` in turn, then with healthy pages."""
+    answers = list(answers)
+
+    def respond(path, query):
+        status, headers, delay = answers.pop(0) if answers else (200, {}, 0.0)
+        time.sleep(delay)
+        return status, headers, b"page" if status == 200 else b""
+
+    return stand_in(respond)
+
+
+def adaptive(clock: FakeClock, **options) -> AdaptiveTokenBucket:
+    settings = dict(requests=1, period=1.0, min_interval=0.5, max_interval=5.0, max_concurrency=3,
+                    step=30.0, latency_target=1.0, log=None)
+    settings.update(options)
+    return AdaptiveTokenBucket(**settings, clock=clock, sleep=clock.sleep)
+
+
+def actions(bucket: AdaptiveTokenBucket) -> list[tuple[str, str]]:
+    return [(decision["action"], decision["reason"]) for decision in bucket.decisions]
+
+
+def test_throttling_pauses_and_decreases(stand_in):
+    server = scripted(stand_in, (429, {"Retry-After": "3600"}, 0.0))
+    clock = FakeClock()
+    bucket = adaptive(clock)
+
+    with HTTPClient(limiter=bucket, max_retries=0, sleep=clock.sleep) as client:
+        with pytest.raises(ConnectionError):
+            client.get(f"{server.url}/page")
+
+    assert actions(bucket) == [("decrease", "HTTP 429"), ("pause", "Retry-After 3600 s")]
+    assert bucket.interval == pytest.approx(2.0)
+    assert bucket.concurrency == 1
+    # Every other request waits for the whole time asked, not only up to `max_interval`
+    start = clock()
+    bucket.acquire()
+    assert clock() - start == pytest.approx(3600, abs=1)
+
+
+def test_rising_latency_decreases(stand_in):
+    server = scripted(stand_in, (200, {}, 0.0), (200, {}, 0.0), (200, {}, 0.6), (200, {}, 0.6))
+    clock = FakeClock()
+    bucket = adaptive(clock, latency_target=0.25)
+
+    with HTTPClient(limiter=bucket, sleep=clock.sleep) as client:
+        for _ in range(4):
+            client.get(f"{server.url}/page")
+
+    decreases = [reason for action, reason in actions(bucket) if action == "decrease"]
+    assert len(decreases) >= 1
+    assert decreases[0].startswith("average latency")
+    assert bucket.concurrency < 3
+    assert bucket.interval > 0.5
+
+
+def test_healthy_responses_increase_up_to_the_limits(stand_in):
+    server = scripted(stand_in, (503, {}, 0.0))
+    clock = FakeClock()
+    bucket = adaptive(clock)
+
+    with HTTPClient(limiter=bucket, max_retries=0, sleep=clock.sleep) as client:
+        with pytest.raises(ConnectionError):
+            client.get(f"{server.url}/page")
+        assert (bucket.interval, bucket.concurrency) == (pytest.approx(2.0), 1)
+
+        intervals = []
+        for _ in range(20):
+            client.get(f"{server.url}/page")
+            intervals.append(bucket.interval)
+
+    # Additive increase: the interval shrinks step by step down to its floor, and stays there
+    assert intervals == sorted(intervals, reverse=True)
+    assert intervals[0] > intervals[1]
+    assert intervals[-1] == pytest.approx(0.5)
+    assert bucket.concurrency == 3
+    assert ("increase", "interval floor reached") in actions(bucket)
+    assert [action for action, _ in actions(bucket)].count("increase") == 3
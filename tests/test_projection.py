@@ -0,0 +1,46 @@
+"""
+Tests of field projection against the stand-in of the arXiv search: pages
+without abstracts and the traffic reported at the end of the run.
+"""
+
+import re
+
+from arxivscraper.arxivscraper import scrape_arxiv
+from arxivscraper.monitoring.metrics import RunMetrics
+from arxivscraper.storage.sinks import read_records
+from arxivscraper.webtools.ratelimit import TokenBucket
+
+QUERY = {"start_date": "2025-06-01", "end_date": "2025-06-30", "category": "gr-qc"}
+
+
+def run(server, output: str, **options) -> RunMetrics:
+    metrics = RunMetrics()
+    scrape_arxiv(**QUERY, output=output, base_url=server.url, limiter=TokenBucket(requests=100, period=1.0),
+                 metrics=metrics, return_dataframe=False, **options)
+    return metrics
+
+
+def test_projected_runs_report_what_they_saved(search_server, dataset, tmp_path, capsys):
+    server = search_server({"gr-qc": [("2025-06-02", paper) for paper in dataset[:400]]})
+
+    full = run(server, str(tmp_path / "full.csv")).counters["bytes_downloaded"]
+    assert "abstracts=show" not in capsys.readouterr().out
+
+    server.requests.clear()
+    output = str(tmp_path / "projected.csv")
+    projected = run(server, output, fields=("index", "title", "tags")).counters["bytes_downloaded"]
+    assert all("abstracts=hide" in path for _, path in server.requests)
+    assert [record["index"] for record in read_records(output)] == [paper["index"] for paper in dataset[:400]]
+
+    printed = re.search(r"Downloaded ([\d,]+) bytes for (\d+) records without abstracts, "
+                        r"about ([\d,]+) bytes \((\d+)%\) less than with abstracts=show", capsys.readouterr().out)
+    assert printed is not None
+    downloaded, records, saved = (int(group.replace(",", "")) for group in printed.groups()[:3])
+    assert (downloaded, records) == (projected, 400)
+    # The estimate is close to what the pages with abstracts actually weighed
+    assert abs(saved - (full - projected)) < 0.2 * (full - projected)
+
+    # The line does not depend on collecting metrics
+    scrape_arxiv(**QUERY, output=output, base_url=server.url, limiter=TokenBucket(requests=100, period=1.0),
+                 fields=("index", "title"), return_dataframe=False)
+    assert f"Downloaded {projected:,} bytes for 400 records without abstracts" in capsys.readouterr().out
@@ -0,0 +1,124 @@
+"""
+Tests of the full-text search index (`storage.search`).
+"""
+
+import pytest
+
+from arxivscraper.storage.search import SearchIndex, id_month, plain_query
+
+
+def record(index: str, title: str, abstract: str, tags: list[str], authors: list[str]) -> dict:
+    return {"index": index, "title": title, "tags": tags, "authors": authors, "abstract": abstract}
+
+
+PAPERS = [
+    record("2501.00001v1", "Black hole entropy from horizon microstates",
+           "We count the microstates of a black hole horizon.", ["gr-qc", "hep-th"], ["Stephen W. Hawking"]),
+    record("2502.00002", "Dark matter halos of dwarf galaxies",
+           "Rotation curves constrain the dark matter profile.", ["astro-ph.GA"], ["Vera Rubin", "Kent Ford"]),
+    record("2503.00003", "Axion dark matter searches with haloscopes",
+           "Haloscopes look for the conversion of axions into photons.", ["hep-ph", "astro-ph.CO"],
+           ["Pierre Sikivie"]),
+    record("hep-th/9901001", "Entropy of an old black hole",
+           "An old-style identifier about black hole thermodynamics.", ["hep-th"], ["Stephen W. Hawking"]),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(str(tmp_path / "index" / "search.sqlite")) as search_index:
+        assert search_index.add(PAPERS) == 4
+        yield search_index
+
+
+def indices(results: list[dict]) -> list[str]:
+    return [result["index"] for result in results]
+
+
+def test_ranked_search(index):
+    results = index.search("black hole")
+    assert sorted(indices(results)) == ["2501.00001", "hep-th/9901001"]
+    assert results[0]["score"] >= results[1]["score"] > 0
+    assert indices(index.search("black hole", limit=1)) == indices(results)[:1]
+    result = index.search("microstates")[0]
+    assert (result["index"], result["month"], result["tags"]) == ("2501.00001", "2025-01", ["gr-qc", "hep-th"])
+    assert "[microstates]" in result["snippet"]
+    # Without query text, every paper passes, newest first
+    assert indices(index.search()) == ["2503.00003", "2502.00002", "2501.00001", "hep-th/9901001"]
+    assert index.search()[0]["score"] is None
+
+
+def test_newer_versions_replace_older_ones_but_not_the_reverse(index):
+    assert index.add([record("2501.00001v3", "Black hole entropy, revised", "Revised.", ["gr-qc"], ["Hawking"])]) == 1
+    assert index.add([record("2501.00001v2", "Black hole entropy, stale", "Stale.", ["gr-qc"], ["Hawking"])]) == 0
+    # Without a version, a record is the current one and keeps the stored version
+    assert index.add([record("2502.00002", "Dark matter halos, current", "Current.", ["astro-ph.GA"], [])]) == 1
+    # Within a batch, the latest version wins whatever the order
+    assert index.add([record("2503.00003v5", "Axions v5", "Five.", ["hep-ph"], []),
+                      record("2503.00003v4", "Axions v4", "Four.", ["hep-ph"], [])]) == 1
+
+    assert len(index) == 4
+    assert indices(index.search("revised")) == ["2501.00001"]
+    assert index.search("stale") == []
+    # The inverted index and the filters follow the update
+    assert index.search("microstates") == []
+    assert indices(index.search(authors=["Hawking"])) == ["2501.00001", "hep-th/9901001"]
+    assert indices(index.search(tags=["hep-th"])) == ["hep-th/9901001"]
+    assert index.search("current")[0]["title"] == "Dark matter halos, current"
+    assert index.search("axions")[0]["title"] == "Axions v5"
+
+
+def test_filters(index):
+    assert indices(index.search("dark matter", tags=["astro-ph.GA"])) == ["2502.00002"]
+    # A category matches its subcategories, but not other categories sharing its prefix
+    assert sorted(indices(index.search(tags=["astro-ph"]))) == ["2502.00002", "2503.00003"]
+    assert index.search(tags=["astro"]) == []
+    assert indices(index.search(tags=["gr-qc", "hep-ph"])) == ["2503.00003", "2501.00001"]
+    # Authors: case-insensitive parts of names, every one required
+    assert indices(index.search(authors=["rubin"])) == ["2502.00002"]
+    assert indices(index.search(authors=["Rubin", "Ford"])) == ["2502.00002"]
+    assert index.search(authors=["Rubin", "Sikivie"]) == []
+    assert index.search(authors=["%"]) == []
+    # Months from the identifiers, old-style ones included
+    assert indices(index.search(since="2025-02")) == ["2503.00003", "2502.00002"]
+    assert indices(index.search(since="2025-02-15", until="2025-02-28")) == ["2502.00002"]
+    assert indices(index.search("black hole", until="2000-01")) == ["hep-th/9901001"]
+    with pytest.raises(ValueError):
+        index.search(since="2025-13")
+    with pytest.raises(ValueError):
+        index.search(until="January")
+
+
+def test_prefix_search(index):
+    assert indices(index.search("axion*")) == ["2503.00003"]
+    assert indices(index.search("haloscope*")) == ["2503.00003"]
+    assert index.search("axio") == []
+    assert plain_query("black hole entrop*") == '"black" "hole" "entrop"*'
+
+
+def test_plain_queries_quote_fts5_operators(index):
+    assert plain_query('dark NOT matter title:"axion" (halo') == '"dark" "NOT" "matter" "title" "axion" "halo"'
+    assert plain_query("-- !") == ""
+    # Operators are searched as words: no error, and no paper has the words 'not' or 'and'
+    assert index.search("dark NOT matter") == []
+    assert index.search("dark AND matter") == []
+    assert index.search("dark OR axion") == []
+    assert indices(index.search("(axion* \"haloscopes")) == ["2503.00003"]
+
+
+def test_raw_queries(index):
+    assert sorted(indices(index.search('title:"dark matter"', raw=True))) == ["2502.00002", "2503.00003"]
+    assert indices(index.search('abstract:"dark matter"', raw=True)) == ["2502.00002"]
+    assert indices(index.search("dark NOT axion", raw=True)) == ["2502.00002"]
+    assert indices(index.search("title:axion* OR microstates", raw=True, tags=["hep-ph"])) == ["2503.00003"]
+    with pytest.raises(ValueError):
+        index.search('title:"dark matter', raw=True)
+    with pytest.raises(ValueError):
+        index.search("unknown_column:black", raw=True)
+
+
+def test_id_month():
+    assert id_month("2507.08819v2") == "2025-07"
+    assert id_month("hep-th/9901001") == "1999-01"
+    assert id_month("math.GT/0309136") == "2003-09"
+    assert id_month("not an id") is None